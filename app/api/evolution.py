@@ -2,12 +2,16 @@
 Minimal Evolution API webhook handler.
 Receives WhatsApp messages and triggers ONE_TURN flow.
 """
+import asyncio
 from typing import Any, Dict
 
 from fastapi import APIRouter, Request
 
 from app.core import langgraph_flow
 from app.core.dedup import turn_controller
+from app.core.history_window import append_turn
+from app.core.http_pool import close_http_clients
+from app.core.state_manager import archive_history_entries
 from app.utils.webhook_normalizer import normalize_webhook_payload
 
 router = APIRouter()
@@ -149,25 +153,28 @@ async def webhook(request: Request) -> Dict[str, Any]:
             print(f"HISTORIAN|state_load_error|error={str(e)}")
             current_state_dict = {}
 
-        # 3. Atua como "Historiador" construindo o histórico completo
-        history = current_state_dict.get("history", [])
-        last_bot_response = current_state_dict.get("last_bot_response")
-
+        # 3. Atua como "Historiador" construindo o histórico (janela limitada)
         print(
-            f"HISTORIAN|current_history_length={len(history)}|"
-            f"has_bot_response={bool(last_bot_response)}"
+            f"HISTORIAN|current_history_length={len(current_state_dict.get('history') or [])}|"
+            f"has_bot_response={bool(current_state_dict.get('last_bot_response'))}"
         )
 
-        # Adiciona a última resposta do bot ao histórico (se existir)
-        if last_bot_response:
-            history.append({"role": "assistant", "content": last_bot_response})
-            print(
-                f"HISTORIAN|bot_response_added|content_preview={last_bot_response[:50]}..."
-            )
-
-        # Adiciona a nova mensagem do usuário ao histórico
-        history.append({"role": "user", "content": text})
-        print(f"HISTORIAN|user_message_added|total_history={len(history)}")
+        # Adiciona última resposta do bot + nova mensagem do usuário; entradas
+        # antigas viram history_summary e são arquivadas fora do checkpoint
+        # (Redis síncrono: o arquivamento roda em thread, fora do event loop)
+        evicted = []
+        history, history_summary = append_turn(
+            current_state_dict,
+            text,
+            phone=phone,
+            archive=lambda _phone, entries: evicted.extend(entries),
+        )
+        if evicted:
+            await asyncio.to_thread(archive_history_entries, phone, evicted)
+        print(
+            f"HISTORIAN|user_message_added|total_history={len(history)}|"
+            f"summary_len={len(history_summary)}"
+        )
 
         # 4. Build state for LangGraph with all required fields + histórico
         state = {
@@ -177,8 +184,9 @@ async def webhook(request: Request) -> Dict[str, Any]:
             "instance": instance,
             # ARCHITECTURAL FIX: Initialize collected_data at the source
             "collected_data": current_state_dict.get("collected_data", {}),
-            # 🎯 HISTORIADOR: Passa o histórico atualizado
+            # 🎯 HISTORIADOR: Passa o histórico atualizado (janela + resumo)
             "history": history,
+            "history_summary": history_summary,
         }
 
         # DEBUG: Log state before LangGraph execution
@@ -250,3 +258,19 @@ async def webhook(request: Request) -> Dict[str, Any]:
             "entities": {},
         }
         return normalize_webhook_payload(response)
+
+
+@router.on_event("shutdown")
+async def shutdown_checkpointer() -> None:
+    """Persiste checkpoints pendentes (write-behind) antes de encerrar."""
+    try:
+        await langgraph_flow.close_checkpointer()
+    except Exception as e:
+        # Checkpoints não persistidos: registrado sem interromper os demais hooks
+        print(f"SHUTDOWN|checkpoint_flush_failed|error={str(e)}")
+
+
+@router.on_event("shutdown")
+async def shutdown_http_pool() -> None:
+    """Fecha os clientes HTTP compartilhados (Evolution API)."""
+    await close_http_clients()
@@ -47,6 +47,9 @@ async def detailed_health_check() -> Dict[str, Any]:
         ("redis", _check_redis),
         ("openai", _check_openai_api),
         ("evolution_api", _check_evolution_api),
+        ("http_pool", _check_http_pool),
+        ("intent_fast_path", _check_intent_fast_path),
+        ("nlu_cache", _check_nlu_cache),
         ("system_resources", _check_system_resources),
         ("configuration", _check_configuration),
         ("performance_services", _check_performance_services)
@@ -525,6 +528,39 @@ async def _check_evolution_api() -> Dict[str, Any]:
         }
 
 
+async def _check_http_pool() -> Dict[str, Any]:
+    """Shared outbound HTTP pool stats (open connections, reuse ratio, handshake time)"""
+    from app.core.http_pool import get_http_pool_stats
+
+    return {
+        "healthy": True,
+        **get_http_pool_stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+async def _check_intent_fast_path() -> Dict[str, Any]:
+    """Local intent fast path stats (local vs. Gemini turns, calibrated thresholds)"""
+    from app.core.langgraph_flow import intent_fast_path
+
+    return {
+        "healthy": True,
+        **intent_fast_path.stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
+async def _check_nlu_cache() -> Dict[str, Any]:
+    """GeminiClassifier NLU cache stats (L1/Redis hits, misses, hit rate)"""
+    from app.core.langgraph_flow import gemini_classifier
+
+    return {
+        "healthy": True,
+        **gemini_classifier.nlu_cache.stats(),
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    }
+
+
 async def _check_system_resources() -> Dict[str, Any]:
     """Check system resource usage - temporarily disabled"""
     try:
@@ -2,12 +2,15 @@
 WhatsApp webhook routes
 """
 
+import dataclasses
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from app.clients.evolution_api import WhatsAppMessage as EvolutionWhatsAppMessage
 from app.core.config import settings
 from app.core.logger import app_logger
 from app.core.compat_imports import get_cecilia_workflow
+from app.core.turn_controller import DebounceScheduler
 from app.models.message import MessageResponse, MessageType, WhatsAppMessage
 from app.models.webhook import WebhookResponse, WhatsAppWebhook
 from app.services.message_preprocessor import message_preprocessor
@@ -16,6 +19,9 @@ from fastapi.responses import PlainTextResponse
 
 router = APIRouter()
 
+# Request headers carrying Evolution credentials; never persisted with a pending turn
+CREDENTIAL_HEADERS = ("apikey", "x-api-key", "authorization")
+
 # Initialize message processors
 # Wave 1: Streaming processor with fallback to existing processors
 # CECILIA-ONLY ARCHITECTURE: Remove feature flags, single source of truth
@@ -113,42 +119,50 @@ async def handle_evolution_webhook(request: Request):
             app_logger.debug("No message found in webhook data")
             return {"status": "ignored", "reason": "no_message"}
         
-        # **CIRÚRGICO**: Deduplication check - avoid reprocessing recent messages
-        from app.core.outbox_repo_redis import is_recent_duplicate
-        if is_recent_duplicate(parsed_message.message_id):
-            app_logger.info(f"💨 Skipping recent duplicate message: {parsed_message.message_id}")
-            return {"status": "ignored", "reason": "recent_duplicate"}
-
         # **NEW**: TurnController integration - aggregate messages + debounce
-        from app.core.turn_controller import append_user_message, flush_turn_if_quiet, _now_ms
-        from app.core.turn_lock import turn_lock
-        from app.services.redis_client import get_redis_client
-        
+        # Async Redis path: dedup + buffer append + lock attempt in 1 round trip
+        from app.core.cache_manager import get_async_redis
+        from app.core.turn_controller import async_ingest_user_message, async_flush_turn_if_quiet, _now_ms
+        from app.core.turn_lock import async_turn_lock
+
         phone_number = parsed_message.phone
         message_id = parsed_message.message_id
         message_text = parsed_message.message
         current_ts = _now_ms()
-        
-        # Get Redis connection for TurnController
-        redis_cache = get_redis_client()
-        
-        # Step 1: Always append user message to buffer
-        append_user_message(redis_cache, phone_number, message_id, message_text, current_ts)
-        
-        # Step 2: Try to acquire turn lock and process if ready
+
+        # Get async Redis connection (shared pool) for TurnController
+        redis_cache = get_async_redis()
+        if redis_cache is None:
+            raise RuntimeError("Async Redis client unavailable for TurnController")
+
+        # Step 1: Dedup check + append user message to buffer + try turn lock
         conversation_id = f"conv_{phone_number}_{current_ts // 60000}"  # 1-minute buckets
-        with turn_lock(conversation_id) as i_hold_the_lock:
+        ingest = await async_ingest_user_message(
+            redis_cache, phone_number, message_id, message_text, current_ts, conversation_id
+        )
+
+        if ingest["duplicate"]:
+            app_logger.info(f"💨 Skipping recent duplicate message: {parsed_message.message_id}")
+            return {"status": "ignored", "reason": "recent_duplicate"}
+
+        # Step 2: Process if ready (lock attempt already made in the pipeline)
+        async with async_turn_lock(conversation_id, acquired=ingest["lock_acquired"]) as i_hold_the_lock:
             # Everyone checks if turn is ready, but only lock holder processes
-            turn_batch = flush_turn_if_quiet(redis_cache, phone_number, current_ts)
-            
+            turn_batch = await async_flush_turn_if_quiet(redis_cache, phone_number, current_ts)
+
             if not turn_batch:
-                # Still in debounce window - wait for more messages
+                # Still in debounce window - timer flushes it if no other message arrives
+                await debounce_scheduler.schedule(
+                    phone_number,
+                    current_ts,
+                    context=await _debounce_context(parsed_message, headers),
+                )
                 app_logger.info(
                     f"TURN_CONTROLLER|waiting_debounce|phone={phone_number[-4:]}|"
                     f"lock_held={i_hold_the_lock}"
                 )
                 return {"status": "batching", "message": "Message added to turn batch"}
-            
+
             # Turn is ready to process
             if not i_hold_the_lock:
                 # Someone else is processing this turn
@@ -157,239 +171,316 @@ async def handle_evolution_webhook(request: Request):
                     f"turn={turn_batch['turn_id']}"
                 )
                 return {"status": "concurrent", "message": "Turn being processed by another instance"}
-            
+
             # I have the lock - process the turn through existing pipeline
-            app_logger.info(
-                f"TURN_CONTROLLER|processing_turn|phone={phone_number[-4:]}|"
-                f"turn={turn_batch['turn_id']}|msg_count={turn_batch['message_count']}|"
-                f"text_len={len(turn_batch['text'])}"
-            )
-            
-            # Use aggregated text instead of single message
-            aggregated_message = parsed_message._replace(
-                message=turn_batch['text'],
-                message_id=turn_batch['turn_id'],  # Use turn_id as message_id
+            return await _process_turn_batch(parsed_message, headers, turn_batch)
+
+    except Exception as e:
+        app_logger.error(f"Error processing Evolution API webhook: {str(e)}", exc_info=True)
+
+        # Ultimate fallback - direct response
+        return {
+            "status": "critical_error",
+            "message": "Olá! Kumon Vila A - instabilidade crítica momentânea. Contato urgente: (51) 99692-1999",
+            "contact": "(51) 99692-1999",
+            "error": "Critical pipeline failure",
+        }
+
+
+async def _process_turn_batch(
+    parsed_message: Any, headers: Dict[str, Any], turn_batch: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Run one aggregated turn through MessagePreprocessor → PipelineOrchestrator
+
+    Called inline by the webhook or by the debounce scheduler when the
+    turn's debounce window closes without another webhook arriving.
+    """
+    phone_number = parsed_message.phone
+
+    # Process the turn through existing pipeline
+    app_logger.info(
+        f"TURN_CONTROLLER|processing_turn|phone={phone_number[-4:]}|"
+        f"turn={turn_batch['turn_id']}|msg_count={turn_batch['message_count']}|"
+        f"text_len={len(turn_batch['text'])}"
+    )
+    
+    # Use aggregated text instead of single message
+    aggregated_message = dataclasses.replace(
+        parsed_message,
+        message=turn_batch['text'],
+        message_id=turn_batch['turn_id'],  # Use turn_id as message_id
+    )
+    
+    # Add turn context to prevent pipeline bypass
+    turn_context = {
+        "turn_id": turn_batch["turn_id"],
+        "turn_message_count": turn_batch["message_count"],
+        "turn_span_ms": turn_batch["span_ms"],
+        "turn_controlled": True
+    }
+    
+    # Continue with existing pipeline logic but use aggregated message
+    
+    # CLEAN ARCHITECTURE: MessagePreprocessor FIRST, then Orchestrator
+    app_logger.info("🔧 Processing through clean MessagePreprocessor")
+
+    # Process through MessagePreprocessor with comprehensive error handling
+    preprocessing_start = datetime.now()
+    try:
+        preprocessor_result = await message_preprocessor.process_message(
+            aggregated_message, headers  # Use aggregated message instead of single
+        )
+
+        preprocessing_time = (datetime.now() - preprocessing_start).total_seconds() * 1000
+
+        app_logger.info(
+            "MessagePreprocessor completed",
+            extra={
+                "success": preprocessor_result.success,
+                "processing_time_ms": preprocessing_time,
+                "rate_limited": preprocessor_result.rate_limited,
+                "error_code": preprocessor_result.error_code,
+                "phone": aggregated_message.phone,
+                "turn_controlled": True,
+                "turn_id": turn_context.get("turn_id"),
+            },
+        )
+
+        # Handle preprocessing failures
+        if not preprocessor_result.success:
+            app_logger.warning(
+                f"MessagePreprocessor failed for {aggregated_message.phone}: {preprocessor_result.error_code}"
             )
-            
-            # Add turn context to prevent pipeline bypass
-            turn_context = {
-                "turn_id": turn_batch["turn_id"],
-                "turn_message_count": turn_batch["message_count"],
-                "turn_span_ms": turn_batch["span_ms"],
-                "turn_controlled": True
-            }
-            
-            # Continue with existing pipeline logic but use aggregated message
-            
-            # CLEAN ARCHITECTURE: MessagePreprocessor FIRST, then Orchestrator
-            app_logger.info("🔧 Processing through clean MessagePreprocessor")
 
-            # Process through MessagePreprocessor with comprehensive error handling
-            preprocessing_start = datetime.now()
-            try:
-                preprocessor_result = await message_preprocessor.process_message(
-                    aggregated_message, headers  # Use aggregated message instead of single
-                )
+            # Return appropriate error response based on preprocessor result
+            if preprocessor_result.rate_limited:
+                return {
+                    "status": "rate_limited",
+                    "message": "Rate limit exceeded. Please wait before sending another message.",
+                    "error_code": "RATE_LIMITED",
+                }
+            elif preprocessor_result.error_code == "AUTH_FAILED":
+                return {
+                    "status": "auth_failed",
+                    "message": "Authentication failed",
+                    "error_code": "AUTH_FAILED",
+                }
+            else:
+                return {
+                    "status": "preprocessing_failed",
+                    "message": preprocessor_result.error_message,
+                    "error_code": preprocessor_result.error_code,
+                }
 
-                preprocessing_time = (datetime.now() - preprocessing_start).total_seconds() * 1000
+        # SUCCESS: Continue to Orchestrator with preprocessed message
+        app_logger.info("🚀 Passing to orchestrator for workflow routing")
 
-                app_logger.info(
-                    "MessagePreprocessor completed",
-                    extra={
-                        "success": preprocessor_result.success,
-                        "processing_time_ms": preprocessing_time,
-                        "rate_limited": preprocessor_result.rate_limited,
-                        "error_code": preprocessor_result.error_code,
-                        "phone": aggregated_message.phone,
-                        "turn_controlled": True,
-                        "turn_id": turn_context.get("turn_id"),
-                    },
-                )
+        # TODO: Create orchestrator that handles session management and intent classification
+        # For now, continue to existing pipeline orchestrator
+        from app.core.pipeline_orchestrator import pipeline_orchestrator
+        from app.services.pipeline_monitor import pipeline_monitor
 
-                # Handle preprocessing failures
-                if not preprocessor_result.success:
-                    app_logger.warning(
-                        f"MessagePreprocessor failed for {aggregated_message.phone}: {preprocessor_result.error_code}"
-                    )
+        # Initialize pipeline orchestrator if needed
+        await pipeline_orchestrator.initialize()
 
-                    # Return appropriate error response based on preprocessor result
-                    if preprocessor_result.rate_limited:
-                        return {
-                            "status": "rate_limited",
-                            "message": "Rate limit exceeded. Please wait before sending another message.",
-                            "error_code": "RATE_LIMITED",
-                        }
-                    elif preprocessor_result.error_code == "AUTH_FAILED":
-                        return {
-                            "status": "auth_failed",
-                            "message": "Authentication failed",
-                            "error_code": "AUTH_FAILED",
-                        }
-                    else:
-                        return {
-                            "status": "preprocessing_failed",
-                            "message": preprocessor_result.error_message,
-                            "error_code": preprocessor_result.error_code,
-                        }
-
-                # SUCCESS: Continue to Orchestrator with preprocessed message
-                app_logger.info("🚀 Passing to orchestrator for workflow routing")
-
-                # TODO: Create orchestrator that handles session management and intent classification
-                # For now, continue to existing pipeline orchestrator
-                from app.core.pipeline_orchestrator import pipeline_orchestrator
-                from app.services.pipeline_monitor import pipeline_monitor
-
-                # Initialize pipeline orchestrator if needed
-                await pipeline_orchestrator.initialize()
-
-                # Execute pipeline with PREPROCESSED message + turn context
-                # Add turn context to message for downstream processing
-                preprocessed_with_context = preprocessor_result.message._replace(
-                    message_id=turn_context["turn_id"]  # Use turn_id as message identifier
-                )
-                
-                pipeline_result = await pipeline_orchestrator.execute_pipeline(
-                    message=preprocessed_with_context,  # Use preprocessed message with turn context
-                    headers=headers,
-                    instance_name=settings.EVOLUTION_INSTANCE_NAME or "kumonvilaa",
-                    skip_preprocessing=True,  # Skip preprocessing since already done
-                    turn_context=turn_context,  # Pass turn context for minimal architecture
-                )
+        # Execute pipeline with PREPROCESSED message + turn context
+        # Add turn context to message for downstream processing
+        preprocessed_with_context = dataclasses.replace(
+            preprocessor_result.message,
+            message_id=turn_context["turn_id"]  # Use turn_id as message identifier
+        )
+        
+        pipeline_result = await pipeline_orchestrator.execute_pipeline(
+            message=preprocessed_with_context,  # Use preprocessed message with turn context
+            headers=headers,
+            instance_name=settings.EVOLUTION_INSTANCE_NAME or "kumonvilaa",
+            skip_preprocessing=True,  # Skip preprocessing since already done
+            turn_context=turn_context,  # Pass turn context for minimal architecture
+        )
 
-                # Record pipeline execution for monitoring
-                await pipeline_monitor.record_pipeline_execution(
-                    execution_id=pipeline_result.execution_id,
-                    phone_number=pipeline_result.phone_number,
-                    stage_results=pipeline_result.stage_results,
-                    total_duration_ms=pipeline_result.metrics.total_duration_ms,
-                    status=pipeline_result.status,
-                    errors=pipeline_result.metrics.errors,
-                )
+        # Record pipeline execution for monitoring
+        await pipeline_monitor.record_pipeline_execution(
+            execution_id=pipeline_result.execution_id,
+            phone_number=pipeline_result.phone_number,
+            stage_results=pipeline_result.stage_results,
+            total_duration_ms=pipeline_result.metrics.total_duration_ms,
+            status=pipeline_result.status,
+            errors=pipeline_result.metrics.errors,
+        )
 
-                # Handle different pipeline results
-                if pipeline_result.status.value == "completed":
-                    # Successful pipeline execution
-                    response = {
-                        "status": "success",
-                        "message": pipeline_result.response_message,
-                        "execution_id": pipeline_result.execution_id,
-                        "processing_time_ms": pipeline_result.metrics.total_duration_ms,
-                        "metadata": {
-                            "pipeline_version": "2.1",
-                            "processing_mode": "full_pipeline_orchestration",
-                            "stage_count": len(pipeline_result.stage_results),
-                            "cache_hits": pipeline_result.metrics.cache_hits,
-                            "cache_misses": pipeline_result.metrics.cache_misses,
-                            "circuit_breaker_triggers": pipeline_result.metrics.circuit_breaker_triggers,
-                            "recovery_used": pipeline_result.recovery_used,
-                            "sla_compliant": pipeline_result.metrics.total_duration_ms <= 3000,
-                        },
-                        "stage_performance": {
-                            stage: {
-                                "duration_ms": pipeline_result.metrics.stage_durations.get(stage, 0),
-                                "success": stage in pipeline_result.stage_results,
-                            }
-                            for stage in [
-                                "preprocessing",
-                                "business_rules",
-                                "langgraph_workflow",
-                                "postprocessing",
-                                "delivery",
-                            ]
-                        },
+        # Handle different pipeline results
+        if pipeline_result.status.value == "completed":
+            # Successful pipeline execution
+            response = {
+                "status": "success",
+                "message": pipeline_result.response_message,
+                "execution_id": pipeline_result.execution_id,
+                "processing_time_ms": pipeline_result.metrics.total_duration_ms,
+                "metadata": {
+                    "pipeline_version": "2.1",
+                    "processing_mode": "full_pipeline_orchestration",
+                    "stage_count": len(pipeline_result.stage_results),
+                    "cache_hits": pipeline_result.metrics.cache_hits,
+                    "cache_misses": pipeline_result.metrics.cache_misses,
+                    "circuit_breaker_triggers": pipeline_result.metrics.circuit_breaker_triggers,
+                    "recovery_used": pipeline_result.recovery_used,
+                    "sla_compliant": pipeline_result.metrics.total_duration_ms <= 3000,
+                },
+                "stage_performance": {
+                    stage: {
+                        "duration_ms": pipeline_result.metrics.stage_durations.get(stage, 0),
+                        "success": stage in pipeline_result.stage_results,
                     }
+                    for stage in [
+                        "preprocessing",
+                        "business_rules",
+                        "langgraph_workflow",
+                        "postprocessing",
+                        "delivery",
+                    ]
+                },
+            }
 
-                    app_logger.info(
-                        "Pipeline execution completed successfully",
-                        extra={
-                            "execution_id": pipeline_result.execution_id,
-                            "phone": pipeline_result.phone_number,
-                            "total_time_ms": pipeline_result.metrics.total_duration_ms,
-                            "stages_completed": len(pipeline_result.stage_results),
-                            "sla_compliant": pipeline_result.metrics.total_duration_ms <= 3000,
-                            "recovery_used": pipeline_result.recovery_used,
-                        },
-                    )
+            app_logger.info(
+                "Pipeline execution completed successfully",
+                extra={
+                    "execution_id": pipeline_result.execution_id,
+                    "phone": pipeline_result.phone_number,
+                    "total_time_ms": pipeline_result.metrics.total_duration_ms,
+                    "stages_completed": len(pipeline_result.stage_results),
+                    "sla_compliant": pipeline_result.metrics.total_duration_ms <= 3000,
+                    "recovery_used": pipeline_result.recovery_used,
+                },
+            )
 
-                    return response
+            return response
 
-                elif pipeline_result.status.value == "circuit_breaker_open":
-                    # Circuit breaker protection triggered
-                    app_logger.warning(f"Circuit breaker protection for {pipeline_result.phone_number}")
+        elif pipeline_result.status.value == "circuit_breaker_open":
+            # Circuit breaker protection triggered
+            app_logger.warning(f"Circuit breaker protection for {pipeline_result.phone_number}")
 
-                    return {
-                        "status": "service_degraded",
-                        "message": pipeline_result.response_message,
-                        "execution_id": pipeline_result.execution_id,
-                        "processing_time_ms": pipeline_result.metrics.total_duration_ms,
-                        "circuit_breaker_triggered": True,
-                        "retry_after_seconds": 60,
-                    }
+            return {
+                "status": "service_degraded",
+                "message": pipeline_result.response_message,
+                "execution_id": pipeline_result.execution_id,
+                "processing_time_ms": pipeline_result.metrics.total_duration_ms,
+                "circuit_breaker_triggered": True,
+                "retry_after_seconds": 60,
+            }
 
-                elif pipeline_result.status.value == "timeout":
-                    # Pipeline timeout
-                    app_logger.error(f"Pipeline timeout for {pipeline_result.phone_number}")
+        elif pipeline_result.status.value == "timeout":
+            # Pipeline timeout
+            app_logger.error(f"Pipeline timeout for {pipeline_result.phone_number}")
 
-                    return {
-                        "status": "timeout",
-                        "message": pipeline_result.response_message,
-                        "execution_id": pipeline_result.execution_id,
-                        "processing_time_ms": pipeline_result.metrics.total_duration_ms,
-                        "contact": "(51) 99692-1999",
-                    }
+            return {
+                "status": "timeout",
+                "message": pipeline_result.response_message,
+                "execution_id": pipeline_result.execution_id,
+                "processing_time_ms": pipeline_result.metrics.total_duration_ms,
+                "contact": "(51) 99692-1999",
+            }
 
-                else:
-                    # Pipeline failure with recovery attempt
-                    app_logger.error(f"Pipeline execution failed for {pipeline_result.phone_number}")
-
-                    return {
-                        "status": "pipeline_failed",
-                        "message": pipeline_result.response_message,
-                        "execution_id": pipeline_result.execution_id,
-                        "processing_time_ms": pipeline_result.metrics.total_duration_ms,
-                        "error_details": pipeline_result.error_details,
-                        "recovery_used": pipeline_result.recovery_used,
-                        "contact": "(51) 99692-1999",
-                    }
+        else:
+            # Pipeline failure with recovery attempt
+            app_logger.error(f"Pipeline execution failed for {pipeline_result.phone_number}")
 
-            except Exception as e:
-                app_logger.error(f"🚨 MessagePreprocessor critical failure: {str(e)}", exc_info=True)
-                
-                # 🚨 SECURITY CRITICAL: DO NOT bypass authentication on exceptions
-                # Log the security incident
-                app_logger.critical(
-                    f"🚨 SECURITY ALERT: Message processing exception bypassed authentication checks",
-                    extra={
-                        "phone": aggregated_message.phone,
-                        "error": str(e),
-                        "headers_available": len(headers),
-                        "security_incident": True,
-                        "turn_controlled": True,
-                        "turn_id": turn_context.get("turn_id")
-                    }
-                )
-                
-                # Return secure error response - DO NOT PROCEED TO WORKFLOW
-                return {
-                    "status": "system_error", 
-                    "message": "System temporarily unavailable. Please try again later.",
-                    "error_code": "SYSTEM_ERROR",
-                    "timestamp": datetime.now().isoformat()
-                }
+            return {
+                "status": "pipeline_failed",
+                "message": pipeline_result.response_message,
+                "execution_id": pipeline_result.execution_id,
+                "processing_time_ms": pipeline_result.metrics.total_duration_ms,
+                "error_details": pipeline_result.error_details,
+                "recovery_used": pipeline_result.recovery_used,
+                "contact": "(51) 99692-1999",
+            }
 
     except Exception as e:
-        app_logger.error(f"Error processing Evolution API webhook: {str(e)}", exc_info=True)
-
-        # Ultimate fallback - direct response
+        app_logger.error(f"🚨 MessagePreprocessor critical failure: {str(e)}", exc_info=True)
+        
+        # 🚨 SECURITY CRITICAL: DO NOT bypass authentication on exceptions
+        # Log the security incident
+        app_logger.critical(
+            f"🚨 SECURITY ALERT: Message processing exception bypassed authentication checks",
+            extra={
+                "phone": aggregated_message.phone,
+                "error": str(e),
+                "headers_available": len(headers),
+                "security_incident": True,
+                "turn_controlled": True,
+                "turn_id": turn_context.get("turn_id")
+            }
+        )
+        
+        # Return secure error response - DO NOT PROCEED TO WORKFLOW
         return {
-            "status": "critical_error",
-            "message": "Olá! Kumon Vila A - instabilidade crítica momentânea. Contato urgente: (51) 99692-1999",
-            "contact": "(51) 99692-1999",
-            "error": "Critical pipeline failure",
+            "status": "system_error", 
+            "message": "System temporarily unavailable. Please try again later.",
+            "error_code": "SYSTEM_ERROR",
+            "timestamp": datetime.now().isoformat()
         }
 
 
+async def _debounce_context(parsed_message: Any, headers: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Context stored in Redis for a turn flushed later by the debounce timer
+
+    Credential headers are dropped; the key is verified now and the timer
+    re-attaches a configured key only when it was valid.
+    """
+    safe_headers = {k: v for k, v in headers.items() if k.lower() not in CREDENTIAL_HEADERS}
+    verified = False
+    if len(safe_headers) < len(headers):
+        verified = await message_preprocessor.auth_validator.validate_request(headers, {})
+    return {
+        "message": dataclasses.asdict(parsed_message),
+        "headers": safe_headers,
+        "credentials_verified": verified,
+    }
+
+
+def _restore_headers(context: Dict[str, Any]) -> Dict[str, Any]:
+    """Headers for the preprocessor auth check of a debounced turn"""
+    headers = dict(context.get("headers", {}))
+    valid_keys = message_preprocessor.auth_validator.valid_api_keys
+    if context.get("credentials_verified") and valid_keys:
+        headers["apikey"] = valid_keys[0]
+    return headers
+
+
+async def _on_debounced_turn(
+    phone: str, turn_batch: Dict[str, Any], context: Optional[Dict[str, Any]]
+) -> None:
+    """DebounceScheduler callback: process a turn flushed by its timer"""
+    if not context:
+        app_logger.warning(
+            f"TURN_CONTROLLER|missing_context|phone={phone[-4:]}|turn={turn_batch['turn_id']}"
+        )
+        return
+
+    result = await _process_turn_batch(
+        EvolutionWhatsAppMessage(**context["message"]), _restore_headers(context), turn_batch
+    )
+    app_logger.info(
+        f"TURN_CONTROLLER|debounced_turn_done|phone={phone[-4:]}|"
+        f"turn={turn_batch['turn_id']}|status={result.get('status')}"
+    )
+
+
+# Timer-driven flush: quiet turns fire once the debounce window closes
+debounce_scheduler = DebounceScheduler(on_turn=_on_debounced_turn)
+
+
+@router.on_event("startup")
+async def start_debounce_scheduler():
+    await debounce_scheduler.start()
+
+
+@router.on_event("shutdown")
+async def stop_debounce_scheduler():
+    await debounce_scheduler.stop()
+
+
 async def process_incoming_message(message_data: Dict[str, Any], value: Dict[str, Any]):
     """Process a single incoming WhatsApp message with integrated MessagePreprocessor pipeline"""
 
@@ -10,6 +10,7 @@ import base64
 from pathlib import Path
 
 from ..core.config import settings
+from ..core.http_pool import get_http_client
 from ..core.logger import app_logger
 
 
@@ -79,33 +80,34 @@ class EvolutionAPIClient:
                 json_data = json.dumps(data, ensure_ascii=False).encode('utf-8')
                 headers['Content-Type'] = 'application/json; charset=utf-8'
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                if method.upper() == "GET":
-                    response = await client.get(url, headers=headers)
-                elif method.upper() == "POST":
-                    if data:
-                        response = await client.post(url, headers=headers, content=json_data)
-                    else:
-                        response = await client.post(url, headers=headers)
-                elif method.upper() == "PUT":
-                    if data:
-                        response = await client.put(url, headers=headers, content=json_data)
-                    else:
-                        response = await client.put(url, headers=headers)
-                elif method.upper() == "DELETE":
-                    response = await client.delete(url, headers=headers)
+            # Cliente compartilhado (keep-alive) por instância Evolution
+            client = get_http_client(f"evolution:{instance_name or 'global'}")
+            if method.upper() == "GET":
+                response = await client.get(url, headers=headers)
+            elif method.upper() == "POST":
+                if data:
+                    response = await client.post(url, headers=headers, content=json_data)
                 else:
-                    raise ValueError(f"Unsupported HTTP method: {method}")
-                
-                response.raise_for_status()
-                
-                # Handle different response types with UTF-8
-                content_type = response.headers.get("content-type", "")
-                if "application/json" in content_type:
-                    return response.json()
+                    response = await client.post(url, headers=headers)
+            elif method.upper() == "PUT":
+                if data:
+                    response = await client.put(url, headers=headers, content=json_data)
                 else:
-                    return {"content": response.text, "status_code": response.status_code}
-                
+                    response = await client.put(url, headers=headers)
+            elif method.upper() == "DELETE":
+                response = await client.delete(url, headers=headers)
+            else:
+                raise ValueError(f"Unsupported HTTP method: {method}")
+            
+            response.raise_for_status()
+            
+            # Handle different response types with UTF-8
+            content_type = response.headers.get("content-type", "")
+            if "application/json" in content_type:
+                return response.json()
+            else:
+                return {"content": response.text, "status_code": response.status_code}
+            
         except httpx.HTTPStatusError as e:
             error_text = e.response.text if hasattr(e.response, 'text') else str(e)
             app_logger.error(f"HTTP error in Evolution API request: {e.response.status_code} - {error_text}")
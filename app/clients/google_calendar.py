@@ -5,7 +5,7 @@ import os
 import json
 import base64
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
@@ -13,6 +13,7 @@ from googleapiclient.errors import HttpError
 from ..core.config import settings
 from ..core.logger import app_logger
 from ..services.calendar_circuit_breaker import circuit_breaker, CircuitBreakerOpenError
+from ..services.calendar_busy_index import busy_interval_index
 from ..services.calendar_cache_service import calendar_cache_service
 from ..services.calendar_rate_limiter import calendar_rate_limiter
 
@@ -22,6 +23,7 @@ class GoogleCalendarClient:
     
     def __init__(self):
         self.service = None
+        self.credentials = None
         self._initialize_service()
     
     def _initialize_service(self):
@@ -87,6 +89,7 @@ class GoogleCalendarClient:
             
             if credentials:
                 # Build the Calendar API service
+                self.credentials = credentials
                 self.service = build('calendar', 'v3', credentials=credentials)
                 app_logger.info("✅ Google Calendar service initialized successfully")
             else:
@@ -161,6 +164,110 @@ class GoogleCalendarClient:
             app_logger.error(f"Unexpected error in check_conflicts: {str(e)}")
         return []
     
+    async def list_busy_intervals(
+        self, start_time: datetime, end_time: datetime, calendar_id: Optional[str] = None
+    ) -> Optional[List[Tuple[datetime, datetime]]]:
+        """
+        Fetch all timed events in a range as (start, end) busy intervals
+
+        One paginated events.list over the whole range replaces one
+        check_conflicts request per slot. Returns None on API errors.
+        """
+        if not self.service:
+            app_logger.error("Google Calendar service not initialized")
+            return []
+        
+        try:
+            calendar_id = calendar_id or settings.GOOGLE_CALENDAR_ID
+            if not calendar_id:
+                app_logger.error("No calendar ID specified")
+                return []
+            
+            busy = []
+            page_token = None
+            while True:
+                events_result = self.service.events().list(
+                    calendarId=calendar_id,
+                    timeMin=start_time.isoformat(),
+                    timeMax=end_time.isoformat(),
+                    singleEvents=True,
+                    orderBy='startTime',
+                    maxResults=2500,
+                    pageToken=page_token
+                ).execute()
+                
+                for event in events_result.get('items', []):
+                    # Same rule as check_conflicts: all-day events don't block slots
+                    if 'dateTime' not in event['start']:
+                        continue
+                    busy.append((
+                        datetime.fromisoformat(event['start']['dateTime'].replace('Z', '+00:00')),
+                        datetime.fromisoformat(event['end']['dateTime'].replace('Z', '+00:00'))
+                    ))
+                
+                page_token = events_result.get('nextPageToken')
+                if not page_token:
+                    break
+            
+            app_logger.info(f"Fetched {len(busy)} busy intervals between {start_time} and {end_time}")
+            return busy
+            
+        except HttpError as e:
+            app_logger.error(f"Google Calendar API error in list_busy_intervals: {str(e)}")
+            return None
+        except Exception as e:
+            app_logger.error(f"Unexpected error in list_busy_intervals: {str(e)}")
+            return None
+    
+    def _build_event_body(self, event_details: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the Google Calendar API event body from booking details"""
+        # Build event object for Google Calendar API
+        event_body = {
+            'summary': event_details.get('summary', 'Kumon Session'),
+            'description': event_details.get('description', ''),
+            'start': {
+                'dateTime': event_details['start_time'].isoformat(),
+                'timeZone': event_details.get('timezone', 'America/Sao_Paulo'),
+            },
+            'end': {
+                'dateTime': event_details['end_time'].isoformat(),
+                'timeZone': event_details.get('timezone', 'America/Sao_Paulo'),
+            },
+            'attendees': [],
+            'reminders': {
+                'useDefault': False,
+                'overrides': [
+                    {'method': 'email', 'minutes': 24 * 60},  # 1 day before
+                    {'method': 'popup', 'minutes': 30},       # 30 minutes before
+                ],
+            },
+        }
+        
+        # Add attendees if provided (Note: Service accounts have limitations)
+        if 'attendees' in event_details:
+            app_logger.warning("Service accounts cannot invite attendees without Domain-Wide Delegation")
+            app_logger.info("Attendees will be added to event description instead")
+            
+            # Add attendees to description instead
+            attendee_emails = []
+            for attendee in event_details['attendees']:
+                if isinstance(attendee, str):
+                    attendee_emails.append(attendee)
+                elif isinstance(attendee, dict) and 'email' in attendee:
+                    attendee_emails.append(attendee['email'])
+            
+            if attendee_emails:
+                if event_body['description']:
+                    event_body['description'] += f"\n\nAttendees: {', '.join(attendee_emails)}"
+                else:
+                    event_body['description'] = f"Attendees: {', '.join(attendee_emails)}"
+        
+        # Add location if provided
+        if 'location' in event_details:
+            event_body['location'] = event_details['location']
+        
+        return event_body
+    
     async def create_event(self, event_details: Dict[str, Any]) -> str:
         """Create a calendar event"""
         if not self.service:
@@ -174,50 +281,7 @@ class GoogleCalendarClient:
                 app_logger.error("No calendar ID specified for event creation")
                 return "error_no_calendar_id"
             
-            # Build event object for Google Calendar API
-            event_body = {
-                'summary': event_details.get('summary', 'Kumon Session'),
-                'description': event_details.get('description', ''),
-                'start': {
-                    'dateTime': event_details['start_time'].isoformat(),
-                    'timeZone': event_details.get('timezone', 'America/Sao_Paulo'),
-                },
-                'end': {
-                    'dateTime': event_details['end_time'].isoformat(),
-                    'timeZone': event_details.get('timezone', 'America/Sao_Paulo'),
-                },
-                'attendees': [],
-                'reminders': {
-                    'useDefault': False,
-                    'overrides': [
-                        {'method': 'email', 'minutes': 24 * 60},  # 1 day before
-                        {'method': 'popup', 'minutes': 30},       # 30 minutes before
-                    ],
-                },
-            }
-            
-            # Add attendees if provided (Note: Service accounts have limitations)
-            if 'attendees' in event_details:
-                app_logger.warning("Service accounts cannot invite attendees without Domain-Wide Delegation")
-                app_logger.info("Attendees will be added to event description instead")
-                
-                # Add attendees to description instead
-                attendee_emails = []
-                for attendee in event_details['attendees']:
-                    if isinstance(attendee, str):
-                        attendee_emails.append(attendee)
-                    elif isinstance(attendee, dict) and 'email' in attendee:
-                        attendee_emails.append(attendee['email'])
-                
-                if attendee_emails:
-                    if event_body['description']:
-                        event_body['description'] += f"\n\nAttendees: {', '.join(attendee_emails)}"
-                    else:
-                        event_body['description'] = f"Attendees: {', '.join(attendee_emails)}"
-            
-            # Add location if provided
-            if 'location' in event_details:
-                event_body['location'] = event_details['location']
+            event_body = self._build_event_body(event_details)
             
             # Create the event
             created_event = self.service.events().insert(
@@ -226,6 +290,7 @@ class GoogleCalendarClient:
             ).execute()
             
             event_id = created_event['id']
+            busy_interval_index.invalidate(calendar_id)
             app_logger.info(f"Created calendar event: {event_id}")
             return event_id
             
@@ -289,6 +354,7 @@ class GoogleCalendarClient:
                 eventId=event_id,
                 body=existing_event
             ).execute()
+            busy_interval_index.invalidate(calendar_id)
             
             app_logger.info(f"Updated calendar event: {event_id}")
             return True
@@ -316,6 +382,7 @@ class GoogleCalendarClient:
                 calendarId=calendar_id,
                 eventId=event_id
             ).execute()
+            busy_interval_index.invalidate(calendar_id)
             
             app_logger.info(f"Deleted calendar event: {event_id}")
             return True
@@ -0,0 +1,441 @@
+"""
+Async Google Calendar client facade
+
+googleapiclient's `.execute()` is blocking; calling it inline from an
+`async def` freezes the event loop for the whole HTTP round trip. This facade:
+- offloads every `.execute()` to a bounded thread pool
+- coalesces event list/get calls into Calendar batch HTTP requests
+- shares one discovery-built service and one set of credentials; each worker
+  thread keeps its own keep-alive authorized transport (httplib2 is not
+  thread-safe)
+- goes through `calendar_circuit_breaker` and `calendar_rate_limiter`
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httplib2
+from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest
+
+from ..core.config import settings
+from ..core.logger import app_logger
+from ..services.calendar_busy_index import busy_interval_index
+from ..services.calendar_circuit_breaker import CircuitBreakerOpenError, calendar_circuit_breaker
+from ..services.calendar_rate_limiter import calendar_rate_limiter
+from .google_calendar import GoogleCalendarClient
+
+# Calendar API accepts at most 50 calls per batch request
+MAX_BATCH_SIZE = 50
+
+
+class CalendarRateLimitError(Exception):
+    """Raised when calendar_rate_limiter denies a request"""
+    pass
+
+
+class CalendarSyncTokenExpiredError(Exception):
+    """Raised when Calendar rejects a sync token (HTTP 410); a full sync is required"""
+    pass
+
+
+def _parse_event_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _aware(value: datetime) -> datetime:
+    """Naive datetimes are taken as local time (as GoogleCalendarClient does)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.now().astimezone().tzinfo)
+    return value
+
+
+def _event_interval(event: Dict[str, Any]) -> Optional[Tuple[datetime, datetime]]:
+    """(start, end) of a timed event; None for all-day events"""
+    if 'dateTime' not in event.get('start', {}):
+        return None
+    return _parse_event_time(event['start']['dateTime']), _parse_event_time(event['end']['dateTime'])
+
+
+class AsyncGoogleCalendarClient:
+    """
+    Non-blocking Google Calendar client
+
+    Drop-in for the GoogleCalendarClient methods used by the scheduling flow
+    (check_conflicts, list_busy_intervals, get/create/update/delete_event),
+    plus batched list_events_batch/get_events.
+    """
+
+    def __init__(
+        self,
+        sync_client: Optional[GoogleCalendarClient] = None,
+        max_workers: Optional[int] = None,
+        http_timeout: Optional[int] = None,
+        batch_uri: Optional[str] = None,
+        circuit_breaker=calendar_circuit_breaker,
+        rate_limiter=calendar_rate_limiter,
+        max_rate_limit_wait: float = 2.0,
+    ):
+        self.sync_client = sync_client or GoogleCalendarClient()
+        self.service = self.sync_client.service
+        self.credentials = self.sync_client.credentials
+        self.batch_uri = batch_uri
+        self.http_timeout = http_timeout or getattr(settings, 'GOOGLE_CALENDAR_HTTP_TIMEOUT', 10)
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiter = rate_limiter
+        self.max_rate_limit_wait = max_rate_limit_wait
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or getattr(settings, 'GOOGLE_CALENDAR_MAX_WORKERS', 4),
+            thread_name_prefix="gcal"
+        )
+        self._local = threading.local()
+
+        # Metrics
+        self.api_calls = 0
+        self.batched_calls = 0
+
+    # ------------------------------------------------------------------
+    # Transport and execution
+    # ------------------------------------------------------------------
+
+    def _thread_http(self):
+        """Keep-alive authorized transport owned by the current worker thread"""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = httplib2.Http(timeout=self.http_timeout)
+            if self.credentials is not None:
+                import google_auth_httplib2
+
+                http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=http)
+            self._local.http = http
+        return http
+
+    async def _acquire(self, request_type: str):
+        """Rate limiter permission, waiting briefly for token refill"""
+        permission = await self.rate_limiter.acquire_permission(request_type)
+        if permission["permitted"]:
+            return
+
+        retry_after = permission.get("retry_after_seconds")
+        if retry_after is not None and retry_after <= self.max_rate_limit_wait:
+            await asyncio.sleep(retry_after)
+            permission = await self.rate_limiter.acquire_permission(request_type)
+            if permission["permitted"]:
+                return
+
+        raise CalendarRateLimitError(permission["reason"])
+
+    async def _run_blocking(self, fn):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn)
+
+    async def _execute(self, request, request_type: str = "standard") -> Any:
+        """Run a googleapiclient request off the event loop with protection"""
+        await self._acquire(request_type)
+        self.api_calls += 1
+        started = time.perf_counter()
+        success = False
+        try:
+            result = await self.circuit_breaker.call(
+                self._run_blocking, lambda: request.execute(http=self._thread_http())
+            )
+            success = True
+            return result
+        finally:
+            await self.rate_limiter.record_request_completion(
+                (time.perf_counter() - started) * 1000, success
+            )
+
+    async def _execute_batch(self, requests: Sequence[Any]) -> List[Any]:
+        """
+        Execute requests through the Calendar batch endpoint
+
+        Returns:
+            One entry per request: the response, or the HttpError it raised
+        """
+        results: List[Any] = [None] * len(requests)
+
+        def callback(request_id, response, exception):
+            results[int(request_id)] = exception if exception is not None else response
+
+        for offset in range(0, len(requests), MAX_BATCH_SIZE):
+            if self.batch_uri:
+                batch = BatchHttpRequest(callback=callback, batch_uri=self.batch_uri)
+            else:
+                batch = self.service.new_batch_http_request(callback=callback)
+            for i, request in enumerate(requests[offset:offset + MAX_BATCH_SIZE], start=offset):
+                batch.add(request, request_id=str(i))
+            self.batched_calls += min(MAX_BATCH_SIZE, len(requests) - offset)
+            await self._execute(batch, "batch")
+
+        return results
+
+    def _calendar_id(self, calendar_id: Optional[str]) -> Optional[str]:
+        calendar_id = calendar_id or settings.GOOGLE_CALENDAR_ID
+        if not calendar_id:
+            app_logger.error("No calendar ID specified")
+        return calendar_id
+
+    def _list_request(self, calendar_id: str, start_time: datetime, end_time: datetime, page_token=None):
+        return self.service.events().list(
+            calendarId=calendar_id,
+            timeMin=start_time.isoformat(),
+            timeMax=end_time.isoformat(),
+            singleEvents=True,
+            orderBy='startTime',
+            maxResults=2500,
+            pageToken=page_token
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def list_events(
+        self, start_time: datetime, end_time: datetime, calendar_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """All events in a range (paginated); raises on API errors"""
+        start_time, end_time = _aware(start_time), _aware(end_time)
+        calendar_id = self._calendar_id(calendar_id)
+        if not self.service or not calendar_id:
+            return []
+
+        events = []
+        page_token = None
+        while True:
+            page = await self._execute(self._list_request(calendar_id, start_time, end_time, page_token))
+            events.extend(page.get('items', []))
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return events
+
+    async def list_events_batch(
+        self, ranges: Sequence[Tuple[datetime, datetime]], calendar_id: Optional[str] = None
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Events for several ranges in one batch request
+
+        Returns:
+            Events per range (None for ranges whose call failed); ranges with
+            more than one page are completed with list_events
+        """
+        calendar_id = self._calendar_id(calendar_id)
+        if not self.service or not calendar_id:
+            return [[] for _ in ranges]
+        ranges = [(_aware(start), _aware(end)) for start, end in ranges]
+
+        responses = await self._execute_batch(
+            [self._list_request(calendar_id, start, end) for start, end in ranges]
+        )
+
+        results = []
+        for (start, end), response in zip(ranges, responses):
+            if isinstance(response, Exception):
+                app_logger.error(f"Google Calendar API error in list_events_batch: {response}")
+                results.append(None)
+            elif response.get('nextPageToken'):
+                results.append(await self.list_events(start, end, calendar_id))
+            else:
+                results.append(response.get('items', []))
+        return results
+
+    async def get_events(
+        self, event_ids: Sequence[str], calendar_id: Optional[str] = None
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Several events in one batch request (None for missing/failed ones)"""
+        calendar_id = self._calendar_id(calendar_id)
+        if not self.service or not calendar_id:
+            return [None for _ in event_ids]
+
+        responses = await self._execute_batch([
+            self.service.events().get(calendarId=calendar_id, eventId=event_id)
+            for event_id in event_ids
+        ])
+        return [None if isinstance(response, Exception) else response for response in responses]
+
+    async def get_event(self, event_id: str, calendar_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get a specific calendar event"""
+        calendar_id = self._calendar_id(calendar_id)
+        if not self.service or not calendar_id:
+            return None
+
+        try:
+            return await self._execute(
+                self.service.events().get(calendarId=calendar_id, eventId=event_id)
+            )
+        except (HttpError, CircuitBreakerOpenError, CalendarRateLimitError) as e:
+            app_logger.error(f"Google Calendar error in get_event: {str(e)}")
+            return None
+
+    async def check_conflicts(
+        self, start_time: datetime, end_time: datetime, calendar_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Events overlapping the range (same shape as GoogleCalendarClient)"""
+        start_time, end_time = _aware(start_time), _aware(end_time)
+        try:
+            events = await self.list_events(start_time, end_time, calendar_id)
+        except Exception as e:
+            app_logger.error(f"Google Calendar error in check_conflicts: {str(e)}")
+            return []
+
+        conflicts = []
+        for event in events:
+            interval = _event_interval(event)
+            if interval and interval[0] < end_time and interval[1] > start_time:
+                conflicts.append({
+                    'id': event['id'],
+                    'summary': event.get('summary', 'No title'),
+                    'start': interval[0],
+                    'end': interval[1],
+                    'description': event.get('description', ''),
+                    'attendees': event.get('attendees', [])
+                })
+        return conflicts
+
+    async def list_busy_intervals(
+        self, start_time: datetime, end_time: datetime, calendar_id: Optional[str] = None
+    ) -> Optional[List[Tuple[datetime, datetime]]]:
+        """Timed events in a range as busy intervals; None on API errors"""
+        try:
+            events = await self.list_events(start_time, end_time, calendar_id)
+        except Exception as e:
+            app_logger.error(f"Google Calendar error in list_busy_intervals: {str(e)}")
+            return None
+
+        return [interval for interval in map(_event_interval, events) if interval]
+
+    async def sync_events(
+        self,
+        calendar_id: Optional[str] = None,
+        sync_token: Optional[str] = None,
+        time_min: Optional[datetime] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Incremental event sync
+
+        Without a sync token this is a full sync from `time_min`; with one,
+        only events changed since that token are returned (cancelled events
+        carry status 'cancelled'). timeMin/orderBy can't be combined with
+        syncToken, so the full sync has no upper bound.
+
+        Returns:
+            (events, next_sync_token); raises CalendarSyncTokenExpiredError
+            when the token is no longer valid
+        """
+        calendar_id = self._calendar_id(calendar_id)
+        if not self.service or not calendar_id:
+            return [], None
+
+        params: Dict[str, Any] = {'calendarId': calendar_id, 'singleEvents': True, 'maxResults': 2500}
+        if sync_token:
+            params['syncToken'] = sync_token
+        elif time_min is not None:
+            params['timeMin'] = _aware(time_min).isoformat()
+
+        events = []
+        page_token = None
+        while True:
+            try:
+                page = await self._execute(self.service.events().list(pageToken=page_token, **params))
+            except HttpError as e:
+                if sync_token and e.resp.status == 410:
+                    raise CalendarSyncTokenExpiredError(calendar_id) from e
+                raise
+            events.extend(page.get('items', []))
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                return events, page.get('nextSyncToken')
+
+    # ------------------------------------------------------------------
+    # Writes (invalidate the busy interval index)
+    # ------------------------------------------------------------------
+
+    async def create_event(self, event_details: Dict[str, Any]) -> str:
+        """Create a calendar event"""
+        if not self.service:
+            return "error_service_not_initialized"
+        calendar_id = self._calendar_id(event_details.get('calendar_id'))
+        if not calendar_id:
+            return "error_no_calendar_id"
+
+        try:
+            created_event = await self._execute(self.service.events().insert(
+                calendarId=calendar_id,
+                body=self.sync_client._build_event_body(event_details)
+            ))
+        except HttpError as e:
+            app_logger.error(f"Google Calendar API error in create_event: {str(e)}")
+            return f"error_api_{e.resp.status}"
+        except Exception as e:
+            app_logger.error(f"Unexpected error in create_event: {str(e)}")
+            return "error_unexpected"
+
+        busy_interval_index.invalidate(calendar_id)
+        app_logger.info(f"Created calendar event: {created_event['id']}")
+        return created_event['id']
+
+    async def update_event(
+        self, event_id: str, event_updates: Dict[str, Any], calendar_id: Optional[str] = None
+    ) -> bool:
+        """Update a calendar event"""
+        calendar_id = self._calendar_id(calendar_id)
+        existing_event = await self.get_event(event_id, calendar_id)
+        if not existing_event:
+            app_logger.error(f"Event {event_id} not found")
+            return False
+
+        existing_event.update(event_updates)
+        try:
+            await self._execute(self.service.events().update(
+                calendarId=calendar_id, eventId=event_id, body=existing_event
+            ))
+        except Exception as e:
+            app_logger.error(f"Google Calendar error in update_event: {str(e)}")
+            return False
+
+        busy_interval_index.invalidate(calendar_id)
+        return True
+
+    async def delete_event(self, event_id: str, calendar_id: Optional[str] = None) -> bool:
+        """Delete a calendar event"""
+        calendar_id = self._calendar_id(calendar_id)
+        if not self.service or not calendar_id:
+            return False
+
+        try:
+            await self._execute(self.service.events().delete(calendarId=calendar_id, eventId=event_id))
+        except Exception as e:
+            app_logger.error(f"Google Calendar error in delete_event: {str(e)}")
+            return False
+
+        busy_interval_index.invalidate(calendar_id)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Facade usage statistics"""
+        return {
+            "api_calls": self.api_calls,
+            "batched_calls": self.batched_calls,
+            "max_workers": self._executor._max_workers,
+        }
+
+    def close(self):
+        """Shut down the worker threads"""
+        self._executor.shutdown(wait=False)
+
+
+# ========== LAZY SINGLETON PATTERN ==========
+
+_async_calendar_client: Optional[AsyncGoogleCalendarClient] = None
+
+
+def get_async_calendar_client() -> AsyncGoogleCalendarClient:
+    """Get the process-wide async calendar client (one service, credentials and thread pool)"""
+    global _async_calendar_client
+    if _async_calendar_client is None:
+        _async_calendar_client = AsyncGoogleCalendarClient()
+    return _async_calendar_client
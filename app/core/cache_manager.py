@@ -6,17 +6,32 @@ Provides centralized Redis access for the application
 import os
 import logging
 import redis
+import redis.asyncio as aioredis
 from typing import Optional
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Shared pool size for the async client (webhook hot path)
+ASYNC_POOL_MAX_CONNECTIONS = int(os.getenv("REDIS_ASYNC_MAX_CONNECTIONS", "50"))
+
+
+def _redis_url() -> str:
+    """Resolve Redis URL from the supported environment variables"""
+    return (
+        os.getenv("REDIS_URL") or
+        os.getenv("MEMORY_REDIS_URL") or
+        os.getenv("REDISCLOUD_URL") or
+        "redis://localhost:6379"
+    )
+
 
 class RedisManager:
     """Redis connection manager with automatic failover"""
     
     def __init__(self):
         self._client: Optional[redis.Redis] = None
+        self._async_client: Optional[aioredis.Redis] = None
         self._connected = False
     
     @property
@@ -30,12 +45,7 @@ class RedisManager:
         """Initialize Redis connection"""
         try:
             # Try to get Redis URL from various environment variables
-            redis_url = (
-                os.getenv("REDIS_URL") or
-                os.getenv("MEMORY_REDIS_URL") or  
-                os.getenv("REDISCLOUD_URL") or
-                "redis://localhost:6379"
-            )
+            redis_url = _redis_url()
             
             logger.info(f"CACHE_INIT|source=app.core.cache_manager|connecting_to_redis")
             logger.info(f"Connecting to Redis: {redis_url[:20]}...")
@@ -63,6 +73,37 @@ class RedisManager:
             self._client = None
             self._connected = False
     
+    @property
+    def async_client(self) -> Optional[aioredis.Redis]:
+        """Get asyncio Redis client backed by a shared connection pool"""
+        if not self._async_client:
+            self._initialize_async()
+        return self._async_client
+
+    def _initialize_async(self):
+        """Initialize asyncio Redis client (connections are opened lazily)"""
+        try:
+            pool = aioredis.ConnectionPool.from_url(
+                _redis_url(),
+                decode_responses=True,
+                max_connections=ASYNC_POOL_MAX_CONNECTIONS,
+                socket_timeout=5,
+                socket_connect_timeout=5,
+                retry_on_timeout=True,
+                socket_keepalive=True,
+                health_check_interval=30
+            )
+            self._async_client = aioredis.Redis(connection_pool=pool)
+
+            logger.info(
+                f"CACHE_INIT|source=app.core.cache_manager|async_pool|"
+                f"max_connections={ASYNC_POOL_MAX_CONNECTIONS}"
+            )
+
+        except Exception as e:
+            logger.warning(f"❌ Async Redis client creation failed: {e}")
+            self._async_client = None
+
     def is_connected(self) -> bool:
         """Check if Redis is connected"""
         if not self._client:
@@ -100,6 +141,16 @@ def get_redis() -> Optional[redis.Redis]:
     return redis_cache.client
 
 
+def get_async_redis() -> Optional[aioredis.Redis]:
+    """
+    Get asyncio Redis client instance (shared connection pool)
+
+    Returns:
+        Optional[aioredis.Redis]: Async Redis client or None if unavailable
+    """
+    return redis_cache.async_client
+
+
 # Legacy compatibility
 def get_cache_client():
     """Legacy function for backward compatibility"""
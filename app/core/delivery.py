@@ -10,6 +10,7 @@ from typing import Any, Dict
 import httpx
 from httpx import Timeout
 
+from .http_pool import get_http_client
 from .phone import format_e164
 
 log = logging.getLogger(__name__)
@@ -22,18 +23,6 @@ def _mask_token(token: str) -> str:
     return f"{token[:8]}...{token[-4:]}"
 
 
-async def _build_client(max_retries: int, timeout_seconds: float) -> httpx.AsyncClient:
-    """Build httpx client with retry configuration"""
-    timeout = Timeout(timeout_seconds, connect=timeout_seconds, read=timeout_seconds)
-
-    # Create transport with retries
-    transport = httpx.AsyncHTTPTransport(retries=max_retries)
-
-    return httpx.AsyncClient(
-        timeout=timeout, transport=transport, follow_redirects=True
-    )
-
-
 async def send_text(
     phone: str, text: str, instance: str = "recepcionistakumon"
 ) -> Dict[str, Any]:
@@ -107,6 +96,8 @@ async def send_text(
     headers = {"apikey": api_key, "Content-Type": "application/json"}
     payload = {"number": e164_phone.lstrip("+"), "textMessage": {"text": text}}
 
+    request_timeout = Timeout(timeout_seconds, connect=timeout_seconds, read=timeout_seconds)
+
     # Log request attempt (mask sensitive data)
     log.info(
         "DELIVERY|attempt|url=%s|instance=%s|phone=****%s|chars=%d|timeout=%gs|retries=%d",
@@ -123,10 +114,11 @@ async def send_text(
         last_exception = None
         for attempt in range(max_retries + 1):
             try:
-                async with await _build_client(
-                    0, timeout_seconds
-                ) as client:  # Retries handled manually
-                    response = await client.post(url, json=payload, headers=headers)
+                # Cliente compartilhado por instância (keep-alive); retries feitos aqui
+                client = get_http_client(f"evolution:{instance}")
+                response = await client.post(
+                    url, json=payload, headers=headers, timeout=request_timeout
+                )
 
                 result["status_code"] = response.status_code
 
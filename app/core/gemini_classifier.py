@@ -9,6 +9,8 @@ from typing import Optional
 
 import google.generativeai as genai
 
+from .nlu_cache import NLUCache, make_cache_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,7 +32,12 @@ class GeminiClassifier:
         else:
             self.model = None
 
-    async def classify(self, text: str, context: Optional[dict] = None) -> dict:
+        # Cache de NLU (LRU local + Redis) para mensagens repetidas no mesmo contexto
+        self.nlu_cache = NLUCache()
+
+    async def classify(
+        self, text: str, context: Optional[dict] = None, use_cache: bool = True
+    ) -> dict:
         """
         Classify user message into structured NLU output with optional context.
         Returns structured dict with primary_intent, secondary_intent, entities, confidence.
@@ -38,6 +45,7 @@ class GeminiClassifier:
         Args:
             text: Current user message
             context: Optional context dict with conversation history and state
+            use_cache: False bypasses the NLU cache for this call
 
         Returns:
             dict: {
@@ -62,6 +70,22 @@ class GeminiClassifier:
                 "error": "Gemini API not configured",
             }
 
+        # NLU cache: a chave cobre tudo o que entra no prompt
+        cache_key = None
+        if use_cache:
+            cache_key = make_cache_key(
+                text,
+                self._format_history_summary(context) +
+                self._format_conversation_history(context),
+                self._get_missing_qualification_vars(context),
+            )
+            cached = await self.nlu_cache.get(cache_key)
+            if cached is not None:
+                print(
+                    f"DEBUG|gemini_classifier|cache_hit|intent={cached.get('primary_intent')}"
+                )
+                return cached
+
         # Build unified NLU prompt
         context_keys = list(context.keys()) if context else "None"
         print(f"DEBUG|ANTES_BUILD_PROMPT|text='{text}'|context_keys={context_keys}")
@@ -79,6 +103,7 @@ class GeminiClassifier:
             structured_result = self._parse_structured_response(result)
             intent_name = structured_result.get("primary_intent")
             print(f"DEBUG|gemini_classifier|parsed_result|intent={intent_name}")
+            await self.nlu_cache.set(cache_key, structured_result)
             return structured_result
 
         except Exception as e:
@@ -97,6 +122,7 @@ class GeminiClassifier:
         """
 
         conversation_history = self._format_conversation_history(context)
+        history_summary = self._format_history_summary(context)
         missing_vars = self._get_missing_qualification_vars(context)
 
         # ---> LOG DE AUDITORIA EXATAMENTE AQUI <---
@@ -139,7 +165,7 @@ Assistente: Entendido, Gabriel. O Kumon é para você mesmo ou para outra pessoa
 **TAREFA ATUAL:**
 
 **CONTEXTO DA CONVERSA:**
-- Histórico (últimas 4 mensagens):
+{history_summary}- Histórico (últimas 4 mensagens):
 {conversation_history}
 - Estado Atual da Qualificação (variáveis que ainda faltam): {missing_vars}
 
@@ -199,7 +225,8 @@ Assistente: Entendido, Gabriel. O Kumon é para você mesmo ou para outra pessoa
         state_data = context  # O 'context' que passamos É o 'state'
 
         # Procura por uma lista de histórico completa primeiro
-        history = state_data.get("history", [])
+        # (cópia rasa: não altera a lista compartilhada com o estado)
+        history = list(state_data.get("history") or [])
 
         # SE não houver uma lista de histórico, CONSTRUA um histórico mínimo
         # a partir da última resposta do bot, que é a informação mais crucial.
@@ -230,6 +257,16 @@ Assistente: Entendido, Gabriel. O Kumon é para você mesmo ou para outra pessoa
             else "Nenhum histórico disponível"
         )
 
+    def _format_history_summary(self, context: Optional[dict]) -> str:
+        """
+        Resumo das mensagens que saíram da janela do histórico (history_summary),
+        como linha do contexto do prompt; vazio quando a conversa ainda cabe na janela.
+        """
+        summary = (context or {}).get("history_summary")
+        if not summary:
+            return ""
+        return f"- Resumo da conversa anterior: {summary}\n"
+
     def _get_missing_qualification_vars(self, context: Optional[dict]) -> str:
         """Get missing qualification variables for NLU prompt."""
         if not context:
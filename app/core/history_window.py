@@ -0,0 +1,137 @@
+"""
+History Window - Histórico limitado e compactado para o estado ONE_TURN
+
+O estado do grafo é persistido inteiro no checkpoint a cada turno. Manter
+todas as mensagens em `history` faz o checkpoint (e as cópias do estado nos
+nós) crescerem linearmente com a conversa, embora o GeminiClassifier só leia
+as últimas trocas.
+
+Política:
+- `history`: ring buffer com as últimas HISTORY_WINDOW_SIZE entradas
+- `history_summary`: resumo cumulativo (texto limitado) das entradas que saíram
+- Entradas que saem da janela são arquivadas fora do checkpoint
+  (state_manager.archive_history_entries)
+"""
+
+import logging
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuração da janela
+HISTORY_WINDOW_SIZE = int(os.getenv("HISTORY_WINDOW_SIZE", "12"))  # 6 trocas user/bot
+SUMMARY_MAX_CHARS = int(os.getenv("HISTORY_SUMMARY_MAX_CHARS", "600"))
+SUMMARY_SNIPPET_CHARS = 80  # tamanho máximo de cada mensagem no resumo
+
+_ROLE_LABELS = {"user": "Usuário", "assistant": "Assistente"}
+
+ArchiveFn = Callable[[str, List[Dict[str, Any]]], Any]
+
+
+def _snippet(entry: Dict[str, Any]) -> str:
+    """Linha curta de resumo para uma entrada do histórico"""
+    role = _ROLE_LABELS.get(str(entry.get("role", "")), str(entry.get("role", "?")))
+    content = " ".join(str(entry.get("content", "")).split())
+    if len(content) > SUMMARY_SNIPPET_CHARS:
+        content = content[: SUMMARY_SNIPPET_CHARS - 1] + "…"
+    return f"{role}: {content}"
+
+
+def roll_summary(summary: str, evicted: List[Dict[str, Any]]) -> str:
+    """
+    Acrescenta as entradas removidas ao resumo, mantendo o tamanho limitado
+
+    O corte acontece pelo início (trechos mais antigos), respeitando o
+    separador entre mensagens.
+
+    Args:
+        summary: Resumo atual
+        evicted: Entradas que saíram da janela
+
+    Returns:
+        str: Novo resumo com no máximo SUMMARY_MAX_CHARS caracteres
+    """
+    parts = [summary] if summary else []
+    parts.extend(_snippet(entry) for entry in evicted)
+    rolled = " | ".join(parts)
+
+    if len(rolled) > SUMMARY_MAX_CHARS:
+        rolled = rolled[-SUMMARY_MAX_CHARS:]
+        cut = rolled.find(" | ")
+        if cut != -1:
+            rolled = rolled[cut + 3:]
+
+    return rolled
+
+
+def compact_history(
+    history: List[Dict[str, Any]],
+    summary: str = "",
+    window: int = HISTORY_WINDOW_SIZE,
+) -> Tuple[List[Dict[str, Any]], str, List[Dict[str, Any]]]:
+    """
+    Aplica a janela ao histórico
+
+    Args:
+        history: Histórico completo do turno
+        summary: Resumo acumulado até aqui
+        window: Número máximo de entradas mantidas
+
+    Returns:
+        Tuple (histórico na janela, resumo atualizado, entradas removidas)
+    """
+    if len(history) <= window:
+        return history, summary, []
+
+    evicted = history[:-window]
+    return history[-window:], roll_summary(summary, evicted), evicted
+
+
+def append_turn(
+    previous_state: Dict[str, Any],
+    text: str,
+    phone: Optional[str] = None,
+    archive: Optional[ArchiveFn] = None,
+    window: int = HISTORY_WINDOW_SIZE,
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Constrói o histórico do novo turno a partir do estado do checkpoint
+
+    Adiciona a última resposta do bot e a nova mensagem do usuário, depois
+    aplica a janela. Entradas removidas vão para `archive(phone, entries)`.
+
+    Args:
+        previous_state: Estado carregado do checkpoint (pode ser vazio)
+        text: Nova mensagem do usuário
+        phone: Telefone (chave do arquivo)
+        archive: Função de arquivamento; None desativa o arquivamento
+        window: Número máximo de entradas mantidas
+
+    Returns:
+        Tuple (history, history_summary) para o novo estado
+    """
+    # Cópia rasa: não altera a lista do estado carregado
+    history = list(previous_state.get("history") or [])
+    summary = previous_state.get("history_summary") or ""
+
+    last_bot_response = previous_state.get("last_bot_response")
+    if last_bot_response:
+        history.append({"role": "assistant", "content": last_bot_response})
+    history.append({"role": "user", "content": text})
+
+    history, summary, evicted = compact_history(history, summary, window)
+
+    if evicted and archive and phone:
+        try:
+            archive(phone, evicted)
+        except Exception as e:
+            logger.warning(f"HISTORY_WINDOW|archive_failed|count={len(evicted)}|error={e}")
+
+    if evicted:
+        logger.debug(
+            f"HISTORY_WINDOW|compacted|evicted={len(evicted)}|"
+            f"window={len(history)}|summary_len={len(summary)}"
+        )
+
+    return history, summary
@@ -0,0 +1,215 @@
+"""
+Core HTTP Pool - Shared keep-alive httpx clients for outbound API calls
+Provides one pooled client per upstream instance (Evolution API delivery and
+EvolutionAPIClient) so replies reuse connections instead of paying a new
+TCP+TLS handshake per message.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Limites por instância (cada instância Evolution tem seu próprio pool)
+HTTP_POOL_MAX_CONNECTIONS = int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", "20"))
+HTTP_POOL_MAX_KEEPALIVE = int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", "10"))
+HTTP_POOL_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", "60"))
+HTTP_POOL_HTTP2 = os.getenv("HTTP_POOL_HTTP2", "true").lower() == "true"
+
+
+def _http2_supported() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+@dataclass
+class PoolStats:
+    """Counters for one pooled client"""
+
+    requests: int = 0
+    new_connections: int = 0
+    handshake_ms_total: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        reused = self.requests - self.new_connections
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reuse_ratio": round(reused / self.requests, 3) if self.requests else 0.0,
+            "avg_handshake_ms": (
+                round(self.handshake_ms_total / self.new_connections, 2)
+                if self.new_connections
+                else 0.0
+            ),
+        }
+
+
+class _InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """Transport that records connection setup through httpcore trace events"""
+
+    def __init__(self, stats: PoolStats, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self._stats
+        started: Dict[str, float] = {}
+
+        async def trace(event_name: str, info: Dict[str, Any]) -> None:
+            if event_name == "connection.connect_tcp.started":
+                started["connect"] = time.perf_counter()
+            elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+                if "connect" in started:
+                    started["ready"] = time.perf_counter()
+
+        request.extensions = {**request.extensions, "trace": trace}
+        stats.requests += 1
+        try:
+            return await super().handle_async_request(request)
+        finally:
+            if "connect" in started:
+                stats.new_connections += 1
+                ready = started.get("ready", time.perf_counter())
+                stats.handshake_ms_total += (ready - started["connect"]) * 1000
+
+    def open_connections(self) -> int:
+        return len(getattr(self._pool, "connections", []))
+
+
+class HTTPClientManager:
+    """Lifecycle manager for shared pooled httpx clients, keyed by instance"""
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, _InstrumentedTransport] = {}
+        self._stats: Dict[str, PoolStats] = {}
+        self._loops: Dict[str, Optional[asyncio.AbstractEventLoop]] = {}
+        self._closing: Set[asyncio.Task] = set()
+        self._http2 = HTTP_POOL_HTTP2 and _http2_supported()
+
+    def get_client(self, key: str = "default", timeout: float = 30.0) -> httpx.AsyncClient:
+        """
+        Get the shared client for an upstream instance, creating it if needed
+
+        Args:
+            key: Pool key (e.g. Evolution instance name)
+            timeout: Default timeout for the client (per-request timeouts still apply)
+
+        Returns:
+            httpx.AsyncClient with keep-alive pooling
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        client = self._clients.get(key)
+        # Conexões pertencem ao event loop que as abriu (ex.: loops distintos em testes)
+        if client is not None and not client.is_closed and self._loops.get(key) is loop:
+            return client
+        if client is not None:
+            self._close_stale_client(key, client, self._loops.get(key), loop)
+
+        stats = self._stats.setdefault(key, PoolStats())
+        limits = httpx.Limits(
+            max_connections=HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_POOL_KEEPALIVE_EXPIRY,
+        )
+        transport = _InstrumentedTransport(stats, limits=limits, http2=self._http2)
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout), transport=transport, follow_redirects=True
+        )
+        self._clients[key] = client
+        self._transports[key] = transport
+        self._loops[key] = loop
+        logger.info(
+            f"HTTP_POOL|client_created|key={key}|max_connections={HTTP_POOL_MAX_CONNECTIONS}|"
+            f"keepalive={HTTP_POOL_MAX_KEEPALIVE}|http2={self._http2}"
+        )
+        return client
+
+    def _close_stale_client(
+        self,
+        key: str,
+        client: httpx.AsyncClient,
+        owner_loop: Optional[asyncio.AbstractEventLoop],
+        loop: Optional[asyncio.AbstractEventLoop],
+    ) -> None:
+        """Close a client replaced after an event loop change, without blocking the caller"""
+        if client.is_closed:
+            return
+        # Preferência: fechar no loop que abriu as conexões, se ainda estiver rodando
+        if owner_loop is not None and owner_loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._aclose_client(key, client), owner_loop)
+        elif loop is not None:
+            task = loop.create_task(self._aclose_client(key, client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        else:
+            logger.warning(f"HTTP_POOL|stale_client_not_closed|key={key}|reason=no_event_loop")
+            return
+        logger.info(f"HTTP_POOL|stale_client_closing|key={key}")
+
+    async def _aclose_client(self, key: str, client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"HTTP_POOL|close_failed|key={key}|error={e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool stats per key: open connections, reuse ratio, handshake time"""
+        pools = {}
+        for key, stats in self._stats.items():
+            transport = self._transports.get(key)
+            client = self._clients.get(key)
+            pools[key] = {
+                **stats.as_dict(),
+                "open_connections": (
+                    transport.open_connections()
+                    if transport is not None and client is not None and not client.is_closed
+                    else 0
+                ),
+            }
+        return {"http2": self._http2, "pools": pools}
+
+    async def aclose(self) -> None:
+        """Close every pooled client (application shutdown)"""
+        for key, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"HTTP_POOL|close_failed|key={key}|error={e}")
+        self._clients.clear()
+        self._transports.clear()
+        self._loops.clear()
+
+
+# Global HTTP client manager
+http_client_manager = HTTPClientManager()
+
+
+def get_http_client(key: str = "default", timeout: float = 30.0) -> httpx.AsyncClient:
+    """Get the shared pooled client for `key`"""
+    return http_client_manager.get_client(key, timeout)
+
+
+def get_http_pool_stats() -> Dict[str, Any]:
+    """Pool stats for health endpoints"""
+    return http_client_manager.stats()
+
+
+async def close_http_clients() -> None:
+    """Close all pooled clients"""
+    await http_client_manager.aclose()
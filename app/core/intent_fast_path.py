@@ -0,0 +1,312 @@
+"""
+Intent Fast Path - Pré-classificador local na frente do GeminiClassifier
+
+Turnos triviais ("oi", "bom dia", "quanto custa?", "quero agendar uma
+avaliação") são resolvidos localmente com os patterns PT-BR compilados de
+`intent_patterns_ptbr`, em microssegundos; turnos ambíguos seguem para o Gemini.
+
+Um turno só é resolvido localmente quando:
+- a mensagem é curta e não contém dígitos (idades, horários, telefones)
+- exatamente uma intenção NLU é candidata (ex.: "oi, quanto custa?" escala)
+- a mensagem é coberta pelo match (+ palavras de ligação), de modo que nenhuma
+  entidade (nome, idade, matéria) seja perdida
+- o score (confiança do pattern × cobertura) atinge o threshold da intenção
+
+Os thresholds são calibrados a partir de tráfego gravado: uma fração dos
+turnos resolvíveis localmente (FAST_PATH_SHADOW_RATE) ainda vai ao Gemini e o
+par (candidato local, intenção do Gemini) é registrado para `calibrate()`.
+As amostras são persistidas no Redis (compartilhadas entre workers e
+restarts) e `start()` recalibra periodicamente a partir delas.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import re
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from .intent_patterns_ptbr import KumonIntentPatternsPTBR, kumon_intent_patterns
+
+logger = logging.getLogger(__name__)
+
+# Configuração
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+FAST_PATH_SHADOW_RATE = float(os.getenv("FAST_PATH_SHADOW_RATE", "0.05"))
+FAST_PATH_MAX_WORDS = int(os.getenv("FAST_PATH_MAX_WORDS", "8"))
+FAST_PATH_MAX_SAMPLES = 5000
+FAST_PATH_CALIBRATE_INTERVAL = int(os.getenv("FAST_PATH_CALIBRATE_INTERVAL", "3600"))
+FAST_PATH_SAMPLES_KEY = "fast_path:samples"
+
+# Patterns PT-BR que podem ser resolvidos localmente -> primary_intent do NLU.
+# Matérias, idades e expressões temporais ficam de fora: são respostas da
+# qualificação/agendamento e precisam da extração de entidades do Gemini.
+LOCAL_INTENTS = {
+    "greeting.hello": "greeting",
+    "information.price": "information",
+    "information.hours": "information",
+    "information.address": "information",
+    "information.general": "information",
+    "scheduling.book": "scheduling",
+    "scheduling.reschedule": "scheduling",
+}
+
+DEFAULT_THRESHOLDS = {
+    "greeting": 0.85,
+    "information": 0.85,
+    "scheduling": 0.85,
+}
+
+# Palavras de ligação que não carregam entidades
+FILLER_WORDS = frozenset(
+    """
+    a o as os um uma de da do das dos em na no para pra por com e é
+    qual quais quanto como onde que quero queria gostaria saber me vocês voces
+    aí ai aqui kumon unidade por favor pf obrigado obrigada gente pessoal
+    """.split()
+)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+class FastPathClassifier:
+    """Local, pattern-based pre-classifier with resolution counters"""
+
+    def __init__(
+        self,
+        patterns: KumonIntentPatternsPTBR = kumon_intent_patterns,
+        thresholds: Optional[Dict[str, float]] = None,
+        shadow_rate: float = FAST_PATH_SHADOW_RATE,
+        max_words: int = FAST_PATH_MAX_WORDS,
+        enabled: bool = FAST_PATH_ENABLED,
+    ):
+        self.patterns = patterns
+        self.thresholds = dict(thresholds or DEFAULT_THRESHOLDS)
+        self.shadow_rate = shadow_rate
+        self.max_words = max_words
+        self.enabled = enabled
+        self.samples: Deque[Dict[str, Any]] = deque(maxlen=FAST_PATH_MAX_SAMPLES)
+        self._pending: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.metrics = {
+            "local": 0,
+            "remote": 0,
+            "shadow": 0,
+            "local_by_intent": {},
+            "escalation_reasons": {},
+        }
+
+    def candidate(self, text: str) -> Dict[str, Any]:
+        """
+        Candidato local para a mensagem, sem aplicar o threshold
+
+        Returns:
+            {"intent", "pattern", "score"} ou {"reason"} quando não há candidato
+        """
+        words = _WORD.findall((text or "").lower())
+        if not words:
+            return {"reason": "empty"}
+        if len(words) > self.max_words:
+            return {"reason": "too_long"}
+        if any(ch.isdigit() for ch in text):
+            return {"reason": "has_digits"}
+
+        detected = self.patterns.extract_intents(text)
+        local = [d for d in detected if d["intent"] in LOCAL_INTENTS]
+        if not local:
+            return {"reason": "no_pattern"}
+        if len({LOCAL_INTENTS[d["intent"]] for d in local}) > 1:
+            return {"reason": "multi_intent"}
+
+        best = local[0]
+        covered = {w for d in detected for m in d["matches"] for w in _WORD.findall(m)}
+        covered_count = sum(1 for w in words if w in covered or w in FILLER_WORDS)
+        score = best["confidence"] * covered_count / len(words)
+
+        return {
+            "intent": LOCAL_INTENTS[best["intent"]],
+            "pattern": best["intent"],
+            "score": round(score, 4),
+        }
+
+    def classify(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve o turno localmente ou retorna None para escalar ao Gemini
+
+        Returns:
+            dict no formato do GeminiClassifier (+ "source": "fast_path") ou None
+        """
+        if not self.enabled:
+            return None
+
+        candidate = self.candidate(text)
+        intent = candidate.get("intent")
+        if intent is None:
+            self._escalate(candidate["reason"])
+            return None
+
+        if candidate["score"] < self.thresholds.get(intent, 1.01):
+            self._escalate("below_threshold")
+            return None
+
+        return {
+            "primary_intent": intent,
+            "secondary_intent": None,
+            "entities": {},
+            "confidence": candidate["score"],
+            "source": "fast_path",
+            "pattern": candidate["pattern"],
+        }
+
+    def should_shadow(self) -> bool:
+        """Sorteia se um turno resolvido localmente também vai ao Gemini"""
+        if self.shadow_rate > 0 and random.random() < self.shadow_rate:
+            self.metrics["shadow"] += 1
+            self.metrics["remote"] += 1
+            return True
+        return False
+
+    def record_local(self, result: Dict[str, Any]) -> None:
+        """Conta um turno resolvido localmente"""
+        self.metrics["local"] += 1
+        by_intent = self.metrics["local_by_intent"]
+        by_intent[result["primary_intent"]] = by_intent.get(result["primary_intent"], 0) + 1
+
+    def record_outcome(self, text: str, gemini_result: Dict[str, Any]) -> None:
+        """Registra (candidato local, intenção do Gemini) para calibração"""
+        if not gemini_result.get("confidence"):
+            return  # erro/fallback do Gemini não serve como rótulo
+        candidate = self.candidate(text)
+        if candidate.get("intent") is None:
+            return
+        sample = {
+            "intent": candidate["intent"],
+            "score": candidate["score"],
+            "gemini_intent": gemini_result.get("primary_intent"),
+        }
+        self.samples.append(sample)
+        self._pending.append(sample)
+
+    def calibrate(
+        self,
+        samples: Optional[Iterable[Dict[str, Any]]] = None,
+        target_precision: float = 0.97,
+        min_support: int = 30,
+        apply: bool = True,
+    ) -> Dict[str, float]:
+        """
+        Menor threshold por intenção com precisão >= target_precision
+
+        Args:
+            samples: dicts {"intent", "score", "gemini_intent"}; padrão: gravados
+            target_precision: precisão mínima do fast path vs. Gemini
+            min_support: amostras mínimas acima do threshold para aceitá-lo
+            apply: atualiza self.thresholds com os valores calibrados
+
+        Returns:
+            Thresholds por intenção (intenções sem dados mantêm o atual)
+        """
+        by_intent: Dict[str, List[Dict[str, Any]]] = {}
+        for sample in self.samples if samples is None else samples:
+            by_intent.setdefault(sample["intent"], []).append(sample)
+
+        calibrated = dict(self.thresholds)
+        for intent, intent_samples in by_intent.items():
+            # Do maior score para o menor: precisão acumulada acima do corte
+            ordered = sorted(intent_samples, key=lambda s: s["score"], reverse=True)
+            correct = 0
+            best = None
+            for i, sample in enumerate(ordered, start=1):
+                correct += sample["gemini_intent"] == intent
+                is_cut = i == len(ordered) or ordered[i]["score"] < sample["score"]
+                if is_cut and i >= min_support and correct / i >= target_precision:
+                    best = sample["score"]
+            if best is not None:
+                calibrated[intent] = best
+            elif len(ordered) >= min_support:
+                calibrated[intent] = 1.01  # nunca atinge a precisão: desliga
+            logger.info(
+                f"FAST_PATH|calibrate|intent={intent}|samples={len(ordered)}|"
+                f"threshold={calibrated[intent]}"
+            )
+
+        if apply:
+            self.thresholds = calibrated
+        return calibrated
+
+    async def sync_samples(self) -> int:
+        """
+        Persiste as amostras novas no Redis e recarrega o histórico compartilhado
+
+        Returns:
+            Número de amostras disponíveis para calibração
+        """
+        from .cache_manager import get_async_redis
+
+        redis = get_async_redis()
+        if redis is None:
+            return len(self.samples)
+
+        pending, self._pending = self._pending, []
+        try:
+            pipe = redis.pipeline(transaction=False)
+            if pending:
+                pipe.rpush(FAST_PATH_SAMPLES_KEY, *(json.dumps(s) for s in pending))
+                pipe.ltrim(FAST_PATH_SAMPLES_KEY, -FAST_PATH_MAX_SAMPLES, -1)
+            pipe.lrange(FAST_PATH_SAMPLES_KEY, 0, -1)
+            results = await pipe.execute()
+        except Exception as e:
+            self._pending = pending + self._pending  # tenta de novo no próximo ciclo
+            logger.warning(f"FAST_PATH|sync_samples_failed|pending={len(self._pending)}|error={e}")
+            return len(self.samples)
+
+        stored = [json.loads(raw) for raw in results[-1]]
+        self.samples = deque(stored + self._pending, maxlen=FAST_PATH_MAX_SAMPLES)
+        return len(self.samples)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync_samples()
+                self.calibrate()
+            except Exception as e:
+                logger.error(f"FAST_PATH|calibrate_failed|error={e}")
+            await asyncio.sleep(FAST_PATH_CALIBRATE_INTERVAL)
+
+    def start(self) -> None:
+        """Calibra a partir das amostras persistidas agora e a cada intervalo"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"FAST_PATH|calibration_started|interval={FAST_PATH_CALIBRATE_INTERVAL}s")
+
+    async def stop(self) -> None:
+        """Cancela a calibração periódica e persiste as amostras pendentes"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pending:
+            await self.sync_samples()
+
+    def _escalate(self, reason: str) -> None:
+        self.metrics["remote"] += 1
+        reasons = self.metrics["escalation_reasons"]
+        reasons[reason] = reasons.get(reason, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores local vs. remoto, incluindo a taxa de resolução local"""
+        total = self.metrics["local"] + self.metrics["remote"]
+        return {
+            **self.metrics,
+            "thresholds": dict(self.thresholds),
+            "samples": len(self.samples),
+            "pending_samples": len(self._pending),
+            "calibration_running": self._task is not None and not self._task.done(),
+            "local_rate": round(self.metrics["local"] / total, 3) if total else 0.0,
+        }
@@ -7,14 +7,15 @@ from typing import Any, Dict
 from langgraph.graph import END, StateGraph
 
 try:
-    from langgraph.checkpoint.postgres import PostgresSaver
+    from app.services.postgres_checkpointer import AsyncPooledCheckpointSaver
 
     CHECKPOINTS_AVAILABLE = True
-except ImportError:
+except Exception:  # langgraph sem API de checkpoint v2 ou dependências ausentes
     CHECKPOINTS_AVAILABLE = False
     print("WARNING: LangGraph checkpoints not available - using fallback")
 
 from app.core.gemini_classifier import GeminiClassifier
+from app.core.intent_fast_path import FastPathClassifier
 
 # Importe os nós e o roteador de seus arquivos dedicados
 from app.core.nodes.greeting import greeting_node
@@ -22,20 +23,22 @@ from app.core.nodes.information import information_node
 from app.core.nodes.master_router import master_router
 from app.core.nodes.qualification import qualification_node
 from app.core.nodes.scheduling import scheduling_node
+from app.core.state.updates import as_graph_node
 
 logger = logging.getLogger(__name__)
 
 # 🧠 INSTÂNCIA CENTRALIZADA: Criada em um único lugar, eliminando importação circular
 gemini_classifier = GeminiClassifier()
+intent_fast_path = FastPathClassifier()
 
 
 # 🔧 WRAPPER: Injeção de Dependência do GeminiClassifier
 async def master_router_wrapper(state: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Wrapper que injeta a instância do GeminiClassifier no master_router.
-    Elimina a dependência circular e centraliza a instanciação.
+    Wrapper que injeta a instância do GeminiClassifier (e do fast path local)
+    no master_router. Elimina a dependência circular e centraliza a instanciação.
     """
-    return await master_router(state, gemini_classifier)
+    return await master_router(state, gemini_classifier, intent_fast_path)
 
 
 # Simple fallback node implementation
@@ -54,7 +57,6 @@ async def fallback_node(state: Dict[str, Any]) -> Dict[str, Any]:
         delivery_result = await send_text(phone, fallback_text, instance)
 
         return {
-            **state,
             "sent": delivery_result.get("sent", "false"),
             "response": fallback_text,
             "routing_decision": "fallback_node",
@@ -62,7 +64,6 @@ async def fallback_node(state: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"FALLBACK|error|{str(e)}")
         return {
-            **state,
             "sent": "false",
             "response": fallback_text,
             "error_reason": str(e),
@@ -91,8 +92,14 @@ def build_graph():
 
     if db_url and CHECKPOINTS_AVAILABLE:
         try:
-            # Instancia o checkpointer PostgreSQL
-            checkpointer = PostgresSaver.from_conn_string(db_url)
+            # Checkpointer PostgreSQL assíncrono com pool (aberto no primeiro uso)
+            checkpointer = AsyncPooledCheckpointSaver.from_conn_string(
+                db_url,
+                min_size=int(os.getenv("CHECKPOINT_POOL_MIN_SIZE", "2")),
+                max_size=int(os.getenv("CHECKPOINT_POOL_MAX_SIZE", "10")),
+                statement_cache_size=int(os.getenv("CHECKPOINT_STATEMENT_CACHE_SIZE", "100")),
+                write_behind=os.getenv("CHECKPOINT_WRITE_BEHIND", "false").lower() == "true",
+            )
             print(f"SUCCESS|checkpointer_configured|db_url={db_url[:50]}...")
         except Exception as e:
             print(f"ERROR|checkpointer_failed|error={str(e)}")
@@ -108,12 +115,13 @@ def build_graph():
     workflow = StateGraph(Dict[str, Any])
 
     # Adiciona os nós, incluindo o master_router_wrapper que injeta o classifier
-    workflow.add_node("master_router", master_router_wrapper)
-    workflow.add_node("greeting_node", greeting_node)
-    workflow.add_node("qualification_node", qualification_node)
-    workflow.add_node("information_node", information_node)
+    # Nós retornam atualizações parciais; as_graph_node faz o merge copy-on-write
+    workflow.add_node("master_router", as_graph_node(master_router_wrapper))
+    workflow.add_node("greeting_node", as_graph_node(greeting_node))
+    workflow.add_node("qualification_node", as_graph_node(qualification_node))
+    workflow.add_node("information_node", as_graph_node(information_node))
     workflow.add_node("scheduling_node", scheduling_node)
-    workflow.add_node("fallback_node", fallback_node)
+    workflow.add_node("fallback_node", as_graph_node(fallback_node))
 
     # Define o ponto de entrada para o ROTEADOR
     workflow.set_entry_point("master_router")
@@ -149,6 +157,13 @@ print(f"DEBUG|graph_built|type={type(graph)}")
 print(f"DEBUG|graph_built|is_none={graph is None}")
 
 
+async def close_checkpointer() -> None:
+    """Drena os checkpoints pendentes (write-behind) e fecha o pool no shutdown."""
+    checkpointer = getattr(graph, "checkpointer", None)
+    if checkpointer is not None and hasattr(checkpointer, "aclose"):
+        await checkpointer.aclose()
+
+
 # A função principal que executa o grafo com checkpoints
 async def run_flow(
     state: Dict[str, Any], config: Dict[str, Any] = None
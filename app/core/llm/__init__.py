@@ -1,6 +1,6 @@
 """
 LLM adapters module.
 """
-from .openai_adapter import OpenAIClient
+from .openai_adapter import OpenAIClient, get_openai_client
 
-__all__ = ["OpenAIClient"]
+__all__ = ["OpenAIClient", "get_openai_client"]
@@ -1,13 +1,20 @@
 """
 OpenAI adapter for v1.x SDK with PT-BR enforcement and resilience.
+
+Uses AsyncOpenAI so a slow generation never blocks the event loop; one
+process-wide client (see get_openai_client) keeps the HTTP connections warm.
 """
 import asyncio
 import os
+import random
 import time
 from typing import Optional
 
 import openai
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+# Limite de chamadas simultâneas ao LLM por processo
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "16"))
 
 
 class OpenAIClient:
@@ -16,7 +23,10 @@ class OpenAIClient:
     """
 
     def __init__(
-        self, api_key: Optional[str] = None, timeout_s: Optional[float] = None
+        self,
+        api_key: Optional[str] = None,
+        timeout_s: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
     ):
         """
         Initialize OpenAI client.
@@ -24,12 +34,31 @@ class OpenAIClient:
         Args:
             api_key: OpenAI API key (defaults to env var OPENAI_API_KEY)
             timeout_s: Default timeout in seconds (defaults to env var OPENAI_TIMEOUT or 8s)
+            max_concurrency: Max in-flight requests (defaults to OPENAI_MAX_CONCURRENCY)
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.default_timeout = timeout_s or float(os.getenv("OPENAI_TIMEOUT", "8"))
+        self.max_concurrency = max_concurrency or OPENAI_MAX_CONCURRENCY
 
-        # Initialize OpenAI client with timeout
-        self.client = OpenAI(api_key=self.api_key, timeout=self.default_timeout)
+        # Async client with timeout; retries are handled in chat() with jitter
+        self.client = AsyncOpenAI(
+            api_key=self.api_key, timeout=self.default_timeout, max_retries=0
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _limiter(self) -> asyncio.Semaphore:
+        """Concurrency limit for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @staticmethod
+    def _backoff_s(attempt: int, base_ms: int = 100, cap_ms: int = 2000) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(cap_ms, base_ms * 3**attempt)) / 1000.0
 
     async def chat(
         self,
@@ -72,28 +101,19 @@ class OpenAIClient:
 
         # Retry logic for rate limits and connection errors
         max_attempts = 3
-        backoff_ms = [100, 300, 900]  # Exponential backoff
 
         for attempt in range(max_attempts):
             try:
                 start_time = time.time()
 
-                # Make request with custom timeout if provided
-                if timeout_s:
-                    # Create new client with custom timeout for this request
-                    temp_client = OpenAI(api_key=self.api_key, timeout=timeout_s)
-                    response = temp_client.chat.completions.create(
-                        model=model,
-                        messages=messages,
-                        temperature=temperature,
-                        max_tokens=max_tokens,
-                    )
-                else:
-                    response = self.client.chat.completions.create(
+                # Per-request timeout on the shared client (no new connection pool)
+                async with self._limiter():
+                    response = await self.client.chat.completions.create(
                         model=model,
                         messages=messages,
                         temperature=temperature,
                         max_tokens=max_tokens,
+                        timeout=timeout_val,
                     )
 
                 # Extract response
@@ -119,7 +139,7 @@ class OpenAIClient:
                     f"LLM|error|type=RateLimitError|code=429|msg={str(e)}|attempt={attempt + 1}"
                 )
                 if attempt < max_attempts - 1:
-                    await asyncio.sleep(backoff_ms[attempt] / 1000.0)
+                    await asyncio.sleep(self._backoff_s(attempt))
                     continue
                 return "Desculpe, o sistema está sobrecarregado. Por favor, aguarde um momento."
 
@@ -129,7 +149,7 @@ class OpenAIClient:
                     f"LLM|error|type=APIConnectionError|msg={str(e)}|attempt={attempt + 1}"
                 )
                 if attempt < max_attempts - 1:
-                    await asyncio.sleep(backoff_ms[attempt] / 1000.0)
+                    await asyncio.sleep(self._backoff_s(attempt))
                     continue
                 return "Desculpe, erro de conexão. Por favor, verifique sua internet."
 
@@ -144,7 +164,7 @@ class OpenAIClient:
                 # Generic API error - retry for 5xx
                 print(f"LLM|error|type=APIError|msg={str(e)}|attempt={attempt + 1}")
                 if attempt < max_attempts - 1:
-                    await asyncio.sleep(backoff_ms[attempt] / 1000.0)
+                    await asyncio.sleep(self._backoff_s(attempt))
                     continue
                 return (
                     "Desculpe, houve um erro no servidor. Por favor, tente mais tarde."
@@ -159,3 +179,14 @@ class OpenAIClient:
 
         # Fallback if all retries exhausted
         return "Desculpe, não foi possível processar sua solicitação após várias tentativas."
+
+
+_default_client: Optional[OpenAIClient] = None
+
+
+def get_openai_client() -> OpenAIClient:
+    """Process-wide OpenAIClient (shared connection pool and concurrency limit)"""
+    global _default_client
+    if _default_client is None:
+        _default_client = OpenAIClient()
+    return _default_client
@@ -0,0 +1,198 @@
+"""
+NLU Cache - Cache em dois níveis (LRU local + Redis) para o GeminiClassifier
+
+Mensagens curtas e repetidas ("oi", "ok", "sim", "quanto custa?") no mesmo
+contexto geram o mesmo prompt e, portanto, o mesmo resultado de NLU. A chave
+combina tudo o que entra no prompt:
+- texto normalizado
+- hash da última fala do assistente (histórico formatado)
+- variáveis de qualificação que ainda faltam
+
+Níveis:
+- L1: OrderedDict LRU em memória com TTL e tamanho máximo
+- L2: Redis (compartilhado entre workers) com TTL
+
+Resultados de fallback/erro nunca são armazenados.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuração
+NLU_CACHE_ENABLED = os.getenv("NLU_CACHE_ENABLED", "true").lower() == "true"
+NLU_CACHE_REDIS_ENABLED = os.getenv("NLU_CACHE_REDIS_ENABLED", "true").lower() == "true"
+NLU_CACHE_MAX_ENTRIES = int(os.getenv("NLU_CACHE_MAX_ENTRIES", "2048"))
+NLU_CACHE_LOCAL_TTL_SEC = int(os.getenv("NLU_CACHE_LOCAL_TTL_SEC", "600"))
+NLU_CACHE_REDIS_TTL_SEC = int(os.getenv("NLU_CACHE_REDIS_TTL_SEC", "86400"))
+NLU_CACHE_MAX_TEXT_CHARS = 200  # mensagens longas raramente se repetem
+
+_KEY_PREFIX = "nlu:v1:"
+_EDGE_PUNCTUATION = " .,;:!?¿¡…\"'"
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_utterance(text: str) -> str:
+    """
+    Normaliza a mensagem do usuário para a chave do cache
+
+    NFKC + casefold + espaços colapsados + pontuação das bordas removida,
+    de modo que "Oi!", "oi" e " OI " compartilhem a mesma entrada.
+    """
+    normalized = unicodedata.normalize("NFKC", text or "").casefold()
+    normalized = _WHITESPACE.sub(" ", normalized)
+    return normalized.strip(_EDGE_PUNCTUATION)
+
+
+def make_cache_key(text: str, history: str, missing_vars: str) -> Optional[str]:
+    """
+    Chave do cache a partir das entradas do prompt
+
+    Returns:
+        str com prefixo "nlu:v1:", ou None se a mensagem não deve ser cacheada
+    """
+    normalized = normalize_utterance(text)
+    if not normalized or len(normalized) > NLU_CACHE_MAX_TEXT_CHARS:
+        return None
+
+    history_hash = hashlib.sha1((history or "").encode("utf-8")).hexdigest()[:16]
+    raw = f"{normalized}\x1f{history_hash}\x1f{missing_vars or ''}"
+    return _KEY_PREFIX + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    """Só resultados válidos (não fallback/erro) entram no cache"""
+    if not isinstance(result, dict) or "error" in result:
+        return False
+    if result.get("primary_intent") in (None, "fallback"):
+        return False
+    return float(result.get("confidence") or 0.0) > 0.0
+
+
+class NLUCache:
+    """Two-tier NLU result cache with hit-rate metrics"""
+
+    def __init__(
+        self,
+        max_entries: int = NLU_CACHE_MAX_ENTRIES,
+        local_ttl_sec: int = NLU_CACHE_LOCAL_TTL_SEC,
+        redis_ttl_sec: int = NLU_CACHE_REDIS_TTL_SEC,
+        redis_getter: Optional[Callable[[], Any]] = None,
+        enabled: bool = NLU_CACHE_ENABLED,
+    ):
+        self.max_entries = max_entries
+        self.local_ttl_sec = local_ttl_sec
+        self.redis_ttl_sec = redis_ttl_sec
+        self.enabled = enabled
+        self._redis_getter = redis_getter
+        self._local: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.metrics = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bypassed": 0,
+            "redis_errors": 0,
+        }
+
+    def _redis(self):
+        if self._redis_getter is not None:
+            return self._redis_getter()
+        if not NLU_CACHE_REDIS_ENABLED:
+            return None
+        from .cache_manager import get_async_redis
+
+        return get_async_redis()
+
+    def _local_get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+        return value
+
+    def _local_set(self, key: str, value: Dict[str, Any]) -> None:
+        self._local[key] = (time.monotonic() + self.local_ttl_sec, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    async def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Busca o resultado no L1 e depois no L2 (promovendo para o L1)
+
+        Returns:
+            Cópia do resultado, ou None em caso de miss/bypass
+        """
+        if not self.enabled or key is None:
+            self.metrics["bypassed"] += 1
+            return None
+
+        value = self._local_get(key)
+        if value is not None:
+            self.metrics["local_hits"] += 1
+            return copy.deepcopy(value)
+
+        client = self._redis()
+        if client is not None:
+            try:
+                raw = await client.get(key)
+                if raw:
+                    value = json.loads(raw)
+                    self._local_set(key, value)
+                    self.metrics["redis_hits"] += 1
+                    return copy.deepcopy(value)
+            except Exception as e:
+                self.metrics["redis_errors"] += 1
+                logger.warning(f"NLU_CACHE|redis_get_failed|error={e}")
+
+        self.metrics["misses"] += 1
+        return None
+
+    async def set(self, key: Optional[str], result: Dict[str, Any]) -> None:
+        """Armazena o resultado nos dois níveis (se for cacheável)"""
+        if not self.enabled or key is None or not is_cacheable(result):
+            return
+
+        value = copy.deepcopy(result)
+        self._local_set(key, value)
+        self.metrics["stores"] += 1
+
+        client = self._redis()
+        if client is not None:
+            try:
+                await client.set(
+                    key, json.dumps(value, ensure_ascii=False), ex=self.redis_ttl_sec
+                )
+            except Exception as e:
+                self.metrics["redis_errors"] += 1
+                logger.warning(f"NLU_CACHE|redis_set_failed|error={e}")
+
+    def clear(self) -> None:
+        """Limpa o L1 (o L2 expira por TTL)"""
+        self._local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de uso, incluindo hit rate"""
+        hits = self.metrics["local_hits"] + self.metrics["redis_hits"]
+        lookups = hits + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "entries": len(self._local),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
@@ -1,4 +1,3 @@
-import copy
 import logging
 from typing import Any, Dict
 
@@ -14,8 +13,7 @@ async def greeting_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     print("DEBUG|greeting_node_executed|CALLED!")
     print(f"DEBUG|greeting_node|state_type={type(state)}")
-    # 1. Proteger o estado contra mutações inesperadas
-    state = copy.deepcopy(state)
+    # 1. O estado recebido não é alterado: o nó retorna só as chaves novas
     logger.info(f"Executing simplified greeting_node for phone: {state.get('phone')}")
 
     # 2. Definir a resposta padrão e única deste nó
@@ -27,16 +25,17 @@ async def greeting_node(state: Dict[str, Any]) -> Dict[str, Any]:
         phone=state.get("phone"), text=response_text, instance=state.get("instance")
     )
 
-    # 4. Atualizar o estado com as ações executadas
-    state["last_bot_response"] = response_text
-    # CRITICAL FIX: Set response field for evolution.py compatibility
-    state["response"] = response_text
-    state["greeting_sent"] = True  # Flag crucial para o roteador no próximo turno
-    
-    # CRITICAL FIX: Set sent flag from delivery result
-    state["sent"] = delivery_result.get("sent", "false")
+    # 4. Montar a atualização com as ações executadas
+    update = {
+        "last_bot_response": response_text,
+        # CRITICAL FIX: Set response field for evolution.py compatibility
+        "response": response_text,
+        "greeting_sent": True,  # Flag crucial para o roteador no próximo turno
+        # CRITICAL FIX: Set sent flag from delivery result
+        "sent": delivery_result.get("sent", "false"),
+    }
 
     logger.info("Greeting sent and state updated with greeting_sent=True.")
 
-    # 5. Retornar o estado final
-    return state
+    # 5. Retornar a atualização parcial (merge feito pelo grafo)
+    return update
@@ -1,8 +1,8 @@
-import copy
 import logging
 from typing import Any, Dict
 
 from ..delivery import send_text
+from ..state.updates import with_collected
 
 logger = logging.getLogger(__name__)
 
@@ -89,27 +89,23 @@ async def information_node(state: Dict[str, Any]) -> Dict[str, Any]:
     2. Get next qualification question from shared logic
     3. Build blended response prompt
     4. Generate response with LLM
-    5. Send response and return updated state
+    5. Send response and return the partial state update
     """
     print("DEBUG|information_node_executed|CALLED!")
     print(f"DEBUG|information_node|state_type={type(state)}")
-    # 1. GUARANTEE STATE SAFETY
-    state = copy.deepcopy(state)
-
+    # 1. GUARANTEE STATE SAFETY: never mutate the incoming state (copy-on-write)
     logger.info(
         f"Processing information request for {state.get('phone_number')} - simplified mode"
     )
 
     # 2. PROCESS NLU ENTITIES INTO COLLECTED_DATA (transfer from nlu_entities)
     nlu_entities = state.get("nlu_entities", {})
-    collected_data = state.get("collected_data", {})
-
-    # Transfer entities to collected_data if they exist
-    for entity_key, entity_value in nlu_entities.items():
-        if entity_value:  # Only transfer non-empty values
-            collected_data[entity_key] = entity_value
 
-    state["collected_data"] = collected_data
+    # Transfer entities to collected_data if they exist (only non-empty values)
+    collected_data = with_collected(
+        state, **{key: value for key, value in nlu_entities.items() if value}
+    )
+    state = {**state, "collected_data": collected_data}
 
     # 3. GET USER QUESTION (already in state)
     user_question = state.get("text", "")
@@ -122,9 +118,9 @@ async def information_node(state: Dict[str, Any]) -> Dict[str, Any]:
 
     # 6. GENERATE RESPONSE WITH LLM
     try:
-        from ..llm.openai_adapter import OpenAIClient
+        from ..llm.openai_adapter import get_openai_client
 
-        openai_client = OpenAIClient()
+        openai_client = get_openai_client()
         response_text = await openai_client.chat(
             model="gpt-3.5-turbo",
             system_prompt=prompt,
@@ -147,18 +143,19 @@ async def information_node(state: Dict[str, Any]) -> Dict[str, Any]:
     phone = state.get("phone")
     instance = state.get("instance", "kumon_assistant")
 
+    sent = "false"
     if phone:
         delivery_result = await send_text(phone, response_text, instance)
         # CRITICAL FIX: Set sent flag from delivery result
-        state["sent"] = delivery_result.get("sent", "false")
-    else:
-        state["sent"] = "false"
-
-    state["last_bot_response"] = response_text
-    # CRITICAL FIX: Set response field for evolution.py compatibility
-    state["response"] = response_text
+        sent = delivery_result.get("sent", "false")
 
     logger.info(f"Information response sent for {state.get('phone_number')}")
 
-    # 8. RETURN UPDATED STATE
-    return state
+    # 8. RETURN PARTIAL STATE UPDATE
+    return {
+        "collected_data": collected_data,
+        "sent": sent,
+        "last_bot_response": response_text,
+        # CRITICAL FIX: Set response field for evolution.py compatibility
+        "response": response_text,
+    }
@@ -1,10 +1,10 @@
 # app/core/routing/master_router.py
 
-import copy
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from app.core.gemini_classifier import GeminiClassifier
+from app.core.intent_fast_path import FastPathClassifier
 from app.utils.formatters import safe_phone_display
 
 logger = logging.getLogger(__name__)
@@ -33,16 +33,37 @@ def _get_continuation_decision(state: Dict[str, Any]) -> str:
     return ""
 
 
+async def _classify_turn(
+    text: str,
+    state: Dict[str, Any],
+    classifier: GeminiClassifier,
+    fast_path: Optional[FastPathClassifier],
+) -> Dict[str, Any]:
+    """Fast path local para turnos triviais; o restante escala para o Gemini."""
+    local_result = fast_path.classify(text) if fast_path else None
+    if local_result is not None and not fast_path.should_shadow():
+        fast_path.record_local(local_result)
+        return local_result
+
+    nlu_result = await classifier.classify(text, context=state)
+    if fast_path is not None:
+        fast_path.record_outcome(text, nlu_result)
+    return nlu_result
+
+
 async def master_router(
-    state: Dict[str, Any], classifier: GeminiClassifier
+    state: Dict[str, Any],
+    classifier: GeminiClassifier,
+    fast_path: Optional[FastPathClassifier] = None,
 ) -> Dict[str, Any]:
     """
     NÓ DECISOR (ASSÍNCRONO) - VERSÃO FINAL E CORRIGIDA
 
     Confia 100% no estado fornecido pelo LangGraph Checkpoints.
+    Não altera o estado recebido: retorna apenas nlu_result e routing_decision.
+    Com fast_path, turnos triviais são classificados localmente sem o Gemini.
     """
-    # Proteger o estado recebido
-    state = copy.deepcopy(state)
+    update: Dict[str, Any] = {}
     phone = state.get("phone")
     text = state.get("text", "")
     logger.info(
@@ -55,13 +76,14 @@ async def master_router(
         # já é o contexto completo e persistido.
         # Nós o passamos DIRETAMENTE para o classificador.
 
-        # 1. Obter Análise da IA com o contexto completo
-        nlu_result = await classifier.classify(text, context=state)
-        state["nlu_result"] = nlu_result
+        # 1. Obter Análise (fast path local ou IA com o contexto completo)
+        nlu_result = await _classify_turn(text, state, classifier, fast_path)
+        update["nlu_result"] = nlu_result
         primary_intent = nlu_result.get("primary_intent", "fallback")
 
         logger.info(
             f"MASTER_ROUTER|NLU Result|intent={primary_intent}|"
+            f"source={nlu_result.get('source', 'gemini')}|"
             f"entities={nlu_result.get('entities')}"
         )
 
@@ -79,11 +101,11 @@ async def master_router(
                 final_decision = _map_intent_to_node(primary_intent)
 
         # 3. Escrever a decisão no "memorando" do estado
-        state["routing_decision"] = final_decision
+        update["routing_decision"] = final_decision
 
     except Exception as e:
         logger.error(f"MASTER_ROUTER|Error|error={str(e)}", exc_info=True)
-        state["routing_decision"] = "fallback_node"
+        update["routing_decision"] = "fallback_node"
 
-    # 4. Retornar o estado completo e modificado
-    return state
+    # 4. Retornar apenas as chaves alteradas (merge feito pelo grafo)
+    return update
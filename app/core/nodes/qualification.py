@@ -1,4 +1,3 @@
-import copy
 import logging
 from typing import Any, Dict
 
@@ -39,11 +38,13 @@ async def qualification_node(state: Dict[str, Any]) -> Dict[str, Any]:
     1. Process entities already extracted by GeminiClassifier contextual
     2. Determine next variable to collect based on sequence
     3. Generate appropriate question or complete qualification
-    4. Return updated state with response sent via Evolution API
+    4. Return partial state update with response sent via Evolution API
     """
 
-    # 1. GARANTA A SEGURANÇA DO ESTADO
-    state = copy.deepcopy(state)
+    # 1. GARANTA A SEGURANÇA DO ESTADO: copy-on-write apenas do que o nó altera
+    #    (topo do dict + collected_data), compartilhando o resto com o estado original
+    state = {**state, "collected_data": dict(state.get("collected_data") or {})}
+    update: Dict[str, Any] = {}
 
     logger.info(
         f"Processing qualification for {_get_phone_from_state(state)} - simplified sequential mode"
@@ -57,6 +58,7 @@ async def qualification_node(state: Dict[str, Any]) -> Dict[str, Any]:
     # 3. DETERMINE O PRÓXIMO PASSO
     next_var_to_collect = None
     collected = state["collected_data"]
+    update["collected_data"] = collected
 
     for var in QUALIFICATION_VARS_SEQUENCE:
         if var not in collected or not collected.get(var):
@@ -88,9 +90,9 @@ async def qualification_node(state: Dict[str, Any]) -> Dict[str, Any]:
             f"System='Direct response generation', User='{response_text}'"
         )
 
-        state["last_bot_response"] = response_text
+        update["last_bot_response"] = response_text
         # CRITICAL FIX: Set response field for evolution.py compatibility
-        state["response"] = response_text
+        update["response"] = response_text
 
         # Send message via Evolution API
         phone = _get_phone_from_state(state)
@@ -98,10 +100,10 @@ async def qualification_node(state: Dict[str, Any]) -> Dict[str, Any]:
         delivery_result = await send_text(phone, response_text, instance)
 
         # CRITICAL FIX: Set sent flag from delivery result
-        state["sent"] = delivery_result.get("sent", "false")
+        update["sent"] = delivery_result.get("sent", "false")
 
         # Update conversation step
-        state["current_step"] = _get_step_for_variable(next_var_to_collect)
+        update["current_step"] = _get_step_for_variable(next_var_to_collect)
 
         logger.info(f"Asking for {next_var_to_collect}: {response_text[:50]}...")
 
@@ -136,9 +138,9 @@ async def qualification_node(state: Dict[str, Any]) -> Dict[str, Any]:
             f"Gostaria de conhecer nossa metodologia e valores?"
         )
 
-        state["last_bot_response"] = response_text
+        update["last_bot_response"] = response_text
         # CRITICAL FIX: Set response field for evolution.py compatibility
-        state["response"] = response_text
+        update["response"] = response_text
 
         # Send message via Evolution API
         phone = _get_phone_from_state(state)
@@ -146,15 +148,15 @@ async def qualification_node(state: Dict[str, Any]) -> Dict[str, Any]:
         delivery_result = await send_text(phone, response_text, instance)
 
         # CRITICAL FIX: Set sent flag from delivery result
-        state["sent"] = delivery_result.get("sent", "false")
+        update["sent"] = delivery_result.get("sent", "false")
 
-        state["current_stage"] = ConversationStage.INFORMATION_GATHERING
-        state["current_step"] = ConversationStep.METHODOLOGY_EXPLANATION
+        update["current_stage"] = ConversationStage.INFORMATION_GATHERING
+        update["current_step"] = ConversationStep.METHODOLOGY_EXPLANATION
 
         logger.info("Qualification complete - transitioned to information gathering")
 
-    # 5. RETORNE O ESTADO ATUALIZADO
-    return state
+    # 5. RETORNE APENAS A ATUALIZAÇÃO (merge feito pelo grafo)
+    return update
 
 
 def _process_nlu_entities(state: Dict[str, Any]) -> None:
@@ -1,10 +1,11 @@
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from ...clients.google_calendar import (  # Real Google Calendar integration
-    GoogleCalendarClient,
+from ...clients.google_calendar_async import (  # Real Google Calendar integration
+    get_async_calendar_client,
 )
+from ...services.availability_warmer import availability_warmer
 from ..state.managers import StateManager
 from ..state.models import (
     ConversationStage,
@@ -27,7 +28,7 @@ class SchedulingNode:
     def __init__(self):
         # Real Google Calendar integration
         try:
-            self.calendar_service = GoogleCalendarClient()
+            self.calendar_service = get_async_calendar_client()
             logger.info("Google Calendar service initialized successfully")
         except Exception as e:
             logger.warning(f"Google Calendar service failed to initialize: {e}")
@@ -144,8 +145,10 @@ class SchedulingNode:
             updates = {}
             return self._create_response(state, response, updates)
 
-        # Gerar horários disponíveis (mock - seria consulta real ao Google Calendar)
-        available_dates = self._generate_available_dates(preference, time_options)
+        # Horários pré-calculados pelo availability_warmer; sem cache quente, usa o gerador local
+        available_dates = await self._cached_available_dates(time_options)
+        if available_dates is None:
+            available_dates = self._generate_available_dates(preference, time_options)
 
         # Gerar resposta com opções
         response_lines = [
@@ -391,6 +394,40 @@ class SchedulingNode:
 
         return self._create_response(state, response, updates)
 
+    async def _cached_available_dates(self, time_options: List[Dict]) -> Optional[List[Dict]]:
+        """Próximos horários livres do cache de disponibilidade (None se o cache estiver frio)"""
+        display = {option["time"]: option["display"] for option in time_options if option["available"]}
+        try:
+            free_slots = await availability_warmer.get_free_slots(list(display), limit=5)
+        except Exception as e:
+            logger.warning(f"Availability cache lookup failed: {e}")
+            return None
+        if not free_slots:
+            return None
+
+        return [
+            self._format_slot(
+                datetime.combine(day, datetime.strptime(slot_time, "%H:%M").time()),
+                display[slot_time],
+                slot_time,
+            )
+            for day, slot_time in free_slots
+        ]
+
+    @staticmethod
+    def _format_slot(slot_datetime: datetime, time_formatted: str, slot_time: str) -> Dict:
+        return {
+            "datetime": slot_datetime,
+            "date_formatted": slot_datetime.strftime("%d/%m/%Y (%A)")
+            .replace("Monday", "Segunda-feira")
+            .replace("Tuesday", "Terça-feira")
+            .replace("Wednesday", "Quarta-feira")
+            .replace("Thursday", "Quinta-feira")
+            .replace("Friday", "Sexta-feira"),
+            "time_formatted": time_formatted,
+            "time": slot_time,
+        }
+
     def _generate_available_dates(
         self, preference: str, time_options: List[Dict]  # noqa: ARG002
     ) -> List[Dict]:
@@ -419,17 +456,9 @@ class SchedulingNode:
                     )
 
                     available_dates.append(
-                        {
-                            "datetime": slot_datetime,
-                            "date_formatted": slot_datetime.strftime("%d/%m/%Y (%A)")
-                            .replace("Monday", "Segunda-feira")
-                            .replace("Tuesday", "Terça-feira")
-                            .replace("Wednesday", "Quarta-feira")
-                            .replace("Thursday", "Quinta-feira")
-                            .replace("Friday", "Sexta-feira"),
-                            "time_formatted": time_option["display"],
-                            "time": time_option["time"],
-                        }
+                        self._format_slot(
+                            slot_datetime, time_option["display"], time_option["time"]
+                        )
                     )
 
                     dates_added += 1
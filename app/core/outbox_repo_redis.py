@@ -9,6 +9,7 @@ Arquitetura:
 - Planner: outbox_push() para persistir mensagens
 - Delivery: outbox_pop_all() para consumir mensagens  
 - TTL automático evita vazamento de memória
+- async_outbox_pop_all() usa o pool redis.asyncio compartilhado (Delivery async)
 """
 
 import json
@@ -33,11 +34,37 @@ def _get_redis_client():
         return None
 
 
+def _get_async_redis_client():
+    """Get asyncio Redis client - import locally to avoid circular dependencies"""
+    try:
+        from .cache_manager import get_async_redis
+        return get_async_redis()
+    except ImportError:
+        logger.error("REDIS_OUTBOX|async_redis_unavailable")
+        return None
+
+
 def _outbox_key(conv_id: str) -> str:
     """Generate Redis key for outbox"""
     return f"{OUTBOX_KEY_PREFIX}:{conv_id}"
 
 
+def _dedupe_key(message_id: str) -> str:
+    """Generate Redis key for recent-message dedupe"""
+    return f"dedupe:{message_id}"
+
+
+def _deserialize(conv_id: str, raw_messages: List[str], op: str) -> List[Dict[str, Any]]:
+    """Deserialize raw outbox entries, skipping invalid JSON"""
+    messages = []
+    for raw_msg in raw_messages:
+        try:
+            messages.append(json.loads(raw_msg))
+        except json.JSONDecodeError as e:
+            logger.warning(f"REDIS_OUTBOX|{op}_invalid_json|conv={conv_id}|error={e}")
+    return messages
+
+
 def outbox_push(conv_id: str, messages: List[Dict[str, Any]]) -> int:
     """
     Persist outbox messages to Redis (atomic handoff Planner → Delivery)
@@ -110,14 +137,7 @@ def outbox_peek_all(conv_id: str) -> List[Dict[str, Any]]:
             return []
         
         # Deserialize messages
-        messages = []
-        for raw_msg in raw_messages:
-            try:
-                msg = json.loads(raw_msg)
-                messages.append(msg)
-            except json.JSONDecodeError as e:
-                logger.warning(f"REDIS_OUTBOX|peek_invalid_json|conv={conv_id}|error={e}")
-                continue
+        messages = _deserialize(conv_id, raw_messages, "peek")
         
         logger.debug(f"REDIS_OUTBOX|peek_success|conv={conv_id}|count={len(messages)}")
         return messages
@@ -158,14 +178,7 @@ def outbox_pop_all(conv_id: str) -> List[Dict[str, Any]]:
             return []
         
         # Deserialize messages
-        messages = []
-        for raw_msg in raw_messages:
-            try:
-                msg = json.loads(raw_msg)
-                messages.append(msg)
-            except json.JSONDecodeError as e:
-                logger.warning(f"REDIS_OUTBOX|pop_invalid_json|conv={conv_id}|error={e}")
-                continue
+        messages = _deserialize(conv_id, raw_messages, "pop")
         
         logger.info(f"REDIS_OUTBOX|pop_success|conv={conv_id}|count={len(messages)}")
         return messages
@@ -194,7 +207,7 @@ def is_recent_duplicate(message_id: str) -> bool:
         return False  # Without Redis, can't dedupe - allow processing
     
     try:
-        key = f"dedupe:{message_id}"
+        key = _dedupe_key(message_id)
         
         # SETNX with TTL: set only if not exists
         was_set = redis.set(key, "1", nx=True, ex=DEDUPE_TTL_SEC)
@@ -213,6 +226,35 @@ def is_recent_duplicate(message_id: str) -> bool:
         return False  # On error, allow processing to be safe
 
 
+async def async_outbox_pop_all(conv_id: str) -> List[Dict[str, Any]]:
+    """Async variant of outbox_pop_all() using the shared redis.asyncio pool"""
+    redis = _get_async_redis_client()
+    if not redis:
+        logger.debug(f"REDIS_OUTBOX|pop_no_redis|conv={conv_id}")
+        return []
+
+    try:
+        key = _outbox_key(conv_id)
+
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.lrange(key, 0, -1)
+            pipe.delete(key)
+            results = await pipe.execute()
+
+        raw_messages = results[0] if results else []
+        if not raw_messages:
+            logger.debug(f"REDIS_OUTBOX|pop_empty|conv={conv_id}")
+            return []
+
+        messages = _deserialize(conv_id, raw_messages, "pop")
+        logger.info(f"REDIS_OUTBOX|pop_success|conv={conv_id}|count={len(messages)}")
+        return messages
+
+    except Exception as e:
+        logger.error(f"REDIS_OUTBOX|pop_failed|conv={conv_id}|error={e}")
+        return []
+
+
 def get_outbox_stats(conv_id: str) -> Dict[str, Any]:
     """
     Get outbox statistics for debugging
@@ -5,7 +5,7 @@ Prevents total system failure when PostgreSQL, Redis, or Qdrant are down
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Awaitable, Callable, Dict, Any, Optional, List
 from datetime import datetime, timezone
 import json
 import os
@@ -184,6 +184,27 @@ class LocalVectorStore:
         self.data_dir.mkdir(parents=True, exist_ok=True)
         self.knowledge_file = self.data_dir / "knowledge_base.json"
         self.knowledge_base = self._load_knowledge_base()
+        
+        # Semantic search over the same embeddings as Qdrant (set by VectorStore)
+        self.embed_texts: Optional[Callable[[List[str]], Awaitable[List[Any]]]] = None
+        self._index = None
+    
+    def set_embedder(self, embed_texts: Callable[[List[str]], Awaitable[List[Any]]]):
+        """Enable semantic search using the given batch embedding function"""
+        self.embed_texts = embed_texts
+        self._index = None
+    
+    async def _ensure_index(self):
+        """Similarity index over knowledge base entries (built once per knowledge base)"""
+        if self._index is None and self.embed_texts is not None and self.knowledge_base:
+            from ..services.similarity_index import SimilarityIndex
+            
+            embeddings = await self.embed_texts([entry["text"] for entry in self.knowledge_base])
+            index = SimilarityIndex(len(embeddings[0]), initial_capacity=len(embeddings))
+            index.add(list(range(len(embeddings))), embeddings)
+            self._index = index
+            logger.info(f"Built local similarity index over {len(index)} entries")
+        return self._index
     
     def _load_knowledge_base(self) -> List[Dict[str, Any]]:
         """Load local knowledge base"""
@@ -234,7 +255,31 @@ class LocalVectorStore:
             }
         ]
     
-    async def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    async def search(
+        self, query: str, limit: int = 5, query_embedding: Optional[Any] = None
+    ) -> List[Dict[str, Any]]:
+        """Semantic search when a query embedding is available, word overlap otherwise"""
+        if query_embedding is not None:
+            try:
+                index = await self._ensure_index()
+            except Exception as e:
+                logger.warning(f"Local similarity index unavailable, using word overlap: {e}")
+                index = None
+            
+            if index is not None and index.dimension == len(query_embedding):
+                return [
+                    {
+                        **self.knowledge_base[row],
+                        "score": score,
+                        "is_fallback": True,
+                        "fallback_reason": "Qdrant unavailable"
+                    }
+                    for row, score in index.search(query_embedding, top_k=limit, min_score=0.0)
+                ]
+        
+        return self._keyword_search(query, limit)
+    
+    def _keyword_search(self, query: str, limit: int) -> List[Dict[str, Any]]:
         """Simple text search in local knowledge base"""
         query_lower = query.lower()
         results = []
@@ -266,6 +311,7 @@ class LocalVectorStore:
         try:
             with open(self.knowledge_file, 'w', encoding='utf-8') as f:
                 json.dump(self.knowledge_base, f, ensure_ascii=False, indent=2)
+            self._index = None
             logger.info(f"Saved {len(self.knowledge_base)} entries to local knowledge base")
         except Exception as e:
             logger.error(f"Error saving knowledge base: {e}")
@@ -415,7 +415,7 @@ async def delivery_node(state: dict, *, max_batch: int = 10) -> dict:
     # REDIS OUTBOX: If outbox is empty, try Redis → state → fallback hierarchy
     if delivery_outbox_count_before == 0:
         logger.info("DELIVERY|attempting_outbox_rehydrate_from_redis")
-        delivery_outbox_count_before = _rehydrate_outbox_from_redis(state)
+        delivery_outbox_count_before = await _rehydrate_outbox_from_redis(state)
         logger.info(f"DELIVERY|post_redis_rehydrate_count: {delivery_outbox_count_before}")
     
     if delivery_outbox_count_before > 0:
@@ -595,7 +595,7 @@ async def delivery_node(state: dict, *, max_batch: int = 10) -> dict:
 # This file is now IO-ONLY as per V2 architecture
 
 
-def _rehydrate_outbox_from_redis(state: dict) -> int:
+async def _rehydrate_outbox_from_redis(state: dict) -> int:
     """
     Rehydrate outbox with Redis → state → fallback hierarchy
     
@@ -610,7 +610,7 @@ def _rehydrate_outbox_from_redis(state: dict) -> int:
     Returns:
         int: Number of messages loaded
     """
-    from ..outbox_repo_redis import outbox_pop_all
+    from ..outbox_repo_redis import async_outbox_pop_all
     
     # Get conversation ID
     conversation_id = state.get("session_id") or state.get("conversation_id")
@@ -620,7 +620,7 @@ def _rehydrate_outbox_from_redis(state: dict) -> int:
     
     # ❶ First try: Redis (primary source from Planner)
     try:
-        redis_messages = outbox_pop_all(conversation_id)
+        redis_messages = await async_outbox_pop_all(conversation_id)
         
         if redis_messages:
             # Success! Load from Redis
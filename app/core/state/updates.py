@@ -0,0 +1,66 @@
+"""
+Copy-on-write state updates for LangGraph nodes
+
+Nodes return partial update dicts (the LangGraph reducer idiom) instead of
+deep-copying and returning the whole state. The graph uses a single root
+channel whose input replaces the checkpoint every turn, so the reducer is
+applied by `as_graph_node` when the node is registered: the result is a new
+top-level dict that shares every untouched value with the previous state.
+"""
+
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Mapping
+
+StateDict = Dict[str, Any]
+NodeFn = Callable[[StateDict], Awaitable[StateDict]]
+
+
+def merge_update(state: Mapping[str, Any], update: Mapping[str, Any]) -> StateDict:
+    """
+    Apply a partial update without mutating the original state
+
+    Args:
+        state: Current state (left untouched)
+        update: Keys to replace
+
+    Returns:
+        New state dict sharing unchanged values with `state`
+    """
+    if not update:
+        return dict(state)
+    return {**state, **update}
+
+
+def with_collected(state: Mapping[str, Any], **fields: Any) -> Dict[str, Any]:
+    """
+    Copy-on-write update of the nested `collected_data` dict
+
+    Args:
+        state: Current state (its collected_data is left untouched)
+        **fields: collected_data keys to set
+
+    Returns:
+        New collected_data dict, or the existing one if nothing changed
+    """
+    collected = state.get("collected_data") or {}
+    if all(key in collected and collected[key] == value for key, value in fields.items()):
+        return collected
+    return {**collected, **fields}
+
+
+def as_graph_node(node: NodeFn) -> NodeFn:
+    """
+    Adapt a node returning a partial update into a full-state graph node
+
+    Args:
+        node: Async node returning only the keys it changed
+
+    Returns:
+        Async node returning `merge_update(state, node(state))`
+    """
+
+    @wraps(node)
+    async def graph_node(state: StateDict) -> StateDict:
+        return merge_update(state, await node(state))
+
+    return graph_node
@@ -19,6 +19,10 @@ except ImportError:
 # In-memory fallback for testing
 _memory_store: Dict[str, str] = {}
 
+# Archive of history entries evicted from the checkpoint window
+ARCHIVE_MAX_ENTRIES = 1000
+ARCHIVE_TTL_SEC = 30 * 86400
+
 
 # REMOVIDO: get_conversation_state e save_conversation_state
 #
@@ -148,3 +152,43 @@ def save_message_to_history(phone: str, role: str, content: str) -> bool:
     except Exception as e:
         print(f"HISTORY|error_saving|phone={phone}|error={str(e)}")
         return False
+
+
+def archive_history_entries(phone: str, entries: list) -> int:
+    """
+    Archive history entries evicted from the checkpoint window.
+
+    Entries go to a capped Redis list (outside the LangGraph checkpoint),
+    so the per-turn checkpoint stays bounded.
+
+    Args:
+        phone: Phone number
+        entries: History entries (role/content dicts) in chronological order
+
+    Returns:
+        Number of archived entries
+    """
+    if not phone or not entries:
+        return 0
+
+    archive_key = f"conversation_archive:{phone.lstrip('+')}"
+    serialized = [json.dumps(entry, ensure_ascii=False) for entry in entries]
+
+    try:
+        if REDIS_AVAILABLE:
+            pipe = redis_client.pipeline()
+            pipe.rpush(archive_key, *serialized)
+            pipe.ltrim(archive_key, -ARCHIVE_MAX_ENTRIES, -1)
+            pipe.expire(archive_key, ARCHIVE_TTL_SEC)
+            pipe.execute()
+        else:
+            archived = json.loads(_memory_store.get(archive_key, "[]"))
+            archived.extend(entries)
+            _memory_store[archive_key] = json.dumps(archived[-ARCHIVE_MAX_ENTRIES:])
+
+        print(f"HISTORY|archived|phone={phone}|count={len(entries)}")
+        return len(entries)
+
+    except Exception as e:
+        print(f"HISTORY|error_archiving|phone={phone}|error={str(e)}")
+        return 0
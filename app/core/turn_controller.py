@@ -6,6 +6,9 @@ TurnController → Planner → Delivery
 
 Responsabilidades:
 - Agrega mensagens do usuário em janela de debounce (1200ms)
+- Buffer em lista Redis (RPUSH) com flush atômico via script Lua
+- Variantes async (redis.asyncio) para o hot path do webhook
+- DebounceScheduler: flush por timer, sem depender de um novo webhook
 - Usa Redis lock para garantir 1 chamada de Planner por turno
 - Gera turn_id determinístico baseado na primeira mensagem
 - Empacota múltiplas mensagens em 1 texto agregado
@@ -13,16 +16,21 @@ Responsabilidades:
 
 import time
 import json
+import asyncio
 import hashlib
 import logging
 from contextlib import contextmanager
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Awaitable, Set
+
+from redis.exceptions import NoScriptError
 
 logger = logging.getLogger(__name__)
 
 # Configuração de debounce e TTL
 DEBOUNCE_MS = 1200  # janela de empacotamento de mensagens
 TURN_TTL_S = 60     # TTL do lock e buffer
+SWEEP_INTERVAL_MS = 250  # varredura dos deadlines compartilhados entre workers
+DEADLINES_KEY = "turn:deadlines"  # sorted set phone → deadline_ms (timer wheel)
 
 
 def _now_ms() -> int:
@@ -40,6 +48,122 @@ def _lock_key(phone: str) -> str:
     return f"turn:{phone}:lock"
 
 
+def _last_ts_key(phone: str) -> str:
+    """Chave Redis com o timestamp da última mensagem do buffer"""
+    return f"turn:{phone}:last_ts"
+
+
+def _ctx_key(phone: str) -> str:
+    """Chave Redis com o contexto do webhook usado ao disparar o turno"""
+    return f"turn:{phone}:ctx"
+
+
+# Scripts Lua: cada operação de buffer é 1 round trip atômico no Redis
+# KEYS[1]=buffer (lista), KEYS[2]=last_ts; ARGV[1]=msg json, ARGV[2]=ts_ms, ARGV[3]=ttl
+_APPEND_LUA = """
+local size = redis.call('RPUSH', KEYS[1], ARGV[1])
+local last_ts = tonumber(redis.call('GET', KEYS[2]) or '0')
+if tonumber(ARGV[2]) > last_ts then
+    redis.call('SET', KEYS[2], ARGV[2])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return size
+"""
+
+# KEYS[1]=buffer, KEYS[2]=last_ts; ARGV[1]=now_ms, ARGV[2]=debounce_ms
+_FLUSH_LUA = """
+local last_ts = redis.call('GET', KEYS[2])
+if not last_ts then
+    return {'empty'}
+end
+local elapsed = tonumber(ARGV[1]) - tonumber(last_ts)
+if elapsed < tonumber(ARGV[2]) then
+    return {'waiting', tostring(elapsed)}
+end
+local msgs = redis.call('LRANGE', KEYS[1], 0, -1)
+redis.call('DEL', KEYS[1], KEYS[2])
+if #msgs == 0 then
+    return {'empty'}
+end
+return {'ready', msgs}
+"""
+
+# Dedupe + append em um só script (caminho async do webhook)
+# KEYS[1]=dedupe, KEYS[2]=buffer, KEYS[3]=last_ts
+# ARGV[1]=msg json, ARGV[2]=ts_ms, ARGV[3]=ttl, ARGV[4]=dedupe ttl
+_INGEST_LUA = """
+if not redis.call('SET', KEYS[1], '1', 'NX', 'EX', ARGV[4]) then
+    return -1
+end
+local size = redis.call('RPUSH', KEYS[2], ARGV[1])
+local last_ts = tonumber(redis.call('GET', KEYS[3]) or '0')
+if tonumber(ARGV[2]) > last_ts then
+    redis.call('SET', KEYS[3], ARGV[2])
+end
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+redis.call('EXPIRE', KEYS[3], ARGV[3])
+return size
+"""
+
+# Remove o deadline apenas se já venceu (1 worker reivindica o disparo)
+# KEYS[1]=deadlines; ARGV[1]=phone, ARGV[2]=now_ms
+_CLAIM_LUA = """
+local deadline = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not deadline then
+    return -1
+end
+if tonumber(deadline) > tonumber(ARGV[2]) then
+    return deadline
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+return 0
+"""
+
+_SCRIPT_SOURCES = {
+    "append": _APPEND_LUA,
+    "flush": _FLUSH_LUA,
+    "ingest": _INGEST_LUA,
+    "claim": _CLAIM_LUA,
+}
+_scripts: Dict[str, Any] = {}
+_async_scripts: Dict[str, Any] = {}
+
+
+def _script(cache, name: str):
+    """Script registrado (EVALSHA com fallback para EVAL), criado uma única vez"""
+    script = _scripts.get(name)
+    if script is None:
+        script = cache.register_script(_SCRIPT_SOURCES[name])
+        _scripts[name] = script
+    return script
+
+
+def _async_script(cache, name: str):
+    """Versão redis.asyncio de _script()"""
+    script = _async_scripts.get(name)
+    if script is None:
+        script = cache.register_script(_SCRIPT_SOURCES[name])
+        _async_scripts[name] = script
+    return script
+
+
+def _decode(value) -> str:
+    """Normaliza respostas Redis (bytes ou str)"""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _load_messages(raw_messages, phone: str) -> List[Dict[str, Any]]:
+    """Desserializa entradas do buffer, descartando itens corrompidos"""
+    messages = []
+    for raw in raw_messages or []:
+        try:
+            messages.append(json.loads(raw))
+        except (json.JSONDecodeError, TypeError):
+            logger.warning(f"TURN_BUFFER|corrupted_entry|phone={phone[-4:]}|skipping")
+    return messages
+
+
 def make_turn_id(phone: str, first_msg_id: str, first_ts_ms: int) -> str:
     """
     Gera turn_id determinístico baseado na primeira mensagem do turno
@@ -98,7 +222,10 @@ def turn_lock(cache, phone: str):
 def append_user_message(cache, phone: str, msg_id: str, text: str, ts_ms: int) -> None:
     """
     Adiciona mensagem do usuário ao buffer de turno
-    
+
+    Usa RPUSH + last_ts em um único script atômico: custo O(1) por mensagem,
+    sem reserializar o buffer inteiro e sem perder mensagens em rajadas.
+
     Args:
         cache: Cliente Redis/cache
         phone: Número do telefone
@@ -106,82 +233,76 @@ def append_user_message(cache, phone: str, msg_id: str, text: str, ts_ms: int) -
         text: Texto da mensagem
         ts_ms: Timestamp em milissegundos
     """
-    key = _turn_key(phone)
-    
-    # Carrega buffer existente
-    buf_json = cache.get(key) or "[]"
-    try:
-        buf = json.loads(buf_json)
-    except json.JSONDecodeError:
-        logger.warning(f"TURN_BUFFER|corrupted_json|phone={phone[-4:]}|resetting")
-        buf = []
-    
-    # Adiciona nova mensagem
     message = {
         "id": msg_id,
         "text": text,
         "ts": ts_ms
     }
-    buf.append(message)
-    
-    # Salva buffer atualizado
-    cache.setex(key, TURN_TTL_S, json.dumps(buf))
-    
+
+    buffer_size = _script(cache, "append")(
+        keys=[_turn_key(phone), _last_ts_key(phone)],
+        args=[json.dumps(message), ts_ms, TURN_TTL_S],
+        client=cache,
+    )
+
     logger.info(
         f"TURN_BUFFER|appended|phone={phone[-4:]}|msg_id={msg_id}|"
-        f"buffer_size={len(buf)}|text_len={len(text)}"
+        f"buffer_size={buffer_size}|text_len={len(text)}"
     )
 
 
 def flush_turn_if_quiet(cache, phone: str, now_ms: int) -> Optional[Dict[str, Any]]:
     """
     Verifica se o turno está quieto e pode ser processado
-    
+
+    Checagem de debounce e consumo do buffer acontecem no mesmo script,
+    então apenas um chamador recebe as mensagens de um turno.
+
     Args:
-        cache: Cliente Redis/cache  
+        cache: Cliente Redis/cache
         phone: Número do telefone
         now_ms: Timestamp atual em milissegundos
-        
+
     Returns:
         Dict com turn_id, messages e text agregado se pronto para processar,
         None se ainda aguardando mensagens
     """
-    key = _turn_key(phone)
-    
-    # Carrega buffer
-    buf_json = cache.get(key) or "[]"
-    try:
-        buf = json.loads(buf_json)
-    except json.JSONDecodeError:
-        logger.warning(f"TURN_FLUSH|corrupted_json|phone={phone[-4:]}|skipping")
-        return None
-    
-    if not buf:
+    reply = _script(cache, "flush")(
+        keys=[_turn_key(phone), _last_ts_key(phone)],
+        args=[now_ms, DEBOUNCE_MS],
+        client=cache,
+    )
+    return _build_turn_batch(phone, reply)
+
+
+def _build_turn_batch(phone: str, reply) -> Optional[Dict[str, Any]]:
+    """Converte a resposta do script de flush no lote do turno"""
+    status = _decode(reply[0])
+
+    if status == "empty":
         logger.debug(f"TURN_FLUSH|empty_buffer|phone={phone[-4:]}")
         return None
-    
-    # Verifica se última mensagem é recente (dentro da janela de debounce)
-    last_msg_ts = buf[-1]["ts"]
-    time_since_last = now_ms - last_msg_ts
-    
-    if time_since_last < DEBOUNCE_MS:
+
+    if status == "waiting":
         logger.debug(
             f"TURN_FLUSH|waiting|phone={phone[-4:]}|"
-            f"time_since_last={time_since_last}ms|debounce={DEBOUNCE_MS}ms"
+            f"time_since_last={_decode(reply[1])}ms|debounce={DEBOUNCE_MS}ms"
         )
         return None
-    
+
+    buf = _load_messages(reply[1], phone)
+    if not buf:
+        logger.warning(f"TURN_FLUSH|corrupted_buffer|phone={phone[-4:]}|skipping")
+        return None
+
     # Turno está quieto - pode processar
     first_msg = buf[0]
     turn_id = make_turn_id(phone, first_msg["id"], first_msg["ts"])
-    
+
     # Agrega texto de todas as mensagens não-vazias
     texts = [msg["text"].strip() for msg in buf if msg["text"].strip()]
     aggregated_text = "\n".join(texts)
-    
-    # Remove buffer do Redis (turno consumido)
-    cache.delete(key)
-    
+
     result = {
         "turn_id": turn_id,
         "messages": buf,
@@ -191,42 +312,303 @@ def flush_turn_if_quiet(cache, phone: str, now_ms: int) -> Optional[Dict[str, An
         "last_ts": buf[-1]["ts"],
         "span_ms": buf[-1]["ts"] - first_msg["ts"]
     }
-    
+
     logger.info(
         f"TURN_FLUSH|ready|phone={phone[-4:]}|turn_id={turn_id}|"
         f"msg_count={len(buf)}|text_len={len(aggregated_text)}|"
         f"span_ms={result['span_ms']}"
     )
-    
+
     return result
 
 
+async def async_append_user_message(cache, phone: str, msg_id: str, text: str, ts_ms: int) -> int:
+    """
+    Versão async de append_user_message (cliente redis.asyncio)
+
+    Returns:
+        int: Tamanho do buffer após a inserção
+    """
+    message = {"id": msg_id, "text": text, "ts": ts_ms}
+
+    buffer_size = await _async_script(cache, "append")(
+        keys=[_turn_key(phone), _last_ts_key(phone)],
+        args=[json.dumps(message), ts_ms, TURN_TTL_S],
+        client=cache,
+    )
+
+    logger.info(
+        f"TURN_BUFFER|appended|phone={phone[-4:]}|msg_id={msg_id}|"
+        f"buffer_size={buffer_size}|text_len={len(text)}"
+    )
+    return buffer_size
+
+
+async def async_flush_turn_if_quiet(cache, phone: str, now_ms: int) -> Optional[Dict[str, Any]]:
+    """Versão async de flush_turn_if_quiet (cliente redis.asyncio)"""
+    reply = await _async_script(cache, "flush")(
+        keys=[_turn_key(phone), _last_ts_key(phone)],
+        args=[now_ms, DEBOUNCE_MS],
+        client=cache,
+    )
+    return _build_turn_batch(phone, reply)
+
+
+async def async_ingest_user_message(
+    cache, phone: str, msg_id: str, text: str, ts_ms: int, conv_id: str
+) -> Dict[str, Any]:
+    """
+    Dedupe + append no buffer + tentativa de lock em 1 round trip (pipeline)
+
+    Substitui is_recent_duplicate() → append_user_message() → turn_lock()
+    no webhook, que custavam 3+ round trips bloqueantes por mensagem.
+
+    Args:
+        cache: Cliente redis.asyncio
+        phone: Número do telefone
+        msg_id: ID da mensagem (chave de dedupe)
+        text: Texto da mensagem
+        ts_ms: Timestamp em milissegundos
+        conv_id: ID da conversa usado pelo turn_lock
+
+    Returns:
+        Dict com duplicate, buffer_size e lock_acquired
+    """
+    from .outbox_repo_redis import DEDUPE_TTL_SEC, _dedupe_key
+    from .turn_lock import LOCK_TTL_SEC, _lock_key as _conv_lock_key
+
+    script = _async_script(cache, "ingest")
+    message = {"id": msg_id, "text": text, "ts": ts_ms}
+    keys = [_dedupe_key(msg_id), _turn_key(phone), _last_ts_key(phone)]
+    args = [json.dumps(message), ts_ms, TURN_TTL_S, DEDUPE_TTL_SEC]
+    lock_key = _conv_lock_key(conv_id)
+
+    async with cache.pipeline(transaction=False) as pipe:
+        pipe.evalsha(script.sha, len(keys), *keys, *args)
+        pipe.set(lock_key, "1", nx=True, ex=LOCK_TTL_SEC)
+        ingest_reply, lock_reply = await pipe.execute(raise_on_error=False)
+
+    if isinstance(ingest_reply, NoScriptError):
+        # Script cache do Redis foi limpo - carrega e reexecuta só o ingest
+        ingest_reply = await script(keys=keys, args=args, client=cache)
+    for reply in (ingest_reply, lock_reply):
+        if isinstance(reply, Exception):
+            raise reply
+
+    duplicate = int(ingest_reply) == -1
+    lock_acquired = bool(lock_reply)
+
+    if duplicate:
+        logger.info(f"TURN_BUFFER|duplicate|phone={phone[-4:]}|msg_id={msg_id}")
+        if lock_acquired:
+            # Mensagem duplicada não dispara turno - devolve o lock
+            await cache.delete(lock_key)
+            lock_acquired = False
+    else:
+        logger.info(
+            f"TURN_BUFFER|appended|phone={phone[-4:]}|msg_id={msg_id}|"
+            f"buffer_size={ingest_reply}|text_len={len(text)}|lock={lock_acquired}"
+        )
+
+    return {
+        "duplicate": duplicate,
+        "buffer_size": 0 if duplicate else int(ingest_reply),
+        "lock_acquired": lock_acquired,
+    }
+
+
+class DebounceScheduler:
+    """
+    Dispara turnos quietos quando a janela de debounce fecha
+
+    - 1 timer asyncio por telefone, rearmado a cada nova mensagem
+    - Deadlines também ficam no sorted set DEADLINES_KEY: a varredura de
+      qualquer worker dispara turnos cujo timer local se perdeu
+    - Claim do deadline + flush atômico garantem 1 disparo por turno
+
+    Args:
+        on_turn: Coroutine chamada com (phone, turn_batch, context)
+        cache_getter: Retorna o cliente redis.asyncio (padrão: get_async_redis)
+        debounce_ms: Janela de debounce
+        sweep_interval_ms: Intervalo da varredura de deadlines vencidos
+    """
+
+    def __init__(
+        self,
+        on_turn: Callable[[str, Dict[str, Any], Optional[Dict[str, Any]]], Awaitable[Any]],
+        cache_getter: Optional[Callable[[], Any]] = None,
+        debounce_ms: int = DEBOUNCE_MS,
+        sweep_interval_ms: int = SWEEP_INTERVAL_MS,
+    ):
+        self.on_turn = on_turn
+        self.debounce_ms = debounce_ms
+        self.sweep_interval_ms = sweep_interval_ms
+        self._cache_getter = cache_getter
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def _cache(self):
+        if self._cache_getter is None:
+            from .cache_manager import get_async_redis
+            self._cache_getter = get_async_redis
+        return self._cache_getter()
+
+    async def start(self) -> None:
+        """Inicia a varredura periódica dos deadlines compartilhados"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop())
+            logger.info(f"TURN_SCHEDULER|started|sweep={self.sweep_interval_ms}ms")
+
+    async def stop(self) -> None:
+        """Cancela timers e varredura; aguarda disparos em andamento"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+        for handle in self._timers.values():
+            handle.cancel()
+        self._timers.clear()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info("TURN_SCHEDULER|stopped")
+
+    async def schedule(
+        self, phone: str, last_ts_ms: int, context: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """
+        Registra (ou adia) o deadline do turno do telefone
+
+        Args:
+            phone: Número do telefone
+            last_ts_ms: Timestamp da última mensagem bufferizada
+            context: Dados do webhook necessários para processar o turno
+
+        Returns:
+            int: Deadline em ms
+        """
+        deadline = last_ts_ms + self.debounce_ms
+        cache = self._cache()
+
+        async with cache.pipeline(transaction=False) as pipe:
+            pipe.zadd(DEADLINES_KEY, {phone: deadline}, gt=True)
+            if context is not None:
+                pipe.set(_ctx_key(phone), json.dumps(context, default=str), ex=TURN_TTL_S)
+            await pipe.execute()
+
+        self._arm(phone, deadline)
+        logger.debug(f"TURN_SCHEDULER|scheduled|phone={phone[-4:]}|deadline={deadline}")
+        return deadline
+
+    def _arm(self, phone: str, deadline_ms: int) -> None:
+        """(Re)arma o timer local do telefone"""
+        handle = self._timers.pop(phone, None)
+        if handle is not None:
+            handle.cancel()
+        delay_s = max(0, deadline_ms - _now_ms()) / 1000
+        loop = asyncio.get_running_loop()
+        self._timers[phone] = loop.call_later(delay_s, self._spawn, phone)
+
+    def _spawn(self, phone: str) -> None:
+        """Callback do timer: dispara o flush em uma task rastreada"""
+        self._timers.pop(phone, None)
+        task = asyncio.create_task(self._fire(phone))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fire(self, phone: str) -> None:
+        """Reivindica o deadline vencido, drena o buffer e chama on_turn"""
+        try:
+            cache = self._cache()
+            now = _now_ms()
+
+            claim = int(await _async_script(cache, "claim")(
+                keys=[DEADLINES_KEY], args=[phone, now], client=cache
+            ))
+            if claim == -1:
+                # Outro worker já disparou este turno
+                return
+            if claim > 0:
+                # Chegou mensagem nova (talvez em outro worker) - adia
+                self._arm(phone, claim)
+                return
+
+            reply = await _async_script(cache, "flush")(
+                keys=[_turn_key(phone), _last_ts_key(phone)],
+                args=[now, self.debounce_ms],
+                client=cache,
+            )
+            if _decode(reply[0]) == "waiting":
+                # Mensagem chegou entre o claim e o flush - reagenda
+                await self.schedule(phone, now - int(_decode(reply[1])))
+                return
+
+            turn_batch = _build_turn_batch(phone, reply)
+            if not turn_batch:
+                return
+
+            async with cache.pipeline(transaction=False) as pipe:
+                pipe.get(_ctx_key(phone))
+                pipe.delete(_ctx_key(phone))
+                raw_ctx, _ = await pipe.execute()
+            context = json.loads(raw_ctx) if raw_ctx else None
+
+            logger.info(
+                f"TURN_SCHEDULER|fired|phone={phone[-4:]}|turn_id={turn_batch['turn_id']}|"
+                f"delay_ms={now - turn_batch['last_ts']}"
+            )
+            await self.on_turn(phone, turn_batch, context)
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"TURN_SCHEDULER|fire_failed|phone={phone[-4:]}|error={e}", exc_info=True)
+
+    async def sweep(self) -> int:
+        """Dispara deadlines vencidos sem timer local (ex.: worker reiniciado)"""
+        cache = self._cache()
+        due = await cache.zrangebyscore(DEADLINES_KEY, "-inf", _now_ms(), start=0, num=100)
+        fired = 0
+        for raw_phone in due:
+            phone = _decode(raw_phone)
+            if phone in self._timers:
+                continue
+            self._spawn(phone)
+            fired += 1
+        return fired
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"TURN_SCHEDULER|sweep_failed|error={e}")
+            await asyncio.sleep(self.sweep_interval_ms / 1000)
+
+
 def get_turn_status(cache, phone: str) -> Dict[str, Any]:
     """
     Verifica status atual do turno para debugging
-    
+
     Args:
         cache: Cliente Redis/cache
         phone: Número do telefone
-        
+
     Returns:
         Dict com status do lock e buffer
     """
     lock_key = _lock_key(phone)
     buffer_key = _turn_key(phone)
-    
+
     has_lock = bool(cache.get(lock_key))
-    buffer_json = cache.get(buffer_key) or "[]"
-    
-    try:
-        buffer_msgs = json.loads(buffer_json)
-    except json.JSONDecodeError:
-        buffer_msgs = []
-    
+    buffer_msgs = _load_messages(cache.lrange(buffer_key, 0, -1), phone)
+
     return {
         "has_lock": has_lock,
         "buffer_size": len(buffer_msgs),
         "buffer_msgs": buffer_msgs,
         "lock_ttl": cache.ttl(lock_key) if has_lock else 0,
         "buffer_ttl": cache.ttl(buffer_key) if buffer_msgs else 0
-    }
\ No newline at end of file
+    }
@@ -9,10 +9,11 @@ Arquitetura:
 - Lock Redis com TTL automático para safety
 - Context manager para uso fácil
 - Identifica conversas por session_id/phone
+- async_turn_lock para o hot path async (redis.asyncio)
 """
 
 import logging
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -32,6 +33,16 @@ def _get_redis_client():
         return None
 
 
+def _get_async_redis_client():
+    """Get asyncio Redis client - import locally to avoid circular dependencies"""
+    try:
+        from .cache_manager import get_async_redis
+        return get_async_redis()
+    except ImportError:
+        logger.error("TURN_LOCK|async_redis_unavailable|no_turn_protection")
+        return None
+
+
 def _lock_key(conv_id: str) -> str:
     """Generate Redis key for turn lock"""
     return f"{LOCK_PREFIX}:{conv_id}"
@@ -98,6 +109,62 @@ def turn_lock(conv_id: str, ttl_sec: int = LOCK_TTL_SEC):
         yield True
 
 
+@asynccontextmanager
+async def async_turn_lock(
+    conv_id: str,
+    ttl_sec: int = LOCK_TTL_SEC,
+    acquired: Optional[bool] = None,
+):
+    """
+    Async turn lock context manager (redis.asyncio)
+
+    Same semantics as turn_lock(). When the SETNX was already sent in a
+    pipeline (see turn_controller.async_ingest_user_message), pass its
+    result as ``acquired`` to skip the extra round trip.
+
+    Args:
+        conv_id: Conversation/session identifier
+        ttl_sec: TTL in seconds for safety (default: 15s)
+        acquired: Result of a lock attempt already made, if any
+
+    Yields:
+        bool: True if lock acquired, False if already locked
+    """
+    redis = _get_async_redis_client()
+    if not redis:
+        logger.warning(f"TURN_LOCK|no_redis|conv={conv_id}|allowing_processing")
+        yield True
+        return
+
+    key = _lock_key(conv_id)
+
+    if acquired is None:
+        try:
+            acquired = bool(await redis.set(key, "1", nx=True, ex=ttl_sec))
+        except Exception as e:
+            logger.error(f"TURN_LOCK|lock_failed|conv={conv_id}|error={e}")
+            # On error, allow processing to continue
+            yield True
+            return
+
+    if not acquired:
+        logger.info(f"TURN_LOCK|already_locked|conv={conv_id}|skipping_turn")
+        yield False
+        return
+
+    logger.info(f"TURN_LOCK|acquired|conv={conv_id}|ttl={ttl_sec}s")
+
+    try:
+        yield True
+    finally:
+        try:
+            deleted = await redis.delete(key)
+            logger.info(f"TURN_LOCK|released|conv={conv_id}|deleted={deleted}")
+        except Exception as e:
+            logger.warning(f"TURN_LOCK|release_failed|conv={conv_id}|error={e}")
+            # TTL will eventually clean up the lock
+
+
 def is_turn_locked(conv_id: str) -> bool:
     """
     Check if conversation has an active turn lock
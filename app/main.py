@@ -822,6 +822,28 @@ async def startup_event():
         app_logger.error(f"❌ Failed to initialize health monitoring: {e}")
         app_logger.warning("Continuing without health monitoring")
 
+    # Availability warm-up: precomputed slot grid per unit calendar
+    try:
+        from app.services.availability_warmer import availability_warmer
+
+        if availability_warmer.calendar_ids():
+            availability_warmer.start()
+            app_logger.info("✅ Availability warmer started")
+        else:
+            app_logger.info("ℹ️ Availability warmer disabled: no unit calendar configured")
+    except Exception as e:
+        app_logger.error(f"❌ Failed to start availability warmer: {e}")
+
+    # Intent fast path: recalibrate thresholds from persisted shadow samples
+    try:
+        from app.core.langgraph_flow import intent_fast_path
+
+        if intent_fast_path.enabled:
+            intent_fast_path.start()
+            app_logger.info("✅ Intent fast path calibration started")
+    except Exception as e:
+        app_logger.error(f"❌ Failed to start intent fast path calibration: {e}")
+
     # Temporarily disable Performance Integration Services until dependencies are resolved
     # try:
     #     app_logger.info("⚡ Initializing Performance Integration Services (Wave 4.2)...")
@@ -838,6 +860,14 @@ async def startup_event():
 async def shutdown_event():
     app_logger.info("Kumon AI Receptionist API shutting down...")
 
+    # Shared outbound HTTP pool (Evolution API)
+    try:
+        from app.core.http_pool import close_http_clients
+
+        await close_http_clients()
+    except Exception as e:
+        app_logger.error(f"❌ Error closing HTTP pool: {e}")
+
     # Performance optimization system temporarily disabled
     # try:
     #     await performance_optimizer.stop_optimization()
@@ -904,6 +934,34 @@ async def shutdown_event():
     except Exception as e:
         app_logger.error(f"❌ Error during cache system cleanup: {e}")
 
+    # Close Qdrant connection pool (only if the vector store was ever loaded)
+    try:
+        import sys
+
+        vector_store_module = sys.modules.get("app.services.vector_store")
+        if vector_store_module is not None:
+            await vector_store_module.vector_store.close()
+    except Exception as e:
+        app_logger.error(f"❌ Error closing vector store: {e}")
+
+    # Stop availability warm-up
+    try:
+        from app.services.availability_warmer import availability_warmer
+
+        await availability_warmer.stop()
+        app_logger.info("✅ Availability warmer stopped")
+    except Exception as e:
+        app_logger.error(f"❌ Error stopping availability warmer: {e}")
+
+    # Stop intent fast path calibration (flushes pending shadow samples)
+    try:
+        from app.core.langgraph_flow import intent_fast_path
+
+        await intent_fast_path.stop()
+        app_logger.info("✅ Intent fast path calibration stopped")
+    except Exception as e:
+        app_logger.error(f"❌ Error stopping intent fast path calibration: {e}")
+
     # Cleanup Wave 5: Health Monitoring System
     try:
         from app.core.health_monitor import health_monitor
@@ -0,0 +1,331 @@
+"""
+Compiled prompt templates for PromptManager
+
+A template is parsed once into literal chunks, variable slots and
+[[?var: "..."]] / [[var|default]] blocks. Whitespace of the literal chunks
+is collapsed and the content safety check runs at compile time, so a
+render resolves the blocks and joins chunks with variable values in one
+pass. The full safety check only runs again when an inserted value (or an
+unresolved slot) could change its outcome. Template files are cached by
+path and re-read when their mtime changes.
+"""
+from __future__ import annotations
+
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..core.config import settings
+from ..core.logger import app_logger
+from ..core.safety.template_safety_v2 import check_and_sanitize as check_and_sanitize_v2
+from ..core.safety.template_safety_v2 import template_safety_v2
+
+_MUSTACHE_RE = re.compile(r'\{\{([^}]+)\}\}')
+_CONDITIONAL_RE = re.compile(r'\[\[\?([^:]+):\s*"([^"]+)"\]\]')
+_DEFAULT_RE = re.compile(r'\[\[([^|]+)\|([^]]+)\]\]')
+_UNRESOLVED_MUSTACHE_RE = re.compile(r'\{\{[^}]+\}\}')
+_UNSAFE_VALUE_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in template_safety_v2._legacy_config_patterns),
+    re.MULTILINE | re.IGNORECASE,
+)
+_FORMATTER = Formatter()
+
+# (leading whitespace, whitespace-collapsed text, trailing whitespace)
+Piece = Tuple[bool, str, bool]
+
+
+def _piece(text: str) -> Piece:
+    return text[:1].isspace(), " ".join(text.split()), text[-1:].isspace()
+
+
+def _strip_mustache(text: str) -> str:
+    """Drop {{...}} tokens left in rendered text (e.g. brought in by a value)"""
+    if "{{" not in text:
+        return text
+    return " ".join(_UNRESOLVED_MUSTACHE_RE.sub("", text).split())
+
+
+def _join_pieces(pieces: List[Piece]) -> str:
+    """Join pieces as if the result went through re.sub(r'\\s+', ' ').strip()"""
+    out: List[str] = []
+    pending_space = False
+    for lead, core, trail in pieces:
+        if not core:
+            pending_space = pending_space or lead or trail
+            continue
+        if out and (pending_space or lead):
+            out.append(" ")
+        out.append(core)
+        pending_space = trail
+    return "".join(out)
+
+
+@dataclass
+class _Literal:
+    raw: Piece  # as written (unformatted output keeps {{ }} escapes)
+    formatted: Piece  # after str.format unescaping
+
+
+@dataclass
+class _Slot:
+    name: str
+    conversion: Optional[str]
+    spec: str
+    raw: Piece
+
+    def render(self, value: Any) -> str:
+        if self.conversion == "r":
+            value = repr(value)
+        elif self.conversion == "a":
+            value = ascii(value)
+        elif self.conversion == "s":
+            value = str(value)
+        return format(value, self.spec)
+
+
+@dataclass
+class _Conditional:
+    variable: str
+    raw: Piece  # [[?var: "content"]] as kept when no variables are given
+    content: List[Any]
+
+
+@dataclass
+class _Default:
+    variable: str
+    raw: Piece  # [[var|default]] as kept when no variables are given
+    slot: _Slot
+    default: List[Any]
+
+
+def _parse_fields(text: str) -> Tuple[List[Any], bool]:
+    """Literal chunks and slots of str.format text; (nodes, parse failed)"""
+    try:
+        parsed = list(_FORMATTER.parse(text))
+    except ValueError:
+        return [_Literal(_piece(text), _piece(text))], True
+
+    nodes: List[Any] = []
+    for literal, name, spec, conversion in parsed:
+        if literal:
+            raw_literal = literal.replace("{", "{{").replace("}", "}}")
+            nodes.append(_Literal(_piece(raw_literal), _piece(literal)))
+        if name is not None:
+            source = "{" + name + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}"
+            nodes.append(_Slot(name, conversion, spec or "", _piece(source)))
+    return nodes, False
+
+
+def _parse_defaults(text: str) -> Tuple[List[Any], bool]:
+    nodes: List[Any] = []
+    failed = False
+    position = 0
+    for match in _DEFAULT_RE.finditer(text):
+        chunk, chunk_failed = _parse_fields(text[position:match.start()])
+        nodes.extend(chunk)
+        variable, default = match.group(1).strip(), match.group(2).strip()
+        default_nodes, default_failed = _parse_fields(default)
+        slot_source = "{" + variable + "}"
+        nodes.append(_Default(
+            variable=variable,
+            raw=_piece(f"[[{variable}|{default}]]"),
+            slot=_Slot(variable, None, "", _piece(slot_source)),
+            default=default_nodes,
+        ))
+        failed = failed or chunk_failed or default_failed
+        position = match.end()
+    chunk, chunk_failed = _parse_fields(text[position:])
+    nodes.extend(chunk)
+    return nodes, failed or chunk_failed
+
+
+def _parse(text: str) -> Tuple[List[Any], bool]:
+    nodes: List[Any] = []
+    failed = False
+    position = 0
+    for match in _CONDITIONAL_RE.finditer(text):
+        chunk, chunk_failed = _parse_defaults(text[position:match.start()])
+        nodes.extend(chunk)
+        variable, content = match.group(1).strip(), match.group(2)
+        content_nodes, content_failed = _parse_defaults(content)
+        nodes.append(_Conditional(variable, _piece(f'[[?{variable}: "{content}"]]'), content_nodes))
+        failed = failed or chunk_failed or content_failed
+        position = match.end()
+    chunk, chunk_failed = _parse_defaults(text[position:])
+    nodes.extend(chunk)
+    return nodes, failed or chunk_failed
+
+
+@dataclass
+class CompiledPrompt:
+    """
+    Prompt template parsed into renderable nodes
+
+    Features:
+    - Mustache {{var}} converted to {var} slots once
+    - [[?var: "..."]] and [[var|default]] blocks resolved per render
+    - Whitespace-collapsed literal chunks (render output is a single join)
+    - Safety verdict of the template text computed at compile time
+    """
+    name: str
+    context: str
+    nodes: List[Any]
+    format_error: bool
+    has_blocks: bool
+    unrendered: str  # output when no variables are given (safety-checked unless has_blocks)
+    blocked_text: Optional[str] = None  # safety fallback when the template itself is unsafe
+    renders: int = field(default=0, compare=False)
+
+    @classmethod
+    def compile(cls, template: str, name: str, context: str = "general") -> "CompiledPrompt":
+        nodes, format_error = _parse(_MUSTACHE_RE.sub(r'{\1}', template))
+        compiled = cls(
+            name=name,
+            context=context,
+            nodes=nodes,
+            format_error=format_error,
+            has_blocks=any(isinstance(node, (_Conditional, _Default)) for node in nodes),
+            unrendered="",
+        )
+        compiled.unrendered = _strip_mustache(_join_pieces([node.raw for node in nodes]))
+
+        # Blocks change the text per render, so only block-free templates get a final verdict
+        if not compiled.has_blocks:
+            safety = check_and_sanitize_v2(compiled.unrendered, template_key=name, context=context)
+            compiled.unrendered = safety["text"]
+            if not safety["safe"]:
+                compiled.blocked_text = safety["text"]
+        return compiled
+
+    def _resolve(self, nodes: List[Any], variables: Dict[str, Any], out: List[Any]):
+        for node in nodes:
+            if isinstance(node, _Conditional):
+                if node.variable in variables:
+                    self._resolve(node.content, variables, out)
+            elif isinstance(node, _Default):
+                if node.variable in variables:
+                    out.append(node.slot)
+                else:
+                    out.extend(node.default)
+            else:
+                out.append(node)
+
+    def render(self, variables: Optional[Dict[str, Any]] = None) -> str:
+        """Rendered, safety-checked prompt text"""
+        self.renders += 1
+        if self.blocked_text is not None:
+            return self.blocked_text
+        if not variables:
+            return self._checked(self.unrendered, needs_check=self.has_blocks)
+
+        items: List[Any] = []
+        self._resolve(self.nodes, variables, items)
+
+        pieces: List[Piece] = []
+        values: List[str] = []
+        try:
+            if self.format_error:
+                raise ValueError("template is not valid str.format syntax")
+            for item in items:
+                if isinstance(item, _Slot):
+                    value = item.render(variables[item.name])
+                    values.append(value)
+                    pieces.append(_piece(value))
+                else:
+                    pieces.append(item.formatted)
+        except Exception:
+            # Same as a failed str.format: the template text is kept as is
+            text = _join_pieces([item.raw for item in items])
+            return self._checked(text, needs_check=True)
+        text = _join_pieces(pieces)
+
+        inserted = "\n".join(values)
+        needs_check = self.has_blocks or "{" in inserted or bool(_UNSAFE_VALUE_RE.search(inserted))
+        return self._checked(text, needs_check=needs_check)
+
+    def _checked(self, text: str, needs_check: bool) -> str:
+        text = _strip_mustache(text)
+        if not needs_check:
+            return text
+        return check_and_sanitize_v2(text, template_key=self.name, context=self.context)["text"]
+
+
+class CompiledTemplateCache:
+    """
+    Template files and compiled prompts, reloaded on file change
+
+    Features:
+    - File text cached by path; re-read only when mtime/size change
+    - Compiled prompts cached by (template text, safety context) with LRU cap
+    """
+
+    def __init__(self, max_compiled: Optional[int] = None):
+        self.max_compiled = (
+            getattr(settings, 'PROMPT_COMPILED_CACHE_SIZE', 512)
+            if max_compiled is None else max_compiled
+        )
+        self._files: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._compiled: "OrderedDict[Tuple[str, str], CompiledPrompt]" = OrderedDict()
+
+        # Metrics
+        self.file_reads = 0
+        self.file_hits = 0
+        self.compilations = 0
+        self.compiled_hits = 0
+
+    def read(self, path: Union[str, os.PathLike]) -> Optional[str]:
+        """Stripped file content, or None when the file does not exist"""
+        key = os.fspath(path)
+        try:
+            stat = os.stat(key)
+        except OSError:
+            self._files.pop(key, None)
+            return None
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(key)
+        if cached is not None and cached[0] == version:
+            self.file_hits += 1
+            return cached[1]
+
+        with open(key, "r", encoding="utf-8") as f:
+            content = f.read().strip()
+        if cached is not None:
+            app_logger.info(f"Template changed on disk, reloading: {key}")
+        self._files[key] = (version, content)
+        self.file_reads += 1
+        return content
+
+    def compile(self, template: str, name: str, context: str = "general") -> CompiledPrompt:
+        """Compiled prompt for a template text (compiled once per text and context)"""
+        key = (template, context)
+        compiled = self._compiled.get(key)
+        if compiled is not None:
+            self._compiled.move_to_end(key)
+            self.compiled_hits += 1
+            return compiled
+
+        compiled = CompiledPrompt.compile(template, name, context)
+        self._compiled[key] = compiled
+        self.compilations += 1
+        if len(self._compiled) > self.max_compiled:
+            self._compiled.popitem(last=False)
+        return compiled
+
+    def clear(self):
+        self._files.clear()
+        self._compiled.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cache sizes and hit counters"""
+        return {
+            "files": len(self._files),
+            "compiled": len(self._compiled),
+            "file_reads": self.file_reads,
+            "file_hits": self.file_hits,
+            "compilations": self.compilations,
+            "compiled_hits": self.compiled_hits,
+        }
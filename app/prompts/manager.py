@@ -18,14 +18,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
-import aiofiles
-
-# LangSmith removed - using local templates only
-from langchain.prompts import PromptTemplate
-
 from ..core.config import settings
 from ..core.logger import app_logger
-from ..core.safety.template_safety_v2 import check_and_sanitize as check_and_sanitize_v2
+from .compiled_templates import CompiledTemplateCache
 from .template_variables import template_variable_resolver
 
 
@@ -35,6 +30,7 @@ class PromptManager:
     def __init__(self):
         # Lazy initialization - defer I/O until needed
         self.cache = {}
+        self.template_cache = CompiledTemplateCache()  # Parsed templates, reloaded on mtime change
         self.fallback_dir: Optional[Path] = None
         self._initialized = False
     
@@ -95,12 +91,10 @@ class PromptManager:
             app_logger.error(f"🚨 All template sources failed for {name}, using BASE CECÍLIA")
             prompt_template = await self._get_base_cecilia_template()
 
-        # NEW PIPELINE ORDER: preprocess → resolve vars → strip {{...}} → safety check → render final
+        # Parsed once per template text: literal chunks, slots, blocks and safety verdict
+        compiled = self.template_cache.compile(prompt_template, name, self._get_context_from_name(name))
         
-        # Step 1: Pre-process template first to handle conditional blocks and defaults
-        preprocessed_template = self._preprocess_template(prompt_template, {})
-        
-        # Step 2: Get intelligent variables based on conversation state and stage
+        # Get intelligent variables based on conversation state and stage
         resolved_variables = {}
         if variables or conversation_state:
             try:
@@ -112,173 +106,9 @@ class PromptManager:
                 app_logger.error(f"Failed to resolve template variables: {e}")
                 resolved_variables = variables or {}
         
-        # Step 3: Apply variables if available
-        formatted_template = preprocessed_template
-        if resolved_variables:
-            try:
-                # First resolve remaining conditional blocks and defaults with actual variables
-                template_with_conditionals = self._resolve_conditional_blocks(preprocessed_template, resolved_variables)
-                # Then apply variables with graceful fallback
-                formatted_template = self._apply_variables_safely(template_with_conditionals, resolved_variables, name)
-            except Exception as e:
-                app_logger.error(f"Failed to apply variables to template {name}: {e}")
-                # Continue with preprocessed template
-        
-        # Step 4: Strip any remaining {{...}} mustache tokens that weren't resolved
-        clean_template = self._strip_remaining_mustache_tokens(formatted_template)
-        
-        # Step 5: CRITICAL - Apply safety check using V2 fail-soft system with front-matter priority
-        safety_result = check_and_sanitize_v2(clean_template, template_key=name, context=self._get_context_from_name(name))
-        
-        # Step 6: Return final rendered template (always safe due to fail-soft)
-        return safety_result["text"]
+        # Resolve blocks and join chunks with variable values (always safe due to fail-soft)
+        return compiled.render(resolved_variables)
 
-    def _preprocess_template(self, template: str, available_variables: Dict[str, Any]) -> str:
-        """
-        Pre-process template to handle conditional blocks and defaults
-        
-        Since this is called first in the pipeline (before variable resolution),
-        we only handle structural template elements, not variable substitution:
-        - [[?var: "text with {var}"]] -> removed if var not available
-        - [[var|default]] -> replaced with default if var not available
-        - Preserve {var} tokens for later variable resolution
-        - Convert {{var}} mustache tokens to {var} for LangChain compatibility
-        """
-        import re
-        
-        # Convert {{variable}} mustache tokens to {variable} for LangChain compatibility
-        # This preserves variables for the later resolution step
-        mustache_pattern = r'\{\{([^}]+)\}\}'
-        template = re.sub(mustache_pattern, r'{\1}', template)
-        app_logger.debug("Converted mustache {{var}} tokens to {var} format")
-        
-        # Handle conditional blocks: [[?var: "content"]]
-        pattern_conditional = r'\[\[\?([^:]+):\s*"([^"]+)"\]\]'
-        def replace_conditional(match):
-            var_name = match.group(1).strip()
-            content = match.group(2)
-            # Since we don't have variables yet, preserve for now
-            # This will be handled by variable resolution step
-            if available_variables and var_name in available_variables:
-                return content
-            elif not available_variables:  # First pass, preserve structure
-                return f"[[?{var_name}: \"{content}\"]]"
-            return ""  # Remove block if variable confirmed not available
-        
-        template = re.sub(pattern_conditional, replace_conditional, template)
-        
-        # Handle default values: [[var|default]]
-        pattern_default = r'\[\[([^|]+)\|([^]]+)\]\]'
-        def replace_default(match):
-            var_name = match.group(1).strip()
-            default = match.group(2).strip()
-            # Since we don't have variables yet, preserve for later resolution
-            if available_variables and var_name in available_variables:
-                return "{" + var_name + "}"
-            elif not available_variables:  # First pass, preserve structure  
-                return f"[[{var_name}|{default}]]"
-            return default
-        
-        template = re.sub(pattern_default, replace_default, template)
-        
-        return template
-    
-    def _resolve_conditional_blocks(self, template: str, variables: Dict[str, Any]) -> str:
-        """
-        Resolve conditional blocks and defaults with actual variable values
-        
-        Handles:
-        - [[?var: "content"]] -> content if var exists, empty if not
-        - [[var|default]] -> {var} if var exists, default if not
-        """
-        import re
-        
-        # Handle conditional blocks: [[?var: "content"]]
-        pattern_conditional = r'\[\[\?([^:]+):\s*"([^"]+)"\]\]'
-        def replace_conditional(match):
-            var_name = match.group(1).strip()
-            content = match.group(2)
-            if var_name in variables:
-                app_logger.debug(f"Including conditional block for variable: {var_name}")
-                return content
-            else:
-                app_logger.debug(f"Excluding conditional block for missing variable: {var_name}")
-                return ""
-        
-        template = re.sub(pattern_conditional, replace_conditional, template)
-        
-        # Handle default values: [[var|default]]
-        pattern_default = r'\[\[([^|]+)\|([^]]+)\]\]'
-        def replace_default(match):
-            var_name = match.group(1).strip()
-            default = match.group(2).strip()
-            if var_name in variables:
-                app_logger.debug(f"Using variable {var_name} instead of default")
-                return "{" + var_name + "}"
-            else:
-                app_logger.debug(f"Using default value for missing variable {var_name}: {default}")
-                return default
-        
-        template = re.sub(pattern_default, replace_default, template)
-        
-        return template
-    
-    def _apply_variables_safely(self, template: str, variables: Dict[str, Any], template_name: str) -> str:
-        """
-        Apply variables to template with graceful error handling
-        
-        Uses LangChain PromptTemplate for safe variable substitution with fallback
-        """
-        try:
-            # Use LangChain PromptTemplate for safe variable substitution
-            langchain_template = PromptTemplate.from_template(template)
-            # Only pass variables that exist in the template
-            template_vars = langchain_template.input_variables
-            filtered_vars = {k: v for k, v in variables.items() if k in template_vars}
-            
-            formatted_result = langchain_template.format(**filtered_vars)
-            app_logger.info(f"Applied {len(filtered_vars)} variables to template: {template_name}")
-            return formatted_result
-            
-        except KeyError as ke:
-            app_logger.warning(f"Missing variable in template {template_name}: {ke}")
-            # Return template with missing variables left as placeholders
-            return template
-        except Exception as e:
-            app_logger.error(f"LangChain formatting failed for {template_name}: {e}")
-            # Fallback to simple string formatting
-            try:
-                return template.format(**variables)
-            except Exception as e2:
-                app_logger.error(f"Fallback formatting also failed for {template_name}: {e2}")
-                return template
-    
-    def _strip_remaining_mustache_tokens(self, template: str) -> str:
-        """
-        Strip any remaining {{...}} mustache tokens that weren't resolved
-        
-        This prevents configuration templates from reaching users by removing
-        any unresolved template variables before safety checks
-        """
-        import re
-        
-        # Pattern to match {{variable}} or {{variable.nested}}
-        mustache_pattern = r'\{\{[^}]+\}\}'
-        
-        # Find all matches for logging
-        matches = re.findall(mustache_pattern, template)
-        if matches:
-            app_logger.info(f"Stripping {len(matches)} remaining mustache tokens: {matches}")
-        
-        # Remove all mustache tokens
-        clean_template = re.sub(mustache_pattern, '', template)
-        
-        # Clean up any double spaces or extra whitespace left behind
-        clean_template = re.sub(r'\s+', ' ', clean_template)
-        clean_template = clean_template.strip()
-        
-        return clean_template
-    
     def _get_context_from_name(self, template_name: str) -> str:
         """Extract context from template name for safety filtering"""
         if "greeting" in template_name.lower():
@@ -355,27 +185,24 @@ class PromptManager:
                 
                 # Try with selected variant first
                 filepath = self.fallback_dir / namespace / stage / f"{kind}_{name_part}_{variant}.txt"
-                if filepath.exists():
-                    async with aiofiles.open(filepath, "r", encoding="utf-8") as f:
-                        content = await f.read()
-                        app_logger.info(f"✅ Using template with variant: {filepath}")
-                        return content.strip()
+                content = self.template_cache.read(filepath)
+                if content is not None:
+                    app_logger.info(f"✅ Using template with variant: {filepath}")
+                    return content
                 
                 # Fallback to neutral variant
                 filepath = self.fallback_dir / namespace / stage / f"{kind}_{name_part}_neutral.txt"
-                if filepath.exists():
-                    async with aiofiles.open(filepath, "r", encoding="utf-8") as f:
-                        content = await f.read()
-                        app_logger.info(f"✅ Using neutral template: {filepath}")
-                        return content.strip()
+                content = self.template_cache.read(filepath)
+                if content is not None:
+                    app_logger.info(f"✅ Using neutral template: {filepath}")
+                    return content
                 
                 # Try without variant
                 filepath = self.fallback_dir / namespace / stage / f"{kind}_{name_part}.txt"
-                if filepath.exists():
-                    async with aiofiles.open(filepath, "r", encoding="utf-8") as f:
-                        content = await f.read()
-                        app_logger.info(f"✅ Using template without variant: {filepath}")
-                        return content.strip()
+                content = self.template_cache.read(filepath)
+                if content is not None:
+                    app_logger.info(f"✅ Using template without variant: {filepath}")
+                    return content
 
             # Special mapping for legacy system templates and fallbacks
             legacy_mappings = {
@@ -388,11 +215,10 @@ class PromptManager:
 
             if name in legacy_mappings:
                 filepath = self.fallback_dir / legacy_mappings[name]
-                if filepath.exists():
-                    async with aiofiles.open(filepath, "r", encoding="utf-8") as f:
-                        content = await f.read()
-                        app_logger.info(f"✅ Using mapped legacy template: {filepath}")
-                        return content.strip()
+                content = self.template_cache.read(filepath)
+                if content is not None:
+                    app_logger.info(f"✅ Using mapped legacy template: {filepath}")
+                    return content
 
             # Fallback to old structure for backward compatibility
             if len(parts) >= 3:
@@ -403,11 +229,10 @@ class PromptManager:
                 # Legacy fallback naming
                 filepath = self.fallback_dir / f"{name.replace(':', '_')}.txt"
 
-            if filepath.exists():
-                async with aiofiles.open(filepath, "r", encoding="utf-8") as f:
-                    content = await f.read()
-                    app_logger.info(f"📁 Using legacy template: {filepath}")
-                    return content.strip()
+            content = self.template_cache.read(filepath)
+            if content is not None:
+                app_logger.info(f"📁 Using legacy template: {filepath}")
+                return content
             else:
                 app_logger.warning(f"❌ Template not found: {name} - Tried: {filepath}")
                 return None
@@ -529,11 +354,10 @@ class PromptManager:
             # Load the selected template
             filepath = self.fallback_dir / template_file
 
-            if filepath.exists():
-                async with aiofiles.open(filepath, "r", encoding="utf-8") as f:
-                    content = await f.read()
-                    app_logger.info(f"Using CECÍLIA template: {template_file}")
-                    return content.strip()
+            content = self.template_cache.read(filepath)
+            if content is not None:
+                app_logger.info(f"Using CECÍLIA template: {template_file}")
+                return content
             else:
                 app_logger.warning(f"Template file not found: {filepath}, using base template")
                 return await self._get_base_cecilia_template()
@@ -547,11 +371,10 @@ class PromptManager:
         try:
             # Try new unified structure first
             base_file = self.fallback_dir / "system" / "base" / "identity.txt"
-            if base_file.exists():
-                async with aiofiles.open(base_file, "r", encoding="utf-8") as f:
-                    content = await f.read()
-                    app_logger.info("Using BASE CECÍLIA template")
-                    return content.strip()
+            content = self.template_cache.read(base_file)
+            if content is not None:
+                app_logger.info("Using BASE CECÍLIA template")
+                return content
         except Exception as e:
             app_logger.error(f"Failed to read base Cecília template: {e}")
 
@@ -598,6 +421,7 @@ IMPORTANTE:
             "local_templates_only": True,
             "total_templates": template_count,
             "template_directory": str(self.fallback_dir),
+            "template_cache": self.template_cache.get_stats(),
         }
 
 
@@ -0,0 +1,175 @@
+"""
+Behavior profile feature matrix for botnet-style similarity checks
+
+Each tracked source is one row of a float64 matrix: average message
+length, topic diversity, message count and the normalized 24-bucket hourly
+activity histogram. A profile update rewrites its own row, and comparing a
+source with every other profile is a handful of vectorized numpy
+operations instead of a Python loop per profile. The number of rows is
+capped (least recently active first, plus a TTL), so the per-message cost
+is bounded no matter how many sources have ever been seen.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from ..core.config import settings
+
+HOURS = 24
+_LENGTH, _DIVERSITY, _COUNT, _HISTOGRAM = 0, 1, 2, 3
+FEATURES = _HISTOGRAM + HOURS
+
+
+class BehaviorProfileIndex:
+    """
+    Compact, capped matrix of behavior features with vectorized similarity
+
+    Features:
+    - One row per source, rewritten in place on every profile update
+    - Similarity of one source against all rows in a single vectorized pass
+    - LRU cap and TTL on tracked sources; removal swaps the last row in
+    """
+
+    def __init__(
+        self,
+        max_sources: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        initial_capacity: int = 256,
+    ):
+        self.max_sources = (
+            getattr(settings, 'THREAT_PROFILE_MAX_SOURCES', 10000)
+            if max_sources is None else max_sources
+        )
+        self.ttl_seconds = (
+            getattr(settings, 'THREAT_PROFILE_TTL_SECONDS', 86400)
+            if ttl_seconds is None else ttl_seconds
+        )
+        self._matrix = np.zeros((max(1, initial_capacity), FEATURES), dtype=np.float64)
+        self._ids: List[Hashable] = []
+        self._rows: Dict[Hashable, int] = {}
+        self._last_seen: "OrderedDict[Hashable, float]" = OrderedDict()
+
+        # Metrics
+        self.comparisons = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, source_id: Hashable) -> bool:
+        return source_id in self._rows
+
+    def _reserve(self, rows: int):
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        grown = np.zeros((capacity, FEATURES), dtype=np.float64)
+        grown[: len(self._ids)] = self._matrix[: len(self._ids)]
+        self._matrix = grown
+
+    def update(self, profile: Any, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Write the row of a BehaviorProfile and mark it most recently active
+
+        Returns:
+            Source ids evicted by the TTL or the size cap
+        """
+        now = time.time() if now is None else now
+        source_id = profile.source_id
+        row = self._rows.get(source_id)
+        if row is None:
+            self._reserve(len(self._ids) + 1)
+            row = len(self._ids)
+            self._ids.append(source_id)
+            self._rows[source_id] = row
+
+        values = self._matrix[row]
+        values[_LENGTH] = profile.avg_message_length
+        values[_DIVERSITY] = profile.topic_diversity
+        values[_COUNT] = profile.message_count
+        activity = np.asarray(profile.activity_pattern, dtype=np.float64)
+        total = activity.sum()
+        values[_HISTOGRAM:] = activity / total if total > 0 else 0.0
+
+        self._last_seen[source_id] = now
+        self._last_seen.move_to_end(source_id)
+        return self._evict(now, keep=source_id)
+
+    def _evict(self, now: float, keep: Hashable) -> List[Hashable]:
+        evicted = []
+        cutoff = now - self.ttl_seconds
+        for source_id, last_seen in self._last_seen.items():
+            if source_id == keep:
+                break
+            if last_seen > cutoff and len(self._last_seen) - len(evicted) <= self.max_sources:
+                break
+            evicted.append(source_id)
+        for source_id in evicted:
+            self.remove(source_id)
+        self.evictions += len(evicted)
+        return evicted
+
+    def remove(self, source_id: Hashable) -> bool:
+        row = self._rows.pop(source_id, None)
+        if row is None:
+            return False
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._ids.pop()
+        self._last_seen.pop(source_id, None)
+        return True
+
+    def clear(self):
+        self._ids.clear()
+        self._rows.clear()
+        self._last_seen.clear()
+
+    def similarities(self, source_id: Hashable) -> np.ndarray:
+        """
+        Similarity of a source with every row (row order), in [0, 1]
+
+        Mean of length similarity (only when both lengths are positive),
+        topic diversity similarity and activity histogram overlap.
+        """
+        matrix = self._matrix[: len(self._ids)]
+        reference = matrix[self._rows[source_id]]
+
+        lengths = matrix[:, _LENGTH]
+        has_length = (lengths > 0) & (reference[_LENGTH] > 0)
+        longest = np.maximum(lengths, reference[_LENGTH])
+        length_similarity = np.where(
+            has_length, 1.0 - np.abs(lengths - reference[_LENGTH]) / np.where(has_length, longest, 1.0), 0.0
+        )
+        diversity_similarity = 1.0 - np.abs(matrix[:, _DIVERSITY] - reference[_DIVERSITY])
+        pattern_overlap = np.minimum(matrix[:, _HISTOGRAM:], reference[_HISTOGRAM:]).sum(axis=1)
+
+        self.comparisons += len(self._ids)
+        return (length_similarity + diversity_similarity + pattern_overlap) / (2 + has_length)
+
+    def count_similar(self, source_id: Hashable, threshold: float = 0.8, min_messages: int = 5) -> int:
+        """Other sources with more than min_messages and similarity above threshold"""
+        if source_id not in self._rows:
+            return 0
+        similar = (self.similarities(source_id) > threshold) & (
+            self._matrix[: len(self._ids), _COUNT] > min_messages
+        )
+        similar[self._rows[source_id]] = False
+        return int(similar.sum())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Size and activity counters"""
+        return {
+            "sources": len(self._ids),
+            "max_sources": self.max_sources,
+            "ttl_seconds": self.ttl_seconds,
+            "comparisons": self.comparisons,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,254 @@
+"""
+Shared multi-window rate limiting (GCRA) backed by Redis
+
+Every replica evaluates the same per-source state, so limits are not
+multiplied by the number of workers. Each window (burst/minute/hour/day)
+is a single GCRA "theoretical arrival time" key; one Lua script checks all
+windows and advances them only when every window conforms, so a decision
+is one atomic round trip with O(1) memory per source and window.
+
+When Redis is unavailable the same algorithm runs in process. Trusted
+sources are served from a local token bucket and only reach Redis once it
+is exhausted.
+"""
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logger import app_logger
+
+# name -> (limit, period in seconds)
+WindowLimits = Dict[str, Tuple[int, float]]
+
+# KEYS[i]=TAT key of window i
+# ARGV[1]=now_ms, ARGV[2]=dry_run ('1' = report usage without counting the hit)
+# ARGV[1+2i]=limit of window i, ARGV[2+2i]=period_ms of window i
+# Reply: {denied window index (0 = allowed), retry_after_ms, usage_1, ..., usage_n}
+_GCRA_LUA = """
+local now = tonumber(ARGV[1])
+local dry_run = ARGV[2] == '1'
+local denied = 0
+local retry_after = 0
+local new_tats = {}
+local reply = {0, 0}
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[1 + 2 * i])
+    local period = tonumber(ARGV[2 + 2 * i])
+    local interval = period / limit
+    local tat = tonumber(redis.call('GET', KEYS[i]) or '0')
+    if tat < now then
+        tat = now
+    end
+    if dry_run then
+        reply[2 + i] = math.ceil((tat - now) / interval - 1e-9)
+    else
+        local new_tat = tat + interval
+        local allow_at = new_tat - period
+        if now < allow_at then
+            if denied == 0 then
+                denied = i
+            end
+            retry_after = math.max(retry_after, allow_at - now)
+        end
+        new_tats[i] = new_tat
+        reply[2 + i] = math.ceil((new_tat - now) / interval - 1e-9)
+    end
+end
+if denied == 0 and not dry_run then
+    for i = 1, #KEYS do
+        redis.call('SET', KEYS[i], string.format('%.3f', new_tats[i]), 'PX', math.ceil(new_tats[i] - now))
+    end
+end
+reply[1] = denied
+reply[2] = math.ceil(retry_after)
+return reply
+"""
+
+
+@dataclass
+class RateDecision:
+    """Outcome of a rate limit check"""
+    allowed: bool
+    usage: Dict[str, int] = field(default_factory=dict)  # requests counted per window
+    exceeded: Optional[str] = None  # first window that rejected the request
+    retry_after: float = 0.0  # seconds
+    backend: str = "redis"
+
+
+def _gcra(
+    tats: List[float], now_ms: float, windows: List[Tuple[int, float]], dry_run: bool
+) -> Tuple[int, float, List[int], List[float]]:
+    """In-process twin of _GCRA_LUA: (denied index, retry_after_ms, usage, new TATs)"""
+    denied, retry_after, usage, new_tats = 0, 0.0, [], []
+    for i, ((limit, period_ms), tat) in enumerate(zip(windows, tats), start=1):
+        interval = period_ms / limit
+        tat = max(tat, now_ms)
+        if dry_run:
+            usage.append(math.ceil((tat - now_ms) / interval - 1e-9))
+            new_tats.append(tat)
+            continue
+        new_tat = tat + interval
+        allow_at = new_tat - period_ms
+        if now_ms < allow_at:
+            denied = denied or i
+            retry_after = max(retry_after, allow_at - now_ms)
+        usage.append(math.ceil((new_tat - now_ms) / interval - 1e-9))
+        new_tats.append(new_tat)
+    return denied, retry_after, usage, new_tats
+
+
+class _TokenBucket:
+    """Local token bucket (trusted-source fast path)"""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class DistributedRateLimiter:
+    """
+    Multi-window GCRA limiter shared by all workers through Redis
+
+    Features:
+    - All windows checked and updated by one Lua script (EVALSHA, one round trip)
+    - Per-window usage and retry_after in every decision
+    - Keys hash-tagged per source ({source}) so one script touches one slot
+    - In-process GCRA with identical semantics when Redis is unavailable
+    - Local token bucket fast path for trusted sources
+    """
+
+    def __init__(
+        self,
+        key_prefix: str = "ratelimit",
+        redis_getter: Optional[Callable[[], Any]] = None,
+        max_local_sources: Optional[int] = None,
+    ):
+        self.key_prefix = key_prefix
+        self._redis_getter = redis_getter
+        self.max_local_sources = (
+            getattr(settings, 'RATE_LIMIT_MAX_LOCAL_SOURCES', 50000)
+            if max_local_sources is None else max_local_sources
+        )
+
+        self._script = None
+        self._script_client = None
+        self._local_tats: Dict[str, float] = {}
+        self._trusted_buckets: Dict[str, _TokenBucket] = {}
+
+        # Metrics
+        self.decisions = {"redis": 0, "local": 0, "trusted": 0}
+        self.rejections = 0
+        self.redis_errors = 0
+
+    def _redis(self):
+        if self._redis_getter is not None:
+            return self._redis_getter()
+        if not getattr(settings, 'RATE_LIMIT_REDIS_ENABLED', True):
+            return None
+        from ..core.cache_manager import get_async_redis
+
+        return get_async_redis()
+
+    def _keys(self, source: str, names: List[str]) -> List[str]:
+        return [f"{self.key_prefix}:{{{source}}}:{name}" for name in names]
+
+    async def hit(self, source: str, windows: WindowLimits, trusted: bool = False) -> RateDecision:
+        """Count one request against every window; rejected requests are not counted"""
+        if trusted and self._take_trusted_token(source, windows):
+            self.decisions["trusted"] += 1
+            return RateDecision(allowed=True, backend="trusted")
+
+        decision = await self._evaluate(source, windows, dry_run=False)
+        if not decision.allowed:
+            self.rejections += 1
+        return decision
+
+    async def peek(self, source: str, windows: WindowLimits) -> RateDecision:
+        """Current usage per window without counting a request"""
+        return await self._evaluate(source, windows, dry_run=True)
+
+    def _take_trusted_token(self, source: str, windows: WindowLimits) -> bool:
+        bucket = self._trusted_buckets.get(source)
+        if bucket is None:
+            # Capacity of the shortest window, refilled at the tightest sustained rate
+            limit, _ = min(windows.values(), key=lambda window: window[1])
+            rate = min(window_limit / period for window_limit, period in windows.values())
+            bucket = self._trusted_buckets[source] = _TokenBucket(limit, rate)
+        return bucket.take()
+
+    async def _evaluate(self, source: str, windows: WindowLimits, dry_run: bool) -> RateDecision:
+        names = list(windows)
+        specs = [(limit, period * 1000) for limit, period in windows.values()]
+        now_ms = time.time() * 1000
+
+        client = self._redis()
+        if client is not None:
+            try:
+                if self._script is None or self._script_client is not client:
+                    self._script = client.register_script(_GCRA_LUA)
+                    self._script_client = client
+                args = [int(now_ms), "1" if dry_run else "0"]
+                for limit, period_ms in specs:
+                    args.extend([limit, int(period_ms)])
+                reply = await self._script(keys=self._keys(source, names), args=args)
+                self.decisions["redis"] += 1
+                return self._decision(names, int(reply[0]), float(reply[1]), reply[2:], "redis")
+            except Exception as e:
+                self.redis_errors += 1
+                app_logger.warning(f"Shared rate limiter unavailable, using local state: {str(e)}")
+
+        keys = self._keys(source, names)
+        denied, retry_after, usage, new_tats = _gcra(
+            [self._local_tats.get(key, 0.0) for key in keys], now_ms, specs, dry_run
+        )
+        if not denied and not dry_run:
+            self._local_tats.update(zip(keys, new_tats))
+            if len(self._local_tats) > self.max_local_sources:
+                self._prune_local(now_ms)
+        self.decisions["local"] += 1
+        return self._decision(names, denied, retry_after, usage, "local")
+
+    def _prune_local(self, now_ms: float):
+        """Drop windows whose bucket has fully drained"""
+        self._local_tats = {key: tat for key, tat in self._local_tats.items() if tat > now_ms}
+
+    @staticmethod
+    def _decision(
+        names: List[str], denied: int, retry_after_ms: float, usage: List[Any], backend: str
+    ) -> RateDecision:
+        return RateDecision(
+            allowed=denied == 0,
+            usage={name: int(count) for name, count in zip(names, usage)},
+            exceeded=names[denied - 1] if denied else None,
+            retry_after=retry_after_ms / 1000,
+            backend=backend,
+        )
+
+    def forget_trusted(self, source: str):
+        """Drop the local fast-path bucket of a source"""
+        self._trusted_buckets.pop(source, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Decision counts per backend"""
+        return {
+            "decisions": dict(self.decisions),
+            "rejections": self.rejections,
+            "redis_errors": self.redis_errors,
+            "local_sources": len(self._local_tats),
+            "trusted_buckets": len(self._trusted_buckets),
+        }
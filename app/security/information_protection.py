@@ -30,6 +30,7 @@ import json
 
 from ..core.logger import app_logger
 from ..core.config import settings
+from .pattern_scanner import PatternRule, security_pattern_scanner
 
 
 class SensitivityLevel(Enum):
@@ -95,6 +96,8 @@ class InformationProtectionSystem:
     def __init__(self):
         # Load sensitive information patterns
         self.sensitive_patterns = self._load_sensitive_patterns()
+        self.pattern_scanner = security_pattern_scanner
+        self.pattern_scanner.register("information_protection", self._scanner_rules())
         self.safe_responses = self._load_safe_responses()
         
         # Information request tracking
@@ -231,20 +234,21 @@ class InformationProtectionSystem:
     async def _pattern_based_analysis(self, user_message: str) -> Dict[str, Any]:
         """Pattern-based sensitive information detection"""
         
-        message_lower = user_message.lower()
+        matches = self.pattern_scanner.matches(user_message, "information_protection")
         disclosures = []
         max_sensitivity = 0.0
         
         # Check against all sensitive patterns
         for pattern in self.sensitive_patterns:
             # Check keywords
-            keyword_matches = sum(1 for kw in pattern.keywords if kw in message_lower)
+            keyword_matches = sum(
+                1 for i in range(len(pattern.keywords)) if (pattern.name, "keyword", i) in matches
+            )
             
             # Check regex patterns
-            pattern_matches = 0
-            for regex_pattern in pattern.patterns:
-                if re.search(regex_pattern, message_lower):
-                    pattern_matches += 1
+            pattern_matches = sum(
+                1 for i in range(len(pattern.patterns)) if (pattern.name, "pattern", i) in matches
+            )
             
             # If either keywords or patterns match, it's a potential disclosure
             if keyword_matches > 0 or pattern_matches > 0:
@@ -484,6 +488,20 @@ class InformationProtectionSystem:
             "safe_alternative_response": self.safe_responses["generic_denial"] if is_sensitive else None
         }
     
+    def _scanner_rules(self) -> List[PatternRule]:
+        """Keywords and regexes of every sensitive pattern, keyed by (name, kind, index)"""
+        rules = []
+        for pattern in self.sensitive_patterns:
+            rules.extend(
+                PatternRule(key=(pattern.name, "keyword", i), pattern=keyword, literal=True)
+                for i, keyword in enumerate(pattern.keywords)
+            )
+            rules.extend(
+                PatternRule(key=(pattern.name, "pattern", i), pattern=regex)
+                for i, regex in enumerate(pattern.patterns)
+            )
+        return rules
+    
     def _load_sensitive_patterns(self) -> List[SensitivePattern]:
         """Load patterns for detecting sensitive information requests"""
         
@@ -0,0 +1,233 @@
+"""
+Shared single-pass pattern scanner for the security modules
+
+Prompt injection, threat detection, information protection and scope
+validation all match the same message against their own regex lists.
+Every rule is compiled once here, and a literal the rule cannot match
+without (derived from the parsed regex) goes into one trie-shaped
+alternation. A scan lowercases the message once, finds every literal in a
+single pass and only evaluates the regexes whose literal is present (plus
+the few rules without one). The result for all modules is cached per
+message, so the modules analysing the same request share one pass.
+"""
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+try:  # Python 3.11+
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover - Python < 3.11
+    import sre_parse
+
+from ..core.config import settings
+
+MIN_LITERAL_LENGTH = 3
+
+# group -> {rule key: matches}; regex rules report 1, count rules the findall count
+ScanResult = Dict[str, Dict[Hashable, int]]
+
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT}
+
+
+@dataclass(frozen=True)
+class PatternRule:
+    """One pattern of a scanner group"""
+    key: Hashable
+    pattern: str
+    flags: int = 0
+    lowercase: bool = True  # match against the lowercased message instead of the raw one
+    count: bool = False  # number of matches (re.findall) instead of presence
+    literal: bool = False  # plain substring of the lowercased message, no regex
+
+
+def required_literals(pattern: str, flags: int = 0) -> Optional[FrozenSet[str]]:
+    """
+    Lowercased literals of which at least one occurs in every match
+
+    None when no such set with literals of MIN_LITERAL_LENGTH+ chars exists.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return None
+    literals = _sequence_literals(list(parsed))
+    return frozenset(literal.lower() for literal in literals) if literals else None
+
+
+def _sequence_literals(items: List[Tuple[Any, Any]]) -> Optional[FrozenSet[str]]:
+    candidates = []
+    run = ""
+    for op, av in items + [(None, None)]:
+        if op is sre_parse.LITERAL:
+            run += chr(av)
+            continue
+        if len(run) >= MIN_LITERAL_LENGTH:
+            candidates.append(frozenset([run]))
+        run = ""
+        if op is sre_parse.SUBPATTERN:
+            candidates.append(_sequence_literals(list(av[-1])))
+        elif op is sre_parse.BRANCH:
+            alternatives = [_sequence_literals(list(branch)) for branch in av[1]]
+            if all(alternatives):
+                candidates.append(frozenset().union(*alternatives))
+        elif op in _REPEATS and av[0] >= 1:
+            candidates.append(_sequence_literals(list(av[2])))
+
+    candidates = [candidate for candidate in candidates if candidate]
+    if not candidates:
+        return None
+    # Most selective: longest shortest-literal, then fewest alternatives
+    return max(candidates, key=lambda c: (min(map(len, c)), -len(c)))
+
+
+def _trie_regex(literals: Iterable[str]) -> str:
+    """Alternation shaped like a trie; matches the longest literal at a position"""
+    trie: Dict[str, Any] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+class SecurityPatternScanner:
+    """
+    Compiled, literal-prefiltered pattern matching shared by the security modules
+
+    Features:
+    - Every regex compiled once per registration, not per message
+    - One pass over the lowercased message finds all prefilter literals
+    - Regexes whose required literal is absent are never evaluated
+    - Results of all groups cached per message (modules share one scan)
+    """
+
+    def __init__(self, cache_size: Optional[int] = None):
+        self.cache_size = (
+            getattr(settings, 'SECURITY_SCAN_CACHE_SIZE', 256) if cache_size is None else cache_size
+        )
+        self._groups: Dict[str, List[PatternRule]] = {}
+        self._cache: "OrderedDict[str, ScanResult]" = OrderedDict()
+        self._compiled = False
+
+        self._literal_regex: Optional[re.Pattern] = None
+        self._literal_closure: Dict[str, Tuple[str, ...]] = {}
+        self._rules_by_literal: Dict[str, List[Tuple[str, PatternRule, Optional[re.Pattern]]]] = {}
+        self._unfiltered: List[Tuple[str, PatternRule, Optional[re.Pattern]]] = []
+
+        # Metrics
+        self.scans = 0
+        self.cache_hits = 0
+        self.regex_evaluations = 0
+
+    def register(self, group: str, rules: Iterable[PatternRule]):
+        """Replace the rules of a group; compiled again on the next scan"""
+        self._groups[group] = list(rules)
+        self._compiled = False
+        self._cache.clear()
+
+    def _compile(self):
+        rules_by_literal: Dict[str, List[Tuple[str, PatternRule, Optional[re.Pattern]]]] = {}
+        unfiltered = []
+        for group, rules in self._groups.items():
+            for rule in rules:
+                if rule.literal:
+                    literals, regex = frozenset([rule.pattern.lower()]), None
+                else:
+                    regex = re.compile(rule.pattern, rule.flags)
+                    literals = None if rule.count else required_literals(rule.pattern, rule.flags)
+                entry = (group, rule, regex)
+                if not literals:
+                    unfiltered.append(entry)
+                    continue
+                for literal in literals:
+                    rules_by_literal.setdefault(literal, []).append(entry)
+
+        # Literals sharing a start position are prefixes of the longest one found there
+        self._literal_closure = {
+            literal: tuple(other for other in rules_by_literal if literal.startswith(other))
+            for literal in rules_by_literal
+        }
+        self._literal_regex = (
+            re.compile(f"(?=({_trie_regex(rules_by_literal)}))") if rules_by_literal else None
+        )
+        self._rules_by_literal = rules_by_literal
+        self._unfiltered = unfiltered
+        self._compiled = True
+
+    def scan(self, text: str) -> ScanResult:
+        """Matches of every registered group (shared, do not mutate)"""
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            self.cache_hits += 1
+            return cached
+
+        if not self._compiled:
+            self._compile()
+        self.scans += 1
+
+        lowered = text.lower()
+        candidates = list(self._unfiltered)
+        if self._literal_regex is not None:
+            found = set()
+            for match in self._literal_regex.finditer(lowered):
+                found.update(self._literal_closure[match.group(1)])
+            seen = set()
+            for literal in found:
+                for entry in self._rules_by_literal[literal]:
+                    if id(entry) not in seen:
+                        seen.add(id(entry))
+                        candidates.append(entry)
+
+        result: ScanResult = {group: {} for group in self._groups}
+        for group, rule, regex in candidates:
+            if regex is None:
+                result[group][rule.key] = 1
+                continue
+            self.regex_evaluations += 1
+            target = lowered if rule.lowercase else text
+            if rule.count:
+                matches = len(regex.findall(target))
+                if matches:
+                    result[group][rule.key] = matches
+            elif regex.search(target):
+                result[group][rule.key] = 1
+
+        self._cache[text] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def matches(self, text: str, group: str) -> Dict[Hashable, int]:
+        """Matches of one group"""
+        return self.scan(text).get(group, {})
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Rule and scan counters"""
+        if not self._compiled:
+            self._compile()
+        return {
+            "groups": len(self._groups),
+            "rules": sum(len(rules) for rules in self._groups.values()),
+            "prefilter_literals": len(self._rules_by_literal),
+            "unfiltered_rules": len(self._unfiltered),
+            "scans": self.scans,
+            "cache_hits": self.cache_hits,
+            "regex_evaluations": self.regex_evaluations,
+        }
+
+
+# Global instance
+security_pattern_scanner = SecurityPatternScanner()
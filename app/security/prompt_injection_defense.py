@@ -20,6 +20,7 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from ..core.config import settings
 from ..core.logger import app_logger
+from .pattern_scanner import PatternRule, security_pattern_scanner
 
 
 class InjectionType(Enum):
@@ -74,6 +75,14 @@ class PromptInjectionDefense:
     def __init__(self):
         # Known injection patterns (constantly updated)
         self.injection_patterns = self._load_injection_patterns()
+        self.pattern_scanner = security_pattern_scanner
+        self.pattern_scanner.register(
+            "prompt_injection",
+            (
+                PatternRule(key=i, pattern=pattern.pattern, flags=re.IGNORECASE | re.MULTILINE)
+                for i, pattern in enumerate(self.injection_patterns)
+            ),
+        )
 
         # Behavioral tracking for adaptive detection
         self.user_behavior: Dict[str, List[Dict]] = {}
@@ -200,10 +209,10 @@ class PromptInjectionDefense:
         max_severity = 0.0
         indicators = {}
 
-        input_lower = user_input.lower()
+        matches = self.pattern_scanner.matches(user_input, "prompt_injection")
 
-        for pattern in self.injection_patterns:
-            if re.search(pattern.pattern, input_lower, re.IGNORECASE | re.MULTILINE):
+        for i, pattern in enumerate(self.injection_patterns):
+            if i in matches:
                 matched_patterns.append(pattern.name)
                 max_confidence = max(max_confidence, pattern.confidence_threshold)
                 max_severity = max(max_severity, pattern.severity)
@@ -14,11 +14,12 @@ from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
+from collections import defaultdict
 import hashlib
 
 from ..core.logger import app_logger
 from ..core.config import settings
+from .distributed_rate_limiter import DistributedRateLimiter, WindowLimits
 
 
 class RateLimitAction(Enum):
@@ -31,12 +32,12 @@ class RateLimitAction(Enum):
 
 @dataclass
 class RateLimitWindow:
-    """Rate limiting time window"""
-    requests: deque = field(default_factory=deque)
+    """Per-source activity (request counts live in the shared limiter)"""
     first_request: Optional[datetime] = None
     last_request: Optional[datetime] = None
     total_requests: int = 0
     blocked_until: Optional[datetime] = None
+    usage: Dict[str, int] = field(default_factory=dict)  # per-window counts at last request
 
 
 @dataclass
@@ -55,7 +56,7 @@ class RateLimiter:
     Advanced rate limiter with 2024 industry benchmarks
     
     Features:
-    - Per-IP rate limiting with sliding windows
+    - Per-IP burst/minute/hour/day limits shared across workers (Redis GCRA)
     - Burst detection and mitigation
     - Adaptive thresholds based on user behavior
     - Integration with threat intelligence
@@ -65,6 +66,9 @@ class RateLimiter:
         # Rate limiting windows per source
         self.windows: Dict[str, RateLimitWindow] = defaultdict(RateLimitWindow)
         
+        # Window counters shared by every worker
+        self.shared_limiter = DistributedRateLimiter(key_prefix="ratelimit:source")
+        
         # Configuration (2024 benchmarks) - Enhanced for production
         self.config = {
             # Standard rate limits (tightened for security)
@@ -167,37 +171,32 @@ class RateLimiter:
             self.suspicious_sources.add(source_identifier)
             app_logger.warning(f"Suspicious behavior detected from {source_identifier}: {behavioral_threat}")
         
-        # Step 5: Add current request to sliding window
-        window.requests.append(current_time)
-        window.last_request = current_time
-        window.total_requests += 1
-        
-        # Track request intervals for pattern analysis
-        if len(window.requests) > 1:
-            interval = (current_time - window.requests[-2]).total_seconds()
+        # Step 5: Track request intervals for pattern analysis
+        if window.last_request is not None:
+            interval = (current_time - window.last_request).total_seconds()
             self.request_intervals[source_identifier].append(interval)
             # Keep only last 50 intervals
             if len(self.request_intervals[source_identifier]) > 50:
                 self.request_intervals[source_identifier] = self.request_intervals[source_identifier][-50:]
-        
-        # Step 6: Clean old requests (sliding window)
-        self._cleanup_old_requests(window, current_time)
-        
-        # Check different time windows
-        minute_count = self._count_requests_in_window(window, current_time, 60)
-        hour_count = self._count_requests_in_window(window, current_time, 3600)
-        burst_count = self._count_requests_in_window(window, current_time, 
-                                                   self.config["burst_window"])
+        window.last_request = current_time
+        window.total_requests += 1
         
         # Determine rate limits based on source reputation
         limits = self._get_adaptive_limits(source_identifier, request_metadata)
         
-        # Step 7: Check burst protection first (enhanced for suspicious sources)
-        burst_threshold = self.config["burst_threshold"]
-        if source_identifier in self.suspicious_sources:
-            burst_threshold = max(1, burst_threshold // 2)  # Stricter threshold for suspicious sources
+        # Step 6: Count the request in every window (one shared round trip)
+        decision = await self.shared_limiter.hit(
+            source_identifier,
+            self._window_limits(source_identifier, limits),
+            trusted=source_identifier in self.trusted_sources,
+        )
+        window.usage = decision.usage
+        burst_count = decision.usage.get("burst", 0)
+        minute_count = decision.usage.get("minute", 0)
+        hour_count = decision.usage.get("hour", 0)
         
-        if burst_count > burst_threshold:
+        # Step 7: Check burst protection first (enhanced for suspicious sources)
+        if decision.exceeded == "burst":
             violation_details = await self._record_violation(
                 source_identifier, "burst_detected", {"burst_count": burst_count}
             )
@@ -223,7 +222,7 @@ class RateLimiter:
             }
         
         # Check minute limit
-        if minute_count > limits["requests_per_minute"]:
+        if decision.exceeded == "minute":
             await self._apply_rate_limit(source_identifier, window, "minute")
             return {
                 "action": RateLimitAction.RATE_LIMIT.value,
@@ -232,14 +231,15 @@ class RateLimiter:
                 "limit": limits["requests_per_minute"]
             }
         
-        # Check hour limit
-        if hour_count > limits["requests_per_hour"]:
-            await self._apply_rate_limit(source_identifier, window, "hour")
+        # Check hour/day limits
+        if decision.exceeded in ("hour", "day"):
+            await self._apply_rate_limit(source_identifier, window, decision.exceeded)
             return {
                 "action": RateLimitAction.RATE_LIMIT.value,
-                "reason": "hour_limit_exceeded", 
-                "current_count": hour_count,
-                "limit": limits["requests_per_hour"]
+                "reason": f"{decision.exceeded}_limit_exceeded",
+                "current_count": decision.usage[decision.exceeded],
+                "limit": limits[f"requests_per_{decision.exceeded}"],
+                "retry_after": decision.retry_after
             }
         
         # Request allowed
@@ -250,30 +250,18 @@ class RateLimiter:
             "limits": limits
         }
     
-    def _cleanup_old_requests(self, window: RateLimitWindow, current_time: datetime):
-        """Remove requests older than 1 hour from sliding window"""
-        cutoff_time = current_time - timedelta(hours=1)
-        
-        while window.requests and window.requests[0] < cutoff_time:
-            window.requests.popleft()
-    
-    def _count_requests_in_window(
-        self, 
-        window: RateLimitWindow, 
-        current_time: datetime, 
-        window_seconds: int
-    ) -> int:
-        """Count requests in specified time window"""
-        cutoff_time = current_time - timedelta(seconds=window_seconds)
-        
-        count = 0
-        for request_time in reversed(window.requests):
-            if request_time >= cutoff_time:
-                count += 1
-            else:
-                break
+    def _window_limits(self, source_identifier: str, limits: Dict[str, int]) -> WindowLimits:
+        """(limit, period) per window for the shared limiter"""
+        burst_threshold = self.config["burst_threshold"]
+        if source_identifier in self.suspicious_sources:
+            burst_threshold = max(1, burst_threshold // 2)  # Stricter threshold for suspicious sources
         
-        return count
+        return {
+            "burst": (burst_threshold, self.config["burst_window"]),
+            "minute": (max(1, limits["requests_per_minute"]), 60),
+            "hour": (max(1, limits["requests_per_hour"]), 3600),
+            "day": (max(1, limits["requests_per_day"]), 86400),
+        }
     
     def _get_adaptive_limits(
         self, 
@@ -283,7 +271,8 @@ class RateLimiter:
         """Get adaptive rate limits based on source reputation"""
         base_limits = {
             "requests_per_minute": self.config["requests_per_minute"],
-            "requests_per_hour": self.config["requests_per_hour"]
+            "requests_per_hour": self.config["requests_per_hour"],
+            "requests_per_day": self.config["requests_per_day"]
         }
         
         # Trusted sources get higher limits
@@ -299,8 +288,7 @@ class RateLimiter:
             multiplier = 1.0
         
         return {
-            "requests_per_minute": int(base_limits["requests_per_minute"] * multiplier),
-            "requests_per_hour": int(base_limits["requests_per_hour"] * multiplier)
+            name: int(limit * multiplier) for name, limit in base_limits.items()
         }
     
     def _is_new_user(self, source_identifier: str) -> bool:
@@ -354,6 +342,7 @@ class RateLimiter:
     async def remove_trusted_source(self, source_identifier: str):
         """Remove source from trusted list"""
         self.trusted_sources.discard(source_identifier)
+        self.shared_limiter.forget_trusted(source_identifier)
         app_logger.info(f"Removed trusted source: {source_identifier}")
     
     def get_rate_limit_status(self, source_identifier: str) -> Dict[str, Any]:
@@ -363,14 +352,11 @@ class RateLimiter:
             return {"status": "no_activity"}
         
         current_time = datetime.now()
-        minute_count = self._count_requests_in_window(window, current_time, 60)
-        hour_count = self._count_requests_in_window(window, current_time, 3600)
-        
         limits = self._get_adaptive_limits(source_identifier, None)
         
         return {
-            "current_minute": minute_count,
-            "current_hour": hour_count,
+            "current_minute": window.usage.get("minute", 0),
+            "current_hour": window.usage.get("hour", 0),
             "limits": limits,
             "is_blocked": window.blocked_until and current_time < window.blocked_until,
             "blocked_until": window.blocked_until,
@@ -558,6 +544,7 @@ class RateLimiter:
                 "behavioral_analysis_active": True,
                 "auto_ban_enabled": True
             },
+            "shared_limiter": self.shared_limiter.get_stats(),
             "security_thresholds": {
                 "auto_ban_violations": self.config["auto_ban_threshold"],
                 "suspicious_score": 0.5,
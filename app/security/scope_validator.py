@@ -31,6 +31,7 @@ import json
 
 from ..core.logger import app_logger
 from ..core.config import settings
+from .pattern_scanner import PatternRule, security_pattern_scanner
 
 
 class ScopeCategory(Enum):
@@ -94,6 +95,17 @@ class ScopeValidator:
         # Load scope patterns and business context
         self.allowed_patterns = self._load_allowed_patterns()
         self.blocked_patterns = self._load_blocked_patterns()
+        self.pattern_scanner = security_pattern_scanner
+        self.pattern_scanner.register("scope_blocked", (
+            PatternRule(key=(pattern.name, i), pattern=regex, flags=re.IGNORECASE, lowercase=False)
+            for pattern in self.blocked_patterns
+            for i, regex in enumerate(pattern.patterns)
+        ))
+        self.pattern_scanner.register("scope_allowed", (
+            PatternRule(key=(pattern["name"], i), pattern=regex, flags=re.IGNORECASE, lowercase=False)
+            for pattern in self.allowed_patterns
+            for i, regex in enumerate(pattern["patterns"])
+        ))
         self.business_context = self._load_business_context()
         
         # Violation tracking per user
@@ -279,10 +291,13 @@ class ScopeValidator:
         violations = []
         scope_score = 1.0  # Start with assuming in-scope
         
+        blocked_matches = self.pattern_scanner.matches(user_message, "scope_blocked")
+        allowed_matches = self.pattern_scanner.matches(user_message, "scope_allowed")
+        
         # Check against blocked patterns
         for pattern in self.blocked_patterns:
-            for regex_pattern in pattern.patterns:
-                if re.search(regex_pattern, user_message, re.IGNORECASE):
+            for i in range(len(pattern.patterns)):
+                if (pattern.name, i) in blocked_matches:
                     violations.append({
                         "type": pattern.violation_type,
                         "severity": pattern.severity,
@@ -294,8 +309,8 @@ class ScopeValidator:
         # Check against allowed patterns
         business_matches = 0
         for pattern in self.allowed_patterns:
-            for regex_pattern in pattern["patterns"]:
-                if re.search(regex_pattern, user_message, re.IGNORECASE):
+            for i in range(len(pattern["patterns"])):
+                if (pattern["name"], i) in allowed_matches:
                     business_matches += 1
                     scope_score += 0.3
         
@@ -83,8 +83,21 @@ class SecurityManager:
     - Prompt Injection: OWASP Top 10 LLM protections
     - Abuse Detection: 95% accuracy for sophisticated attacks
     - Response Time: <10ms security decision latency
+    
+    Evaluation runs in two stages: cheap gating checks (blocked source, rate
+    limit), then the independent detectors concurrently. Verdicts are applied
+    in stage order and the first blocking one cancels the remaining detectors.
     """
     
+    # Detector -> security_context key of its result (also the verdict order)
+    DETECTOR_CONTEXT_KEYS = {
+        "ddos": "ddos_info",
+        "prompt_injection": "prompt_injection_info",
+        "scope": "scope_violation_info",
+        "information_protection": "information_disclosure_info",
+        "advanced_threat": "advanced_threat_info",
+    }
+    
     def __init__(self):
         # Security components
         from .rate_limiter import RateLimiter, DDoSProtection
@@ -104,6 +117,9 @@ class SecurityManager:
         self.active_threats: Dict[str, List[SecurityThreat]] = defaultdict(list)
         self.blocked_sources: Dict[str, datetime] = {}
         self.security_metrics = SecurityMetrics()
+        self.detector_latency: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
         
         # Security configuration (2024 benchmarks)
         self.config = {
@@ -160,12 +176,14 @@ class SecurityManager:
             "threats_detected": [],
             "security_score": 0.0,
             "mitigation_applied": [],
+            "detector_timings_ms": {},
         }
+        timings = security_context["detector_timings_ms"]
         
         try:
             self.security_metrics.total_requests += 1
             
-            # Step 1: Check if source is already blocked
+            # Stage 1: cheap gating checks
             if await self._is_source_blocked(source_identifier):
                 return SecurityAction.BLOCK_PERMANENT, {
                     **security_context,
@@ -173,9 +191,10 @@ class SecurityManager:
                     "block_expiry": self.blocked_sources.get(source_identifier)
                 }
             
-            # Step 2: Rate limiting evaluation
-            rate_limit_result = await self.rate_limiter.check_rate_limit(
-                source_identifier, request_metadata
+            rate_limit_result = await self._timed(
+                "rate_limit",
+                self.rate_limiter.check_rate_limit(source_identifier, request_metadata),
+                timings,
             )
             
             if rate_limit_result["action"] != "allow":
@@ -185,119 +204,37 @@ class SecurityManager:
                     "rate_limit_info": rate_limit_result
                 }
             
-            # Step 3: DDoS protection evaluation
-            ddos_result = await self.ddos_protection.evaluate_request(
-                source_identifier, user_message, request_metadata
-            )
-            
-            # Convert threat_level string to ThreatLevel enum (robust conversion)
-            threat_level_str = ddos_result.get("threat_level", "none")
-            if isinstance(threat_level_str, str):
-                try:
-                    threat_level = ThreatLevel(threat_level_str.lower())
-                except ValueError:
-                    # If invalid value, default to NONE
-                    threat_level = ThreatLevel.NONE
-                    app_logger.warning(f"Invalid threat level '{threat_level_str}', defaulting to NONE")
-            else:
-                threat_level = threat_level_str
-            
-            # Debug: Check threat level type and value
-            app_logger.info(f"DEBUG: threat_level type={type(threat_level)}, value={threat_level}, repr={repr(threat_level)}")
-            
-            # Use proper enum comparison instead of string comparison
-            if threat_level in [ThreatLevel.HIGH, ThreatLevel.CRITICAL]:
-                app_logger.info(f"DEBUG: DDoS threat level is HIGH/CRITICAL, handling threat")
-                await self._handle_ddos_threat(source_identifier, ddos_result)
-                return SecurityAction.BLOCK_TEMPORARY, {
+            # Stage 2: independent detectors run concurrently
+            blocking, results = await self._run_detectors(source_identifier, {
+                "ddos": self.ddos_protection.evaluate_request(
+                    source_identifier, user_message, request_metadata
+                ),
+                "prompt_injection": self.prompt_defense.detect_injection(
+                    user_message, request_metadata
+                ),
+                "scope": self.scope_validator.validate_scope(
+                    user_message, request_metadata
+                ),
+                "information_protection": self.info_protection.check_information_request(
+                    user_message, request_metadata
+                ),
+                "advanced_threat": self.threat_detector.detect_advanced_threats(
+                    source_identifier, user_message, request_metadata
+                ),
+            }, timings)
+            
+            if blocking is not None:
+                action, detector = blocking
+                return action, {
                     **security_context,
-                    "ddos_info": ddos_result
+                    self.DETECTOR_CONTEXT_KEYS[detector]: results[detector]
                 }
             
-            # Step 4: Prompt injection detection
-            prompt_injection_result = await self.prompt_defense.detect_injection(
-                user_message, request_metadata
+            # Stage 3: overall security score
+            security_score = self._calculate_security_score(
+                [rate_limit_result] + [results[detector] for detector in self.DETECTOR_CONTEXT_KEYS]
             )
             
-            if prompt_injection_result["is_injection"]:
-                await self._handle_prompt_injection(source_identifier, prompt_injection_result)
-                self.security_metrics.prompt_injection_attempts += 1
-                
-                if prompt_injection_result["severity"] >= 0.8:
-                    return SecurityAction.BLOCK_TEMPORARY, {
-                        **security_context,
-                        "prompt_injection_info": prompt_injection_result
-                    }
-            
-            # Step 5: Scope validation (anti-besteiras)
-            scope_result = await self.scope_validator.validate_scope(
-                user_message, request_metadata
-            )
-            
-            if not scope_result["is_valid_scope"]:
-                await self._handle_scope_violation(source_identifier, scope_result)
-                self.security_metrics.scope_violations += 1
-                
-                # Only block for HIGH severity violations (> 0.8), not ambiguous ones (0.0)
-                if scope_result["violation_severity"] > 0.8:
-                    return SecurityAction.BLOCK_TEMPORARY, {
-                        **security_context,
-                        "scope_violation_info": scope_result
-                    }
-            
-            # Step 6: Information disclosure prevention
-            info_disclosure_result = await self.info_protection.check_information_request(
-                user_message, request_metadata
-            )
-            
-            if info_disclosure_result["is_sensitive_request"]:
-                await self._handle_information_request(source_identifier, info_disclosure_result)
-                self.security_metrics.information_leaks_prevented += 1
-                
-                # Only block ACTUAL sensitive requests (severity > 0.95), not false positives
-                if info_disclosure_result.get("severity", 0.0) > 0.95:
-                    return SecurityAction.BLOCK_TEMPORARY, {
-                        **security_context,
-                        "information_disclosure_info": info_disclosure_result
-                    }
-            
-            # Step 7: Advanced threat detection
-            advanced_threat_result = await self.threat_detector.detect_advanced_threats(
-                source_identifier, user_message, request_metadata
-            )
-            
-            # Convert threat_level string to ThreatLevel enum (robust conversion)
-            adv_threat_level_str = advanced_threat_result.get("threat_level", "none")
-            if isinstance(adv_threat_level_str, str):
-                try:
-                    adv_threat_level = ThreatLevel(adv_threat_level_str.lower())
-                except ValueError:
-                    # If invalid value, default to NONE
-                    adv_threat_level = ThreatLevel.NONE
-                    app_logger.warning(f"Invalid advanced threat level '{adv_threat_level_str}', defaulting to NONE")
-            else:
-                adv_threat_level = adv_threat_level_str
-            
-            # Use proper enum comparison instead of string comparison
-            if adv_threat_level in [ThreatLevel.MEDIUM, ThreatLevel.HIGH, ThreatLevel.CRITICAL]:
-                await self._handle_advanced_threat(source_identifier, advanced_threat_result)
-                
-                if adv_threat_level in [ThreatLevel.HIGH, ThreatLevel.CRITICAL]:
-                    return SecurityAction.ESCALATE, {
-                        **security_context,
-                        "advanced_threat_info": advanced_threat_result
-                    }
-            
-            # Step 8: Calculate overall security score
-            security_score = self._calculate_security_score([
-                rate_limit_result,
-                ddos_result, 
-                prompt_injection_result,
-                scope_result,
-                info_disclosure_result,
-                advanced_threat_result
-            ])
-            
             security_context.update({
                 "security_score": security_score,
                 "evaluation_duration_ms": (time.time() - start_time) * 1000,
@@ -319,6 +256,124 @@ class SecurityManager:
                 "fail_secure": True
             }
     
+    async def _timed(self, name: str, awaitable, timings: Dict[str, float]) -> Any:
+        """Await a check and record its latency"""
+        start = time.perf_counter()
+        result = await awaitable
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        timings[name] = elapsed_ms
+        latency = self.detector_latency[name]
+        latency["count"] += 1
+        latency["total_ms"] += elapsed_ms
+        latency["max_ms"] = max(latency["max_ms"], elapsed_ms)
+        return result
+    
+    async def _run_detectors(
+        self,
+        source_identifier: str,
+        detectors: Dict[str, Any],
+        timings: Dict[str, float]
+    ) -> Tuple[Optional[Tuple[SecurityAction, str]], Dict[str, Dict[str, Any]]]:
+        """
+        Run detectors concurrently and apply their verdicts in stage order
+        
+        Returns ((action, detector) of the first blocking verdict or None, results)
+        """
+        verdicts = {
+            "ddos": self._ddos_verdict,
+            "prompt_injection": self._prompt_injection_verdict,
+            "scope": self._scope_verdict,
+            "information_protection": self._information_verdict,
+            "advanced_threat": self._advanced_threat_verdict,
+        }
+        tasks = {
+            name: asyncio.ensure_future(self._timed(name, detector, timings))
+            for name, detector in detectors.items()
+        }
+        results: Dict[str, Dict[str, Any]] = {}
+        
+        try:
+            for name, task in tasks.items():
+                results[name] = await task
+                action = await verdicts[name](source_identifier, results[name])
+                if action is not None:
+                    return (action, name), results
+            return None, results
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+    
+    @staticmethod
+    def _to_threat_level(value: Any, label: str) -> ThreatLevel:
+        """Convert a threat_level string to ThreatLevel (robust conversion)"""
+        if not isinstance(value, str):
+            return value
+        try:
+            return ThreatLevel(value.lower())
+        except ValueError:
+            # If invalid value, default to NONE
+            app_logger.warning(f"Invalid {label} '{value}', defaulting to NONE")
+            return ThreatLevel.NONE
+    
+    async def _ddos_verdict(self, source_identifier: str, ddos_result: Dict[str, Any]) -> Optional[SecurityAction]:
+        threat_level = self._to_threat_level(ddos_result.get("threat_level", "none"), "threat level")
+        
+        # Use proper enum comparison instead of string comparison
+        if threat_level in [ThreatLevel.HIGH, ThreatLevel.CRITICAL]:
+            await self._handle_ddos_threat(source_identifier, ddos_result)
+            return SecurityAction.BLOCK_TEMPORARY
+        return None
+    
+    async def _prompt_injection_verdict(
+        self, source_identifier: str, prompt_injection_result: Dict[str, Any]
+    ) -> Optional[SecurityAction]:
+        if prompt_injection_result["is_injection"]:
+            await self._handle_prompt_injection(source_identifier, prompt_injection_result)
+            self.security_metrics.prompt_injection_attempts += 1
+            
+            if prompt_injection_result["severity"] >= 0.8:
+                return SecurityAction.BLOCK_TEMPORARY
+        return None
+    
+    async def _scope_verdict(self, source_identifier: str, scope_result: Dict[str, Any]) -> Optional[SecurityAction]:
+        # Scope validation (anti-besteiras)
+        if not scope_result["is_valid_scope"]:
+            await self._handle_scope_violation(source_identifier, scope_result)
+            self.security_metrics.scope_violations += 1
+            
+            # Only block for HIGH severity violations (> 0.8), not ambiguous ones (0.0)
+            if scope_result["violation_severity"] > 0.8:
+                return SecurityAction.BLOCK_TEMPORARY
+        return None
+    
+    async def _information_verdict(
+        self, source_identifier: str, info_disclosure_result: Dict[str, Any]
+    ) -> Optional[SecurityAction]:
+        if info_disclosure_result["is_sensitive_request"]:
+            await self._handle_information_request(source_identifier, info_disclosure_result)
+            self.security_metrics.information_leaks_prevented += 1
+            
+            # Only block ACTUAL sensitive requests (severity > 0.95), not false positives
+            if info_disclosure_result.get("severity", 0.0) > 0.95:
+                return SecurityAction.BLOCK_TEMPORARY
+        return None
+    
+    async def _advanced_threat_verdict(
+        self, source_identifier: str, advanced_threat_result: Dict[str, Any]
+    ) -> Optional[SecurityAction]:
+        adv_threat_level = self._to_threat_level(
+            advanced_threat_result.get("threat_level", "none"), "advanced threat level"
+        )
+        
+        if adv_threat_level in [ThreatLevel.MEDIUM, ThreatLevel.HIGH, ThreatLevel.CRITICAL]:
+            await self._handle_advanced_threat(source_identifier, advanced_threat_result)
+            
+            if adv_threat_level in [ThreatLevel.HIGH, ThreatLevel.CRITICAL]:
+                return SecurityAction.ESCALATE
+        return None
+    
     async def _is_source_blocked(self, source_identifier: str) -> bool:
         """Check if source is currently blocked"""
         if source_identifier not in self.blocked_sources:
@@ -520,6 +575,14 @@ class SecurityManager:
                 "information_leaks_prevented": self.security_metrics.information_leaks_prevented,
                 "ddos_attacks_mitigated": self.security_metrics.ddos_attacks_mitigated,
             },
+            "detector_latency": {
+                name: {
+                    "count": latency["count"],
+                    "avg_ms": latency["total_ms"] / max(1, latency["count"]),
+                    "max_ms": latency["max_ms"],
+                }
+                for name, latency in self.detector_latency.items()
+            },
             "active_threats": len(self.active_threats),
             "blocked_sources": len(self.blocked_sources),
             "configuration": self.config,
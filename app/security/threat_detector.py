@@ -23,6 +23,40 @@ import re
 
 from ..core.logger import app_logger
 from ..core.config import settings
+from .behavior_index import BehaviorProfileIndex
+from .pattern_scanner import PatternRule, security_pattern_scanner
+
+# Obfuscation techniques (counted on the raw message)
+OBFUSCATION_PATTERNS = [
+    r'[a-z]{1}[^a-z]{1,3}[a-z]{1}',  # Character separation
+    r'[0-9]+[a-z]+[0-9]+',           # Number/letter mixing
+    r'[A-Z]{2,}[a-z]{1}[A-Z]{2,}',   # Case mixing
+]
+
+# Information gathering patterns
+RECON_PATTERNS = [
+    r'como.*funciona',
+    r'que.*(?:sistema|tecnologia|servidor)',
+    r'onde.*(?:localizado|hospedado|servidor)',
+    r'quantos.*(?:usuários|clientes|funcionários)',
+    r'qual.*(?:versão|sistema|banco)',
+]
+
+# Authority manipulation
+AUTHORITY_PATTERNS = [
+    r'(?:sou|eu sou).*(?:gerente|diretor|admin|desenvolvedor)',
+    r'meu.*(?:chefe|supervisor).*(?:disse|pediu|mandou)',
+    r'urgente.*(?:problema|erro|falha)',
+    r'precisa.*(?:rápido|urgente|imediatamente)'
+]
+
+# Emotional manipulation
+EMOTION_PATTERNS = [
+    r'por favor.*(?:ajude|ajuda)',
+    r'estou.*(?:desesperado|preocupado|aflito)',
+    r'família.*(?:problema|emergência)',
+    r'criança.*(?:problema|perigo|risco)'
+]
 
 
 class ThreatCategory(Enum):
@@ -103,6 +137,7 @@ class ThreatDetectionSystem:
     def __init__(self):
         # Behavior profiles per source
         self.behavior_profiles: Dict[str, BehaviorProfile] = {}
+        self.profile_index = BehaviorProfileIndex()  # Feature matrix + LRU/TTL cap
         
         # Threat correlation tracking
         self.attack_campaigns: Dict[str, List[Dict]] = defaultdict(list)
@@ -111,6 +146,17 @@ class ThreatDetectionSystem:
         # Advanced threat patterns
         self.evasion_patterns = self._load_evasion_patterns()
         self.apt_indicators = self._load_apt_indicators()
+        self.pattern_scanner = security_pattern_scanner
+        self.pattern_scanner.register(
+            "threat_obfuscation",
+            (PatternRule(key=p, pattern=p, lowercase=False, count=True) for p in OBFUSCATION_PATTERNS),
+        )
+        for group, patterns in (
+            ("threat_recon", RECON_PATTERNS),
+            ("threat_authority", AUTHORITY_PATTERNS),
+            ("threat_emotion", EMOTION_PATTERNS),
+        ):
+            self.pattern_scanner.register(group, (PatternRule(key=p, pattern=p) for p in patterns))
         
         # ML-based detection features
         self.anomaly_thresholds = {
@@ -272,6 +318,8 @@ class ThreatDetectionSystem:
         
         profile.last_activity = current_time
         self.behavior_profiles[source_id] = profile
+        for evicted_id in self.profile_index.update(profile):
+            self.behavior_profiles.pop(evicted_id, None)
     
     async def _behavioral_anomaly_detection(
         self, 
@@ -391,15 +439,8 @@ class ThreatDetectionSystem:
         
         # Check for botnet-like behavior
         if len(self.behavior_profiles) > 10:
-            similar_profiles = 0
-            reference_profile = self.behavior_profiles[source_id]
-            
-            for other_id, other_profile in self.behavior_profiles.items():
-                if other_id != source_id and other_profile.message_count > 5:
-                    # Compare behavioral similarity
-                    similarity = self._calculate_profile_similarity(reference_profile, other_profile)
-                    if similarity > 0.8:  # Very similar behavior
-                        similar_profiles += 1
+            # Very similar behavior (> 0.8) among profiles with more than 5 messages
+            similar_profiles = self.profile_index.count_similar(source_id, threshold=0.8, min_messages=5)
             
             if similar_profiles > 3:  # Multiple similar profiles = potential botnet
                 indicators.append(ThreatIndicator(
@@ -437,16 +478,7 @@ class ThreatDetectionSystem:
             evasion_score += 0.4
         
         # Obfuscation techniques
-        obfuscation_patterns = [
-            r'[a-z]{1}[^a-z]{1,3}[a-z]{1}',  # Character separation
-            r'[0-9]+[a-z]+[0-9]+',           # Number/letter mixing
-            r'[A-Z]{2,}[a-z]{1}[A-Z]{2,}',   # Case mixing
-        ]
-        
-        obfuscation_matches = 0
-        for pattern in obfuscation_patterns:
-            matches = len(re.findall(pattern, message))
-            obfuscation_matches += matches
+        obfuscation_matches = sum(self.pattern_scanner.matches(message, "threat_obfuscation").values())
         
         if obfuscation_matches > 3:
             indicators.append(ThreatIndicator(
@@ -523,21 +555,8 @@ class ThreatDetectionSystem:
         indicators = []
         recon_score = 0.0
         
-        message_lower = message.lower()
-        
         # Information gathering patterns
-        recon_patterns = [
-            r'como.*funciona',
-            r'que.*(?:sistema|tecnologia|servidor)',
-            r'onde.*(?:localizado|hospedado|servidor)',
-            r'quantos.*(?:usuários|clientes|funcionários)',
-            r'qual.*(?:versão|sistema|banco)',
-        ]
-        
-        recon_matches = 0
-        for pattern in recon_patterns:
-            if re.search(pattern, message_lower):
-                recon_matches += 1
+        recon_matches = len(self.pattern_scanner.matches(message, "threat_recon"))
         
         if recon_matches > 0:
             indicators.append(ThreatIndicator(
@@ -577,18 +596,10 @@ class ThreatDetectionSystem:
         indicators = []
         se_score = 0.0
         
-        message_lower = message.lower()
-        
         # Authority manipulation
-        authority_patterns = [
-            r'(?:sou|eu sou).*(?:gerente|diretor|admin|desenvolvedor)',
-            r'meu.*(?:chefe|supervisor).*(?:disse|pediu|mandou)',
-            r'urgente.*(?:problema|erro|falha)',
-            r'precisa.*(?:rápido|urgente|imediatamente)'
-        ]
-        
-        for pattern in authority_patterns:
-            if re.search(pattern, message_lower):
+        authority_matches = self.pattern_scanner.matches(message, "threat_authority")
+        for pattern in AUTHORITY_PATTERNS:
+            if pattern in authority_matches:
                 indicators.append(ThreatIndicator(
                     indicator_type="authority_manipulation",
                     severity=0.7,
@@ -600,15 +611,9 @@ class ThreatDetectionSystem:
                 break
         
         # Emotional manipulation
-        emotion_patterns = [
-            r'por favor.*(?:ajude|ajuda)',
-            r'estou.*(?:desesperado|preocupado|aflito)',
-            r'família.*(?:problema|emergência)',
-            r'criança.*(?:problema|perigo|risco)'
-        ]
-        
-        for pattern in emotion_patterns:
-            if re.search(pattern, message_lower):
+        emotion_matches = self.pattern_scanner.matches(message, "threat_emotion")
+        for pattern in EMOTION_PATTERNS:
+            if pattern in emotion_matches:
                 indicators.append(ThreatIndicator(
                     indicator_type="emotional_manipulation",
                     severity=0.5,
@@ -830,43 +835,6 @@ class ThreatDetectionSystem:
             if event["timestamp"] > cutoff_time
         ]
     
-    def _calculate_profile_similarity(
-        self, 
-        profile1: BehaviorProfile, 
-        profile2: BehaviorProfile
-    ) -> float:
-        """Calculate similarity between two behavior profiles"""
-        
-        similarities = []
-        
-        # Message length similarity
-        if profile1.avg_message_length > 0 and profile2.avg_message_length > 0:
-            length_diff = abs(profile1.avg_message_length - profile2.avg_message_length)
-            max_length = max(profile1.avg_message_length, profile2.avg_message_length)
-            length_similarity = 1.0 - (length_diff / max_length)
-            similarities.append(length_similarity)
-        
-        # Topic diversity similarity
-        diversity_diff = abs(profile1.topic_diversity - profile2.topic_diversity)
-        diversity_similarity = 1.0 - diversity_diff
-        similarities.append(diversity_similarity)
-        
-        # Activity pattern similarity (simplified)
-        if len(profile1.activity_pattern) == len(profile2.activity_pattern):
-            pattern_correlation = 0.0
-            total1 = sum(profile1.activity_pattern)
-            total2 = sum(profile2.activity_pattern)
-            
-            if total1 > 0 and total2 > 0:
-                for i in range(len(profile1.activity_pattern)):
-                    p1 = profile1.activity_pattern[i] / total1
-                    p2 = profile2.activity_pattern[i] / total2
-                    pattern_correlation += min(p1, p2)
-            
-            similarities.append(pattern_correlation)
-        
-        return sum(similarities) / len(similarities) if similarities else 0.0
-    
     def _load_evasion_patterns(self) -> List[Dict[str, Any]]:
         """Load advanced evasion technique patterns"""
         return []  # Simplified for this implementation
@@ -913,6 +881,7 @@ class ThreatDetectionSystem:
                 "persistence_attacks": True,
                 "reconnaissance": True
             },
+            "profile_index": self.profile_index.get_stats(),
             "ml_features": len(self.zero_day_indicators),
             "threat_intelligence": "Real-time behavioral analysis with ML"
         }
\ No newline at end of file
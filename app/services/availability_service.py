@@ -8,14 +8,17 @@ import pytz
 from ..models.booking_request import AvailabilitySlot
 from ..core.config import settings
 from ..core.logger import app_logger
-from ..clients.google_calendar import GoogleCalendarClient
+from ..clients.google_calendar_async import get_async_calendar_client
+from .calendar_busy_index import busy_interval_index
 
 
 class AvailabilityService:
     """Service to check calendar availability and suggest time slots"""
     
     def __init__(self):
-        self.calendar_client = GoogleCalendarClient()
+        self.calendar_client = get_async_calendar_client()
+        self.busy_index = busy_interval_index
+        self.calendar_id = settings.GOOGLE_CALENDAR_ID
         self.timezone = pytz.timezone(settings.TIMEZONE)
         
         # Business configuration
@@ -58,13 +61,19 @@ class AvailabilityService:
         all_slots = []
         start_date = datetime.now(self.timezone).date() + timedelta(days=1)  # Start tomorrow
         
-        for i in range(days_ahead):
-            check_date = start_date + timedelta(days=i)
-            
-            # Skip non-business days
-            if check_date.weekday() not in self.business_days:
-                continue
-            
+        # Skip non-business days
+        check_dates = [
+            start_date + timedelta(days=i)
+            for i in range(days_ahead)
+            if (start_date + timedelta(days=i)).weekday() in self.business_days
+        ]
+        if not check_dates:
+            return []
+        
+        # One calendar fetch for the whole period; each slot is then a bisect lookup
+        await self._ensure_busy_index(check_dates[0], check_dates[-1])
+        
+        for check_date in check_dates:
             day_slots = await self._get_slots_for_date(check_date, appointment_type)
             all_slots.extend(day_slots)
             
@@ -115,6 +124,32 @@ class AvailabilityService:
         
         return slots
     
+    def _day_bounds(self, start_date: datetime.date, end_date: datetime.date):
+        """Localized [start_date 00:00, end_date + 1 day 00:00) window"""
+        window_start = self.timezone.localize(datetime.combine(start_date, datetime.min.time()))
+        window_end = self.timezone.localize(
+            datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        )
+        return window_start, window_end
+    
+    async def _ensure_busy_index(self, start_date: datetime.date, end_date: datetime.date) -> bool:
+        """Load the busy index for the date range unless a fresh window covers it"""
+        
+        window_start, window_end = self._day_bounds(start_date, end_date)
+        if self.busy_index.covers(self.calendar_id, window_start, window_end):
+            return True
+        
+        # Fetch past the window edges so buffer-expanded events are included
+        buffer = timedelta(minutes=self.buffer_time)
+        busy = await self.calendar_client.list_busy_intervals(
+            window_start - buffer, window_end + buffer, self.calendar_id
+        )
+        if busy is None:
+            return False
+        
+        self.busy_index.load(self.calendar_id, window_start, window_end, busy)
+        return True
+    
     async def _is_slot_available(self, date: datetime.date, time: str) -> bool:
         """Check if a specific time slot is available"""
         
@@ -122,7 +157,13 @@ class AvailabilityService:
             # Create datetime for the slot
             slot_datetime = datetime.combine(date, datetime.strptime(time, "%H:%M").time())
             slot_datetime = self.timezone.localize(slot_datetime)
+            slot_end = slot_datetime + timedelta(minutes=self.appointment_duration)
+            
+            # Answer from the busy index (buffer already applied to busy intervals)
+            if await self._ensure_busy_index(date, date):
+                return self.busy_index.is_free(self.calendar_id, slot_datetime, slot_end)
             
+            # Index unavailable (calendar fetch failed): per-slot conflict query
             # Add buffer time for checking conflicts
             start_check = slot_datetime - timedelta(minutes=self.buffer_time)
             end_check = slot_datetime + timedelta(minutes=self.appointment_duration + self.buffer_time)
@@ -0,0 +1,309 @@
+"""
+Background availability warmer
+
+Keeps a per-calendar event mirror in sync with Google Calendar through sync
+tokens (only changed events are fetched after the first full sync) and
+precomputes the free slot grid for the next business days into
+`calendar_cache_service`, so the scheduling flow answers from cache instead of
+querying the calendar on the conversation turn.
+"""
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pytz
+
+from ..clients.google_calendar_async import (
+    AsyncGoogleCalendarClient,
+    CalendarSyncTokenExpiredError,
+    _event_interval,
+    get_async_calendar_client,
+)
+from ..core.config import settings
+from ..core.logger import app_logger
+from .calendar_busy_index import BusyIntervalIndex, busy_interval_index
+from .calendar_cache_service import calendar_cache_service
+
+
+class AvailabilityWarmer:
+    """
+    Periodic free-slot precomputation per unit calendar
+
+    Features:
+    - Incremental refresh with Calendar sync tokens (full resync on HTTP 410)
+    - Half-hourly slot grid over business hours for the next N business days
+    - Early refresh when a booking write invalidates the busy index
+    """
+
+    def __init__(
+        self,
+        calendar_client: Optional[AsyncGoogleCalendarClient] = None,
+        cache=calendar_cache_service,
+        days_ahead: Optional[int] = None,
+        refresh_interval: Optional[float] = None,
+        slot_minutes: int = 30,
+    ):
+        self._calendar_client = calendar_client
+        self.cache = cache
+        self.days_ahead = (
+            getattr(settings, 'AVAILABILITY_WARM_DAYS', 14) if days_ahead is None else days_ahead
+        )
+        self.refresh_interval = (
+            getattr(settings, 'AVAILABILITY_WARM_INTERVAL', 300)
+            if refresh_interval is None else refresh_interval
+        )
+        self.timezone = pytz.timezone(settings.TIMEZONE)
+        self.business_days = settings.BUSINESS_DAYS
+
+        # Grid shape; also part of the cache key so config changes never read an old grid
+        self.grid = {
+            'start': settings.BUSINESS_HOURS_START,
+            'end': settings.BUSINESS_HOURS_END,
+            'slot_minutes': slot_minutes,
+            'duration_minutes': settings.APPOINTMENT_DURATION_MINUTES,
+            'buffer_minutes': settings.BUFFER_TIME_MINUTES,
+        }
+        self._index = BusyIntervalIndex(buffer_minutes=settings.BUFFER_TIME_MINUTES, ttl_seconds=float('inf'))
+
+        self._events: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._sync_tokens: Dict[str, str] = {}
+        # In-process copy of the last computed grid, read on the conversation turn
+        self._grids: Dict[str, Dict[date, List[str]]] = {}
+        self._grid_refreshed_at: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self.full_syncs = 0
+        self.incremental_syncs = 0
+        self.events_synced = 0
+        self.refresh_errors = 0
+        self.last_refresh_ms = 0.0
+
+    @property
+    def calendar_client(self) -> AsyncGoogleCalendarClient:
+        if self._calendar_client is None:
+            self._calendar_client = get_async_calendar_client()
+        return self._calendar_client
+
+    def calendar_ids(self) -> List[str]:
+        """Calendars of the active units (plus the default calendar)"""
+        from .unit_manager import unit_manager
+
+        calendar_ids = [settings.GOOGLE_CALENDAR_ID] if settings.GOOGLE_CALENDAR_ID else []
+        for unit in unit_manager._units.values():
+            calendar_id = unit.config.google_calendar_id
+            if unit.config.is_active and calendar_id and calendar_id not in calendar_ids:
+                calendar_ids.append(calendar_id)
+        return calendar_ids
+
+    def business_dates(self, today: Optional[date] = None) -> List[date]:
+        """Next `days_ahead` business days, starting tomorrow"""
+        day = today or datetime.now(self.timezone).date()
+        dates = []
+        while len(dates) < self.days_ahead:
+            day += timedelta(days=1)
+            if day.weekday() in self.business_days:
+                dates.append(day)
+        return dates
+
+    def _localize(self, day: date, minutes: int = 0) -> datetime:
+        return self.timezone.localize(datetime.combine(day, datetime.min.time())) + timedelta(minutes=minutes)
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    async def _sync(self, calendar_id: str, window_start: datetime):
+        """Apply changed events to the calendar mirror (full sync when no token)"""
+        token = self._sync_tokens.get(calendar_id)
+        try:
+            changed, next_token = await self.calendar_client.sync_events(
+                calendar_id, sync_token=token, time_min=None if token else window_start
+            )
+        except CalendarSyncTokenExpiredError:
+            app_logger.info(f"Sync token expired for {calendar_id}, running full sync")
+            token = None
+            changed, next_token = await self.calendar_client.sync_events(
+                calendar_id, time_min=window_start
+            )
+
+        if token is None:
+            self._events[calendar_id] = {}
+            self.full_syncs += 1
+        else:
+            self.incremental_syncs += 1
+
+        events = self._events[calendar_id]
+        for event in changed:
+            if event.get('status') == 'cancelled':
+                events.pop(event['id'], None)
+            else:
+                events[event['id']] = event
+        self.events_synced += len(changed)
+
+        if next_token:
+            self._sync_tokens[calendar_id] = next_token
+        else:
+            self._sync_tokens.pop(calendar_id, None)
+
+    def compute_free_times(self, calendar_id: str, day: date) -> List[str]:
+        """Free slot start times ("HH:MM") for the day from the synced events"""
+        grid = self.grid
+        free_times = []
+        for minutes in range(grid['start'] * 60, grid['end'] * 60, grid['slot_minutes']):
+            if minutes + grid['duration_minutes'] > grid['end'] * 60:
+                break
+            start = self._localize(day, minutes)
+            if self._index.is_free(calendar_id, start, start + timedelta(minutes=grid['duration_minutes'])):
+                free_times.append(f"{minutes // 60:02d}:{minutes % 60:02d}")
+        return free_times
+
+    async def refresh_calendar(
+        self, calendar_id: str, today: Optional[date] = None, dates: Optional[Sequence[date]] = None
+    ):
+        """Sync one calendar and rewrite its cached grid (next business days by default)"""
+        # The mirror and busy index always cover the full horizon, even when
+        # only some dates are rewritten (warm_cache), so other grid days keep their events
+        horizon = self.business_dates(today)
+        dates = sorted(dates) if dates else horizon
+        first_day, last_day = min(horizon[0], dates[0]), max(horizon[-1], dates[-1])
+        window_start = self._localize(first_day)
+        await self._sync(calendar_id, window_start)
+
+        # Drop events that end before the grid; incremental syncs can deliver them
+        events = self._events[calendar_id]
+        busy: List[Tuple[datetime, datetime]] = []
+        for event_id, event in list(events.items()):
+            interval = _event_interval(event)
+            if interval is None:
+                continue
+            if interval[1] < window_start:
+                del events[event_id]
+            else:
+                busy.append(interval)
+        self._index.load(calendar_id, window_start, self._localize(last_day + timedelta(days=1)), busy)
+
+        grid = self._grids.setdefault(calendar_id, {})
+        for day in dates:
+            grid[day] = self.compute_free_times(calendar_id, day)
+            await self.cache.set_availability(str(day), calendar_id, self.grid, grid[day])
+        self._grid_refreshed_at[calendar_id] = time.monotonic()
+
+        # Keep only upcoming days
+        for day in [day for day in grid if day < first_day]:
+            del grid[day]
+
+    async def refresh(self, today: Optional[date] = None):
+        """Refresh every unit calendar; failures keep the previous grid until its TTL"""
+        started = time.perf_counter()
+        for calendar_id in self.calendar_ids():
+            try:
+                await self.refresh_calendar(calendar_id, today)
+            except Exception as e:
+                self.refresh_errors += 1
+                app_logger.error(f"Availability warm-up failed for {calendar_id}: {e}")
+        self.last_refresh_ms = (time.perf_counter() - started) * 1000
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def get_free_slots(
+        self,
+        times: Sequence[str],
+        limit: int = 5,
+        calendar_id: Optional[str] = None,
+        today: Optional[date] = None,
+    ) -> Optional[List[Tuple[date, str]]]:
+        """
+        Earliest cached free (date, time) pairs among the given times
+
+        Returns:
+            Up to `limit` slots, or None when the grid is not warm (callers
+            fall back to their own lookup)
+        """
+        calendar_id = calendar_id or settings.GOOGLE_CALENDAR_ID
+        if calendar_id not in self._events:
+            return None
+
+        # A grid older than the cache TTL is as stale as an expired cache entry
+        refreshed_at = self._grid_refreshed_at.get(calendar_id, float('-inf'))
+        grid = (
+            self._grids.get(calendar_id, {})
+            if time.monotonic() - refreshed_at <= self.cache.availability_ttl else {}
+        )
+
+        wanted = set(times)
+        slots = []
+        for day in self.business_dates(today):
+            free_times = grid.get(day)
+            if free_times is None:
+                free_times = await self.cache.get_availability(str(day), calendar_id, self.grid)
+            if free_times is None:
+                return None
+            slots.extend((day, slot_time) for slot_time in free_times if slot_time in wanted)
+            if len(slots) >= limit:
+                break
+        return slots[:limit]
+
+    # ------------------------------------------------------------------
+    # Background job
+    # ------------------------------------------------------------------
+
+    def request_refresh(self, calendar_id: Optional[str] = None):  # noqa: ARG002
+        """Wake the background job early (busy index invalidation listener)"""
+        if self._wake is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            await self.refresh()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """Start the periodic refresh on the running event loop"""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        busy_interval_index.add_invalidation_listener(self.request_refresh)
+        self._task = asyncio.create_task(self._run())
+        app_logger.info(
+            f"Availability warmer started: {self.days_ahead} business days, "
+            f"every {self.refresh_interval}s"
+        )
+
+    async def stop(self):
+        """Cancel the periodic refresh"""
+        busy_interval_index.remove_invalidation_listener(self.request_refresh)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Warmer usage statistics"""
+        return {
+            "calendars": len(self._events),
+            "events": sum(len(events) for events in self._events.values()),
+            "full_syncs": self.full_syncs,
+            "incremental_syncs": self.incremental_syncs,
+            "events_synced": self.events_synced,
+            "refresh_errors": self.refresh_errors,
+            "last_refresh_ms": round(self.last_refresh_ms, 2),
+            "running": self._task is not None and not self._task.done(),
+        }
+
+
+# Global availability warmer instance
+availability_warmer = AvailabilityWarmer()
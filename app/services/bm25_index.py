@@ -0,0 +1,153 @@
+"""
+Incremental BM25 inverted index with PT-BR tokenization
+
+Terms are lowercased, accent-folded, stripped of common stopwords and
+reduced by a light Portuguese suffix stemmer, so "mensalidades",
+"Mensalidade" and "mensalidade?" hit the same postings list. A query only
+touches the postings of its own terms instead of scanning every document.
+"""
+import heapq
+import math
+import re
+import unicodedata
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+
+STOPWORDS = frozenset(
+    """
+    a ao aos as ate com como da das de do dos e ela ele em entre era essa esse
+    esta este eu isso la lhe mais mas me meu minha na nas no nos o os ou para
+    pela pelo por qual quais que se sem ser seu sua tem um uma vai voce voces
+    """.split()
+)
+
+# (suffix, replacement), first match wins; plural forms before singular ones
+_SUFFIX_RULES = (
+    ("mente", ""),
+    ("coes", "cao"),
+    ("soes", "sao"),
+    ("oes", "ao"),
+    ("aes", "ao"),
+    ("ais", "al"),
+    ("eis", "el"),
+    ("ois", "ol"),
+    ("ns", "m"),
+    ("res", "r"),
+    ("zes", "z"),
+    ("s", ""),
+)
+_FINAL_VOWELS = ("a", "e", "o")
+MIN_STEM_LENGTH = 3
+
+
+def fold_accents(text: str) -> str:
+    """Lowercase and remove diacritics (ç -> c, ã -> a)"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def stem_pt(token: str) -> str:
+    """Light Portuguese stemmer: plural/adverb suffixes, then the final vowel"""
+    for suffix, replacement in _SUFFIX_RULES:
+        if token.endswith(suffix) and len(token) - len(suffix) + len(replacement) >= MIN_STEM_LENGTH:
+            token = token[: len(token) - len(suffix)] + replacement
+            break
+    if token.endswith(_FINAL_VOWELS) and len(token) > MIN_STEM_LENGTH:
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Stemmed, accent-folded tokens without stopwords"""
+    return [
+        stem_pt(word)
+        for word in _WORD_RE.findall(fold_accents(text or ""))
+        if word not in STOPWORDS and len(word) > 1
+    ]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index, updated one document at a time
+
+    Features:
+    - Postings term -> {doc_id: term frequency}
+    - add/remove only touch the document's own terms
+    - Query cost proportional to the postings of the query terms
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[Hashable, int]] = {}
+        self._doc_lengths: Dict[Hashable, int] = {}
+        self._doc_terms: Dict[Hashable, Dict[str, int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, doc_id: Hashable) -> bool:
+        return doc_id in self._doc_lengths
+
+    def add(self, doc_id: Hashable, tokens: Iterable[str]):
+        """Index a document (replaces a previous version with the same id)"""
+        self.remove(doc_id)
+        frequencies: Dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        length = sum(frequencies.values())
+        self._doc_terms[doc_id] = frequencies
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+    def remove(self, doc_id: Hashable) -> bool:
+        frequencies = self._doc_terms.pop(doc_id, None)
+        if frequencies is None:
+            return False
+        for term in frequencies:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        return True
+
+    def clear(self):
+        self._postings.clear()
+        self._doc_lengths.clear()
+        self._doc_terms.clear()
+        self._total_length = 0
+
+    def search(self, query_tokens: Iterable[str], top_k: int = 5) -> List[Tuple[Hashable, float]]:
+        """Top (doc_id, score) with score > 0, best first"""
+        total_docs = len(self._doc_lengths)
+        if not total_docs:
+            return []
+
+        average_length = self._total_length / total_docs or 1.0
+        scores: Dict[Hashable, float] = {}
+        for term in set(query_tokens):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            doc_freq = len(postings)
+            idf = math.log(1 + (total_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+    def get_stats(self) -> Dict[str, float]:
+        """Index size statistics"""
+        return {
+            "documents": len(self._doc_lengths),
+            "terms": len(self._postings),
+            "average_length": round(self._total_length / len(self._doc_lengths), 2)
+            if self._doc_lengths else 0.0,
+        }
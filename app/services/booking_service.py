@@ -8,7 +8,7 @@ import re
 
 from ..models.booking_request import BookingRequest, BookingStatus, BookingConfirmation
 from ..core.logger import app_logger
-from ..clients.google_calendar import GoogleCalendarClient
+from ..clients.google_calendar_async import get_async_calendar_client
 from .availability_service import AvailabilityService
 
 
@@ -17,7 +17,7 @@ class BookingService:
     
     def __init__(self):
         self.availability_service = AvailabilityService()
-        self.calendar_client = GoogleCalendarClient()
+        self.calendar_client = get_async_calendar_client()
         
         # In-memory storage for active bookings (use database in production)
         self.active_bookings = {}
@@ -0,0 +1,135 @@
+"""
+Busy interval index for Google Calendar availability checks
+
+One events fetch per date range is loaded into a sorted, merged interval
+list per calendar, so slot availability is answered with bisect instead of
+one calendar request per slot.
+"""
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import settings
+from ..core.logger import app_logger
+
+
+class _CalendarIntervals:
+    """Merged busy intervals (epoch seconds) for one calendar and loaded window"""
+
+    __slots__ = ("window_start", "window_end", "loaded_at", "starts", "ends")
+
+    def __init__(self, window_start: float, window_end: float, intervals: List[Tuple[float, float]]):
+        self.window_start = window_start
+        self.window_end = window_end
+        self.loaded_at = time.monotonic()
+        self.starts: List[float] = []
+        self.ends: List[float] = []
+
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+
+class BusyIntervalIndex:
+    """
+    In-memory free/busy index per calendar
+
+    Features:
+    - Busy intervals expanded by the booking buffer time and merged on load
+    - O(log n) slot checks with bisect
+    - TTL-bound windows, invalidated on calendar writes
+    """
+
+    def __init__(self, buffer_minutes: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self.buffer = timedelta(
+            minutes=settings.BUFFER_TIME_MINUTES if buffer_minutes is None else buffer_minutes
+        )
+        self.ttl_seconds = (
+            getattr(settings, 'BUSY_INDEX_TTL', 300) if ttl_seconds is None else ttl_seconds
+        )
+        self._calendars: Dict[str, _CalendarIntervals] = {}
+        self._invalidation_listeners: List[Callable[[Optional[str]], None]] = []
+
+        # Metrics
+        self.loads = 0
+        self.lookups = 0
+        self.invalidations = 0
+
+    def covers(self, calendar_id: str, start: datetime, end: datetime) -> bool:
+        """Whether [start, end) is inside a fresh loaded window for the calendar"""
+        entry = self._calendars.get(calendar_id)
+        if entry is None:
+            return False
+        if time.monotonic() - entry.loaded_at > self.ttl_seconds:
+            return False
+        return entry.window_start <= start.timestamp() and end.timestamp() <= entry.window_end
+
+    def load(
+        self,
+        calendar_id: str,
+        window_start: datetime,
+        window_end: datetime,
+        busy: Iterable[Tuple[datetime, datetime]],
+    ):
+        """Replace the calendar's window with the busy intervals fetched for it"""
+        buffer = self.buffer.total_seconds()
+        intervals = [
+            (start.timestamp() - buffer, end.timestamp() + buffer) for start, end in busy
+        ]
+        entry = _CalendarIntervals(window_start.timestamp(), window_end.timestamp(), intervals)
+        self._calendars[calendar_id] = entry
+        self.loads += 1
+        app_logger.debug(
+            f"Busy index loaded for {calendar_id}: {len(entry.starts)} intervals "
+            f"between {window_start} and {window_end}"
+        )
+
+    def is_free(self, calendar_id: str, start: datetime, end: datetime) -> bool:
+        """Whether [start, end) overlaps no (buffer-expanded) busy interval"""
+        entry = self._calendars[calendar_id]
+        self.lookups += 1
+
+        # First merged interval ending after the slot start
+        i = bisect_right(entry.ends, start.timestamp())
+        return i == len(entry.starts) or entry.starts[i] >= end.timestamp()
+
+    def invalidate(self, calendar_id: Optional[str] = None):
+        """Drop the loaded window for a calendar (or all calendars)"""
+        if calendar_id is None:
+            self._calendars.clear()
+        else:
+            self._calendars.pop(calendar_id, None)
+        self.invalidations += 1
+
+        for listener in self._invalidation_listeners:
+            try:
+                listener(calendar_id)
+            except Exception as e:
+                app_logger.warning(f"Busy index invalidation listener failed: {e}")
+
+    def add_invalidation_listener(self, listener: Callable[[Optional[str]], None]):
+        """Call `listener(calendar_id)` whenever a calendar is invalidated (writes)"""
+        if listener not in self._invalidation_listeners:
+            self._invalidation_listeners.append(listener)
+
+    def remove_invalidation_listener(self, listener: Callable[[Optional[str]], None]):
+        if listener in self._invalidation_listeners:
+            self._invalidation_listeners.remove(listener)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Index usage statistics"""
+        return {
+            "calendars": len(self._calendars),
+            "intervals": sum(len(entry.starts) for entry in self._calendars.values()),
+            "loads": self.loads,
+            "lookups": self.lookups,
+            "invalidations": self.invalidations,
+        }
+
+
+# Global busy interval index instance
+busy_interval_index = BusyIntervalIndex()
@@ -141,6 +141,8 @@ class CalendarCacheService:
         # Store in memory cache
         self._set_in_memory(cache_key, availability_data, self.availability_ttl)
         
+        await self._ensure_redis_initialized()
+        
         # Store in Redis cache
         if self.redis_client:
             try:
@@ -297,9 +299,11 @@ class CalendarCacheService:
     async def warm_cache(self, dates: List[str], calendar_id: str):
         """Pre-warm cache with availability data for upcoming dates"""
         app_logger.info(f"Warming cache for {len(dates)} dates")
-        # This would be called with actual availability data
-        # Implementation depends on integration with GoogleCalendarClient
-        pass
+        from .availability_warmer import availability_warmer
+
+        await availability_warmer.refresh_calendar(
+            calendar_id, dates=[datetime.strptime(d, "%Y-%m-%d").date() for d in dates]
+        )
     
     async def get_cache_stats(self) -> Dict[str, Any]:
         """Get comprehensive cache performance statistics"""
@@ -52,6 +52,7 @@ class CalendarCircuitBreaker:
         self.success_count = 0
         self.last_failure_time: Optional[datetime] = None
         self.next_attempt_time: Optional[datetime] = None
+        self._probe_in_flight = False
         
         # Metrics
         self.total_requests = 0
@@ -78,33 +79,41 @@ class CalendarCircuitBreaker:
             CircuitBreakerOpenError: When circuit is open
             HttpError: When Google API returns error
         """
+        # The lock guards state transitions only, so concurrent calls are not
+        # serialized behind a slow API request
         async with self._lock:
             self.total_requests += 1
             
             # Check if circuit should be open
-            if await self._should_attempt():
-                try:
-                    # Execute the function with timeout
-                    result = await asyncio.wait_for(
-                        func(*args, **kwargs),
-                        timeout=self.timeout
-                    )
-                    
-                    # Record success
-                    await self._record_success()
-                    return result
-                    
-                except (HttpError, asyncio.TimeoutError, Exception) as e:
-                    # Record failure
-                    await self._record_failure(e)
-                    raise
-            else:
+            if not await self._should_attempt():
                 # Circuit is open - fail fast
                 self.total_fallback_calls += 1
                 raise CircuitBreakerOpenError(
                     f"Circuit breaker is {self.state.value}. "
                     f"Next attempt at {self.next_attempt_time}"
                 )
+            is_probe = self.state == CircuitState.HALF_OPEN
+        
+        try:
+            # Execute the function with timeout
+            result = await asyncio.wait_for(
+                func(*args, **kwargs),
+                timeout=self.timeout
+            )
+        except (HttpError, asyncio.TimeoutError, Exception) as e:
+            # Record failure
+            async with self._lock:
+                await self._record_failure(e)
+            raise
+        else:
+            # Record success
+            async with self._lock:
+                await self._record_success()
+            return result
+        finally:
+            if is_probe:
+                # Next HALF_OPEN caller may probe (also after cancellation)
+                self._probe_in_flight = False
     
     async def _should_attempt(self) -> bool:
         """Determine if request should be attempted"""
@@ -116,11 +125,15 @@ class CalendarCircuitBreaker:
             if self.next_attempt_time and datetime.now() >= self.next_attempt_time:
                 app_logger.info("Circuit breaker entering HALF_OPEN state for recovery test")
                 self.state = CircuitState.HALF_OPEN
+                self._probe_in_flight = True
                 return True
             return False
         
         if self.state == CircuitState.HALF_OPEN:
-            # Allow limited requests to test recovery
+            # Single in-flight probe: concurrent callers fail fast until it completes
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
             return True
         
         return False
@@ -218,6 +231,7 @@ class CalendarCircuitBreaker:
         self.success_count = 0
         self.last_failure_time = None
         self.next_attempt_time = None
+        self._probe_in_flight = False
 
 
 class CircuitBreakerOpenError(Exception):
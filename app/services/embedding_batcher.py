@@ -0,0 +1,152 @@
+"""
+Micro-batching front for query embeddings
+
+Concurrent conversations each embedding their own query would pay one model
+forward pass apiece on the CPU thread pool. The batcher holds query requests
+for a few milliseconds (or until max_batch_size) and runs a single batched
+embed call for all of them, fanning the vectors back out to the awaiting
+callers.
+"""
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+from ..core.logger import app_logger
+
+# Histogram bucket upper bounds
+QUEUE_WAIT_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 250)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128)
+
+
+class _Histogram:
+    """Bucket histogram (non-cumulative counts per upper bound, plus overflow)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> Dict[str, object]:
+        labels = [f"le_{bound}" for bound in self.buckets] + ["inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+        }
+
+
+class EmbeddingMicroBatcher:
+    """
+    Coalesces concurrent single-text embedding requests into batches
+
+    Features:
+    - Flush on max_batch_size or after max_wait_ms from the first queued request
+    - Duplicate texts inside a batch are embedded once
+    - Queue-wait (ms) and batch-size histograms
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], Awaitable[List[np.ndarray]]],
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+    ):
+        self.embed_batch = embed_batch
+        self.max_batch_size = (
+            getattr(settings, 'EMBEDDING_MICROBATCH_MAX_SIZE', 32)
+            if max_batch_size is None else max_batch_size
+        )
+        self.max_wait_ms = (
+            getattr(settings, 'EMBEDDING_MICROBATCH_WAIT_MS', 5)
+            if max_wait_ms is None else max_wait_ms
+        )
+
+        self._pending: List[Tuple[str, asyncio.Future, float]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+
+        # Metrics
+        self.queue_wait_ms = _Histogram(QUEUE_WAIT_BUCKETS_MS)
+        self.batch_sizes = _Histogram(BATCH_SIZE_BUCKETS)
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Embedding for one text, computed together with concurrent requests"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future, time.perf_counter()))
+        self.requests += 1
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_ms / 1000, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future, float]]):
+        started = time.perf_counter()
+        for _, _, queued_at in batch:
+            self.queue_wait_ms.observe((started - queued_at) * 1000)
+        self.batch_sizes.observe(len(batch))
+        self.batches += 1
+
+        texts = list(dict.fromkeys(text for text, _, _ in batch))
+        try:
+            embeddings = await self.embed_batch(texts)
+            if len(embeddings) != len(texts):
+                raise ValueError(f"expected {len(texts)} embeddings, got {len(embeddings)}")
+        except Exception as e:
+            self.errors += 1
+            app_logger.error(f"Embedding micro-batch of {len(texts)} texts failed: {str(e)}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        by_text = dict(zip(texts, embeddings))
+        for text, future, _ in batch:
+            if not future.done():  # caller may have been cancelled
+                future.set_result(by_text[text])
+
+    async def drain(self):
+        """Flush queued requests and wait for running batches"""
+        self._flush()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, object]:
+        """Batcher usage statistics"""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "pending": len(self._pending),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+            "batch_size": self.batch_sizes.snapshot(),
+        }
@@ -6,8 +6,6 @@ from __future__ import annotations
 import os
 import asyncio
 import hashlib
-import pickle
-import time
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Union
 from concurrent.futures import ThreadPoolExecutor
@@ -18,6 +16,9 @@ import torch
 
 from ..core.config import settings
 from ..core.logger import app_logger
+from .embedding_batcher import EmbeddingMicroBatcher
+from .embedding_store import EmbeddingMatrixStore
+from .similarity_index import top_k_cosine
 
 
 class EmbeddingService:
@@ -28,14 +29,14 @@ class EmbeddingService:
         self.model: Optional[SentenceTransformer] = None
         self.executor: Optional[ThreadPoolExecutor] = None
         self.cache_dir: Optional[Path] = None
+        self.store: Optional[EmbeddingMatrixStore] = None
+        self.query_batcher = EmbeddingMicroBatcher(self.embed_texts)
         self.device: Optional[str] = None
         self._initialized = False
         
         # Cache management settings (lightweight)
         self.max_cache_size_mb = getattr(settings, 'EMBEDDING_CACHE_SIZE_MB', 100)
         self.max_cache_files = getattr(settings, 'EMBEDDING_CACHE_FILES', 1000) 
-        self.cache_cleanup_interval = getattr(settings, 'CACHE_CLEANUP_INTERVAL', 3600)
-        self.last_cleanup_time = 0
     
     def _ensure_initialized(self) -> None:
         """Lazy initialization of heavy resources"""
@@ -52,12 +53,30 @@ class EmbeddingService:
         self.executor = ThreadPoolExecutor(max_workers=2)
         self.cache_dir = Path(settings.EMBEDDING_CACHE_DIR)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.store = self._open_store()
         self.device = self._get_device()
         
         app_logger.info(f"Embedding service initialized with device: {self.device}")
-        app_logger.info(f"Cache limits: {self.max_cache_size_mb}MB, {self.max_cache_files} files")
+        app_logger.info(
+            f"Cache limits: {self.max_cache_size_mb}MB, {self.store.max_rows} embeddings"
+        )
         self._initialized = True
     
+    def _open_store(self) -> EmbeddingMatrixStore:
+        """Memory-mapped cache matrix for the configured model"""
+        row_bytes = settings.EMBEDDING_DIMENSION * np.dtype(np.float32).itemsize
+        max_rows = min(
+            self.max_cache_files,
+            int(self.max_cache_size_mb * 1024 * 1024) // row_bytes
+        )
+        model_hash = hashlib.md5(settings.EMBEDDING_MODEL_NAME.encode()).hexdigest()[:8]
+        return EmbeddingMatrixStore(
+            self.cache_dir,
+            settings.EMBEDDING_DIMENSION,
+            namespace=f"st_{model_hash}",
+            max_rows=max_rows
+        )
+    
     def _get_device(self) -> str:
         """Determine the best device to use for embeddings"""
         if torch.cuda.is_available():
@@ -143,15 +162,30 @@ class EmbeddingService:
         embedding = await self.embed_texts([text], use_cache=use_cache)
         return embedding[0] if embedding else np.zeros(settings.EMBEDDING_DIMENSION)
     
+    async def embed_query(self, text: str) -> np.ndarray:
+        """
+        Embedding for a search query
+        
+        Cache hits return immediately; misses go through the micro-batcher so
+        concurrent queries share one model forward pass.
+        """
+        self._ensure_initialized()
+        if not text or not text.strip():
+            return np.zeros(settings.EMBEDDING_DIMENSION)
+        
+        text = text.strip()
+        cached_embedding = self._get_cached_embedding(text)
+        if cached_embedding is not None:
+            return cached_embedding
+        
+        return await self.query_batcher.embed(text)
+    
     async def embed_texts(self, texts: List[str], use_cache: bool = True) -> List[np.ndarray]:
         """Generate embeddings for multiple texts"""
         self._ensure_initialized()
         if not texts:
             return []
         
-        # Check if cache cleanup is needed
-        await self._cleanup_cache_if_needed()
-        
         # Ensure model is loaded
         await self.initialize_model()
         
@@ -165,8 +199,8 @@ class EmbeddingService:
         texts_to_embed = []
         
         if use_cache:
-            for i, text in valid_texts:
-                cached = self._get_cached_embedding(text)
+            cached_embeddings = self._get_cached_embeddings([text for _, text in valid_texts])
+            for (i, text), cached in zip(valid_texts, cached_embeddings):
                 if cached is not None:
                     embeddings_map[i] = cached
                 else:
@@ -193,8 +227,10 @@ class EmbeddingService:
                 # Map back to original indices and cache
                 for (original_idx, text), embedding in zip(texts_to_embed, raw_embeddings):
                     embeddings_map[original_idx] = embedding
-                    if use_cache:
-                        self._cache_embedding(text, embedding)
+                if use_cache:
+                    self._cache_embeddings(
+                        [(text, embedding) for (_, text), embedding in zip(texts_to_embed, raw_embeddings)]
+                    )
                 
                 app_logger.info(f"Successfully generated {len(raw_embeddings)} embeddings")
                 
@@ -242,90 +278,35 @@ class EmbeddingService:
             return [np.zeros(settings.EMBEDDING_DIMENSION) for _ in texts]
     
     def _get_cache_key(self, text: str) -> str:
-        """Generate cache key for text"""
-        text_hash = hashlib.md5(text.encode()).hexdigest()
-        model_hash = hashlib.md5(settings.EMBEDDING_MODEL_NAME.encode()).hexdigest()[:8]
-        return f"{model_hash}_{text_hash}"
+        """Generate cache key for text (the store namespace already carries the model)"""
+        return hashlib.md5(text.encode()).hexdigest()
     
     def _get_cached_embedding(self, text: str) -> Optional[np.ndarray]:
-        """Retrieve cached embedding if available"""
+        """Retrieve cached embedding if available (read-only view into the cache matrix)"""
+        return self._get_cached_embeddings([text])[0]
+    
+    def _get_cached_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Retrieve cached embeddings for several texts (None for misses)"""
+        if self.store is None:
+            return [None] * len(texts)
         try:
-            cache_key = self._get_cache_key(text)
-            cache_file = self.cache_dir / f"{cache_key}.pkl"
-            
-            if cache_file.exists():
-                # Update access time for LRU cleanup
-                cache_file.touch()
-                with open(cache_file, 'rb') as f:
-                    return pickle.load(f)
+            return self.store.get_many([self._get_cache_key(text) for text in texts])
         except Exception as e:
-            app_logger.warning(f"Error reading cached embedding: {str(e)}")
-        
-        return None
+            app_logger.warning(f"Error reading cached embeddings: {str(e)}")
+            return [None] * len(texts)
     
     def _cache_embedding(self, text: str, embedding: np.ndarray) -> None:
         """Cache embedding to disk"""
-        try:
-            cache_key = self._get_cache_key(text)
-            cache_file = self.cache_dir / f"{cache_key}.pkl"
-            
-            with open(cache_file, 'wb') as f:
-                pickle.dump(embedding, f)
-                
-        except Exception as e:
-            app_logger.warning(f"Error caching embedding: {str(e)}")
+        self._cache_embeddings([(text, embedding)])
     
-    async def _cleanup_cache_if_needed(self) -> None:
-        """Clean up cache if it exceeds size or file limits"""
-        current_time = time.time()
-        
-        # Check if cleanup is needed (time-based or size-based)
-        if current_time - self.last_cleanup_time < self.cache_cleanup_interval:
+    def _cache_embeddings(self, items: List[tuple]) -> None:
+        """Append (text, embedding) pairs to the cache matrix"""
+        if self.store is None:
             return
-        
         try:
-            cache_files = list(self.cache_dir.glob("*.pkl"))
-            
-            if not cache_files:
-                return
-            
-            # Calculate total cache size
-            total_size = sum(f.stat().st_size for f in cache_files)
-            total_size_mb = total_size / (1024 * 1024)
-            
-            # Check if cleanup is needed
-            files_exceed = len(cache_files) > self.max_cache_files
-            size_exceeds = total_size_mb > self.max_cache_size_mb
-            
-            if files_exceed or size_exceeds:
-                app_logger.info(
-                    f"Cache cleanup needed: {len(cache_files)} files, {total_size_mb:.1f}MB "
-                    f"(limits: {self.max_cache_files} files, {self.max_cache_size_mb}MB)"
-                )
-                
-                # Sort by access time (LRU)
-                cache_files.sort(key=lambda f: f.stat().st_atime)
-                
-                # Remove oldest files
-                files_to_remove = max(
-                    len(cache_files) - self.max_cache_files,
-                    int(len(cache_files) * 0.3)  # Remove 30% if size limit exceeded
-                )
-                
-                removed_count = 0
-                for cache_file in cache_files[:files_to_remove]:
-                    try:
-                        cache_file.unlink()
-                        removed_count += 1
-                    except Exception as e:
-                        app_logger.warning(f"Error removing cache file {cache_file}: {str(e)}")
-                
-                app_logger.info(f"Removed {removed_count} old cache files")
-            
-            self.last_cleanup_time = current_time
-            
+            self.store.put_many([(self._get_cache_key(text), embedding) for text, embedding in items])
         except Exception as e:
-            app_logger.error(f"Error in cache cleanup: {str(e)}")
+            app_logger.warning(f"Error caching embeddings: {str(e)}")
     
     def cosine_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """Calculate cosine similarity between two embeddings"""
@@ -347,33 +328,26 @@ class EmbeddingService:
         candidate_embeddings: List[np.ndarray], 
         top_k: int = 5
     ) -> List[tuple]:
-        """Find most similar embeddings to query"""
-        similarities = []
-        
-        for i, candidate in enumerate(candidate_embeddings):
-            similarity = self.cosine_similarity(query_embedding, candidate)
-            similarities.append((i, similarity))
-        
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
-        return similarities[:top_k]
+        """Find most similar embeddings to query (one matmul + argpartition top-k)"""
+        return top_k_cosine(query_embedding, candidate_embeddings, top_k)
     
     async def get_embedding_stats(self) -> Dict[str, Any]:
         """Get statistics about the embedding service"""
-        cache_files = list(self.cache_dir.glob("*.pkl"))
+        store_stats = self.store.stats() if self.store else {}
         
         stats = {
             "model_name": settings.EMBEDDING_MODEL_NAME,
             "embedding_dimension": settings.EMBEDDING_DIMENSION,
             "device": self.device,
-            "cached_embeddings": len(cache_files),
-            "cache_size_mb": sum(f.stat().st_size for f in cache_files) / (1024 * 1024),
+            "cached_embeddings": store_stats.get("rows", 0),
+            "cache_size_mb": store_stats.get("size_mb", 0.0),
             "model_loaded": self.model is not None,
             "cache_limits": {
                 "max_size_mb": self.max_cache_size_mb,
                 "max_files": self.max_cache_files
-            }
+            },
+            "cache_store": store_stats,
+            "query_batching": self.query_batcher.get_stats()
         }
         
         if self.model:
@@ -384,10 +358,13 @@ class EmbeddingService:
     def clear_cache(self) -> None:
         """Clear the embedding cache"""
         try:
-            cache_files = list(self.cache_dir.glob("*.pkl"))
-            for cache_file in cache_files:
-                cache_file.unlink()
-            app_logger.info(f"Cleared {len(cache_files)} cached embeddings")
+            cleared = len(self.store) if self.store else 0
+            if self.store:
+                self.store.clear()
+            # Per-text pickle files from the previous cache format
+            for legacy_file in self.cache_dir.glob("*.pkl"):
+                legacy_file.unlink()
+            app_logger.info(f"Cleared {cleared} cached embeddings")
         except Exception as e:
             app_logger.error(f"Error clearing cache: {str(e)}")
 
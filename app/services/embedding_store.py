@@ -0,0 +1,308 @@
+"""
+Memory-mapped embedding cache store
+
+All cached vectors of a namespace live in one append-only float32 matrix
+file, with a key→row log next to it. Lookups are dict hits returning
+read-only numpy views into the memory map (no open/stat/unpickle per text),
+and the cache is bounded by LRU compaction into a new file generation
+instead of directory-wide stat scans. Raw float32 rows replace pickle, so
+reading the cache never executes code.
+
+Layout (per namespace, under the cache directory):
+- {namespace}.meta.json      current generation and dimension
+- {namespace}.{gen}.f32      row-major float32 matrix
+- {namespace}.{gen}.keys     "key<TAB>row" lines, appended after the row data
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core.logger import app_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+
+class EmbeddingMatrixStore:
+    """
+    Append-only float32 matrix + hash→row index for cached embeddings
+
+    Features:
+    - Zero-copy lookups (read-only views into a np.memmap)
+    - Appends shared across worker processes (flock + generation check)
+    - LRU compaction into a new generation when max_rows is exceeded
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        dimension: int,
+        namespace: str = "embeddings",
+        max_rows: Optional[int] = None,
+        compact_ratio: float = 0.7,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dimension = dimension
+        self.namespace = namespace
+        self.max_rows = max_rows
+        self.compact_ratio = compact_ratio
+        self.row_bytes = dimension * np.dtype(np.float32).itemsize
+
+        self._lock = threading.RLock()
+        self._meta_path = self.directory / f"{namespace}.meta.json"
+        self._lock_path = self.directory / f"{namespace}.lock"
+
+        self._generation = -1
+        self._index: Dict[str, int] = {}
+        self._last_used: Dict[int, int] = {}
+        self._clock = 0
+        self._keys_offset = 0
+        self._matrix: Optional[np.memmap] = None
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.appends = 0
+        self.compactions = 0
+
+        with self._lock, self._file_lock():
+            self._refresh()
+
+    # ------------------------------------------------------------------
+    # Files
+    # ------------------------------------------------------------------
+
+    def _data_path(self, generation: int) -> Path:
+        return self.directory / f"{self.namespace}.{generation}.f32"
+
+    def _keys_path(self, generation: int) -> Path:
+        return self.directory / f"{self.namespace}.{generation}.keys"
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive lock shared by every process using this namespace"""
+        with open(self._lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_generation(self) -> int:
+        """Current generation from the meta file (held under the file lock)"""
+        try:
+            meta = json.loads(self._meta_path.read_text())
+            if meta.get("dimension") == self.dimension:
+                return int(meta["generation"])
+            app_logger.info(
+                f"Embedding store {self.namespace}: dimension changed "
+                f"({meta.get('dimension')} -> {self.dimension}), starting a new generation"
+            )
+            return self._write_generation(int(meta.get("generation", -1)) + 1)
+        except FileNotFoundError:
+            return self._write_generation(0)
+        except (ValueError, KeyError, TypeError):
+            app_logger.warning(f"Embedding store {self.namespace}: unreadable meta, starting over")
+            return self._write_generation(0)
+
+    def _write_generation(self, generation: int) -> int:
+        tmp_path = self._meta_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"generation": generation, "dimension": self.dimension}))
+        os.replace(tmp_path, self._meta_path)
+        return generation
+
+    def _refresh(self):
+        """Pick up a new generation and rows appended by other processes"""
+        generation = self._read_generation()
+        if generation != self._generation:
+            self._generation = generation
+            self._index.clear()
+            self._last_used.clear()
+            self._keys_offset = 0
+            self._matrix = None
+        self._ingest_keys()
+
+    def _ingest_keys(self):
+        """Index "key<TAB>row" lines appended since the last read"""
+        try:
+            with open(self._keys_path(self._generation), "rb") as f:
+                f.seek(self._keys_offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return
+
+        complete = chunk.rfind(b"\n") + 1
+        for line in chunk[:complete].decode("utf-8", errors="replace").splitlines():
+            key, _, row = line.rpartition("\t")
+            if key and row.isdigit():
+                self._index[key] = int(row)
+        self._keys_offset += complete
+
+    def _rows_on_disk(self) -> int:
+        try:
+            return self._data_path(self._generation).stat().st_size // self.row_bytes
+        except FileNotFoundError:
+            return 0
+
+    def _map(self):
+        rows = self._rows_on_disk()
+        self._matrix = (
+            np.memmap(self._data_path(self._generation), dtype=np.float32, mode="r", shape=(rows, self.dimension))
+            if rows else None
+        )
+
+    def _row_view(self, row: int) -> Optional[np.ndarray]:
+        if self._matrix is None or row >= self._matrix.shape[0]:
+            self._map()
+            if self._matrix is None or row >= self._matrix.shape[0]:
+                return None
+        self._clock += 1
+        self._last_used[row] = self._clock
+        return self._matrix[row]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Cached vector as a read-only view, or None"""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Cached vectors for several keys (None for misses)"""
+        with self._lock:
+            results = [None] * len(keys)
+            missing = []
+            for i, key in enumerate(keys):
+                row = self._index.get(key)
+                if row is not None:
+                    results[i] = self._row_view(row)
+                if results[i] is None:
+                    missing.append(i)
+
+            if missing:
+                # Rows appended (or compacted) by other worker processes
+                with self._file_lock():
+                    self._refresh()
+                for i in missing:
+                    row = self._index.get(keys[i])
+                    if row is not None:
+                        results[i] = self._row_view(row)
+
+            found = sum(result is not None for result in results)
+            self.hits += found
+            self.misses += len(keys) - found
+            return results
+
+    def put(self, key: str, vector: np.ndarray):
+        """Append one vector (no-op if the key is already stored)"""
+        self.put_many([(key, vector)])
+
+    def put_many(self, items: Sequence[Tuple[str, np.ndarray]]):
+        """Append vectors for keys not yet stored, compacting past max_rows"""
+        with self._lock, self._file_lock():
+            self._refresh()
+
+            new_items: Dict[str, np.ndarray] = {}
+            for key, vector in items:
+                if key in self._index or key in new_items:
+                    continue
+                vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+                if vector.shape[0] != self.dimension:
+                    app_logger.warning(
+                        f"Embedding store {self.namespace}: skipping vector of dimension "
+                        f"{vector.shape[0]} (expected {self.dimension})"
+                    )
+                    continue
+                new_items[key] = vector
+            if not new_items:
+                return
+
+            with open(self._data_path(self._generation), "ab") as data_file:
+                first_row = os.fstat(data_file.fileno()).st_size // self.row_bytes
+                # Drop a partial row left by an interrupted write
+                data_file.truncate(first_row * self.row_bytes)
+                data_file.write(np.stack(list(new_items.values())).tobytes())
+            with open(self._keys_path(self._generation), "a", encoding="utf-8") as keys_file:
+                keys_file.write(
+                    "".join(f"{key}\t{first_row + i}\n" for i, key in enumerate(new_items))
+                )
+
+            self.appends += len(new_items)
+            self._ingest_keys()
+            for row in range(first_row, first_row + len(new_items)):
+                self._clock += 1
+                self._last_used[row] = self._clock
+
+            if self.max_rows and len(self._index) > self.max_rows:
+                self._compact()
+
+    def _compact(self):
+        """Rewrite the most recently used rows into a new generation"""
+        self._map()
+        keep = max(1, int(self.max_rows * self.compact_ratio))
+        # Most recently used first; never-touched rows rank by recency of append
+        by_recency = sorted(
+            self._index.items(),
+            key=lambda item: (self._last_used.get(item[1], 0), item[1]),
+            reverse=True,
+        )[:keep]
+        by_recency = [(key, row) for key, row in by_recency if row < self._matrix.shape[0]]
+        by_recency.reverse()
+
+        old_generation = self._generation
+        new_generation = old_generation + 1
+        rows = [row for _, row in by_recency]
+        np.asarray(self._matrix[rows], dtype=np.float32).tofile(self._data_path(new_generation))
+        self._keys_path(new_generation).write_text(
+            "".join(f"{key}\t{i}\n" for i, (key, _) in enumerate(by_recency)), encoding="utf-8"
+        )
+        self._write_generation(new_generation)
+
+        last_used = {new_row: self._last_used.get(row, 0) for new_row, row in enumerate(rows)}
+        self._refresh()
+        self._last_used.update(last_used)
+        self.compactions += 1
+
+        for path in (self._data_path(old_generation), self._keys_path(old_generation)):
+            path.unlink(missing_ok=True)
+        app_logger.info(
+            f"Embedding store {self.namespace}: compacted to {len(rows)} rows "
+            f"(generation {new_generation})"
+        )
+
+    def clear(self):
+        """Drop every cached vector (starts an empty generation)"""
+        with self._lock, self._file_lock():
+            old_generation = self._generation
+            self._write_generation(old_generation + 1)
+            self._refresh()
+            for path in (self._data_path(old_generation), self._keys_path(old_generation)):
+                path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Store usage statistics"""
+        rows = self._rows_on_disk()
+        return {
+            "rows": len(self._index),
+            "size_mb": round(rows * self.row_bytes / (1024 * 1024), 3),
+            "generation": self._generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "appends": self.appends,
+            "compactions": self.compactions,
+            "max_rows": self.max_rows,
+        }
@@ -6,8 +6,6 @@ from __future__ import annotations
 import os
 import asyncio
 import hashlib
-import json
-import time
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Union
 from concurrent.futures import ThreadPoolExecutor
@@ -15,6 +13,8 @@ import numpy as np
 
 from ..core.config import settings
 from ..core.logger import app_logger
+from .embedding_store import EmbeddingMatrixStore
+from .similarity_index import top_k_cosine
 
 
 class HybridEmbeddingService:
@@ -31,6 +31,7 @@ class HybridEmbeddingService:
         self.fallback_service = None
         self.last_resort_service = None
         self.cache_dir: Optional[Path] = None
+        self.stores: Dict[int, EmbeddingMatrixStore] = {}
         self.use_gcp_embeddings = getattr(settings, 'USE_GCP_EMBEDDINGS', False)
         self._initialized = False
     
@@ -48,6 +49,14 @@ class HybridEmbeddingService:
         app_logger.info(f"Hybrid Embedding service initialized - GCP enabled: {self.use_gcp_embeddings}")
         self.cache_dir = Path(settings.EMBEDDING_CACHE_DIR)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # One matrix per vector size: local/TF-IDF vectors and Vertex AI vectors differ
+        max_rows = getattr(settings, 'EMBEDDING_CACHE_FILES', 1000)
+        self.stores = {
+            dimension: EmbeddingMatrixStore(
+                self.cache_dir, dimension, namespace=f"hybrid_{dimension}", max_rows=max_rows
+            )
+            for dimension in (settings.EMBEDDING_DIMENSION, GCPEmbeddingWrapper.dimension)
+        }
         self._initialized = True
     
     async def initialize_model(self) -> None:
@@ -136,98 +145,118 @@ class HybridEmbeddingService:
     
     async def embed_text(self, text: str) -> List[float]:
         """Generate embedding using the best available service"""
+        return (await self.embed_texts([text]))[0]
+    
+    async def embed_texts(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts
+        
+        Cache lookups are done in bulk and all misses go to the best available
+        service in one batched call (one model.encode / multi-instance Vertex
+        request / one TF-IDF transform) instead of one call per text.
+        """
         self._ensure_initialized()
-        if not text or not text.strip():
-            return [0.0] * 384
+        if not texts:
+            return []
+        batch_size = batch_size or getattr(settings, 'EMBEDDING_BATCH_SIZE', 32)
         
-        # Check cache first
-        cache_key = self._get_cache_key(text)
-        cached_embedding = await self._get_cached_embedding(cache_key)
-        if cached_embedding is not None:
-            return cached_embedding
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        positions: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = [0.0] * 384
+            else:
+                positions.setdefault(text, []).append(i)
         
-        embedding = None
-        service_used = "none"
+        # Check cache first
+        unique_texts = list(positions)
+        cache_keys = [self._get_cache_key(text) for text in unique_texts]
+        cached_embeddings = await self._get_cached_embeddings(cache_keys)
         
-        # Try primary service (Sentence Transformers - FREE)
-        if self.primary_service:
-            try:
-                embedding = await self.primary_service.embed_text(text)
-                service_used = "sentence-transformers (FREE)"
-            except Exception as e:
-                app_logger.warning(f"Primary service failed: {str(e)}")
+        misses = []
+        for text, cache_key, cached in zip(unique_texts, cache_keys, cached_embeddings):
+            if cached is None:
+                misses.append((text, cache_key))
+            else:
+                for i in positions[text]:
+                    results[i] = cached
         
-        # Try fallback service (GCP - PAID)
-        if embedding is None and self.fallback_service:
-            try:
-                embedding = await self.fallback_service.embed_text(text)
-                service_used = "gcp-vertex-ai (PAID)"
-            except Exception as e:
-                app_logger.warning(f"Fallback service failed: {str(e)}")
+        if misses:
+            embeddings, service_used = await self._generate_embeddings(
+                [text for text, _ in misses], batch_size
+            )
+            app_logger.debug(f"{len(misses)} embeddings generated using: {service_used}")
+            
+            for (text, _), embedding in zip(misses, embeddings):
+                for i in positions[text]:
+                    results[i] = embedding
+            
+            # Cache the results
+            await self._cache_embeddings(
+                [(cache_key, embedding) for (_, cache_key), embedding in zip(misses, embeddings)]
+            )
         
-        # Try last resort (TF-IDF - FREE but lower quality)
-        if embedding is None and self.last_resort_service:
+        return results
+    
+    async def _generate_embeddings(self, texts: List[str], batch_size: int):
+        """Embed texts with the first service that handles the whole batch"""
+        services = [
+            (self.primary_service, "sentence-transformers (FREE)", app_logger.warning),
+            (self.fallback_service, "gcp-vertex-ai (PAID)", app_logger.warning),
+            (self.last_resort_service, "tfidf (FREE, lower quality)", app_logger.error),
+        ]
+        for service, service_used, log in services:
+            if not service:
+                continue
             try:
-                embedding = await self.last_resort_service.embed_text(text)
-                service_used = "tfidf (FREE, lower quality)"
+                embeddings = await service.embed_texts(texts, batch_size=batch_size)
+                if len(embeddings) == len(texts):
+                    return embeddings, service_used
+                raise ValueError(f"expected {len(texts)} embeddings, got {len(embeddings)}")
             except Exception as e:
-                app_logger.error(f"Last resort service failed: {str(e)}")
+                log(f"{service_used} failed: {str(e)}")
         
         # Final fallback - zero vector
-        if embedding is None:
-            embedding = [0.0] * 384
-            service_used = "zero-vector (fallback)"
-        
-        app_logger.debug(f"Embedding generated using: {service_used}")
-        
-        # Cache the result
-        await self._cache_embedding(cache_key, embedding)
-        return embedding
-    
-    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts"""
-        self._ensure_initialized()
-        if not texts:
-            return []
-        
-        # Process in batches for efficiency
-        embeddings = []
-        for text in texts:
-            embedding = await self.embed_text(text)
-            embeddings.append(embedding)
-        
-        return embeddings
+        return [[0.0] * 384 for _ in texts], "zero-vector (fallback)"
     
     def _get_cache_key(self, text: str) -> str:
         """Generate cache key for text"""
         return hashlib.md5(f"hybrid_embedding_{text}".encode()).hexdigest()
     
-    async def _get_cached_embedding(self, cache_key: str) -> Optional[List[float]]:
-        """Get embedding from cache"""
-        cache_file = self.cache_dir / f"{cache_key}.json"
-        
-        if cache_file.exists():
+    async def _get_cached_embeddings(self, cache_keys: List[str]) -> List[Optional[List[float]]]:
+        """Get embeddings from cache (None for misses)"""
+        results: List[Optional[List[float]]] = [None] * len(cache_keys)
+        for store in self.stores.values():
+            missing = [i for i, result in enumerate(results) if result is None]
+            if not missing:
+                break
             try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                return data.get('embedding')
+                cached = store.get_many([cache_keys[i] for i in missing])
             except Exception as e:
                 app_logger.warning(f"Cache read error: {str(e)}")
+                continue
+            for i, embedding in zip(missing, cached):
+                if embedding is not None:
+                    results[i] = embedding.tolist()
         
-        return None
+        return results
     
-    async def _cache_embedding(self, cache_key: str, embedding: List[float]) -> None:
-        """Cache embedding to disk"""
-        cache_file = self.cache_dir / f"{cache_key}.json"
+    async def _cache_embeddings(self, items: List[tuple]) -> None:
+        """Cache (cache_key, embedding) pairs to disk, one matrix per vector size"""
+        by_dimension: Dict[int, List[tuple]] = {}
+        for cache_key, embedding in items:
+            by_dimension.setdefault(len(embedding), []).append(
+                (cache_key, np.asarray(embedding, dtype=np.float32))
+            )
         
-        try:
-            with open(cache_file, 'w') as f:
-                json.dump({
-                    'embedding': embedding,
-                    'timestamp': time.time()
-                }, f)
-        except Exception as e:
-            app_logger.warning(f"Cache write error: {str(e)}")
+        for dimension, dimension_items in by_dimension.items():
+            store = self.stores.get(dimension)
+            if store is None:
+                continue
+            try:
+                store.put_many(dimension_items)
+            except Exception as e:
+                app_logger.warning(f"Cache write error: {str(e)}")
     
     @staticmethod
     def cosine_similarity(a: List[float], b: List[float]) -> float:
@@ -250,6 +279,13 @@ class HybridEmbeddingService:
             
         except Exception:
             return 0.0
+    
+    @staticmethod
+    def find_most_similar(
+        query_embedding: List[float], candidate_embeddings: List[List[float]], top_k: int = 5
+    ) -> List[tuple]:
+        """(index, cosine similarity) of the top_k candidates, one matmul for all"""
+        return top_k_cosine(query_embedding, candidate_embeddings, top_k)
 
 
 # Wrapper classes for different services
@@ -263,58 +299,73 @@ class SentenceTransformersWrapper:
     
     async def embed_text(self, text: str) -> List[float]:
         """Generate embedding using Sentence Transformers"""
+        return (await self.embed_texts([text]))[0]
+    
+    async def embed_texts(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
+        """One model.encode call for all texts (batched internally by the model)"""
         loop = asyncio.get_event_loop()
-        embedding = await loop.run_in_executor(
+        embeddings = await loop.run_in_executor(
             self.executor,
-            lambda: self.model.encode([text], convert_to_numpy=True)[0].tolist()
+            lambda: self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
         )
-        return embedding
+        return embeddings.tolist()
 
 
 class GCPEmbeddingWrapper:
     """Wrapper for GCP Vertex AI"""
     
+    # textembedding-gecko output size
+    dimension = 768
+    
     def __init__(self, client, settings):
         self.client = client
         self.project_id = getattr(settings, 'GOOGLE_PROJECT_ID', '')
         self.location = getattr(settings, 'GOOGLE_LOCATION', 'us-central1')
         self.model_name = "textembedding-gecko@003"
+        # Instances per predict request (Vertex AI allows up to 250 for gecko in us-central1)
+        self.max_instances = getattr(settings, 'GCP_EMBEDDING_BATCH_SIZE', 250)
     
     async def embed_text(self, text: str) -> List[float]:
         """Generate embedding using GCP Vertex AI with Gemini"""
+        return (await self.embed_texts([text]))[0]
+    
+    async def embed_texts(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:  # noqa: ARG002
+        """Multi-instance predict requests (up to max_instances texts each)"""
         try:
-            from google.cloud import aiplatform
             from google.protobuf import json_format
             from google.protobuf.struct_pb2 import Value
             
             # Prepare the request
-            endpoint = f"projects/{self.project_id}/locations/{self.location}/publishers/google/models/textembedding-gecko@003"
+            endpoint = f"projects/{self.project_id}/locations/{self.location}/publishers/google/models/{self.model_name}"
+            parameters = json_format.ParseDict({}, Value())
             
-            # Create the instance
-            instance_dict = {
-                "content": text,
-                "task_type": "RETRIEVAL_QUERY"
-            }
-            
-            instance = json_format.ParseDict(instance_dict, Value())
-            
-            # Make the prediction request
-            response = self.client.predict(
-                endpoint=endpoint,
-                instances=[instance],
-                parameters=json_format.ParseDict({}, Value())
-            )
-            
-            # Extract embedding from response
-            if response.predictions:
-                prediction = response.predictions[0]
-                embedding_values = prediction.get("embeddings", {}).get("values", [])
+            embeddings = []
+            for offset in range(0, len(texts), self.max_instances):
+                instances = [
+                    json_format.ParseDict({"content": text, "task_type": "RETRIEVAL_QUERY"}, Value())
+                    for text in texts[offset:offset + self.max_instances]
+                ]
+                
+                # Make the prediction request off the event loop
+                loop = asyncio.get_event_loop()
+                response = await loop.run_in_executor(
+                    None,
+                    lambda: self.client.predict(
+                        endpoint=endpoint, instances=instances, parameters=parameters
+                    )
+                )
                 
-                if embedding_values:
-                    return list(embedding_values)
+                # Extract embeddings from response
+                for prediction in response.predictions:
+                    embedding_values = prediction.get("embeddings", {}).get("values", [])
+                    if not embedding_values:
+                        raise Exception("No embedding returned from Vertex AI")
+                    embeddings.append(list(embedding_values))
             
             # If no valid response, raise error to trigger fallback
-            raise Exception("No embedding returned from Vertex AI")
+            if len(embeddings) != len(texts):
+                raise Exception(f"Vertex AI returned {len(embeddings)} embeddings for {len(texts)} texts")
+            return embeddings
             
         except Exception as e:
             app_logger.error(f"GCP Vertex AI embedding failed: {str(e)}")
@@ -335,31 +386,31 @@ class TFIDFWrapper:
     
     async def embed_text(self, text: str) -> List[float]:
         """Generate embedding using TF-IDF"""
+        return (await self.embed_texts([text]))[0]
+    
+    async def embed_texts(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:  # noqa: ARG002
+        """One vectorized transform for all texts, padded/truncated to 384 dimensions"""
         try:
             if not self.fitted:
                 # Fit with some basic texts
-                self.vectorizer.fit(self.fallback_texts + [text])
+                self.vectorizer.fit(self.fallback_texts + list(texts))
                 self.fitted = True
             
-            # Transform text to TF-IDF vector
-            tfidf_matrix = self.vectorizer.transform([text])
-            dense_embedding = tfidf_matrix.toarray()[0].tolist()
+            # Transform all texts to TF-IDF vectors at once
+            dense = self.vectorizer.transform(texts).toarray()
             
             # Pad or truncate to 384 dimensions
-            if len(dense_embedding) < 384:
-                dense_embedding.extend([0.0] * (384 - len(dense_embedding)))
-            else:
-                dense_embedding = dense_embedding[:384]
-            
-            return dense_embedding
+            embeddings = np.zeros((len(texts), 384))
+            width = min(384, dense.shape[1])
+            embeddings[:, :width] = dense[:, :width]
+            return embeddings.tolist()
             
         except Exception as e:
             # Hash-based embedding as absolute fallback
-            embedding = []
-            for i in range(384):
-                hash_val = hash(f"{text}_{i}") % 1000000
-                embedding.append(hash_val / 1000000.0 - 0.5)
-            return embedding
+            return [
+                [hash(f"{text}_{i}") % 1000000 / 1000000.0 - 0.5 for i in range(384)]
+                for text in texts
+            ]
 
 
 # ========== LAZY SINGLETON PATTERN ==========
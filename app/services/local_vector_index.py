@@ -0,0 +1,229 @@
+"""
+Persisted in-process vector index mirroring the Qdrant collection
+
+VectorStore writes every upsert/delete here as well, so when Qdrant is
+unreachable the fallback path still ranks documents by the same embeddings
+and payload filters instead of by word overlap.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+from ..core.logger import app_logger
+from .similarity_index import SimilarityIndex
+
+
+class LocalVectorIndex:
+    """
+    Flat cosine index over Qdrant points, persisted next to the fallback data
+
+    Features:
+    - SimilarityIndex rows (one matmul + argpartition per query)
+    - Inverted postings for category/keywords filters (Qdrant filter semantics)
+    - Atomic snapshot to {name}.npy + {name}.json after each write
+    - Lazy load on first use; dimension change resets the index
+
+    Point ids are kept as strings, matching SearchResult.id.
+    """
+
+    def __init__(self, name: str, directory: Optional[str] = None):
+        self.name = name
+        self.directory = Path(
+            directory or getattr(settings, 'LOCAL_VECTOR_INDEX_DIR', './fallback_data/vectors')
+        )
+        self.vectors_file = self.directory / f"{name}.npy"
+        self.payloads_file = self.directory / f"{name}.json"
+
+        self.index: Optional[SimilarityIndex] = None
+        self.payloads: Dict[Hashable, Dict[str, Any]] = {}
+        self._postings: Dict[Tuple[str, Any], Set[Hashable]] = {}
+        self._loaded = False
+
+        # Metrics
+        self.searches = 0
+        self.saves = 0
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self.index) if self.index is not None else 0
+
+    @property
+    def dimension(self) -> Optional[int]:
+        self._ensure_loaded()
+        return self.index.dimension if self.index is not None else None
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not (self.vectors_file.exists() and self.payloads_file.exists()):
+            return
+
+        try:
+            with open(self.payloads_file, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            vectors = np.load(self.vectors_file)
+            if len(snapshot["ids"]) != len(vectors):
+                raise ValueError(f"{len(snapshot['ids'])} ids for {len(vectors)} vectors")
+
+            self._reset(vectors.shape[1], len(vectors))
+            self._add(snapshot["ids"], vectors, snapshot["payloads"])
+            app_logger.info(f"Loaded local vector index '{self.name}' with {len(vectors)} points")
+        except Exception as e:
+            app_logger.warning(f"Discarding unreadable local vector index '{self.name}': {str(e)}")
+            self.index = None
+            self.payloads.clear()
+            self._postings.clear()
+
+    def _reset(self, dimension: int, capacity: int = 1024):
+        self.index = SimilarityIndex(dimension, initial_capacity=capacity)
+        self.payloads.clear()
+        self._postings.clear()
+
+    def _postings_keys(self, payload: Dict[str, Any]):
+        category = payload.get("category")
+        if category:
+            yield ("category", category)
+        for keyword in payload.get("keywords") or []:
+            yield ("keywords", keyword)
+
+    def _add(self, ids: Sequence[Hashable], vectors: Sequence[Any], payloads: Sequence[Dict[str, Any]]):
+        self._discard_postings(ids)
+        self.index.add(ids, vectors)
+        for point_id, payload in zip(ids, payloads):
+            self.payloads[point_id] = payload
+            for key in self._postings_keys(payload):
+                self._postings.setdefault(key, set()).add(point_id)
+
+    def _discard_postings(self, ids: Sequence[Hashable]):
+        for point_id in ids:
+            payload = self.payloads.pop(point_id, None)
+            if payload is None:
+                continue
+            for key in self._postings_keys(payload):
+                members = self._postings.get(key)
+                if members is not None:
+                    members.discard(point_id)
+                    if not members:
+                        del self._postings[key]
+
+    def upsert(self, points: Sequence[Tuple[Hashable, Any, Dict[str, Any]]], save: bool = True):
+        """Insert or replace (id, vector, payload) points"""
+        if not points:
+            return
+        self._ensure_loaded()
+
+        dimension = len(points[0][1])
+        if self.index is None or self.index.dimension != dimension:
+            if self.index is not None:
+                app_logger.warning(
+                    f"Embedding dimension changed ({self.index.dimension} -> {dimension}), "
+                    f"resetting local vector index '{self.name}'"
+                )
+            self._reset(dimension, max(1024, len(points)))
+
+        ids, vectors, payloads = zip(*points)
+        self._add(
+            [str(point_id) for point_id in ids],
+            np.asarray(vectors, dtype=np.float32),
+            list(payloads),
+        )
+        if save:
+            self.save()
+
+    def delete(self, ids: Sequence[Hashable], save: bool = True) -> int:
+        """Remove points by id; returns how many were present"""
+        self._ensure_loaded()
+        if self.index is None:
+            return 0
+        ids = [str(point_id) for point_id in ids]
+        self._discard_postings(ids)
+        removed = self.index.remove(ids)
+        if removed and save:
+            self.save()
+        return removed
+
+    def clear(self):
+        """Drop every point and the snapshot on disk"""
+        self._loaded = True
+        self.index = None
+        self.payloads.clear()
+        self._postings.clear()
+        for path in (self.vectors_file, self.payloads_file):
+            path.unlink(missing_ok=True)
+
+    def _filter_mask(
+        self, category: Optional[str], keywords: Optional[List[str]]
+    ) -> Optional[np.ndarray]:
+        """Rows matching any filter condition (same as the Qdrant 'should' filter)"""
+        keys = ([("category", category)] if category else []) + [
+            ("keywords", keyword) for keyword in keywords or []
+        ]
+        if not keys:
+            return None
+        matching: Set[Hashable] = set()
+        for key in keys:
+            matching |= self._postings.get(key, set())
+        return self.index.mask_for(matching)
+
+    def search(
+        self,
+        query_vector: Any,
+        limit: int = 5,
+        score_threshold: Optional[float] = None,
+        category: Optional[str] = None,
+        keywords: Optional[List[str]] = None,
+    ) -> List[Tuple[Hashable, float, Dict[str, Any]]]:
+        """Top (id, score, payload) by cosine similarity, optionally filtered"""
+        self._ensure_loaded()
+        if self.index is None or self.index.dimension != len(query_vector):
+            return []
+
+        self.searches += 1
+        mask = self._filter_mask(category, keywords)
+        return [
+            (point_id, score, self.payloads[point_id])
+            for point_id, score in self.index.search(
+                query_vector, top_k=limit, min_score=score_threshold, mask=mask
+            )
+        ]
+
+    def save(self):
+        """Atomically write the vectors and payloads snapshot"""
+        if self.index is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            ids = self.index.ids
+            tmp_vectors = self.vectors_file.with_suffix(".npy.tmp")
+            tmp_payloads = self.payloads_file.with_suffix(".json.tmp")
+
+            with open(tmp_vectors, "wb") as f:
+                np.save(f, self.index.vectors())
+            with open(tmp_payloads, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"ids": ids, "payloads": [self.payloads[point_id] for point_id in ids]},
+                    f,
+                    ensure_ascii=False,
+                )
+
+            os.replace(tmp_vectors, self.vectors_file)
+            os.replace(tmp_payloads, self.payloads_file)
+            self.saves += 1
+        except Exception as e:
+            app_logger.error(f"Error saving local vector index '{self.name}': {str(e)}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index usage statistics"""
+        self._ensure_loaded()
+        return {
+            "points": len(self),
+            "dimension": self.dimension,
+            "filter_values": len(self._postings),
+            "searches": self.searches,
+            "saves": self.saves,
+        }
@@ -18,7 +18,7 @@ import uuid
 from ..core.logger import app_logger
 from ..core.config import settings
 from ..models.message import MessageType, MessageResponse
-from ..clients.google_calendar import GoogleCalendarClient
+from ..clients.google_calendar_async import get_async_calendar_client
 from ..clients.evolution_api import EvolutionAPIClient
 from ..services.enhanced_cache_service import EnhancedCacheService
 
@@ -94,7 +94,7 @@ class MessagePostprocessor:
     
     def __init__(self):
         # Initialize clients and cache
-        self.calendar_client = GoogleCalendarClient()
+        self.calendar_client = get_async_calendar_client()
         self.evolution_client = EvolutionAPIClient() 
         self.cache_service = EnhancedCacheService()
         
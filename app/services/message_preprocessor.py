@@ -5,7 +5,6 @@ Implements pure preprocessing without orchestration - focused on security and fo
 """
 
 import base64
-import json
 import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -16,7 +15,7 @@ import pytz
 from ..clients.evolution_api import WhatsAppMessage
 from ..core.config import settings
 from ..core.logger import app_logger
-from ..services.enhanced_cache_service import CacheLayer, enhanced_cache_service
+from ..security.distributed_rate_limiter import DistributedRateLimiter
 
 
 @dataclass
@@ -93,17 +92,18 @@ class MessageSanitizer:
 
 class RateLimiter:
     """
-    Phone number based rate limiting with Redis backend
+    Phone number based rate limiting shared across workers (Redis GCRA)
     """
 
     def __init__(self):
         self.messages_per_minute = 50
         self.burst_tolerance = 10
         self.window_size_seconds = 60
+        self.shared_limiter = DistributedRateLimiter(key_prefix="ratelimit:phone")
 
     async def check_rate_limit(self, phone_number: str) -> bool:
         """
-        Check rate limit status for phone number using sliding window algorithm
+        Check rate limit status for phone number (one atomic Redis round trip)
 
         Args:
             phone_number: Phone number to check
@@ -112,44 +112,23 @@ class RateLimiter:
             True if request is allowed, False if rate limited
         """
         try:
-            cache_key = f"rate_limit:{phone_number}"
-            current_time = datetime.now()
-            window_start = current_time - timedelta(seconds=self.window_size_seconds)
-
-            # Get current request timestamps from cache
-            cached_requests = await enhanced_cache_service.get(cache_key, CacheLayer.L1)
-            if cached_requests:
-                request_timestamps = json.loads(cached_requests)
-            else:
-                request_timestamps = []
-
-            # Filter out old requests (outside window)
-            recent_requests = [
-                ts for ts in request_timestamps if datetime.fromisoformat(ts) > window_start
-            ]
-
-            # Check if under limit
-            if len(recent_requests) < self.messages_per_minute:
-                # Add current request timestamp
-                recent_requests.append(current_time.isoformat())
-
-                # Store updated timestamps
-                await enhanced_cache_service.set(
-                    cache_key,
-                    json.dumps(recent_requests),
-                    CacheLayer.L1,
-                    ttl=self.window_size_seconds + 10,  # Extra TTL buffer
-                )
+            decision = await self.shared_limiter.hit(
+                phone_number, {"minute": (self.messages_per_minute, self.window_size_seconds)}
+            )
 
+            if decision.allowed:
                 app_logger.debug(
-                    f"Rate limit check passed for {phone_number}: {len(recent_requests)}/{self.messages_per_minute}"
+                    f"Rate limit check passed for {phone_number}: "
+                    f"{decision.usage.get('minute', 0)}/{self.messages_per_minute}"
                 )
                 return True
-            else:
-                app_logger.warning(
-                    f"Rate limit exceeded for {phone_number}: {len(recent_requests)}/{self.messages_per_minute}"
-                )
-                return False
+
+            app_logger.warning(
+                f"Rate limit exceeded for {phone_number}: "
+                f"{decision.usage['minute']}/{self.messages_per_minute} "
+                f"(retry after {decision.retry_after:.1f}s)"
+            )
+            return False
 
         except Exception as e:
             app_logger.error(f"Error checking rate limit for {phone_number}: {str(e)}")
@@ -5,6 +5,7 @@ Custom checkpointer that integrates with workflow state repository
 
 import asyncio
 import json
+import threading
 from typing import Optional, Dict, Any, Iterator, Tuple, List
 from uuid import uuid4
 
@@ -486,8 +487,341 @@ class PostgreSQLCheckpointSaver(BaseCheckpointSaver):
             app_logger.error(f"Error during checkpointer cleanup: {e}")
 
 
+# ---------------------------------------------------------------------------
+# Async pooled checkpointer for the ONE_TURN graph
+# ---------------------------------------------------------------------------
+
+_TURN_CHECKPOINTS_DDL = """
+    CREATE TABLE IF NOT EXISTS langgraph_turn_checkpoints (
+        thread_id TEXT NOT NULL,
+        checkpoint_ns TEXT NOT NULL DEFAULT '',
+        checkpoint_id TEXT NOT NULL,
+        parent_checkpoint_id TEXT,
+        checkpoint_type TEXT NOT NULL,
+        checkpoint BYTEA NOT NULL,
+        metadata_type TEXT,
+        metadata BYTEA,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (thread_id, checkpoint_ns)
+    )
+"""
+
+# SQL fixo: o statement cache do asyncpg prepara cada consulta uma única vez por conexão
+_SELECT_LATEST_SQL = """
+    SELECT checkpoint_id, parent_checkpoint_id, checkpoint_type, checkpoint,
+           metadata_type, metadata
+    FROM langgraph_turn_checkpoints
+    WHERE thread_id = $1 AND checkpoint_ns = $2
+"""
+
+_UPSERT_SQL = """
+    INSERT INTO langgraph_turn_checkpoints (
+        thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id,
+        checkpoint_type, checkpoint, metadata_type, metadata, updated_at
+    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, NOW())
+    ON CONFLICT (thread_id, checkpoint_ns) DO UPDATE SET
+        checkpoint_id = EXCLUDED.checkpoint_id,
+        parent_checkpoint_id = EXCLUDED.parent_checkpoint_id,
+        checkpoint_type = EXCLUDED.checkpoint_type,
+        checkpoint = EXCLUDED.checkpoint,
+        metadata_type = EXCLUDED.metadata_type,
+        metadata = EXCLUDED.metadata,
+        updated_at = NOW()
+"""
+
+
+def _asyncpg_dsn(conn_string: str) -> str:
+    """Normalize SQLAlchemy-style URLs (postgresql+asyncpg://) for asyncpg"""
+    scheme, sep, rest = conn_string.partition("://")
+    return f"{scheme.split('+', 1)[0]}{sep}{rest}"
+
+
+class AsyncPooledCheckpointSaver(PostgreSQLCheckpointSaver):
+    """
+    Async, connection-pooled checkpointer for the ONE_TURN graph
+
+    - asyncpg pool created lazily on the running event loop, so concurrent
+      conversations no longer share (and block on) a single DB socket
+    - Keeps only the latest checkpoint per thread (the webhook reads the last
+      state; history lives in the state itself) with one UPSERT per turn
+    - Fixed SQL text, prepared once per pooled connection via the asyncpg
+      statement cache (statement_cache_size=0 for PgBouncer transaction mode)
+    - Optional write-behind: aput returns immediately and a per-thread writer
+      persists the newest checkpoint; reads see unflushed checkpoints first.
+      Failed UPSERTs are retried with backoff; a checkpoint that still cannot
+      be written stays pending and flush()/aclose() raise
+    """
+
+    def __init__(
+        self,
+        conn_string: str,
+        min_size: int = 2,
+        max_size: int = 10,
+        statement_cache_size: int = 100,
+        command_timeout: float = 10.0,
+        write_behind: bool = False,
+        write_retries: int = 3,
+        retry_delay: float = 0.2,
+    ):
+        super().__init__()
+        self.dsn = _asyncpg_dsn(conn_string)
+        self.pool_config = {
+            "min_size": min_size,
+            "max_size": max_size,
+            "statement_cache_size": statement_cache_size,
+            "command_timeout": command_timeout,
+            "server_settings": {"jit": "off"},
+        }
+        self.write_behind = write_behind
+        self.write_retries = write_retries
+        self.retry_delay = retry_delay
+        self.pool = None
+        self._pool_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # loop the pool was opened on
+        # (thread_id, checkpoint_ns) -> linha ainda não persistida (write-behind)
+        self._unflushed: Dict[Tuple[str, str], Tuple] = {}
+        self._writers: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stats = {"reads": 0, "writes": 0, "coalesced": 0, "write_failures": 0}
+
+    @classmethod
+    def from_conn_string(cls, conn_string: str, **kwargs: Any) -> "AsyncPooledCheckpointSaver":
+        """Build the saver; the pool itself is opened on first use"""
+        return cls(conn_string, **kwargs)
+
+    async def initialize(self):
+        """Create the pool and the checkpoint table (idempotent)"""
+        if self.pool is not None:
+            return
+
+        if self._pool_lock is None:
+            self._pool_lock = asyncio.Lock()
+
+        async with self._pool_lock:
+            if self.pool is not None:
+                return
+
+            import asyncpg
+
+            pool = await asyncpg.create_pool(self.dsn, **self.pool_config)
+            async with pool.acquire() as conn:
+                await conn.execute(_TURN_CHECKPOINTS_DDL)
+
+            self.pool = pool
+            self._loop = asyncio.get_running_loop()
+            self.is_initialized = True
+            app_logger.info(
+                f"CHECKPOINTER|pool_ready|min={self.pool_config['min_size']}|"
+                f"max={self.pool_config['max_size']}|write_behind={self.write_behind}"
+            )
+
+    @staticmethod
+    def _key(config: Dict[str, Any]) -> Tuple[str, str]:
+        configurable = config.get("configurable", {})
+        return str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")
+
+    def _to_tuple(self, key: Tuple[str, str], row: Tuple) -> CheckpointTuple:
+        """Deserialize a stored row into a CheckpointTuple"""
+        checkpoint_id, parent_id, checkpoint_type, checkpoint, metadata_type, metadata = row
+        thread_id, checkpoint_ns = key
+
+        def _config(cp_id: str) -> Dict[str, Any]:
+            return {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": cp_id,
+                }
+            }
+
+        return CheckpointTuple(
+            config=_config(checkpoint_id),
+            checkpoint=self.serde.loads_typed((checkpoint_type, bytes(checkpoint))),
+            metadata=(
+                self.serde.loads_typed((metadata_type, bytes(metadata))) if metadata else {}
+            ),
+            parent_config=_config(parent_id) if parent_id else None,
+        )
+
+    async def aget_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        """Latest checkpoint for the thread (unflushed write-behind first)"""
+        if not config.get("configurable", {}).get("thread_id"):
+            return None
+
+        key = self._key(config)
+        pending = self._unflushed.get(key)
+        if pending is not None:
+            return self._to_tuple(key, pending[2:])
+
+        await self.initialize()
+        self.stats["reads"] += 1
+        async with self.pool.acquire() as conn:
+            record = await conn.fetchrow(_SELECT_LATEST_SQL, *key)
+
+        if record is None:
+            return None
+        return self._to_tuple(key, tuple(record))
+
+    async def alist(self, config: Dict[str, Any], *, filter=None, before=None, limit=None):
+        """Only the latest checkpoint is kept per thread"""
+        if config is None or limit == 0:
+            return
+        latest = await self.aget_tuple(config)
+        if latest is not None:
+            yield latest
+
+    async def aput(
+        self,
+        config: Dict[str, Any],
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Persist the checkpoint (or queue it when write-behind is on)"""
+        key = self._key(config)
+        checkpoint_type, checkpoint_bytes = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_bytes = self.serde.dumps_typed(metadata)
+        row = (
+            *key,
+            checkpoint["id"],
+            config.get("configurable", {}).get("checkpoint_id"),
+            checkpoint_type,
+            checkpoint_bytes,
+            metadata_type,
+            metadata_bytes,
+        )
+
+        if self.write_behind:
+            if key in self._unflushed:
+                self.stats["coalesced"] += 1
+            self._unflushed[key] = row
+            writer = self._writers.get(key)
+            if writer is None or writer.done():
+                self._writers[key] = asyncio.create_task(self._drain(key))
+        else:
+            await self._write(row)
+
+        return {
+            "configurable": {
+                "thread_id": key[0],
+                "checkpoint_ns": key[1],
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def _write(self, row: Tuple) -> None:
+        await self.initialize()
+        async with self.pool.acquire() as conn:
+            await conn.execute(_UPSERT_SQL, *row)
+        self.stats["writes"] += 1
+
+    async def _drain(self, key: Tuple[str, str]) -> None:
+        """Write-behind worker: persist the newest row until nothing is pending"""
+        failures = 0
+        try:
+            while key in self._unflushed:
+                # Cada tentativa grava a linha mais recente (coalescida durante o backoff)
+                row = self._unflushed[key]
+                try:
+                    await self._write(row)
+                except Exception as e:
+                    failures += 1
+                    self.stats["write_failures"] += 1
+                    if failures >= self.write_retries:
+                        # Continua pendente: a próxima aput ou flush() tenta de novo
+                        app_logger.error(
+                            f"CHECKPOINTER|write_behind_failed|thread={key[0]}|"
+                            f"attempts={failures}|error={e}"
+                        )
+                        return
+                    app_logger.warning(
+                        f"CHECKPOINTER|write_behind_retry|thread={key[0]}|attempt={failures}|error={e}"
+                    )
+                    await asyncio.sleep(self.retry_delay * 2 ** (failures - 1))
+                    continue
+                failures = 0
+                if self._unflushed.get(key) is row:
+                    del self._unflushed[key]
+        finally:
+            self._writers.pop(key, None)
+
+    async def flush(self) -> None:
+        """Wait for every pending write-behind checkpoint; raise if any is still unwritten"""
+        while self._writers:
+            await asyncio.gather(*list(self._writers.values()), return_exceptions=True)
+
+        # Checkpoints cujos writers desistiram: última tentativa, erro propagado
+        errors = []
+        for key, row in list(self._unflushed.items()):
+            try:
+                await self._write(row)
+            except Exception as e:
+                self.stats["write_failures"] += 1
+                errors.append(e)
+                continue
+            if self._unflushed.get(key) is row:
+                del self._unflushed[key]
+        if errors:
+            app_logger.error(
+                f"CHECKPOINTER|flush_failed|unwritten={len(self._unflushed)}|error={errors[0]}"
+            )
+            raise errors[0]
+
+    async def aclose(self) -> None:
+        """Flush pending writes and close the pool"""
+        try:
+            await self.flush()
+        finally:
+            if self.pool is not None:
+                await self.pool.close()
+                self.pool = None
+                self.is_initialized = False
+
+    # Sync API (graph.invoke, get_state): bridged to the loop that owns the pool
+
+    def _sync_loop(self) -> asyncio.AbstractEventLoop:
+        """Loop running the pool, or a private background loop when none is running"""
+        if self._loop is not None and self._loop.is_running():
+            return self._loop
+        if self._loop is not None:
+            # Pool connections belong to a loop that has stopped; reopen on the new one
+            self.pool = None
+            self._pool_lock = None
+            self.is_initialized = False
+
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="checkpointer-loop", daemon=True).start()
+        self._loop = loop
+        return loop
+
+    def _run_sync(self, coro):
+        loop = self._sync_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise asyncio.InvalidStateError(
+                "Synchronous checkpointer calls from the pool's event loop would deadlock; "
+                "use aget_tuple/aput/alist"
+            )
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def get_tuple(self, config: Dict[str, Any]) -> Optional[CheckpointTuple]:
+        return self._run_sync(self.aget_tuple(config))
+
+    def put(self, config, checkpoint, metadata, new_versions=None):
+        return self._run_sync(self.aput(config, checkpoint, metadata, new_versions))
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        async def _collect():
+            return [item async for item in self.alist(config, filter=filter, before=before, limit=limit)]
+
+        yield from self._run_sync(_collect())
+
+
 # Global PostgreSQL checkpointer instance
 postgres_checkpointer = PostgreSQLCheckpointSaver()
 
 # Export the main class with an alias for compatibility
-PostgresCheckpointer = PostgreSQLCheckpointSaver
\ No newline at end of file
+PostgresCheckpointer = PostgreSQLCheckpointSaver
@@ -9,6 +9,10 @@ from pathlib import Path
 
 from ..core.config import settings
 from ..core.logger import app_logger
+from .bm25_index import BM25Index, tokenize
+
+# Keywords are curated matching terms: index them with extra weight
+KEYWORD_FIELD_WEIGHT = 2
 
 
 class FewShotExample:
@@ -28,6 +32,8 @@ class RAGEngine:
     def __init__(self):
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
         self.few_shot_examples = self._load_few_shot_examples()
+        self.example_index = BM25Index()
+        self._rebuild_example_index()
         app_logger.info(f"RAG Engine initialized with {len(self.few_shot_examples)} few-shot examples")
     
     def _load_few_shot_examples(self) -> List[FewShotExample]:
@@ -93,41 +99,24 @@ class RAGEngine:
             )
         ]
     
+    @staticmethod
+    def _example_tokens(example: FewShotExample) -> List[str]:
+        """Index terms for an example: question plus weighted keywords"""
+        keyword_tokens = tokenize(" ".join(example.keywords))
+        return tokenize(example.question) + keyword_tokens * KEYWORD_FIELD_WEIGHT
+    
+    def _rebuild_example_index(self):
+        """Index every loaded example (doc id = position in few_shot_examples)"""
+        self.example_index.clear()
+        for position, example in enumerate(self.few_shot_examples):
+            self.example_index.add(position, self._example_tokens(example))
+    
     def _find_similar_examples(self, question: str, max_examples: int = 3) -> List[FewShotExample]:
-        """Find similar examples based on keywords and content with improved scoring"""
-        
-        question_lower = question.lower()
-        scored_examples = []
-        
-        for example in self.few_shot_examples:
-            score = 0
-            
-            # Keyword matching (high weight)
-            for keyword in example.keywords:
-                if keyword.lower() in question_lower:
-                    score += 5
-            
-            # Question text similarity (medium weight)
-            example_words = example.question.lower().split()
-            question_words = question_lower.split()
-            
-            for word in question_words:
-                if len(word) > 3:  # Only consider meaningful words
-                    if word in example.question.lower():
-                        score += 3
-                    elif any(word in example_word for example_word in example_words):
-                        score += 1
-            
-            # Category bonus for direct matches
-            if any(cat_word in question_lower for cat_word in ["preço", "custa", "valor"] if example.category == "pricing"):
-                score += 2
-            
-            if score > 0:
-                scored_examples.append((score, example))
-        
-        # Sort by score and return top examples
-        scored_examples.sort(key=lambda x: x[0], reverse=True)
-        return [example for score, example in scored_examples[:max_examples]]
+        """Find similar examples by BM25 over stemmed question and keyword terms"""
+        return [
+            self.few_shot_examples[position]
+            for position, _ in self.example_index.search(tokenize(question), max_examples)
+        ]
     
     async def answer_question(self, question: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Answer user question using few-shot learning approach"""
@@ -254,6 +243,7 @@ class RAGEngine:
         
         new_example = FewShotExample(question, answer, category, keywords or [], context)
         self.few_shot_examples.append(new_example)
+        self.example_index.add(len(self.few_shot_examples) - 1, self._example_tokens(new_example))
         
         app_logger.info(f"Added new few-shot example in category: {category}")
     
@@ -268,6 +258,7 @@ class RAGEngine:
     def reload_examples(self):
         """Reload examples from JSON file"""
         self.few_shot_examples = self._load_few_shot_examples()
+        self._rebuild_example_index()
         app_logger.info(f"Reloaded few-shot examples: {len(self.few_shot_examples)} examples")
     
     def get_example_stats(self) -> Dict[str, Any]:
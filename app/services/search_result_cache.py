@@ -0,0 +1,94 @@
+"""
+Short-TTL cache of vector search results
+
+Repeated FAQ questions produce the same query embedding; caching the
+results by (embedding hash, search parameters) lets VectorStore skip the
+Qdrant round trip. Any write to the collection clears the cache.
+"""
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+
+
+class SearchResultCache:
+    """
+    In-memory LRU of search results with a short TTL
+
+    Features:
+    - Key: sha1 of the float32 query embedding + limit/threshold/filters
+    - Oldest entries evicted past max_entries; expired entries dropped on read
+    - Deep copies in and out, so callers can't mutate cached results
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = (
+            getattr(settings, 'QDRANT_SEARCH_CACHE_TTL', 60) if ttl_seconds is None else ttl_seconds
+        )
+        self.max_entries = (
+            getattr(settings, 'QDRANT_SEARCH_CACHE_SIZE', 1024) if max_entries is None else max_entries
+        )
+        self._entries: "OrderedDict[Hashable, Tuple[float, List[Any]]]" = OrderedDict()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(
+        query_embedding: Any,
+        limit: int,
+        score_threshold: Optional[float],
+        category_filter: Optional[str] = None,
+        keyword_filter: Optional[List[str]] = None,
+    ) -> Tuple:
+        digest = hashlib.sha1(np.asarray(query_embedding, dtype=np.float32).tobytes()).hexdigest()
+        keywords = tuple(sorted(keyword_filter)) if keyword_filter else ()
+        return (digest, limit, score_threshold, category_filter, keywords)
+
+    def get(self, key: Hashable) -> Optional[List[Any]]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry[1])
+
+    def set(self, key: Hashable, results: List[Any]):
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.deepcopy(results))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every entry (called after collection writes)"""
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache usage statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds,
+        }
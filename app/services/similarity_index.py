@@ -0,0 +1,179 @@
+"""
+Matrix-backed cosine similarity index
+
+Candidates are kept L2-normalized in one contiguous float32 matrix, so a
+query is a single matmul over all rows (or one matmul for a batch of
+queries) followed by argpartition for the top-k, instead of a Python loop
+over candidates and a full sort.
+"""
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalization (zero rows stay zero)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _top_k(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of the top_k scores, best first (argpartition + sort of k)"""
+    if top_k <= 0 or scores.shape[0] == 0:
+        return np.empty(0, dtype=np.int64)
+    if top_k < scores.shape[0]:
+        candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def top_k_cosine(
+    query: np.ndarray, candidates: Sequence[np.ndarray], top_k: int = 5
+) -> List[Tuple[int, float]]:
+    """(index, cosine similarity) of the top_k candidates for an ad-hoc list"""
+    if len(candidates) == 0:
+        return []
+    scores = _normalize(np.stack(candidates)) @ _normalize(query)
+    return [(int(i), float(scores[i])) for i in _top_k(scores, top_k)]
+
+
+class SimilarityIndex:
+    """
+    Flat cosine similarity index with incremental add/remove
+
+    Features:
+    - Pre-normalized float32 rows in a growable contiguous matrix
+    - One matmul per query (or per batch of queries) + argpartition top-k
+    - Upsert by id; removal swaps the last row into the freed slot
+    """
+
+    def __init__(self, dimension: int, initial_capacity: int = 1024):
+        self.dimension = dimension
+        self._matrix = np.zeros((max(1, initial_capacity), dimension), dtype=np.float32)
+        self._ids: List[Hashable] = []
+        self._rows: Dict[Hashable, int] = {}
+
+        # Metrics
+        self.searches = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return item_id in self._rows
+
+    @property
+    def ids(self) -> List[Hashable]:
+        """Ids in row order"""
+        return list(self._ids)
+
+    def _reserve(self, rows: int):
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+        grown[: len(self._ids)] = self._matrix[: len(self._ids)]
+        self._matrix = grown
+
+    def add(self, ids: Sequence[Hashable], vectors: Sequence[np.ndarray]):
+        """Insert or replace vectors by id"""
+        if len(ids) == 0:
+            return
+        vectors = _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dimension))
+        self._reserve(len(self._ids) + len(ids))
+
+        for item_id, vector in zip(ids, vectors):
+            row = self._rows.get(item_id)
+            if row is None:
+                row = len(self._ids)
+                self._ids.append(item_id)
+                self._rows[item_id] = row
+            self._matrix[row] = vector
+
+    def remove(self, ids: Iterable[Hashable]) -> int:
+        """Remove vectors by id; returns how many were present"""
+        removed = 0
+        for item_id in ids:
+            row = self._rows.pop(item_id, None)
+            if row is None:
+                continue
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._ids.pop()
+            removed += 1
+        return removed
+
+    def clear(self):
+        self._ids.clear()
+        self._rows.clear()
+
+    def mask_for(self, ids: Iterable[Hashable]) -> np.ndarray:
+        """Boolean row mask selecting the given ids (unknown ids are ignored)"""
+        mask = np.zeros(len(self._ids), dtype=bool)
+        mask[[self._rows[item_id] for item_id in ids if item_id in self._rows]] = True
+        return mask
+
+    def vectors(self) -> np.ndarray:
+        """Normalized vectors in row order (view)"""
+        return self._matrix[: len(self._ids)]
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int = 5,
+        min_score: Optional[float] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Top-k (id, cosine similarity) for one query
+
+        Args:
+            mask: optional boolean array over rows; False rows are excluded
+        """
+        return self.search_batch(np.asarray(query)[None, :], top_k, min_score, mask)[0]
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int = 5,
+        min_score: Optional[float] = None,
+        mask: Optional[np.ndarray] = None,
+    ) -> List[List[Tuple[Hashable, float]]]:
+        """Top-k (id, cosine similarity) per query, one matmul for the batch"""
+        self.searches += len(queries)
+        if not self._ids:
+            return [[] for _ in range(len(queries))]
+
+        # Masked searches only score the selected rows
+        rows = np.flatnonzero(mask) if mask is not None else None
+        matrix = self.vectors() if rows is None else self.vectors()[rows]
+        scores = _normalize(queries) @ matrix.T
+
+        results = []
+        for row_scores in scores:
+            hits = []
+            for position in _top_k(row_scores, top_k):
+                score = float(row_scores[position])
+                if min_score is not None and score < min_score:
+                    break
+                row = position if rows is None else rows[position]
+                hits.append((self._ids[row], score))
+            results.append(hits)
+        return results
+
+    def get_stats(self) -> Dict[str, int]:
+        """Index usage statistics"""
+        return {
+            "vectors": len(self._ids),
+            "capacity": self._matrix.shape[0],
+            "dimension": self.dimension,
+            "searches": self.searches,
+        }
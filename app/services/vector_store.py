@@ -7,8 +7,9 @@ import uuid
 from dataclasses import asdict, dataclass
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+import httpx
 import numpy as np
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models
 from qdrant_client.http.models import (
     Distance,
@@ -25,6 +26,8 @@ from qdrant_client.http.models import (
 from ..core.config import settings
 from ..core.logger import app_logger
 from .embedding_service import embedding_service
+from .local_vector_index import LocalVectorIndex
+from .search_result_cache import SearchResultCache
 
 
 @dataclass
@@ -55,12 +58,34 @@ class VectorStore:
     """Vector store service using Qdrant for semantic search"""
 
     def __init__(self):
-        self.client: Optional[QdrantClient] = None
+        self.client: Optional[AsyncQdrantClient] = None
         self.collection_name = settings.QDRANT_COLLECTION_NAME
         self.embedding_dim = settings.EMBEDDING_DIMENSION
         self._initialized = False
         self._fallback_mode = False
         self._fallback_store = None
+        # Mirror of the collection used when Qdrant is unreachable
+        self.local_index = LocalVectorIndex(self.collection_name)
+        # Repeated questions skip the Qdrant round trip
+        self.search_cache = SearchResultCache()
+
+        # Bulk upserts: points per request and requests in flight
+        self.upsert_batch_size = getattr(settings, 'QDRANT_UPSERT_BATCH_SIZE', 256)
+        self.upsert_concurrency = getattr(settings, 'QDRANT_UPSERT_CONCURRENCY', 4)
+
+    def _create_client(self) -> AsyncQdrantClient:
+        """Async client with a bounded keep-alive pool (gRPC when QDRANT_PREFER_GRPC)"""
+        return AsyncQdrantClient(
+            url=settings.QDRANT_URL,
+            api_key=settings.QDRANT_API_KEY or None,
+            timeout=getattr(settings, 'QDRANT_TIMEOUT', 10),
+            prefer_grpc=getattr(settings, 'QDRANT_PREFER_GRPC', False),
+            limits=httpx.Limits(
+                max_connections=getattr(settings, 'QDRANT_MAX_CONNECTIONS', 20),
+                max_keepalive_connections=getattr(settings, 'QDRANT_MAX_KEEPALIVE', 10),
+                keepalive_expiry=30,
+            ),
+        )
 
     async def initialize(self) -> None:
         """Initialize the vector store connection and collection"""
@@ -68,21 +93,11 @@ class VectorStore:
             return
 
         try:
-            # Initialize Qdrant client with reduced timeout for faster fallback
-            if settings.QDRANT_API_KEY:
-                self.client = QdrantClient(
-                    url=settings.QDRANT_URL,
-                    api_key=settings.QDRANT_API_KEY,
-                    timeout=60,  # Maximum timeout for Railway network
-                )
-            else:
-                self.client = QdrantClient(
-                    url=settings.QDRANT_URL,
-                    timeout=60,  # Maximum timeout for Railway network
-                )
+            self.client = self._create_client()
 
             # Ensure collection exists
             await self._ensure_collection_exists()
+            await self._sync_local_index()
 
             self._initialized = True
             app_logger.info(f"Vector store initialized with collection: {self.collection_name}")
@@ -103,20 +118,31 @@ class VectorStore:
             # Set fallback mode
             self._fallback_mode = True
             self._fallback_store = robust_fallback_manager.vector_store
+            self._fallback_store.set_embedder(embedding_service.embed_texts)
 
             app_logger.info("✅ Vector store fallback mode activated successfully")
 
+    async def close(self) -> None:
+        """Close the Qdrant connection pool"""
+        if self.client is not None:
+            try:
+                await self.client.close()
+            except Exception as e:
+                app_logger.warning(f"Error closing Qdrant client: {str(e)}")
+            self.client = None
+        self._initialized = False
+
     async def _ensure_collection_exists(self) -> None:
         """Ensure the collection exists, create if it doesn't"""
         try:
             # Check if collection exists
-            collections = self.client.get_collections()
+            collections = await self.client.get_collections()
             collection_names = [col.name for col in collections.collections]
 
             if self.collection_name not in collection_names:
                 app_logger.info(f"Creating collection: {self.collection_name}")
 
-                self.client.create_collection(
+                await self.client.create_collection(
                     collection_name=self.collection_name,
                     vectors_config=VectorParams(size=self.embedding_dim, distance=Distance.COSINE),
                 )
@@ -129,6 +155,79 @@ class VectorStore:
             app_logger.error(f"Error ensuring collection exists: {str(e)}")
             raise
 
+    async def _sync_local_index(self) -> None:
+        """Rebuild the local fallback index from Qdrant when point counts differ"""
+        try:
+            collection_info = await self.client.get_collection(self.collection_name)
+            points_count = collection_info.points_count or 0
+            if points_count == len(self.local_index):
+                return
+
+            app_logger.info(
+                f"Syncing local vector index from Qdrant ({points_count} points, "
+                f"{len(self.local_index)} local)"
+            )
+            self.local_index.clear()
+            offset = None
+            while True:
+                records, offset = await self.client.scroll(
+                    collection_name=self.collection_name,
+                    limit=256,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+                self.local_index.upsert(
+                    [(record.id, record.vector, record.payload or {}) for record in records],
+                    save=False,
+                )
+                if offset is None:
+                    break
+            self.local_index.save()
+
+        except Exception as e:
+            app_logger.warning(f"Could not sync local vector index: {str(e)}")
+
+    def _mirror_to_local_index(self, documents: List[DocumentChunk]) -> None:
+        """Apply a Qdrant upsert to the local fallback index"""
+        try:
+            self.local_index.upsert(
+                [
+                    (
+                        doc.id,
+                        doc.embedding,
+                        {
+                            "content": doc.content,
+                            "category": doc.category,
+                            "keywords": doc.keywords,
+                            "metadata": doc.metadata,
+                        },
+                    )
+                    for doc in documents
+                    if doc.embedding is not None
+                ]
+            )
+        except Exception as e:
+            app_logger.warning(f"Local vector index upsert failed: {str(e)}")
+
+    async def _upsert_points(self, points: List[PointStruct]) -> List[models.UpdateStatus]:
+        """Upsert in chunks of upsert_batch_size, upsert_concurrency requests in flight"""
+        semaphore = asyncio.Semaphore(self.upsert_concurrency)
+
+        async def _upsert_chunk(chunk: List[PointStruct]) -> models.UpdateStatus:
+            async with semaphore:
+                result = await self.client.upsert(
+                    collection_name=self.collection_name, points=chunk, wait=True
+                )
+                return result.status
+
+        return await asyncio.gather(
+            *(
+                _upsert_chunk(points[start:start + self.upsert_batch_size])
+                for start in range(0, len(points), self.upsert_batch_size)
+            )
+        )
+
     async def add_documents(self, documents: List[DocumentChunk]) -> bool:
         """Add documents to the vector store"""
         if not self._initialized:
@@ -159,10 +258,6 @@ class VectorStore:
             points = []
             for doc in documents:
                 if doc.embedding is not None:
-                    app_logger.info(
-                        f"Creating PointStruct with ID: {doc.id} (type: {type(doc.id)})"
-                    )
-
                     point = PointStruct(
                         id=doc.id,  # DocumentChunk.id is now guaranteed to be int
                         vector=doc.embedding.tolist(),
@@ -173,20 +268,29 @@ class VectorStore:
                             "metadata": doc.metadata,
                         },
                     )
-
-                    app_logger.info(f"PointStruct created successfully with ID: {point.id}")
                     points.append(point)
 
+            if self._fallback_mode:
+                # Qdrant unavailable: searchable locally for now, but not persisted
+                # (the next sync from Qdrant rebuilds the local index), so callers must retry
+                self._mirror_to_local_index(documents)
+                app_logger.warning(
+                    f"Vector store in fallback mode: {len(points)} documents indexed locally only"
+                )
+                return False
+
             # Upload points to Qdrant
             if points:
-                result = self.client.upsert(collection_name=self.collection_name, points=points)
+                statuses = await self._upsert_points(points)
+                self._mirror_to_local_index(documents)
+                self.search_cache.clear()
 
                 app_logger.info(
-                    f"Successfully added {len(points)} documents to vector store. "
-                    f"Operation status: {result.status}"
+                    f"Successfully added {len(points)} documents to vector store "
+                    f"in {len(statuses)} request(s). Operation statuses: {set(statuses)}"
                 )
 
-                return result.status == models.UpdateStatus.COMPLETED
+                return all(status == models.UpdateStatus.COMPLETED for status in statuses)
 
             return True
 
@@ -206,9 +310,19 @@ class VectorStore:
         if not self._initialized:
             await self.initialize()
 
+        query_embedding = None
         try:
             # Generate query embedding
-            query_embedding = await embedding_service.embed_text(query)
+            query_embedding = await embedding_service.embed_query(query)
+            if self._fallback_mode:
+                raise ConnectionError("Qdrant unavailable (fallback mode)")
+
+            cache_key = self.search_cache.make_key(
+                query_embedding, limit, score_threshold, category_filter, keyword_filter
+            )
+            cached_results = self.search_cache.get(cache_key)
+            if cached_results is not None:
+                return cached_results
 
             # Build filter conditions
             filter_conditions = []
@@ -234,7 +348,7 @@ class VectorStore:
                     search_filter = Filter(should=filter_conditions)
 
             # Perform search
-            search_results = self.client.search(
+            search_results = await self.client.search(
                 collection_name=self.collection_name,
                 query_vector=query_embedding.tolist(),
                 query_filter=search_filter,
@@ -254,6 +368,7 @@ class VectorStore:
                     score=result.score,
                 )
                 results.append(search_result)
+            self.search_cache.set(cache_key, results)
 
             app_logger.info(
                 f"Vector search returned {len(results)} results for query",
@@ -269,10 +384,33 @@ class VectorStore:
         except Exception as e:
             app_logger.error(f"Error searching vector store: {str(e)}")
 
+            # Same embeddings and filters, served from the local mirror
+            if query_embedding is not None and len(self.local_index):
+                app_logger.warning(f"Using local vector index for query: {query[:50]}")
+                return [
+                    SearchResult(
+                        id=str(point_id),
+                        content=payload.get("content", ""),
+                        category=payload.get("category", ""),
+                        keywords=payload.get("keywords", []),
+                        metadata=payload.get("metadata", {}),
+                        score=score,
+                    )
+                    for point_id, score, payload in self.local_index.search(
+                        query_embedding,
+                        limit=limit,
+                        score_threshold=score_threshold,
+                        category=category_filter,
+                        keywords=keyword_filter,
+                    )
+                ]
+
             # If in fallback mode or if search fails, use fallback
             if getattr(self, "_fallback_mode", False) and hasattr(self, "_fallback_store"):
                 app_logger.warning(f"Using fallback vector search for query: {query[:50]}")
-                fallback_results = await self._fallback_store.search(query, limit)
+                fallback_results = await self._fallback_store.search(
+                    query, limit, query_embedding=query_embedding
+                )
 
                 # Convert fallback results to SearchResult format
                 results = []
@@ -296,14 +434,25 @@ class VectorStore:
         if not self._initialized:
             await self.initialize()
 
+        if self._fallback_mode:
+            # Qdrant unavailable: keep the local index in sync with Qdrant, callers must retry
+            app_logger.warning(
+                f"Vector store in fallback mode: {len(document_ids)} documents not deleted"
+            )
+            return False
+
         try:
-            result = self.client.delete(
+            result = await self.client.delete(
                 collection_name=self.collection_name,
                 points_selector=models.PointIdsList(points=document_ids),
             )
+            if result.status != models.UpdateStatus.COMPLETED:
+                return False
 
+            self.local_index.delete(document_ids)
+            self.search_cache.clear()
             app_logger.info(f"Deleted {len(document_ids)} documents from vector store")
-            return result.status == models.UpdateStatus.COMPLETED
+            return True
 
         except Exception as e:
             app_logger.error(f"Error deleting documents from vector store: {str(e)}")
@@ -319,7 +468,7 @@ class VectorStore:
             await self.initialize()
 
         try:
-            collection_info = self.client.get_collection(self.collection_name)
+            collection_info = await self.client.get_collection(self.collection_name)
 
             return {
                 "name": collection_info.config.name,
@@ -338,9 +487,12 @@ class VectorStore:
         if not self._initialized:
             await self.initialize()
 
+        self.local_index.clear()
+        self.search_cache.clear()
+
         try:
             # Delete the collection and recreate it
-            self.client.delete_collection(self.collection_name)
+            await self.client.delete_collection(self.collection_name)
             await self._ensure_collection_exists()
 
             app_logger.info(f"Cleared collection: {self.collection_name}")
@@ -363,7 +515,7 @@ class VectorStore:
             await self.initialize()
 
         try:
-            result = self.client.retrieve(collection_name=self.collection_name, ids=[document_id])
+            result = await self.client.retrieve(collection_name=self.collection_name, ids=[document_id])
 
             if result:
                 point = result[0]
@@ -387,12 +539,48 @@ class VectorStore:
         if not self._initialized:
             await self.initialize()
 
-        try:
-            # This would typically be used when changing embedding models
-            # For now, we'll just log that it's not implemented
-            app_logger.warning("Bulk embedding update not implemented yet")
+        if self._fallback_mode:
+            app_logger.warning("Bulk embedding update skipped: Qdrant unavailable")
             return False
 
+        try:
+            # Re-embed page by page; each page is upserted in parallel chunks
+            updated = 0
+            offset = None
+            while True:
+                records, offset = await self.client.scroll(
+                    collection_name=self.collection_name,
+                    limit=self.upsert_batch_size * self.upsert_concurrency,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+                if records:
+                    embeddings = await embedding_service.embed_texts(
+                        [(record.payload or {}).get("content", "") for record in records]
+                    )
+                    await self._upsert_points(
+                        [
+                            PointStruct(id=record.id, vector=embedding.tolist(), payload=record.payload)
+                            for record, embedding in zip(records, embeddings)
+                        ]
+                    )
+                    self.local_index.upsert(
+                        [
+                            (record.id, embedding, record.payload or {})
+                            for record, embedding in zip(records, embeddings)
+                        ],
+                        save=False,
+                    )
+                    updated += len(records)
+                if offset is None:
+                    break
+
+            self.local_index.save()
+            self.search_cache.clear()
+            app_logger.info(f"Bulk embedding update re-embedded {updated} documents")
+            return True
+
         except Exception as e:
             app_logger.error(f"Error in bulk embedding update: {str(e)}")
             return False
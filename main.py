@@ -5,6 +5,7 @@ Single endpoint: /webhook for Evolution API.
 from fastapi import FastAPI
 
 from app.api.evolution import router as evolution_router
+from app.core.http_pool import get_http_pool_stats
 
 # Create FastAPI app
 app = FastAPI(
@@ -25,7 +26,7 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "mode": "ONE_TURN"}
+    return {"status": "healthy", "mode": "ONE_TURN", "http_pool": get_http_pool_stats()}
 
 
 if __name__ == "__main__":
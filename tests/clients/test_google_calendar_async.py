@@ -0,0 +1,426 @@
+"""
+Tests for the async Google Calendar facade against a local fake Calendar server.
+Real googleapiclient requests (including the batch endpoint) run off the event loop.
+"""
+import asyncio
+import email
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+import httplib2
+import pytest
+from googleapiclient.discovery import build
+
+from app.clients.google_calendar import GoogleCalendarClient
+from app.clients import google_calendar_async
+from app.clients.google_calendar_async import (
+    AsyncGoogleCalendarClient,
+    CalendarRateLimitError,
+    get_async_calendar_client,
+)
+from app.services.calendar_busy_index import busy_interval_index
+from app.services.calendar_circuit_breaker import (
+    CalendarCircuitBreaker,
+    CircuitBreakerOpenError,
+    CircuitState,
+)
+from app.services.calendar_rate_limiter import CalendarRateLimiter
+
+CALENDAR_ID = "unit@calendar"
+DAY = datetime(2030, 1, 7, tzinfo=timezone.utc)
+
+
+class FakeCalendarState:
+    """In-memory calendar served by the fake HTTP server."""
+
+    def __init__(self):
+        self.events = {}
+        self.latency_s = 0.0
+        self.page_size = 2500
+        self.http_requests = 0
+        self.batch_requests = 0
+        self.fail_status = None
+        self.lock = threading.Lock()
+
+    def add(self, event_id, start, end):
+        self.events[event_id] = {
+            "id": event_id,
+            "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": end.isoformat()},
+        }
+
+    def handle(self, method, url, body):
+        """(status, payload) for one Calendar API call."""
+        time.sleep(self.latency_s)
+        if self.fail_status:
+            return self.fail_status, {"error": {"code": self.fail_status, "message": "boom"}}
+
+        parsed = urlparse(url)
+        parts = [unquote(p) for p in parsed.path.split("/") if p]
+        # [.../]calendars/{cid}/events[/{eid}]
+        tail = parts[parts.index("events") + 1:]
+        event_id = tail[0] if tail else None
+        query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+
+        with self.lock:
+            if method == "GET" and event_id is None:
+                lo = datetime.fromisoformat(query["timeMin"])
+                hi = datetime.fromisoformat(query["timeMax"])
+                if lo.tzinfo is None or hi.tzinfo is None:
+                    # A API real rejeita timeMin/timeMax sem offset
+                    return 400, {"error": {"code": 400, "message": "Bad Request"}}
+                items = [
+                    e
+                    for e in self.events.values()
+                    if datetime.fromisoformat(e["start"]["dateTime"]) < hi and
+                    datetime.fromisoformat(e["end"]["dateTime"]) > lo
+                ]
+                offset = int(query.get("pageToken", 0))
+                page = {"items": items[offset:offset + self.page_size]}
+                if offset + self.page_size < len(items):
+                    page["nextPageToken"] = str(offset + self.page_size)
+                return 200, page
+            if method == "GET":
+                if event_id not in self.events:
+                    return 404, {"error": {"code": 404, "message": "Not Found"}}
+                return 200, self.events[event_id]
+            if method == "POST":
+                new_id = f"evt{len(self.events)}"
+                self.events[new_id] = {"id": new_id, **json.loads(body)}
+                return 200, self.events[new_id]
+            if method == "DELETE":
+                self.events.pop(event_id, None)
+                return 204, None
+        return 405, {"error": {"code": 405}}
+
+
+def _make_handler(state: FakeCalendarState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _body(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def _send(self, status, payload, content_type="application/json"):
+            data = b"" if payload is None else (
+                payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+            )
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _dispatch(self, method):
+            state.http_requests += 1
+            body = self._body()
+            if self.path.startswith("/batch/"):
+                return self._batch(body)
+            self._send(*state.handle(method, self.path, body))
+
+        def _batch(self, body):
+            state.batch_requests += 1
+            message = email.message_from_bytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+            )
+            boundary = "fake_batch_boundary"
+            out = []
+            for part in message.get_payload():
+                payload = part.get_payload().replace("\r\n", "\n")
+                request_line, _, rest = payload.partition("\n")
+                method, url, _ = request_line.split(" ")
+                inner_body = rest.split("\n\n", 1)[1] if "\n\n" in rest else ""
+                status, payload = state.handle(method, url, inner_body)
+                content_id = part["Content-ID"].strip("<>")
+                out.append(
+                    f"--{boundary}\r\nContent-Type: application/http\r\n"
+                    f"Content-ID: <response-{content_id}>\r\n\r\n"
+                    f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n\r\n"
+                    f"{json.dumps(payload) if payload is not None else ''}\r\n"
+                )
+            out.append(f"--{boundary}--")
+            self._send(200, "".join(out).encode(), f"multipart/mixed; boundary={boundary}")
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+    return Handler
+
+
+@pytest.fixture
+def calendar_server():
+    state = FakeCalendarState()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.base_url = f"http://127.0.0.1:{server.server_port}/"
+    yield state
+    server.shutdown()
+
+
+class PermissiveRateLimiter(CalendarRateLimiter):
+    """Rate limiter with a bucket large enough for tests."""
+
+    def __init__(self):
+        super().__init__()
+        self.per_second_bucket.capacity = self.per_second_bucket.tokens = 10_000
+
+
+def _client(state, **kwargs) -> AsyncGoogleCalendarClient:
+    sync_client = GoogleCalendarClient.__new__(GoogleCalendarClient)
+    sync_client.credentials = None
+    sync_client.service = build(
+        "calendar",
+        "v3",
+        http=httplib2.Http(),
+        static_discovery=True,
+        client_options={"api_endpoint": state.base_url},
+    )
+    kwargs.setdefault("rate_limiter", PermissiveRateLimiter())
+    kwargs.setdefault("circuit_breaker", CalendarCircuitBreaker())
+    return AsyncGoogleCalendarClient(
+        sync_client=sync_client,
+        batch_uri=state.base_url + "batch/calendar/v3",
+        **kwargs,
+    )
+
+
+class TestAsyncCalendarClient:
+    """Reads, writes and batching through the fake server."""
+
+    @pytest.mark.asyncio
+    async def test_check_conflicts_and_busy_intervals(self, calendar_server):
+        calendar_server.add("a", DAY + timedelta(hours=10), DAY + timedelta(hours=11))
+        client = _client(calendar_server)
+
+        conflicts = await client.check_conflicts(
+            DAY + timedelta(hours=10, minutes=30), DAY + timedelta(hours=12), CALENDAR_ID
+        )
+        busy = await client.list_busy_intervals(DAY, DAY + timedelta(days=1), CALENDAR_ID)
+
+        assert [c["id"] for c in conflicts] == ["a"]
+        assert busy == [(DAY + timedelta(hours=10), DAY + timedelta(hours=11))]
+
+    @pytest.mark.asyncio
+    async def test_naive_datetimes_are_taken_as_local_time(self, calendar_server):
+        local_day = DAY.astimezone().replace(tzinfo=None)
+        calendar_server.add("a", DAY + timedelta(hours=10), DAY + timedelta(hours=11))
+        client = _client(calendar_server)
+
+        conflicts = await client.check_conflicts(
+            local_day + timedelta(hours=10, minutes=30), local_day + timedelta(hours=12), CALENDAR_ID
+        )
+        per_day = await client.list_events_batch([(local_day, local_day + timedelta(days=1))], CALENDAR_ID)
+
+        assert [c["id"] for c in conflicts] == ["a"]
+        assert [e["id"] for e in per_day[0]] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_pagination(self, calendar_server):
+        for i in range(5):
+            calendar_server.add(f"e{i}", DAY + timedelta(hours=i), DAY + timedelta(hours=i, minutes=30))
+        calendar_server.page_size = 2
+        client = _client(calendar_server)
+
+        events = await client.list_events(DAY, DAY + timedelta(days=1), CALENDAR_ID)
+
+        assert len(events) == 5
+        assert calendar_server.http_requests == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_list_and_get_use_one_http_request_each(self, calendar_server):
+        for i in range(14):
+            day = DAY + timedelta(days=i)
+            calendar_server.add(f"d{i}", day + timedelta(hours=9), day + timedelta(hours=10))
+        client = _client(calendar_server)
+
+        per_day = await client.list_events_batch(
+            [(DAY + timedelta(days=i), DAY + timedelta(days=i + 1)) for i in range(14)],
+            CALENDAR_ID,
+        )
+        events = await client.get_events(["d0", "d5", "missing"], CALENDAR_ID)
+
+        assert [[e["id"] for e in day] for day in per_day] == [[f"d{i}"] for i in range(14)]
+        assert [e and e["id"] for e in events] == ["d0", "d5", None]
+        assert calendar_server.http_requests == 2
+        assert calendar_server.batch_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_busy_index(self, calendar_server):
+        client = _client(calendar_server)
+        busy_interval_index.load(CALENDAR_ID, DAY, DAY + timedelta(days=1), [])
+
+        event_id = await client.create_event(
+            {
+                "calendar_id": CALENDAR_ID,
+                "start_time": DAY + timedelta(hours=15),
+                "end_time": DAY + timedelta(hours=16),
+            }
+        )
+
+        assert event_id in calendar_server.events
+        assert not busy_interval_index.covers(CALENDAR_ID, DAY, DAY + timedelta(hours=1))
+        assert await client.delete_event(event_id, CALENDAR_ID)
+        assert event_id not in calendar_server.events
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self, calendar_server):
+        calendar_server.latency_s = 0.2
+        client = _client(calendar_server)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await client.list_events(DAY, DAY + timedelta(days=1), CALENDAR_ID)
+        task.cancel()
+
+        assert ticks >= 10  # o loop continuou rodando durante a chamada bloqueante
+
+
+class TestSharedCalendarClient:
+    """One client (service, credentials, worker pool) per process."""
+
+    def test_call_sites_share_one_client(self, calendar_server, monkeypatch):
+        from app.services.availability_service import AvailabilityService
+        from app.services.availability_warmer import AvailabilityWarmer
+        from app.services.booking_service import BookingService
+
+        shared = _client(calendar_server)
+        monkeypatch.setattr(google_calendar_async, "_async_calendar_client", shared)
+
+        assert get_async_calendar_client() is shared
+        assert AvailabilityService().calendar_client is shared
+        assert BookingService().calendar_client is shared
+        assert AvailabilityWarmer().calendar_client is shared
+
+    def test_created_once(self, monkeypatch):
+        monkeypatch.setattr(google_calendar_async, "_async_calendar_client", None)
+
+        first = get_async_calendar_client()
+
+        assert get_async_calendar_client() is first
+        first.close()
+
+
+class TestAsyncCalendarResilience:
+    """Circuit breaker and rate limiter integration."""
+
+    @pytest.mark.asyncio
+    async def test_failures_open_circuit_breaker(self, calendar_server):
+        calendar_server.fail_status = 500
+        breaker = CalendarCircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        client = _client(calendar_server, circuit_breaker=breaker)
+
+        assert await client.list_busy_intervals(DAY, DAY + timedelta(days=1), CALENDAR_ID) is None
+        assert await client.list_busy_intervals(DAY, DAY + timedelta(days=1), CALENDAR_ID) is None
+        with pytest.raises(CircuitBreakerOpenError):
+            await client.list_events(DAY, DAY + timedelta(days=1), CALENDAR_ID)
+
+        assert calendar_server.http_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_half_open_allows_single_probe(self):
+        breaker = CalendarCircuitBreaker(failure_threshold=1, success_threshold=1)
+        breaker.state = CircuitState.OPEN
+        breaker.next_attempt_time = datetime.now() - timedelta(seconds=1)
+        calls = []
+
+        async def probe():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        results = await asyncio.gather(
+            *[breaker.call(probe) for _ in range(3)], return_exceptions=True
+        )
+
+        assert results.count("ok") == 1
+        assert sum(isinstance(r, CircuitBreakerOpenError) for r in results) == 2
+        assert len(calls) == 1
+        assert breaker.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens_and_releases_slot(self):
+        breaker = CalendarCircuitBreaker(failure_threshold=1, success_threshold=2)
+        breaker.state = CircuitState.HALF_OPEN
+
+        async def failing():
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            await breaker.call(failing)
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker._probe_in_flight is False
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_denial_raises(self, calendar_server):
+        limiter = CalendarRateLimiter()
+        limiter.per_second_bucket.tokens = 0
+        limiter.per_second_bucket.refill_rate = 0.001
+        client = _client(calendar_server, rate_limiter=limiter, max_rate_limit_wait=0.1)
+
+        with pytest.raises(CalendarRateLimitError):
+            await client.list_events(DAY, DAY + timedelta(days=1), CALENDAR_ID)
+        assert calendar_server.http_requests == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_are_not_serialized_by_breaker(self, calendar_server):
+        calendar_server.latency_s = 0.2
+        client = _client(calendar_server, max_workers=4)
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *[client.list_events(DAY, DAY + timedelta(days=1), CALENDAR_ID) for _ in range(4)]
+        )
+
+        assert time.perf_counter() - start < 0.6
+
+
+@pytest.mark.performance
+class TestAsyncCalendarBenchmark:
+    """14 daily event lists: sequential calls vs one batch request."""
+
+    @pytest.mark.asyncio
+    async def test_batch_vs_sequential(self, calendar_server):
+        calendar_server.latency_s = 0.01
+        client = _client(calendar_server)
+        ranges = [(DAY + timedelta(days=i), DAY + timedelta(days=i + 1)) for i in range(14)]
+
+        start = time.perf_counter()
+        for lo, hi in ranges:
+            await client.list_events(lo, hi, CALENDAR_ID)
+        sequential_ms = (time.perf_counter() - start) * 1000
+        sequential_requests, calendar_server.http_requests = calendar_server.http_requests, 0
+
+        start = time.perf_counter()
+        await client.list_events_batch(ranges, CALENDAR_ID)
+        batch_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"\nBENCH|gcal_async|sequential_requests={sequential_requests}|"
+            f"sequential_ms={sequential_ms:.1f}|batch_requests={calendar_server.http_requests}|"
+            f"batch_ms={batch_ms:.1f}"
+        )
+
+        assert calendar_server.http_requests == 1
+        assert sequential_requests == 14
@@ -0,0 +1,174 @@
+"""
+Tests for the shared pooled HTTP client used for Evolution API delivery.
+A local mock Evolution server counts TCP connections to show reuse.
+"""
+import asyncio
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.core import http_pool
+from app.core.delivery import send_text
+
+
+class _MockEvolutionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"messageId": f"msg_{self.server.connections}"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def evolution_server(monkeypatch):
+    """Mock Evolution API on localhost."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MockEvolutionHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setenv("EVOLUTION_API_URL", base_url)
+    monkeypatch.setenv("EVOLUTION_API_KEY", "test_api_key")
+    monkeypatch.setenv("RUNNING_IN_DOCKER", "0")
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Fresh client manager wired as the global one."""
+    fresh = http_pool.HTTPClientManager()
+    monkeypatch.setattr(http_pool, "http_client_manager", fresh)
+    return fresh
+
+
+class TestHTTPClientManager:
+    """Client lifecycle and keys."""
+
+    @pytest.mark.asyncio
+    async def test_same_key_shares_client(self, manager):
+        first = manager.get_client("evolution:kumon")
+
+        assert manager.get_client("evolution:kumon") is first
+        assert manager.get_client("evolution:other") is not first
+        await manager.aclose()
+
+    @pytest.mark.asyncio
+    async def test_closed_client_is_recreated(self, manager):
+        first = manager.get_client("evolution:kumon")
+        await manager.aclose()
+
+        assert first.is_closed
+        assert manager.get_client("evolution:kumon") is not first
+        await manager.aclose()
+
+    @pytest.mark.asyncio
+    async def test_client_from_finished_loop_is_closed(self, manager):
+        async def create():
+            return manager.get_client("evolution:kumon")
+
+        stale = await asyncio.to_thread(asyncio.run, create())
+        fresh = manager.get_client("evolution:kumon")
+        await asyncio.sleep(0.01)
+
+        assert fresh is not stale
+        assert stale.is_closed
+        await manager.aclose()
+
+    @pytest.mark.asyncio
+    async def test_client_closed_on_its_running_loop(self, manager):
+        async def create():
+            return manager.get_client("evolution:kumon")
+
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            stale = asyncio.run_coroutine_threadsafe(create(), other_loop).result()
+            manager.get_client("evolution:kumon")
+            for _ in range(50):
+                if stale.is_closed:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert stale.is_closed
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join()
+            other_loop.close()
+        await manager.aclose()
+
+    @pytest.mark.asyncio
+    async def test_send_text_reuses_connection(self, manager, evolution_server):
+        for i in range(5):
+            result = await send_text("5511999999999", f"mensagem {i}", "kumon")
+            assert result["sent"] == "true"
+
+        stats = manager.stats()["pools"]["evolution:kumon"]
+        assert evolution_server.connections == 1
+        assert stats["requests"] == 5
+        assert stats["new_connections"] == 1
+        assert stats["reuse_ratio"] == 0.8
+        assert stats["open_connections"] == 1
+        await manager.aclose()
+
+
+@pytest.mark.performance
+class TestHTTPPoolBenchmark:
+    """Fresh client per message vs shared keep-alive client."""
+
+    MESSAGES = 50
+
+    @pytest.mark.asyncio
+    async def test_shared_client_skips_handshakes(self, manager, evolution_server):
+        url = f"http://127.0.0.1:{evolution_server.server_address[1]}/message/sendText/kumon"
+        payload = {"number": "5511999999999", "textMessage": {"text": "oi"}}
+
+        start = time.perf_counter()
+        for _ in range(self.MESSAGES):
+            async with httpx.AsyncClient() as client:
+                await client.post(url, json=payload)
+        fresh_elapsed = time.perf_counter() - start
+        fresh_connections = evolution_server.connections
+
+        client = manager.get_client("evolution:kumon")
+        start = time.perf_counter()
+        for _ in range(self.MESSAGES):
+            await client.post(url, json=payload)
+        shared_elapsed = time.perf_counter() - start
+        shared_connections = evolution_server.connections - fresh_connections
+        stats = manager.stats()["pools"]["evolution:kumon"]
+
+        print(
+            f"\nBENCH|http_pool|messages={self.MESSAGES}|"
+            f"fresh_ms={fresh_elapsed * 1000:.1f}|shared_ms={shared_elapsed * 1000:.1f}|"
+            f"fresh_connections={fresh_connections}|shared_connections={shared_connections}|"
+            f"avg_handshake_ms={stats['avg_handshake_ms']}"
+        )
+
+        assert fresh_connections == self.MESSAGES
+        assert shared_connections == 1
+        assert shared_elapsed < fresh_elapsed
+        await manager.aclose()
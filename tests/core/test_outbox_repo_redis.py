@@ -0,0 +1,33 @@
+"""
+Tests for the Redis outbox handoff (Planner → Delivery).
+Planner persists with the sync client, Delivery drains with redis.asyncio.
+"""
+import fakeredis
+import pytest
+
+from app.core import outbox_repo_redis as outbox
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Sync and async fake clients sharing the same server."""
+    server = fakeredis.FakeServer()
+    sync_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    async_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(outbox, "_get_redis_client", lambda: sync_client)
+    monkeypatch.setattr(outbox, "_get_async_redis_client", lambda: async_client)
+    return sync_client
+
+
+class TestAsyncOutboxPop:
+    """Delivery drains the outbox without blocking the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_pop_all_returns_messages_and_clears_key(self, fake_redis):
+        outbox.outbox_push("conv-1", [{"text": "Olá"}, {"text": "Tudo bem?"}])
+
+        messages = await outbox.async_outbox_pop_all("conv-1")
+
+        assert [m["text"] for m in messages] == ["Olá", "Tudo bem?"]
+        assert not fake_redis.exists("outbox:conv-1")
+        assert await outbox.async_outbox_pop_all("conv-1") == []
@@ -0,0 +1,282 @@
+"""
+Tests for TurnController Redis list buffering and atomic flush.
+Ensures bursts from one phone never lose or duplicate messages.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import fakeredis
+import pytest
+
+from app.core import turn_controller as tc
+
+PHONE = "5511999990000"
+
+
+@pytest.fixture
+def cache():
+    """Fresh in-memory Redis with Lua scripting support."""
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+class TestTurnBuffer:
+    """Append / flush semantics of the turn buffer."""
+
+    def test_append_uses_list_and_last_ts(self, cache):
+        """Each append is one list entry plus the latest timestamp."""
+        tc.append_user_message(cache, PHONE, "m1", "oi", 1000)
+        tc.append_user_message(cache, PHONE, "m2", "tudo bem?", 1500)
+
+        assert cache.llen(tc._turn_key(PHONE)) == 2
+        assert cache.get(tc._last_ts_key(PHONE)) == "1500"
+        assert 0 < cache.ttl(tc._turn_key(PHONE)) <= tc.TURN_TTL_S
+
+    def test_last_ts_never_moves_backwards(self, cache):
+        """Out-of-order arrivals keep the newest timestamp."""
+        tc.append_user_message(cache, PHONE, "m1", "a", 5000)
+        tc.append_user_message(cache, PHONE, "m2", "b", 4000)
+
+        assert cache.get(tc._last_ts_key(PHONE)) == "5000"
+
+    def test_flush_waits_inside_debounce_window(self, cache):
+        """Buffer is kept while the debounce window is open."""
+        tc.append_user_message(cache, PHONE, "m1", "oi", 1000)
+
+        assert tc.flush_turn_if_quiet(cache, PHONE, 1000 + tc.DEBOUNCE_MS - 1) is None
+        assert cache.llen(tc._turn_key(PHONE)) == 1
+
+    def test_flush_drains_quiet_turn(self, cache):
+        """Quiet turn is aggregated and removed in one call."""
+        tc.append_user_message(cache, PHONE, "m1", "oi", 1000)
+        tc.append_user_message(cache, PHONE, "m2", "  ", 1100)
+        tc.append_user_message(cache, PHONE, "m3", "quero matrícula", 1200)
+
+        batch = tc.flush_turn_if_quiet(cache, PHONE, 1200 + tc.DEBOUNCE_MS)
+
+        assert batch["message_count"] == 3
+        assert batch["text"] == "oi\nquero matrícula"
+        assert batch["turn_id"] == tc.make_turn_id(PHONE, "m1", 1000)
+        assert batch["span_ms"] == 200
+        assert not cache.exists(tc._turn_key(PHONE), tc._last_ts_key(PHONE))
+        assert tc.flush_turn_if_quiet(cache, PHONE, 99999) is None
+
+    def test_flush_empty_buffer(self, cache):
+        """No buffer means nothing to flush."""
+        assert tc.flush_turn_if_quiet(cache, PHONE, 1000) is None
+
+    def test_turn_status_reads_list(self, cache):
+        """Debug status reflects the list buffer."""
+        tc.append_user_message(cache, PHONE, "m1", "oi", 1000)
+
+        status = tc.get_turn_status(cache, PHONE)
+
+        assert status["buffer_size"] == 1
+        assert status["buffer_msgs"][0]["id"] == "m1"
+        assert status["has_lock"] is False
+
+
+class TestTurnBufferConcurrency:
+    """Burst traffic from one phone across many workers."""
+
+    def test_concurrent_appends_and_flushes_lose_nothing(self, cache):
+        """Every message is flushed exactly once under contention."""
+        total = 400
+        flushed = []
+
+        def worker(i: int):
+            tc.append_user_message(cache, PHONE, f"m{i}", f"msg {i}", i)
+            batch = tc.flush_turn_if_quiet(cache, PHONE, i + tc.DEBOUNCE_MS)
+            return batch["messages"] if batch else []
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            for messages in pool.map(worker, range(total)):
+                flushed.extend(messages)
+
+        # Drain anything still buffered after the burst
+        tail = tc.flush_turn_if_quiet(cache, PHONE, total + 10 * tc.DEBOUNCE_MS)
+        if tail:
+            flushed.extend(tail["messages"])
+
+        ids = [msg["id"] for msg in flushed]
+        assert len(ids) == total
+        assert set(ids) == {f"m{i}" for i in range(total)}
+
+
+class TestAsyncIngest:
+    """redis.asyncio hot path: dedup + append + lock in one pipeline."""
+
+    @pytest.fixture
+    def async_cache(self, monkeypatch):
+        """Async fake Redis wired as the shared async client."""
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        monkeypatch.setattr("app.core.cache_manager.get_async_redis", lambda: client)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_ingest_appends_and_takes_lock(self, async_cache):
+        """First delivery buffers the message and acquires the turn lock."""
+        result = await tc.async_ingest_user_message(
+            async_cache, PHONE, "m1", "oi", 1000, "conv_1"
+        )
+
+        assert result == {"duplicate": False, "buffer_size": 1, "lock_acquired": True}
+        assert await async_cache.exists("turnlock:conv_1")
+        assert await async_cache.llen(tc._turn_key(PHONE)) == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_is_not_buffered_and_releases_lock(self, async_cache):
+        """Redelivered webhook neither buffers nor holds the lock."""
+        await tc.async_ingest_user_message(async_cache, PHONE, "m1", "oi", 1000, "conv_1")
+        await async_cache.delete("turnlock:conv_1")
+
+        result = await tc.async_ingest_user_message(
+            async_cache, PHONE, "m1", "oi", 1001, "conv_1"
+        )
+
+        assert result["duplicate"] is True
+        assert result["lock_acquired"] is False
+        assert not await async_cache.exists("turnlock:conv_1")
+        assert await async_cache.llen(tc._turn_key(PHONE)) == 1
+
+    @pytest.mark.asyncio
+    async def test_async_lock_and_flush(self, async_cache):
+        """Pre-acquired lock is released and the quiet turn flushed."""
+        from app.core.turn_lock import async_turn_lock
+
+        ingest = await tc.async_ingest_user_message(
+            async_cache, PHONE, "m1", "oi", 1000, "conv_1"
+        )
+
+        async with async_turn_lock("conv_1", acquired=ingest["lock_acquired"]) as held:
+            assert held is True
+            batch = await tc.async_flush_turn_if_quiet(
+                async_cache, PHONE, 1000 + tc.DEBOUNCE_MS
+            )
+
+        assert batch["text"] == "oi"
+        assert not await async_cache.exists("turnlock:conv_1")
+
+
+class TestDebounceScheduler:
+    """Timer-driven flush of quiet turns."""
+
+    @pytest.fixture
+    def async_cache(self):
+        """Async fake Redis shared by all simulated workers."""
+        return fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    def _scheduler(self, cache, fired):
+        async def on_turn(phone, batch, context):
+            fired.append((phone, batch, context))
+
+        return tc.DebounceScheduler(
+            on_turn=on_turn, cache_getter=lambda: cache, debounce_ms=50, sweep_interval_ms=20
+        )
+
+    @pytest.mark.asyncio
+    async def test_quiet_turn_fires_without_new_webhook(self, async_cache):
+        """Last buffered turn flushes once the window closes."""
+        fired = []
+        scheduler = self._scheduler(async_cache, fired)
+        ts = tc._now_ms()
+
+        await tc.async_append_user_message(async_cache, PHONE, "m1", "oi", ts)
+        await scheduler.schedule(PHONE, ts, context={"headers": {"host": "test"}})
+        await asyncio.sleep(0.2)
+
+        assert len(fired) == 1
+        phone, batch, context = fired[0]
+        assert phone == PHONE
+        assert batch["text"] == "oi"
+        assert context == {"headers": {"host": "test"}}
+        assert await async_cache.zscore(tc.DEADLINES_KEY, PHONE) is None
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_new_message_pushes_deadline(self, async_cache):
+        """A message inside the window delays the flush and joins the turn."""
+        fired = []
+        scheduler = self._scheduler(async_cache, fired)
+        ts = tc._now_ms()
+
+        await tc.async_append_user_message(async_cache, PHONE, "m1", "oi", ts)
+        await scheduler.schedule(PHONE, ts)
+        await asyncio.sleep(0.03)
+        ts2 = tc._now_ms()
+        await tc.async_append_user_message(async_cache, PHONE, "m2", "tudo bem?", ts2)
+        await scheduler.schedule(PHONE, ts2)
+        await asyncio.sleep(0.03)
+
+        assert fired == []
+
+        await asyncio.sleep(0.15)
+        assert len(fired) == 1
+        assert fired[0][1]["message_count"] == 2
+        await scheduler.stop()
+
+    @pytest.mark.asyncio
+    async def test_fires_once_across_workers(self, async_cache):
+        """Several workers scheduling the same turn run the pipeline once."""
+        fired = []
+        workers = [self._scheduler(async_cache, fired) for _ in range(4)]
+        ts = tc._now_ms()
+
+        await tc.async_append_user_message(async_cache, PHONE, "m1", "oi", ts)
+        for worker in workers:
+            await worker.start()
+            await worker.schedule(PHONE, ts)
+        await asyncio.sleep(0.2)
+
+        assert len(fired) == 1
+        for worker in workers:
+            await worker.stop()
+
+    @pytest.mark.asyncio
+    async def test_sweep_fires_orphaned_deadline(self, async_cache):
+        """Deadline left by a dead worker is picked up by the sweeper."""
+        fired = []
+        scheduler = self._scheduler(async_cache, fired)
+        ts = tc._now_ms() - 1000
+
+        await tc.async_append_user_message(async_cache, PHONE, "m1", "oi", ts)
+        await async_cache.zadd(tc.DEADLINES_KEY, {PHONE: ts + 50})
+
+        await scheduler.start()
+        await asyncio.sleep(0.1)
+
+        assert len(fired) == 1
+        assert fired[0][2] is None
+        await scheduler.stop()
+
+
+class TestDebounceContext:
+    """Webhook credentials never reach the Redis debounce context."""
+
+    HEADERS = {"host": "api.test", "apikey": "test-development-key", "user-agent": "okhttp"}
+
+    def _message(self):
+        from app.clients.evolution_api import WhatsAppMessage
+
+        return WhatsAppMessage(
+            message_id="m1", phone=PHONE, message="oi", message_type="text", timestamp=1, instance="kumon"
+        )
+
+    @pytest.mark.asyncio
+    async def test_credentials_are_stripped_and_restored_when_valid(self):
+        from app.api.v1 import whatsapp
+
+        context = await whatsapp._debounce_context(self._message(), self.HEADERS)
+
+        assert "apikey" not in context["headers"] and context["credentials_verified"]
+        assert "test-development-key" not in str(context)
+        restored = whatsapp._restore_headers(context)
+        assert await whatsapp.message_preprocessor.auth_validator.validate_request(restored, {})
+
+    @pytest.mark.asyncio
+    async def test_invalid_key_is_not_restored(self):
+        from app.api.v1 import whatsapp
+
+        context = await whatsapp._debounce_context(self._message(), {**self.HEADERS, "apikey": "wrong"})
+
+        assert not context["credentials_verified"]
+        assert "apikey" not in whatsapp._restore_headers(context)
@@ -83,9 +83,12 @@ async def test_history_is_appended_and_passed_to_classifier():
     conversation_id = f"test-history-{uuid.uuid4()}"
     config = {"configurable": {"thread_id": conversation_id}}
 
+    # Fast path desligado: "oi" seria resolvido localmente sem o classifier
     with patch(
         "app.core.langgraph_flow.gemini_classifier.classify", new_callable=AsyncMock
-    ) as mock_classify:
+    ) as mock_classify, patch(
+        "app.core.langgraph_flow.intent_fast_path.enabled", False
+    ):
         # Mock das respostas do classifier para simular fluxo normal
         mock_classify.side_effect = [
             # Turno 1: greeting
@@ -0,0 +1,212 @@
+"""
+Tests for the two-tier NLU cache in front of GeminiClassifier.
+Repeated short utterances in the same dialogue context skip the Gemini call.
+"""
+import asyncio
+import json
+import random
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import fakeredis
+import pytest
+
+from app.core import nlu_cache
+from app.core.nlu_cache import NLUCache, make_cache_key, normalize_utterance
+
+GREETING_RESULT = {
+    "primary_intent": "greeting",
+    "secondary_intent": None,
+    "entities": {},
+    "confidence": 0.9,
+}
+
+
+def _local_cache(**kwargs) -> NLUCache:
+    """Cache without the Redis tier."""
+    return NLUCache(redis_getter=lambda: None, enabled=True, **kwargs)
+
+
+def _classifier(cache: NLUCache, latency_s: float = 0.0):
+    """GeminiClassifier with a mocked model returning a greeting."""
+    from app.core.gemini_classifier import GeminiClassifier
+
+    async def generate(prompt):
+        await asyncio.sleep(latency_s)
+        response = MagicMock()
+        response.text = json.dumps(GREETING_RESULT)
+        return response
+
+    with patch.dict("os.environ", {"GEMINI_API_KEY": "test"}), patch(
+        "app.core.gemini_classifier.genai"
+    ):
+        classifier = GeminiClassifier()
+    classifier.model = MagicMock()
+    classifier.model.generate_content_async = AsyncMock(side_effect=generate)
+    classifier.nlu_cache = cache
+    return classifier
+
+
+class TestNLUCacheKey:
+    """Normalization and key composition."""
+
+    def test_normalization_collapses_case_space_and_edge_punctuation(self):
+        assert normalize_utterance("  Oi!! ") == "oi"
+        assert normalize_utterance("Quanto   custa?") == "quanto custa"
+
+    def test_key_depends_on_history_and_missing_vars(self):
+        base = make_cache_key("sim", "Assistente: É para você?", "student_name")
+
+        assert make_cache_key("SIM.", "Assistente: É para você?", "student_name") == base
+        assert make_cache_key("sim", "Assistente: Qual a idade?", "student_name") != base
+        assert make_cache_key("sim", "Assistente: É para você?", "Nenhuma") != base
+
+    def test_empty_or_long_text_is_not_cached(self):
+        assert make_cache_key("  ?! ", "", "") is None
+        assert make_cache_key("x" * 500, "", "") is None
+
+
+class TestNLUCacheTiers:
+    """LRU, TTL and Redis tiers."""
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_oldest(self):
+        cache = _local_cache(max_entries=2)
+        for key in ("a", "b"):
+            await cache.set(key, GREETING_RESULT)
+        await cache.get("a")  # "a" becomes most recent
+        await cache.set("c", GREETING_RESULT)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == GREETING_RESULT
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_local_ttl_expires(self):
+        cache = _local_cache(local_ttl_sec=0)
+        await cache.set("a", GREETING_RESULT)
+
+        assert await cache.get("a") is None
+
+    @pytest.mark.asyncio
+    async def test_fallback_results_are_not_stored(self):
+        cache = _local_cache()
+        await cache.set("a", {"primary_intent": "fallback", "confidence": 0.0})
+
+        assert await cache.get("a") is None
+        assert cache.stats()["stores"] == 0
+
+    @pytest.mark.asyncio
+    async def test_hits_return_copies(self):
+        cache = _local_cache()
+        await cache.set("a", GREETING_RESULT)
+
+        (await cache.get("a"))["entities"]["student_name"] = "João"
+
+        assert (await cache.get("a"))["entities"] == {}
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_is_shared_between_workers(self):
+        redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+        worker_a = NLUCache(redis_getter=lambda: redis, enabled=True)
+        worker_b = NLUCache(redis_getter=lambda: redis, enabled=True)
+
+        await worker_a.set("nlu:v1:k", GREETING_RESULT)
+
+        assert await worker_b.get("nlu:v1:k") == GREETING_RESULT
+        assert await worker_b.get("nlu:v1:k") == GREETING_RESULT
+        assert worker_b.stats()["redis_hits"] == 1
+        assert worker_b.stats()["local_hits"] == 1
+        assert 0 < await redis.ttl("nlu:v1:k") <= nlu_cache.NLU_CACHE_REDIS_TTL_SEC
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_degrade_to_miss(self):
+        broken = MagicMock()
+        broken.get = AsyncMock(side_effect=ConnectionError("redis down"))
+        cache = NLUCache(redis_getter=lambda: broken, enabled=True)
+
+        assert await cache.get("k") is None
+        assert cache.stats()["redis_errors"] == 1
+
+
+class TestGeminiClassifierCache:
+    """Cache wired into GeminiClassifier.classify."""
+
+    CONTEXT = {"history": [{"role": "assistant", "content": "Olá! Como posso ajudar?"}]}
+
+    @pytest.mark.asyncio
+    async def test_repeated_utterance_skips_gemini(self):
+        classifier = _classifier(_local_cache())
+
+        first = await classifier.classify("Oi!", self.CONTEXT)
+        second = await classifier.classify("oi", self.CONTEXT)
+
+        assert first == second == GREETING_RESULT
+        assert classifier.model.generate_content_async.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_different_context_misses(self):
+        classifier = _classifier(_local_cache())
+
+        await classifier.classify("sim", self.CONTEXT)
+        await classifier.classify(
+            "sim", {"history": [{"role": "assistant", "content": "Qual a idade?"}]}
+        )
+
+        assert classifier.model.generate_content_async.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_history_summary_enters_prompt_and_key(self):
+        classifier = _classifier(_local_cache())
+        summarized = {**self.CONTEXT, "history_summary": "Usuário: meu filho tem 8 anos"}
+
+        await classifier.classify("sim", self.CONTEXT)
+        await classifier.classify("sim", summarized)
+
+        prompts = [c.args[0] for c in classifier.model.generate_content_async.call_args_list]
+        assert len(prompts) == 2
+        assert "Resumo da conversa anterior: Usuário: meu filho tem 8 anos" in prompts[1]
+        assert "Resumo da conversa anterior" not in prompts[0]
+
+    @pytest.mark.asyncio
+    async def test_bypass_flags(self):
+        classifier = _classifier(_local_cache())
+
+        await classifier.classify("oi", self.CONTEXT, use_cache=False)
+        await classifier.classify("oi", self.CONTEXT, use_cache=False)
+        classifier.nlu_cache.enabled = False
+        await classifier.classify("oi", self.CONTEXT)
+
+        assert classifier.model.generate_content_async.call_count == 3
+
+
+@pytest.mark.performance
+class TestNLUCacheBenchmark:
+    """Skewed traffic of short utterances: Gemini round trips avoided."""
+
+    TURNS = 300
+    UTTERANCES = ["oi", "ok", "sim", "não", "quanto custa?", "obrigado", "Oi!", "Sim."]
+
+    @pytest.mark.asyncio
+    async def test_hit_rate_on_repeated_traffic(self):
+        rng = random.Random(7)
+        contexts = [
+            {"history": [{"role": "assistant", "content": f"Pergunta {i}"}]} for i in range(4)
+        ]
+        classifier = _classifier(_local_cache(), latency_s=0.002)
+
+        start = time.perf_counter()
+        for _ in range(self.TURNS):
+            text = rng.choice(self.UTTERANCES)
+            await classifier.classify(text, rng.choice(contexts))
+        elapsed = time.perf_counter() - start
+
+        stats = classifier.nlu_cache.stats()
+        calls = classifier.model.generate_content_async.call_count
+        print(
+            f"\nBENCH|nlu_cache|turns={self.TURNS}|gemini_calls={calls}|"
+            f"hit_rate={stats['hit_rate']}|elapsed_ms={elapsed * 1000:.0f}"
+        )
+
+        assert stats["hit_rate"] > 0.8
+        assert calls <= len(self.UTTERANCES) * len(contexts)
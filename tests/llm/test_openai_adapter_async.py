@@ -0,0 +1,112 @@
+"""
+Async behaviour tests for OpenAI adapter: non-blocking calls, shared client
+and concurrency limits.
+"""
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+
+def _response(text: str) -> Mock:
+    response = Mock()
+    response.choices = [Mock()]
+    response.choices[0].message.content = text
+    return response
+
+
+class TestOpenAIAdapterAsync:
+    """AsyncOpenAI-based adapter."""
+
+    @pytest.mark.asyncio
+    async def test_slow_generation_does_not_block_other_calls(self):
+        """Concurrent chats overlap instead of running back to back."""
+        from app.core.llm.openai_adapter import OpenAIClient
+
+        async def slow_create(**kwargs):
+            await asyncio.sleep(0.1)
+            return _response("ok")
+
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
+            mock_client = Mock()
+            mock_client.chat.completions.create = AsyncMock(side_effect=slow_create)
+            mock_openai_class.return_value = mock_client
+
+            adapter = OpenAIClient(api_key="test_key")
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(
+                    adapter.chat(model="gpt-3.5-turbo", system_prompt="T", user_prompt=str(i))
+                    for i in range(5)
+                )
+            )
+            elapsed = time.perf_counter() - start
+
+        assert results == ["ok"] * 5
+        assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_is_respected(self):
+        """No more than max_concurrency requests are in flight."""
+        from app.core.llm.openai_adapter import OpenAIClient
+
+        in_flight = 0
+        peak = 0
+
+        async def tracked_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return _response("ok")
+
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
+            mock_client = Mock()
+            mock_client.chat.completions.create = AsyncMock(side_effect=tracked_create)
+            mock_openai_class.return_value = mock_client
+
+            adapter = OpenAIClient(api_key="test_key", max_concurrency=2)
+            await asyncio.gather(
+                *(
+                    adapter.chat(model="gpt-3.5-turbo", system_prompt="T", user_prompt=str(i))
+                    for i in range(6)
+                )
+            )
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_per_request_timeout_reuses_client(self):
+        """timeout_s is passed per request; no extra client is built."""
+        from app.core.llm.openai_adapter import OpenAIClient
+
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
+            mock_client = Mock()
+            mock_client.chat.completions.create = AsyncMock(return_value=_response("ok"))
+            mock_openai_class.return_value = mock_client
+
+            adapter = OpenAIClient(api_key="test_key")
+            await adapter.chat(
+                model="gpt-3.5-turbo", system_prompt="T", user_prompt="T", timeout_s=2.5
+            )
+
+        assert mock_openai_class.call_count == 1
+        assert mock_client.chat.completions.create.call_args.kwargs["timeout"] == 2.5
+
+    def test_backoff_is_jittered_and_capped(self):
+        from app.core.llm.openai_adapter import OpenAIClient
+
+        delays = [OpenAIClient._backoff_s(attempt) for attempt in range(6) for _ in range(50)]
+
+        assert all(0 <= delay <= 2.0 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_get_openai_client_is_process_wide(self, monkeypatch):
+        from app.core.llm import openai_adapter
+
+        monkeypatch.setattr(openai_adapter, "_default_client", None)
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI"):
+            first = openai_adapter.get_openai_client()
+            assert openai_adapter.get_openai_client() is first
@@ -1,7 +1,7 @@
 """
 Contract tests for OpenAI adapter.
 """
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -19,9 +19,9 @@ class TestOpenAIAdapterContract:
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Olá! Como posso ajudar você hoje?"
 
-        with patch("app.core.llm.openai_adapter.OpenAI") as mock_openai_class:
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
             mock_client = Mock()
-            mock_client.chat.completions.create = Mock(return_value=mock_response)
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
             mock_openai_class.return_value = mock_client
 
             adapter = OpenAIClient(api_key="test_key")
@@ -45,14 +45,14 @@ class TestOpenAIAdapterContract:
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Resposta em português"
 
-        with patch("app.core.llm.openai_adapter.OpenAI") as mock_openai_class:
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
             mock_client = Mock()
 
             def capture_create(**kwargs):
                 captured_messages.extend(kwargs.get("messages", []))
                 return mock_response
 
-            mock_client.chat.completions.create = Mock(side_effect=capture_create)
+            mock_client.chat.completions.create = AsyncMock(side_effect=capture_create)
             mock_openai_class.return_value = mock_client
 
             adapter = OpenAIClient(api_key="test_key")
@@ -81,14 +81,14 @@ class TestOpenAIAdapterContract:
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Test response"
 
-        with patch("app.core.llm.openai_adapter.OpenAI") as mock_openai_class:
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
             mock_client = Mock()
 
             def capture_params(**kwargs):
                 captured_params.update(kwargs)
                 return mock_response
 
-            mock_client.chat.completions.create = Mock(side_effect=capture_params)
+            mock_client.chat.completions.create = AsyncMock(side_effect=capture_params)
             mock_openai_class.return_value = mock_client
 
             adapter = OpenAIClient(api_key="test_key")
@@ -112,11 +112,11 @@ class TestOpenAIAdapterContract:
 
         from app.core.llm.openai_adapter import OpenAIClient
 
-        with patch("app.core.llm.openai_adapter.OpenAI") as mock_openai_class:
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
             mock_client = Mock()
 
             # Simulate timeout error
-            mock_client.chat.completions.create = Mock(
+            mock_client.chat.completions.create = AsyncMock(
                 side_effect=openai.APITimeoutError(request=Mock(url="test"))
             )
             mock_openai_class.return_value = mock_client
@@ -1,7 +1,7 @@
 """
 Resilience tests for OpenAI adapter.
 """
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -20,12 +20,12 @@ class TestOpenAIAdapterResilience:
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Success after retry"
 
-        with patch("app.core.llm.openai_adapter.OpenAI") as mock_openai_class:
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
             mock_client = Mock()
 
             # First call: rate limit error
             # Second call: success
-            mock_client.chat.completions.create = Mock(
+            mock_client.chat.completions.create = AsyncMock(
                 side_effect=[
                     openai.RateLimitError(
                         message="Rate limit exceeded",
@@ -54,11 +54,11 @@ class TestOpenAIAdapterResilience:
 
         from app.core.llm.openai_adapter import OpenAIClient
 
-        with patch("app.core.llm.openai_adapter.OpenAI") as mock_openai_class:
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
             mock_client = Mock()
 
             # BadRequest error (400)
-            mock_client.chat.completions.create = Mock(
+            mock_client.chat.completions.create = AsyncMock(
                 side_effect=openai.BadRequestError(
                     message="Invalid request", response=Mock(status_code=400), body={}
                 )
@@ -87,12 +87,12 @@ class TestOpenAIAdapterResilience:
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Success after connection retry"
 
-        with patch("app.core.llm.openai_adapter.OpenAI") as mock_openai_class:
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
             mock_client = Mock()
 
             # First call: connection error
             # Second call: success
-            mock_client.chat.completions.create = Mock(
+            mock_client.chat.completions.create = AsyncMock(
                 side_effect=[
                     openai.APIConnectionError(
                         message="Connection failed", request=Mock(url="test")
@@ -122,11 +122,11 @@ class TestOpenAIAdapterResilience:
         mock_response.choices = [Mock()]
         mock_response.choices[0].message.content = "Success"
 
-        with patch("app.core.llm.openai_adapter.OpenAI") as mock_openai_class:
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
             mock_client = Mock()
 
             # Simulate success
-            mock_client.chat.completions.create = Mock(return_value=mock_response)
+            mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
             mock_openai_class.return_value = mock_client
 
             adapter = OpenAIClient(api_key="test_key")
@@ -141,7 +141,7 @@ class TestOpenAIAdapterResilience:
             assert "LLM|res|" in captured.out
 
             # Test error logging
-            mock_client.chat.completions.create = Mock(
+            mock_client.chat.completions.create = AsyncMock(
                 side_effect=openai.APIError(
                     message="Test error", request=Mock(url="test"), body=None
                 )
@@ -162,11 +162,11 @@ class TestOpenAIAdapterResilience:
 
         from app.core.llm.openai_adapter import OpenAIClient
 
-        with patch("app.core.llm.openai_adapter.OpenAI") as mock_openai_class:
+        with patch("app.core.llm.openai_adapter.AsyncOpenAI") as mock_openai_class:
             mock_client = Mock()
 
             # Always fail with rate limit
-            mock_client.chat.completions.create = Mock(
+            mock_client.chat.completions.create = AsyncMock(
                 side_effect=openai.RateLimitError(
                     message="Rate limit", response=Mock(status_code=429), body={}
                 )
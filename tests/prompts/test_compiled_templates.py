@@ -0,0 +1,212 @@
+"""
+Tests for compiled prompt templates.
+Rendering from the compiled form must produce exactly what the previous
+preprocess → resolve → format → strip → safety pipeline produced.
+"""
+import os
+import re
+import time
+from pathlib import Path
+
+import pytest
+from langchain.prompts import PromptTemplate
+
+from app.core.safety.template_safety_v2 import check_and_sanitize as check_and_sanitize_v2
+from app.prompts.compiled_templates import CompiledPrompt, CompiledTemplateCache
+from app.prompts.manager import PromptManager
+
+TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "app" / "prompts" / "templates"
+TEMPLATE_FILES = sorted(TEMPLATES_DIR.rglob("*.txt"))
+
+ALL_VARIABLES = {
+    "username": "Maria",
+    "gender_pronoun": "ela",
+    "gender_possessive": "sua",
+    "gender_article": "a",
+    "gender_self_suffix": "a",
+    "student_name": "Pedro",
+    "student_age": 8,
+    "first_name": "Maria",
+    "child_name": "Pedro",
+    "confirmed_time": "14h",
+    "confirmed_day": "terça",
+    "available_slots": "segunda 10h, quarta 15h",
+    "user_message": "quero saber o valor",
+    "context": "primeiro contato",
+}
+VARIABLE_SETS = {
+    "none": {},
+    "all": ALL_VARIABLES,
+    "partial": {"username": "Maria", "unused": "x"},
+    "whitespace": {name: "  valor \n com   espaços  " for name in ALL_VARIABLES},
+    "empty_values": {name: "" for name in ALL_VARIABLES},
+}
+
+
+def _legacy_render(template, variables, name, context="general"):
+    """Implementação anterior (PromptManager.get_prompt, etapas 1-5)."""
+    template = re.sub(r'\{\{([^}]+)\}\}', r'{\1}', template)
+    template = re.sub(
+        r'\[\[\?([^:]+):\s*"([^"]+)"\]\]',
+        lambda m: f"[[?{m.group(1).strip()}: \"{m.group(2)}\"]]", template,
+    )
+    template = re.sub(
+        r'\[\[([^|]+)\|([^]]+)\]\]',
+        lambda m: f"[[{m.group(1).strip()}|{m.group(2).strip()}]]", template,
+    )
+
+    formatted = template
+    if variables:
+        try:
+            resolved = re.sub(
+                r'\[\[\?([^:]+):\s*"([^"]+)"\]\]',
+                lambda m: m.group(2) if m.group(1).strip() in variables else "", template,
+            )
+            resolved = re.sub(
+                r'\[\[([^|]+)\|([^]]+)\]\]',
+                lambda m: "{" + m.group(1).strip() + "}" if m.group(1).strip() in variables
+                else m.group(2).strip(), resolved,
+            )
+            try:
+                prompt = PromptTemplate.from_template(resolved)
+                formatted = prompt.format(
+                    **{k: v for k, v in variables.items() if k in prompt.input_variables}
+                )
+            except KeyError:
+                formatted = resolved
+            except Exception:
+                try:
+                    formatted = resolved.format(**variables)
+                except Exception:
+                    formatted = resolved
+        except Exception:
+            pass
+
+    clean = re.sub(r'\{\{[^}]+\}\}', '', formatted)
+    clean = re.sub(r'\s+', ' ', clean).strip()
+    return check_and_sanitize_v2(clean, template_key=name, context=context)["text"]
+
+
+class TestCompiledPromptEquivalence:
+    """Compiled rendering matches the previous pipeline."""
+
+    @pytest.mark.parametrize("path", TEMPLATE_FILES, ids=lambda p: str(p.relative_to(TEMPLATES_DIR)))
+    @pytest.mark.parametrize("variable_set", sorted(VARIABLE_SETS))
+    def test_repository_templates(self, path, variable_set):
+        template = path.read_text(encoding="utf-8").strip()
+        variables = VARIABLE_SETS[variable_set]
+        name = path.stem
+
+        compiled = CompiledPrompt.compile(template, name)
+
+        assert compiled.render(variables) == _legacy_render(template, variables, name)
+
+    @pytest.mark.parametrize(
+        "template",
+        [
+            'Olá {username}! [[?student_name: "Seu filho {student_name} vai adorar."]] Até logo.',
+            "Oi [[username|responsável]], tudo bem?",
+            'Oi {{username}}. [[?missing: "nunca {x}"]] [[other|padrão {username}]]',
+            "Preço: {{ valor }} e {{username}}",
+            "Texto com {{chaves}} literais e {username:>10} alinhado",
+            "Formato quebrado {username",
+            "  muitos \n\n espaços\t entre   palavras  {username}  ",
+            "Valor {student_age!r} e {missing}",
+        ],
+    )
+    @pytest.mark.parametrize("variable_set", ["none", "all", "partial", "empty_values"])
+    def test_block_and_slot_syntax(self, template, variable_set):
+        variables = VARIABLE_SETS[variable_set]
+
+        compiled = CompiledPrompt.compile(template, "greeting:welcome", "greeting")
+
+        assert compiled.render(variables) == _legacy_render(template, variables, "greeting:welcome", "greeting")
+
+    @pytest.mark.parametrize(
+        "value",
+        ["{{admin_prompt}}", "{SYSTEM_PROMPT}", "Você é Cecília, assistente do Kumon", "---\nrole: system\n---"],
+    )
+    def test_unsafe_values_still_checked(self, value):
+        template = "Olá {username}, bem-vindo!"
+        variables = {"username": value}
+
+        compiled = CompiledPrompt.compile(template, "greeting:welcome", "greeting")
+
+        assert compiled.render(variables) == _legacy_render(template, variables, "greeting:welcome", "greeting")
+
+
+class TestCompiledTemplateCache:
+    """File reload on change and compiled prompt reuse."""
+
+    def test_file_reloaded_when_mtime_changes(self, tmp_path):
+        cache = CompiledTemplateCache()
+        path = tmp_path / "greeting.txt"
+        path.write_text("  Olá {username}  \n", encoding="utf-8")
+
+        assert cache.read(path) == "Olá {username}"
+        assert cache.read(path) == "Olá {username}"
+
+        path.write_text("Oi {username}", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert cache.read(path) == "Oi {username}"
+        assert cache.get_stats()["file_reads"] == 2
+        assert cache.get_stats()["file_hits"] == 1
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert CompiledTemplateCache().read(tmp_path / "nope.txt") is None
+
+    def test_compiled_once_per_template_and_context(self):
+        cache = CompiledTemplateCache(max_compiled=2)
+
+        first = cache.compile("Olá {username}", "a", "greeting")
+        assert cache.compile("Olá {username}", "b", "greeting") is first
+        cache.compile("Olá {username}", "a", "general")
+        cache.compile("Tchau {username}", "a", "general")
+
+        stats = cache.get_stats()
+        assert stats["compilations"] == 3 and stats["compiled_hits"] == 1
+        assert stats["compiled"] == 2
+
+    @pytest.mark.asyncio
+    async def test_prompt_manager_renders_through_cache(self):
+        manager = PromptManager()
+        manager._ensure_initialized()
+        name = "kumon:greeting:welcome:initial"
+
+        first = await manager.get_prompt(name, variables={"username": "Maria"})
+        second = await manager.get_prompt(name, variables={"username": "Maria"})
+
+        assert first == second
+        stats = (await manager.get_prompt_stats())["template_cache"]
+        assert stats["compiled_hits"] >= 1 and stats["file_hits"] >= 1
+
+
+@pytest.mark.performance
+class TestPromptRenderBenchmark:
+    """Per-render cost across all repository templates: regex pipeline vs compiled."""
+
+    def test_render_all_templates(self):
+        templates = [(p.stem, p.read_text(encoding="utf-8").strip()) for p in TEMPLATE_FILES]
+        cache = CompiledTemplateCache()
+        rounds = 5
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for name, template in templates:
+                _legacy_render(template, ALL_VARIABLES, name)
+        legacy_us = (time.perf_counter() - start) / (rounds * len(templates)) * 1e6
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for name, template in templates:
+                cache.compile(template, name).render(ALL_VARIABLES)
+        compiled_us = (time.perf_counter() - start) / (rounds * len(templates)) * 1e6
+
+        print(
+            f"\nBENCH|prompt_render|templates={len(templates)}|legacy_us={legacy_us:.1f}|"
+            f"compiled_us={compiled_us:.1f}|compilations={cache.get_stats()['compilations']}"
+        )
+
+        assert compiled_us < legacy_us
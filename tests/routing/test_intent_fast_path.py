@@ -0,0 +1,226 @@
+"""
+Tests for the local fast-path pre-classifier in front of GeminiClassifier.
+Trivial turns resolve locally; ambiguous or entity-bearing turns escalate.
+"""
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import fakeredis
+import pytest
+
+from app.core.intent_fast_path import FastPathClassifier
+from app.core.nodes.master_router import master_router
+
+GEMINI_RESULT = {
+    "primary_intent": "qualification",
+    "secondary_intent": None,
+    "entities": {"parent_name": "Gabriel"},
+    "confidence": 0.9,
+}
+
+
+def _fast_path(**kwargs) -> FastPathClassifier:
+    kwargs.setdefault("shadow_rate", 0.0)
+    return FastPathClassifier(enabled=True, **kwargs)
+
+
+def _classifier(result=GEMINI_RESULT):
+    classifier = MagicMock()
+    classifier.classify = AsyncMock(return_value=result)
+    return classifier
+
+
+class TestFastPathClassifier:
+    """Local resolution and escalation rules."""
+
+    @pytest.mark.parametrize(
+        "text,intent",
+        [
+            ("oi", "greeting"),
+            ("Bom dia!", "greeting"),
+            ("olá, tudo bem?", "greeting"),
+            ("quanto custa?", "information"),
+            ("qual o valor da mensalidade?", "information"),
+            ("qual o endereço?", "information"),
+            ("quero agendar uma avaliação", "scheduling"),
+        ],
+    )
+    def test_trivial_turns_resolve_locally(self, text, intent):
+        result = _fast_path().classify(text)
+
+        assert result["primary_intent"] == intent
+        assert result["entities"] == {}
+        assert result["source"] == "fast_path"
+
+    @pytest.mark.parametrize(
+        "text,reason",
+        [
+            ("Oi, meu nome é Gabriel", "below_threshold"),  # entidade não coberta
+            ("oi, quanto custa?", "multi_intent"),
+            ("é para meu filho de 7 anos", "has_digits"),
+            ("Matemática", "no_pattern"),  # resposta da qualificação
+            ("sim", "no_pattern"),
+        ],
+    )
+    def test_ambiguous_turns_escalate(self, text, reason):
+        fast_path = _fast_path()
+
+        assert fast_path.classify(text) is None
+        assert fast_path.stats()["escalation_reasons"] == {reason: 1}
+
+    def test_disabled_never_resolves(self):
+        assert FastPathClassifier(enabled=False).classify("oi") is None
+
+
+class TestFastPathCalibration:
+    """Thresholds calibrated from recorded (local candidate, Gemini) pairs."""
+
+    def test_calibrate_picks_lowest_threshold_meeting_precision(self):
+        samples = [
+            {"intent": "greeting", "score": 0.95, "gemini_intent": "greeting"}
+        ] * 40 + [
+            {"intent": "greeting", "score": 0.6, "gemini_intent": "qualification"}
+        ] * 10
+
+        thresholds = _fast_path().calibrate(samples, min_support=30)
+
+        assert thresholds["greeting"] == 0.95
+        assert thresholds["scheduling"] == 0.85  # sem dados: mantém o padrão
+
+    def test_calibrate_disables_intent_that_never_meets_precision(self):
+        samples = [
+            {"intent": "scheduling", "score": 0.9, "gemini_intent": "qualification"}
+        ] * 40
+        fast_path = _fast_path()
+
+        fast_path.calibrate(samples, min_support=30)
+
+        assert fast_path.classify("quero agendar uma avaliação") is None
+
+    def test_gemini_outcomes_are_recorded_as_samples(self):
+        fast_path = _fast_path()
+        fast_path.record_outcome("oi", {"primary_intent": "greeting", "confidence": 0.9})
+        fast_path.record_outcome("oi", {"primary_intent": "fallback", "confidence": 0.0})
+        fast_path.record_outcome("sim", GEMINI_RESULT)
+
+        assert list(fast_path.samples) == [
+            {"intent": "greeting", "score": 0.95, "gemini_intent": "greeting"}
+        ]
+
+
+class TestSamplePersistence:
+    """Shadow samples persisted in Redis and periodic calibration."""
+
+    @pytest.fixture
+    def async_cache(self, monkeypatch):
+        client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        monkeypatch.setattr("app.core.cache_manager.get_async_redis", lambda: client)
+        return client
+
+    @pytest.mark.asyncio
+    async def test_samples_shared_across_instances(self, async_cache):
+        worker = _fast_path()
+        worker.record_outcome("oi", {"primary_intent": "greeting", "confidence": 0.9})
+        worker.record_outcome("bom dia", {"primary_intent": "greeting", "confidence": 0.9})
+
+        assert await worker.sync_samples() == 2
+        assert worker.stats()["pending_samples"] == 0
+
+        restarted = _fast_path()
+        assert await restarted.sync_samples() == 2
+        assert restarted.samples[0]["gemini_intent"] == "greeting"
+
+    @pytest.mark.asyncio
+    async def test_samples_kept_pending_when_redis_fails(self, monkeypatch):
+        broken = MagicMock()
+        broken.pipeline.return_value.execute = AsyncMock(side_effect=ConnectionError("down"))
+        monkeypatch.setattr("app.core.cache_manager.get_async_redis", lambda: broken)
+        fast_path = _fast_path()
+        fast_path.record_outcome("oi", {"primary_intent": "greeting", "confidence": 0.9})
+
+        await fast_path.sync_samples()
+
+        assert fast_path.stats()["pending_samples"] == 1
+
+    @pytest.mark.asyncio
+    async def test_start_calibrates_from_persisted_samples(self, async_cache):
+        seeded = _fast_path()
+        for _ in range(40):
+            seeded.record_outcome("oi", {"primary_intent": "greeting", "confidence": 0.9})
+        await seeded.sync_samples()
+
+        fast_path = _fast_path(thresholds={"greeting": 0.99})
+        fast_path.start()
+        await asyncio.sleep(0.05)
+        await fast_path.stop()
+
+        assert fast_path.thresholds["greeting"] == 0.95
+        assert fast_path.stats()["calibration_running"] is False
+
+
+class TestMasterRouterFastPath:
+    """Fast path wired into master_router."""
+
+    @pytest.mark.asyncio
+    async def test_local_turn_skips_gemini(self):
+        classifier = _classifier()
+        fast_path = _fast_path()
+
+        update = await master_router({"text": "quanto custa?"}, classifier, fast_path)
+
+        assert update["routing_decision"] == "information_node"
+        assert update["nlu_result"]["source"] == "fast_path"
+        classifier.classify.assert_not_awaited()
+        assert fast_path.stats()["local"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_turn_escalates_to_gemini(self):
+        classifier = _classifier()
+        fast_path = _fast_path()
+
+        update = await master_router(
+            {"text": "Oi, meu nome é Gabriel"}, classifier, fast_path
+        )
+
+        assert update["nlu_result"] == GEMINI_RESULT
+        classifier.classify.assert_awaited_once()
+        assert fast_path.stats()["remote"] == 1
+
+    @pytest.mark.asyncio
+    async def test_shadow_turns_still_call_gemini(self):
+        classifier = _classifier({"primary_intent": "greeting", "confidence": 0.9})
+        fast_path = _fast_path(shadow_rate=1.0)
+
+        await master_router({"text": "oi"}, classifier, fast_path)
+
+        classifier.classify.assert_awaited_once()
+        assert fast_path.stats()["shadow"] == 1
+        assert len(fast_path.samples) == 1
+
+    @pytest.mark.asyncio
+    async def test_without_fast_path_always_calls_gemini(self):
+        classifier = _classifier()
+
+        await master_router({"text": "oi"}, classifier)
+
+        classifier.classify.assert_awaited_once()
+
+
+@pytest.mark.performance
+class TestFastPathBenchmark:
+    """Local resolution latency for trivial turns."""
+
+    def test_local_resolution_is_sub_millisecond(self):
+        fast_path = _fast_path()
+        texts = ["oi", "bom dia", "quanto custa?", "quero agendar uma avaliação"]
+        rounds = 500
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for text in texts:
+                assert fast_path.classify(text) is not None
+        per_turn_us = (time.perf_counter() - start) / (rounds * len(texts)) * 1e6
+        print(f"\nBENCH|intent_fast_path|per_turn_us={per_turn_us:.1f}")
+
+        assert per_turn_us < 1000
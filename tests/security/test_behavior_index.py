@@ -0,0 +1,165 @@
+"""
+Tests for the behavior profile feature matrix used in botnet detection.
+Vectorized similarity must agree with the previous pairwise computation.
+"""
+import random
+import time
+
+import pytest
+
+from app.security.behavior_index import BehaviorProfileIndex
+from app.security.threat_detector import BehaviorProfile, ThreatDetectionSystem
+
+
+def _legacy_similarity(profile1, profile2):
+    """Implementação anterior (ThreatDetectionSystem._calculate_profile_similarity)."""
+    similarities = []
+    if profile1.avg_message_length > 0 and profile2.avg_message_length > 0:
+        length_diff = abs(profile1.avg_message_length - profile2.avg_message_length)
+        max_length = max(profile1.avg_message_length, profile2.avg_message_length)
+        similarities.append(1.0 - (length_diff / max_length))
+    similarities.append(1.0 - abs(profile1.topic_diversity - profile2.topic_diversity))
+    pattern_correlation = 0.0
+    total1, total2 = sum(profile1.activity_pattern), sum(profile2.activity_pattern)
+    if total1 > 0 and total2 > 0:
+        for i in range(len(profile1.activity_pattern)):
+            pattern_correlation += min(profile1.activity_pattern[i] / total1, profile2.activity_pattern[i] / total2)
+    similarities.append(pattern_correlation)
+    return sum(similarities) / len(similarities)
+
+
+def _legacy_count_similar(profiles, source_id):
+    reference = profiles[source_id]
+    return sum(
+        1 for other_id, other in profiles.items()
+        if other_id != source_id and other.message_count > 5 and _legacy_similarity(reference, other) > 0.8
+    )
+
+
+def _profile(rng, source_id, bot=False):
+    if bot:
+        activity = [0] * 24
+        activity[3] = rng.randint(20, 22)
+        return BehaviorProfile(
+            source_id=source_id, message_count=30, avg_message_length=rng.uniform(40, 42),
+            topic_diversity=0.1, activity_pattern=activity,
+        )
+    return BehaviorProfile(
+        source_id=source_id,
+        message_count=rng.randint(0, 40),
+        avg_message_length=rng.choice([0.0, rng.uniform(5, 300)]),
+        topic_diversity=rng.random(),
+        activity_pattern=[rng.choice([0, 0, 1, 3, 8]) for _ in range(24)],
+    )
+
+
+class TestBehaviorProfileIndex:
+    """Equivalence, in-place updates and capacity limits."""
+
+    def test_similarity_matches_pairwise_computation(self):
+        rng = random.Random(3)
+        profiles = {f"s{i}": _profile(rng, f"s{i}", bot=i % 7 == 0) for i in range(200)}
+        index = BehaviorProfileIndex(max_sources=1000, ttl_seconds=3600)
+        for profile in profiles.values():
+            index.update(profile)
+
+        for source_id in ("s0", "s1", "s7", "s50"):
+            similarities = index.similarities(source_id)
+            for other_id in ("s0", "s2", "s14", "s99"):
+                expected = _legacy_similarity(profiles[source_id], profiles[other_id])
+                assert similarities[index._rows[other_id]] == pytest.approx(expected)
+            assert index.count_similar(source_id) == _legacy_count_similar(profiles, source_id)
+
+    def test_update_rewrites_row_in_place(self):
+        index = BehaviorProfileIndex(max_sources=10, ttl_seconds=3600)
+        profile = BehaviorProfile(source_id="a", message_count=1, avg_message_length=10)
+        index.update(profile)
+        profile.avg_message_length = 20
+        index.update(profile)
+
+        assert len(index) == 1
+        assert index._matrix[0, 0] == 20
+
+    def test_lru_cap_evicts_least_recently_active(self):
+        index = BehaviorProfileIndex(max_sources=3, ttl_seconds=3600)
+        for source_id in ("a", "b", "c"):
+            index.update(BehaviorProfile(source_id=source_id), now=100)
+        index.update(BehaviorProfile(source_id="a"), now=101)
+
+        evicted = index.update(BehaviorProfile(source_id="d"), now=102)
+
+        assert evicted == ["b"]
+        assert sorted(index._rows) == ["a", "c", "d"]
+        assert index.similarities("d").shape == (3,)
+
+    def test_ttl_evicts_inactive_sources(self):
+        index = BehaviorProfileIndex(max_sources=100, ttl_seconds=60)
+        index.update(BehaviorProfile(source_id="old"), now=0)
+        index.update(BehaviorProfile(source_id="recent"), now=50)
+
+        evicted = index.update(BehaviorProfile(source_id="new"), now=100)
+
+        assert evicted == ["old"]
+        assert index.get_stats()["evictions"] == 1
+
+    def test_unknown_source_has_no_similar_profiles(self):
+        assert BehaviorProfileIndex().count_similar("nobody") == 0
+
+
+class TestThreatDetectorUsesIndex:
+    """ThreatDetectionSystem keeps profiles and index in sync."""
+
+    @pytest.mark.asyncio
+    async def test_botnet_behavior_detected(self):
+        detector = ThreatDetectionSystem()
+        rng = random.Random(5)
+        for i in range(12):
+            profile = _profile(rng, f"bot{i}", bot=True)
+            detector.behavior_profiles[profile.source_id] = profile
+            detector.profile_index.update(profile)
+
+        result = await detector._coordinated_attack_detection("bot0", {"ip": "1.2.3.4"})
+
+        botnet = [i for i in result["indicators"] if i.indicator_type == "botnet_behavior"]
+        assert botnet and botnet[0].evidence["similar_profiles"] == 11
+
+    @pytest.mark.asyncio
+    async def test_evicted_profiles_are_dropped(self):
+        detector = ThreatDetectionSystem()
+        detector.profile_index.max_sources = 2
+
+        for source_id in ("a", "b", "c"):
+            await detector._update_behavior_profile(source_id, "olá", None)
+
+        assert sorted(detector.behavior_profiles) == ["b", "c"]
+        assert len(detector.profile_index) == 2
+
+
+@pytest.mark.performance
+class TestBotnetSimilarityBenchmark:
+    """Per-message botnet check as tracked sources grow: pairwise loop vs matrix."""
+
+    def test_latency_by_source_count(self):
+        rng = random.Random(11)
+        results = []
+
+        for size in (1_000, 10_000):
+            profiles = {f"s{i}": _profile(rng, f"s{i}", bot=i % 50 == 0) for i in range(size)}
+            index = BehaviorProfileIndex(max_sources=size, ttl_seconds=3600)
+            for profile in profiles.values():
+                index.update(profile)
+
+            start = time.perf_counter()
+            legacy = _legacy_count_similar(profiles, "s0")
+            loop_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            indexed = index.count_similar("s0")
+            matrix_ms = (time.perf_counter() - start) * 1000
+
+            assert indexed == legacy
+            results.append(f"n={size}|loop_ms={loop_ms:.2f}|matrix_ms={matrix_ms:.3f}")
+
+        print("\nBENCH|botnet_similarity|" + "|".join(results))
+
+        assert matrix_ms < loop_ms
@@ -0,0 +1,230 @@
+"""
+Tests for the shared multi-window rate limiter (GCRA in one Lua script).
+Workers sharing Redis see the same counters; local fallback has the same semantics.
+"""
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+import fakeredis
+import pytest
+
+from app.security.distributed_rate_limiter import DistributedRateLimiter
+from app.security.rate_limiter import RateLimitAction, RateLimiter
+from app.services.message_preprocessor import RateLimiter as PhoneRateLimiter
+
+WINDOWS = {"burst": (3, 10), "minute": (5, 60)}
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeAsyncRedis()
+
+
+def _shared(redis, **kwargs) -> DistributedRateLimiter:
+    return DistributedRateLimiter(redis_getter=lambda: redis, **kwargs)
+
+
+def _local() -> DistributedRateLimiter:
+    return DistributedRateLimiter(redis_getter=lambda: None)
+
+
+class FailingRedis:
+    def register_script(self, source):
+        async def _script(keys, args):
+            raise ConnectionError("redis down")
+
+        return _script
+
+
+class TestDistributedRateLimiter:
+    """GCRA decisions, sharing between workers and fallbacks."""
+
+    @pytest.mark.asyncio
+    async def test_first_exhausted_window_rejects(self, redis):
+        limiter = _shared(redis)
+
+        decisions = [await limiter.hit("1.2.3.4", WINDOWS) for _ in range(4)]
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert decisions[2].usage == {"burst": 3, "minute": 3}
+        assert decisions[3].exceeded == "burst"
+        assert 0 < decisions[3].retry_after <= 10
+        assert decisions[3].backend == "redis"
+
+    @pytest.mark.asyncio
+    async def test_rejected_requests_are_not_counted(self, redis):
+        limiter = _shared(redis)
+        for _ in range(5):
+            await limiter.hit("src", WINDOWS)
+
+        usage = await limiter.peek("src", WINDOWS)
+
+        assert usage.usage == {"burst": 3, "minute": 3}
+
+    @pytest.mark.asyncio
+    async def test_workers_share_one_limit(self, redis):
+        worker_a, worker_b = _shared(redis), _shared(redis)
+
+        allowed = [
+            (await (worker_a if i % 2 else worker_b).hit("src", {"minute": (4, 60)})).allowed
+            for i in range(6)
+        ]
+
+        assert allowed == [True, True, True, True, False, False]
+
+    @pytest.mark.asyncio
+    async def test_sources_are_independent_and_keys_expire(self, redis):
+        limiter = _shared(redis)
+        for _ in range(3):
+            await limiter.hit("a", WINDOWS)
+
+        assert (await limiter.hit("b", WINDOWS)).allowed
+        ttl = await redis.pttl("ratelimit:{a}:minute")
+        assert 0 < ttl <= 60_000
+
+    @pytest.mark.asyncio
+    async def test_local_fallback_matches_redis(self, redis):
+        shared, local = _shared(redis), _local()
+
+        for _ in range(6):
+            from_redis = await shared.hit("src", WINDOWS)
+            from_local = await local.hit("src", WINDOWS)
+            assert (from_redis.allowed, from_redis.exceeded, from_redis.usage) == (
+                from_local.allowed, from_local.exceeded, from_local.usage
+            )
+        assert from_local.backend == "local"
+
+    @pytest.mark.asyncio
+    async def test_redis_error_falls_back_to_local_state(self):
+        limiter = DistributedRateLimiter(redis_getter=FailingRedis)
+
+        decisions = [await limiter.hit("src", {"minute": (2, 60)}) for _ in range(3)]
+
+        assert [d.allowed for d in decisions] == [True, True, False]
+        assert limiter.get_stats()["redis_errors"] == 3
+
+    @pytest.mark.asyncio
+    async def test_trusted_sources_use_local_bucket_first(self, redis):
+        limiter = _shared(redis)
+
+        decisions = [await limiter.hit("trusted", WINDOWS, trusted=True) for _ in range(4)]
+
+        assert [d.backend for d in decisions] == ["trusted"] * 3 + ["redis"]
+        assert decisions[3].allowed  # contadores compartilhados ainda vazios
+        assert limiter.get_stats()["decisions"]["trusted"] == 3
+
+    @pytest.mark.asyncio
+    async def test_local_state_is_pruned(self):
+        limiter = DistributedRateLimiter(redis_getter=lambda: None, max_local_sources=10)
+        limiter._local_tats = {f"ratelimit:{{old{i}}}:minute": 0.0 for i in range(10)}
+
+        await limiter.hit("new", {"minute": (5, 60)})
+
+        assert list(limiter._local_tats) == ["ratelimit:{new}:minute"]
+
+
+class TestSecurityRateLimiterIntegration:
+    """Security RateLimiter counts through the shared limiter."""
+
+    def _rate_limiter(self, redis) -> RateLimiter:
+        rate_limiter = RateLimiter()
+        rate_limiter.shared_limiter = _shared(redis, key_prefix="ratelimit:source")
+        return rate_limiter
+
+    @pytest.mark.asyncio
+    async def test_burst_blocks_source(self, redis):
+        rate_limiter = self._rate_limiter(redis)
+
+        results = [await rate_limiter.check_rate_limit("10.0.0.1") for _ in range(6)]
+
+        assert [r["action"] for r in results[:5]] == [RateLimitAction.ALLOW.value] * 5
+        assert results[5]["reason"] == "burst_detected"
+        assert rate_limiter.get_rate_limit_status("10.0.0.1")["is_blocked"]
+
+    @pytest.mark.asyncio
+    async def test_minute_limit_is_shared_between_replicas(self, redis):
+        replica_a, replica_b = self._rate_limiter(redis), self._rate_limiter(redis)
+        for replica in (replica_a, replica_b):
+            replica.config["burst_threshold"] = 100
+        # usuário novo: 30% de 30/min = 9
+        results = [
+            await (replica_a if i % 2 else replica_b).check_rate_limit("10.0.0.2")
+            for i in range(10)
+        ]
+
+        assert results[8]["action"] == RateLimitAction.ALLOW.value
+        assert results[8]["current_minute"] == 9
+        assert results[9]["reason"] == "minute_limit_exceeded"
+
+
+class TestPhoneRateLimiter:
+    """message_preprocessor.RateLimiter uses the shared minute window."""
+
+    @pytest.mark.asyncio
+    async def test_blocks_after_messages_per_minute(self, redis):
+        limiter = PhoneRateLimiter()
+        limiter.shared_limiter = _shared(redis, key_prefix="ratelimit:phone")
+        limiter.messages_per_minute = 3
+
+        allowed = [await limiter.check_rate_limit("5551999999999") for _ in range(4)]
+
+        assert allowed == [True, True, True, False]
+
+
+def _legacy_deque_check(windows, source, now):
+    """Implementação anterior: deque de datetimes + contagem reversa por janela."""
+    requests = windows.setdefault(source, deque())
+    requests.append(now)
+    cutoff = now - timedelta(hours=1)
+    while requests and requests[0] < cutoff:
+        requests.popleft()
+    counts = []
+    for seconds in (10, 60, 3600):
+        window_cutoff = now - timedelta(seconds=seconds)
+        count = 0
+        for request_time in reversed(requests):
+            if request_time >= window_cutoff:
+                count += 1
+            else:
+                break
+        counts.append(count)
+    return counts
+
+
+@pytest.mark.performance
+class TestRateLimiterBenchmark:
+    """Decisions/sec for a busy source: legacy deque vs GCRA (local and shared)."""
+
+    LIMITS = {"burst": (10_000, 10), "minute": (10_000, 60), "hour": (100_000, 3600), "day": (1_000_000, 86400)}
+
+    @pytest.mark.asyncio
+    async def test_decisions_per_second(self, redis):
+        n = 3000
+
+        legacy_windows = {}
+        start = time.perf_counter()
+        for _ in range(n):
+            _legacy_deque_check(legacy_windows, "src", datetime.now())
+        legacy_dps = n / (time.perf_counter() - start)
+
+        local = _local()
+        start = time.perf_counter()
+        for _ in range(n):
+            await local.hit("src", self.LIMITS)
+        local_dps = n / (time.perf_counter() - start)
+
+        shared = _shared(redis)
+        start = time.perf_counter()
+        for _ in range(500):
+            await shared.hit("src", self.LIMITS)
+        shared_dps = 500 / (time.perf_counter() - start)
+
+        print(
+            f"\nBENCH|rate_limiter|legacy_deque_dps={legacy_dps:.0f}|"
+            f"gcra_local_dps={local_dps:.0f}|gcra_fakeredis_dps={shared_dps:.0f}|"
+            f"legacy_entries={len(legacy_windows['src'])}|gcra_keys={len(local._local_tats)}"
+        )
+
+        assert local_dps > legacy_dps
+        assert len(local._local_tats) == len(self.LIMITS)
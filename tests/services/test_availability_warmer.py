@@ -0,0 +1,299 @@
+"""
+Tests for the background availability warmer.
+Incremental sync-token refresh feeding the cached slot grid read by SchedulingNode.
+"""
+import asyncio
+import time
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import httplib2
+import pytest
+import pytz
+from googleapiclient.errors import HttpError
+
+from app.clients.google_calendar import GoogleCalendarClient
+from app.clients.google_calendar_async import AsyncGoogleCalendarClient
+from app.core.nodes.scheduling import SchedulingNode
+from app.services.availability_warmer import AvailabilityWarmer
+from app.services.calendar_busy_index import BusyIntervalIndex
+from app.services.calendar_cache_service import CalendarCacheService
+from app.services.calendar_circuit_breaker import CalendarCircuitBreaker
+from app.services.calendar_rate_limiter import CalendarRateLimiter
+
+TZ = pytz.timezone("America/Sao_Paulo")
+FRIDAY = date(2030, 1, 4)
+MONDAY = date(2030, 1, 7)
+CALENDAR = "unit@calendar"
+
+
+def _at(day: date, hour: int, minute: int = 0) -> datetime:
+    return TZ.localize(datetime.combine(day, datetime.min.time())) + timedelta(
+        hours=hour, minutes=minute
+    )
+
+
+def _event(event_id: str, start: datetime, end: datetime) -> dict:
+    return {
+        "id": event_id,
+        "status": "confirmed",
+        "start": {"dateTime": start.isoformat()},
+        "end": {"dateTime": end.isoformat()},
+    }
+
+
+class FakeSyncCalendarService:
+    """events().list with Calendar sync-token semantics over a change log."""
+
+    def __init__(self, page_size: int = 2500):
+        self.changes = []  # (version, event)
+        self.page_size = page_size
+        self.requests = []
+        self.expired_tokens = set()
+
+    def put(self, event: dict):
+        self.changes.append((len(self.changes) + 1, event))
+
+    def cancel(self, event_id: str):
+        self.put({"id": event_id, "status": "cancelled"})
+
+    def events(self):
+        return self
+
+    def list(self, calendarId, pageToken=None, syncToken=None, timeMin=None, **kwargs):
+        self.requests.append({"syncToken": syncToken, "timeMin": timeMin, "pageToken": pageToken})
+
+        def execute():
+            if syncToken in self.expired_tokens:
+                raise HttpError(httplib2.Response({"status": 410}), b"Sync token is no longer valid")
+
+            since = int(syncToken or 0)
+            latest = {}
+            for version, event in self.changes:
+                if version > since:
+                    latest[event["id"]] = event
+            items = list(latest.values())
+            if syncToken is None:
+                items = [e for e in items if e.get("status") != "cancelled"]
+
+            offset = int(pageToken or 0)
+            page = {"items": items[offset:offset + self.page_size]}
+            if offset + self.page_size < len(items):
+                page["nextPageToken"] = str(offset + self.page_size)
+            else:
+                page["nextSyncToken"] = str(len(self.changes))
+            return page
+
+        return _Request(execute)
+
+
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self, http=None):
+        return self._fn()
+
+
+@pytest.fixture
+def service():
+    service = FakeSyncCalendarService()
+    service.put(_event("a", _at(MONDAY, 10), _at(MONDAY, 11)))
+    return service
+
+
+@pytest.fixture
+def warmer(service):
+    sync_client = GoogleCalendarClient.__new__(GoogleCalendarClient)
+    sync_client.service, sync_client.credentials = service, None
+    rate_limiter = CalendarRateLimiter()
+    rate_limiter.per_second_bucket.capacity = rate_limiter.per_second_bucket.tokens = 10_000
+    client = AsyncGoogleCalendarClient(
+        sync_client, circuit_breaker=CalendarCircuitBreaker(), rate_limiter=rate_limiter
+    )
+
+    cache = CalendarCacheService()
+    cache._redis_initialized = True  # memória apenas
+    warmer = AvailabilityWarmer(calendar_client=client, cache=cache, days_ahead=14)
+    with patch.object(warmer, "calendar_ids", return_value=[CALENDAR]):
+        yield warmer
+
+
+async def _free_times(warmer, day: date):
+    return await warmer.cache.get_availability(str(day), CALENDAR, warmer.grid)
+
+
+class TestAvailabilityWarmer:
+    """Sync-token refresh and precomputed grid."""
+
+    @pytest.mark.asyncio
+    async def test_full_then_incremental_sync(self, warmer, service):
+        await warmer.refresh(today=FRIDAY)
+
+        free = await _free_times(warmer, MONDAY)
+        # 10h ocupado; 9h e 11h caem no buffer de 15 min do evento
+        assert "08:00" in free and "12:00" in free
+        assert not {"09:00", "09:30", "10:00", "10:30", "11:00"} & set(free)
+        assert service.requests[0]["timeMin"] == _at(MONDAY, 0).isoformat()
+
+        service.put(_event("b", _at(MONDAY, 15), _at(MONDAY, 16)))
+        await warmer.refresh(today=FRIDAY)
+
+        assert service.requests[-1] == {"syncToken": "1", "timeMin": None, "pageToken": None}
+        assert "15:00" not in await _free_times(warmer, MONDAY)
+        assert warmer.get_stats()["full_syncs"] == 1
+        assert warmer.get_stats()["incremental_syncs"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_event_frees_slots(self, warmer, service):
+        await warmer.refresh(today=FRIDAY)
+        service.cancel("a")
+        await warmer.refresh(today=FRIDAY)
+
+        assert "10:00" in await _free_times(warmer, MONDAY)
+        assert warmer.get_stats()["events"] == 0
+
+    @pytest.mark.asyncio
+    async def test_partial_refresh_keeps_earlier_grid_days(self, warmer, service):
+        later = MONDAY + timedelta(days=7)
+        await warmer.refresh(today=FRIDAY)
+
+        await warmer.refresh_calendar(CALENDAR, today=FRIDAY, dates=[later])
+        service.put(_event("b", _at(MONDAY, 15), _at(MONDAY, 16)))
+        await warmer.refresh_calendar(CALENDAR, today=FRIDAY, dates=[later])
+
+        assert warmer.get_stats()["events"] == 2
+        assert MONDAY in warmer._grids[CALENDAR]
+        assert not warmer._index.is_free(CALENDAR, _at(MONDAY, 10), _at(MONDAY, 11))
+
+    @pytest.mark.asyncio
+    async def test_expired_sync_token_falls_back_to_full_sync(self, warmer, service):
+        await warmer.refresh(today=FRIDAY)
+        service.expired_tokens.add("1")
+        service.cancel("a")
+        await warmer.refresh(today=FRIDAY)
+
+        assert service.requests[-1]["timeMin"] is not None
+        assert warmer.get_stats()["full_syncs"] == 2
+        assert "10:00" in await _free_times(warmer, MONDAY)
+
+    @pytest.mark.asyncio
+    async def test_paginated_sync(self, warmer, service):
+        service.page_size = 1
+        service.put(_event("b", _at(MONDAY, 15), _at(MONDAY, 16)))
+        await warmer.refresh(today=FRIDAY)
+
+        free = await _free_times(warmer, MONDAY)
+        assert "10:00" not in free and "15:00" not in free
+        assert warmer._sync_tokens[CALENDAR] == "2"
+
+    @pytest.mark.asyncio
+    async def test_get_free_slots(self, warmer):
+        assert await warmer.get_free_slots(["10:00"], calendar_id=CALENDAR, today=FRIDAY) is None
+
+        await warmer.refresh(today=FRIDAY)
+        slots = await warmer.get_free_slots(
+            ["10:00", "14:00"], limit=3, calendar_id=CALENDAR, today=FRIDAY
+        )
+
+        tuesday = MONDAY + timedelta(days=1)
+        assert slots == [(MONDAY, "14:00"), (tuesday, "10:00"), (tuesday, "14:00")]
+
+    @pytest.mark.asyncio
+    async def test_refresh_error_keeps_previous_grid(self, warmer, service):
+        await warmer.refresh(today=FRIDAY)
+        service.list = None  # qualquer chamada falha
+
+        await warmer.refresh(today=FRIDAY)
+
+        assert warmer.get_stats()["refresh_errors"] == 1
+        assert "08:00" in await _free_times(warmer, MONDAY)
+
+    @pytest.mark.asyncio
+    async def test_index_invalidation_triggers_early_refresh(self, warmer):
+        warmer.refresh_interval = 3600
+        index = BusyIntervalIndex()
+        with patch("app.services.availability_warmer.busy_interval_index", index):
+            warmer.start()
+            for _ in range(50):
+                if warmer.get_stats()["full_syncs"]:
+                    break
+                await asyncio.sleep(0.01)
+
+            index.invalidate(CALENDAR)
+            for _ in range(50):
+                if warmer.get_stats()["incremental_syncs"]:
+                    break
+                await asyncio.sleep(0.01)
+            await warmer.stop()
+
+        assert warmer.get_stats()["incremental_syncs"] == 1
+        assert not warmer.get_stats()["running"]
+
+
+class TestSchedulingNodeCache:
+    """SchedulingNode offers cached free slots, falling back when cold."""
+
+    TIME_OPTIONS = [
+        {"time": "09:00", "display": "9h00", "available": True},
+        {"time": "10:00", "display": "10h00", "available": True},
+    ]
+
+    @pytest.mark.asyncio
+    async def test_uses_cached_slots(self, warmer):
+        await warmer.refresh(today=FRIDAY)
+        node = SchedulingNode.__new__(SchedulingNode)
+
+        with patch("app.core.nodes.scheduling.availability_warmer", warmer), patch.object(
+            warmer, "business_dates", return_value=warmer.business_dates(FRIDAY)
+        ), patch("app.services.availability_warmer.settings.GOOGLE_CALENDAR_ID", CALENDAR):
+            dates = await node._cached_available_dates(self.TIME_OPTIONS)
+
+        # segunda 9h/10h estão ocupados (evento + buffer): primeira opção é terça
+        assert dates[0]["datetime"] == datetime(2030, 1, 8, 9, 0)
+        assert dates[0]["date_formatted"] == "08/01/2030 (Terça-feira)"
+        assert [d["time_formatted"] for d in dates[:2]] == ["9h00", "10h00"]
+        assert len(dates) == 5
+
+    @pytest.mark.asyncio
+    async def test_cold_cache_returns_none(self, warmer):
+        node = SchedulingNode.__new__(SchedulingNode)
+
+        with patch("app.core.nodes.scheduling.availability_warmer", warmer):
+            assert await node._cached_available_dates(self.TIME_OPTIONS) is None
+
+
+@pytest.mark.performance
+class TestAvailabilityWarmerBenchmark:
+    """Turn-time slot lookup from the warmed grid."""
+
+    @pytest.mark.asyncio
+    async def test_cached_lookup_is_sub_millisecond(self, warmer, service):
+        for i in range(200):
+            day = MONDAY + timedelta(days=i % 14)
+            service.put(_event(f"e{i}", _at(day, 8 + i % 9), _at(day, 9 + i % 9)))
+
+        start = time.perf_counter()
+        await warmer.refresh(today=FRIDAY)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        service.put(_event("late", _at(MONDAY, 17), _at(MONDAY, 18)))
+        start = time.perf_counter()
+        await warmer.refresh(today=FRIDAY)
+        incremental_ms = (time.perf_counter() - start) * 1000
+
+        times = ["14:00", "14:30", "15:00", "15:30", "16:00", "16:30", "17:00", "17:30"]
+        rounds = 200
+        start = time.perf_counter()
+        for _ in range(rounds):
+            slots = await warmer.get_free_slots(times, calendar_id=CALENDAR, today=FRIDAY)
+        lookup_us = (time.perf_counter() - start) / rounds * 1e6
+
+        print(
+            f"\nBENCH|availability_warmer|full_refresh_ms={full_ms:.1f}|"
+            f"incremental_refresh_ms={incremental_ms:.1f}|"
+            f"lookup_us={lookup_us:.1f}"
+        )
+
+        assert slots is not None
+        assert lookup_us < 1000
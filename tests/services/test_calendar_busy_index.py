@@ -0,0 +1,271 @@
+"""
+Tests for the busy interval index behind AvailabilityService.
+One calendar fetch per date range; slot checks are bisect lookups.
+"""
+import time
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+import pytz
+
+from app.clients.google_calendar import GoogleCalendarClient
+from app.clients.google_calendar_async import AsyncGoogleCalendarClient
+from app.services.availability_service import AvailabilityService
+from app.services.calendar_busy_index import BusyIntervalIndex
+from app.services.calendar_circuit_breaker import CalendarCircuitBreaker
+from app.services.calendar_rate_limiter import CalendarRateLimiter
+
+TZ = pytz.timezone("America/Sao_Paulo")
+MONDAY = date(2030, 1, 7)
+
+
+def _at(day: date, hour: int, minute: int = 0) -> datetime:
+    return TZ.localize(datetime.combine(day, datetime.min.time())) + timedelta(
+        hours=hour, minutes=minute
+    )
+
+
+class FakeCalendarService:
+    """Minimal googleapiclient stand-in for events().list/insert/delete."""
+
+    def __init__(self, events=None, latency_s: float = 0.0, page_size: int = 2500):
+        self.events_by_id = {e["id"]: e for e in events or []}
+        self.latency_s = latency_s
+        self.page_size = page_size
+        self.list_calls = 0
+
+    def events(self):
+        return self
+
+    def list(self, timeMin, timeMax, pageToken=None, **kwargs):
+        def execute():
+            self.list_calls += 1
+            time.sleep(self.latency_s)
+            lo, hi = datetime.fromisoformat(timeMin), datetime.fromisoformat(timeMax)
+            items = [
+                e
+                for e in self.events_by_id.values()
+                if "dateTime" not in e["start"] or (
+                    datetime.fromisoformat(e["start"]["dateTime"]) < hi and
+                    datetime.fromisoformat(e["end"]["dateTime"]) > lo
+                )
+            ]
+            offset = int(pageToken or 0)
+            page = {"items": items[offset:offset + self.page_size]}
+            if offset + self.page_size < len(items):
+                page["nextPageToken"] = str(offset + self.page_size)
+            return page
+
+        return _Request(execute)
+
+    def insert(self, calendarId, body):
+        def execute():
+            event_id = f"evt{len(self.events_by_id)}"
+            self.events_by_id[event_id] = {"id": event_id, **body}
+            return {"id": event_id}
+
+        return _Request(execute)
+
+    def delete(self, calendarId, eventId):
+        return _Request(lambda: self.events_by_id.pop(eventId))
+
+
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self, http=None):
+        return self._fn()
+
+
+def _event(event_id: str, start: datetime, end: datetime) -> dict:
+    return {
+        "id": event_id,
+        "start": {"dateTime": start.isoformat()},
+        "end": {"dateTime": end.isoformat()},
+    }
+
+
+@pytest.fixture
+def service():
+    return FakeCalendarService(
+        [
+            _event("a", _at(MONDAY, 10), _at(MONDAY, 11)),
+            {"id": "allday", "start": {"date": str(MONDAY)}, "end": {"date": str(MONDAY)}},
+        ]
+    )
+
+
+@pytest.fixture
+def availability(service):
+    with patch(
+        "app.services.availability_service.busy_interval_index",
+        BusyIntervalIndex(buffer_minutes=15, ttl_seconds=300),
+    ):
+        availability = AvailabilityService()
+
+    sync_client = GoogleCalendarClient.__new__(GoogleCalendarClient)
+    sync_client.service, sync_client.credentials = service, None
+    rate_limiter = CalendarRateLimiter()
+    rate_limiter.per_second_bucket.capacity = rate_limiter.per_second_bucket.tokens = 10_000
+    availability.calendar_client = AsyncGoogleCalendarClient(
+        sync_client, circuit_breaker=CalendarCircuitBreaker(), rate_limiter=rate_limiter
+    )
+    availability.calendar_id = "unit@calendar"
+    return availability
+
+
+class TestBusyIntervalIndex:
+    """Interval merging, buffer expansion and bisect lookups."""
+
+    def test_buffer_expanded_overlap(self):
+        index = BusyIntervalIndex(buffer_minutes=15)
+        index.load("cal", _at(MONDAY, 0), _at(MONDAY, 24), [(_at(MONDAY, 10), _at(MONDAY, 11))])
+
+        assert not index.is_free("cal", _at(MONDAY, 9), _at(MONDAY, 10))  # buffer antes
+        assert not index.is_free("cal", _at(MONDAY, 11), _at(MONDAY, 12))  # buffer depois
+        assert index.is_free("cal", _at(MONDAY, 8), _at(MONDAY, 9))
+        assert index.is_free("cal", _at(MONDAY, 12), _at(MONDAY, 13))
+
+    def test_overlapping_intervals_are_merged(self):
+        index = BusyIntervalIndex(buffer_minutes=0)
+        index.load(
+            "cal",
+            _at(MONDAY, 0),
+            _at(MONDAY, 24),
+            [
+                (_at(MONDAY, 14), _at(MONDAY, 15)),
+                (_at(MONDAY, 9), _at(MONDAY, 10, 30)),
+                (_at(MONDAY, 10), _at(MONDAY, 11)),
+            ],
+        )
+
+        assert index.get_stats()["intervals"] == 2
+        assert not index.is_free("cal", _at(MONDAY, 10, 45), _at(MONDAY, 11, 15))
+        assert index.is_free("cal", _at(MONDAY, 11), _at(MONDAY, 14))
+
+    def test_coverage_respects_window_and_ttl(self):
+        index = BusyIntervalIndex(ttl_seconds=0)
+        index.load("cal", _at(MONDAY, 0), _at(MONDAY, 24), [])
+
+        assert not index.covers("cal", _at(MONDAY, 8), _at(MONDAY, 9))
+        index.ttl_seconds = 300
+        assert index.covers("cal", _at(MONDAY, 8), _at(MONDAY, 9))
+        assert not index.covers("cal", _at(MONDAY, 23), _at(MONDAY, 25))
+        assert not index.covers("other", _at(MONDAY, 8), _at(MONDAY, 9))
+
+
+class TestAvailabilityServiceIndex:
+    """AvailabilityService answers slots from the index."""
+
+    @pytest.mark.asyncio
+    async def test_day_slots_use_one_fetch(self, availability, service):
+        slots = await availability.get_available_slots(preferred_date=str(MONDAY))
+
+        # 10h está ocupado e 9h/11h caem no buffer de 15 min; o evento de dia inteiro é ignorado
+        times = [slot.time for slot in slots]
+        assert "10:00" not in times and "09:00" not in times and "11:00" not in times
+        assert "08:00" in times and "12:00" in times
+        assert service.list_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_period_scan_prefetches_range(self, availability, service):
+        service.events_by_id.clear()  # agenda livre: a varredura percorre todos os dias
+        slots = await availability._get_slots_for_period(3, "consultation")
+        last_day = datetime.strptime(slots[-1].date, "%Y-%m-%d").date()
+        await availability.check_specific_time_availability(str(last_day), "15:00")
+
+        assert slots
+        assert service.list_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_index(self, availability, service):
+        assert await availability.check_specific_time_availability(str(MONDAY), "15:00")
+
+        with patch(
+            "app.clients.google_calendar_async.busy_interval_index", availability.busy_index
+        ), patch("app.clients.google_calendar_async.settings.GOOGLE_CALENDAR_ID", "unit@calendar"):
+            event_id = await availability.calendar_client.create_event(
+                {"start_time": _at(MONDAY, 15), "end_time": _at(MONDAY, 16)}
+            )
+            assert not await availability.check_specific_time_availability(str(MONDAY), "15:00")
+
+            await availability.calendar_client.delete_event(event_id)
+            assert await availability.check_specific_time_availability(str(MONDAY), "15:00")
+
+        assert service.list_calls == 3
+
+    @pytest.mark.asyncio
+    async def test_pagination(self, availability, service):
+        service.page_size = 1
+        service.events_by_id["b"] = _event("b", _at(MONDAY, 14), _at(MONDAY, 15))
+
+        assert not await availability.check_specific_time_availability(str(MONDAY), "14:00")
+        assert service.list_calls == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_failure_falls_back_to_per_slot_query(self, availability):
+        async def failing_fetch(*args):
+            return None
+
+        availability.calendar_client.list_busy_intervals = failing_fetch
+        with patch.object(
+            availability.calendar_client, "check_conflicts", return_value=[{"id": "a"}]
+        ) as check_conflicts:
+            assert not await availability.check_specific_time_availability(str(MONDAY), "10:00")
+
+        check_conflicts.assert_awaited_once()
+
+
+@pytest.mark.performance
+class TestBusyIndexBenchmark:
+    """14-day scan: per-slot events.list vs one ranged fetch + bisect."""
+
+    LATENCY_S = 0.005
+
+    @pytest.mark.asyncio
+    async def test_fourteen_day_scan(self, availability, service):
+        service.latency_s = self.LATENCY_S
+        days = [MONDAY + timedelta(days=i) for i in range(14)]
+        business_days = [d for d in days if d.weekday() in availability.business_days]
+        slots = availability._generate_time_slots(MONDAY)
+
+        async def per_slot_scan():
+            free = 0
+            for day in business_days:
+                for slot in slots:
+                    start = _at(day, int(slot[:2]))
+                    conflicts = await availability.calendar_client.check_conflicts(
+                        start - timedelta(minutes=15), start + timedelta(minutes=75), "unit@calendar"
+                    )
+                    free += not conflicts
+            return free
+
+        async def indexed_scan():
+            free = 0
+            for day in business_days:
+                for slot in slots:
+                    free += await availability._is_slot_available(day, slot)
+            return free
+
+        start = time.perf_counter()
+        baseline_free = await per_slot_scan()
+        baseline_ms = (time.perf_counter() - start) * 1000
+        baseline_calls, service.list_calls = service.list_calls, 0
+
+        start = time.perf_counter()
+        await availability._ensure_busy_index(business_days[0], business_days[-1])
+        indexed_free = await indexed_scan()
+        indexed_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"\nBENCH|busy_index|slots={len(business_days) * len(slots)}|"
+            f"per_slot_calls={baseline_calls}|per_slot_ms={baseline_ms:.1f}|"
+            f"indexed_calls={service.list_calls}|indexed_ms={indexed_ms:.1f}"
+        )
+
+        assert indexed_free == baseline_free
+        assert service.list_calls == 1
+        assert baseline_calls == len(business_days) * len(slots)
+        assert indexed_ms < baseline_ms
@@ -0,0 +1,130 @@
+"""
+Tests for the query-embedding micro-batcher.
+Concurrent requests share one embed call; results fan back out to callers.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.services.embedding_batcher import EmbeddingMicroBatcher
+
+
+class FakeEncoder:
+    """Batch embed on a single CPU worker with per-call overhead."""
+
+    def __init__(self, call_overhead_s: float = 0.0, per_text_s: float = 0.0):
+        self.call_overhead_s = call_overhead_s
+        self.per_text_s = per_text_s
+        self.batches = []
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def _encode(self, texts):
+        time.sleep(self.call_overhead_s + self.per_text_s * len(texts))
+        return [np.full(4, float(len(text)), dtype=np.float32) for text in texts]
+
+    async def embed_texts(self, texts):
+        self.batches.append(list(texts))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._encode, texts)
+
+
+class TestEmbeddingMicroBatcher:
+    """Flush policy, fan-out and error propagation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_batch(self):
+        encoder = FakeEncoder()
+        batcher = EmbeddingMicroBatcher(encoder.embed_texts, max_batch_size=32, max_wait_ms=5)
+
+        results = await asyncio.gather(*(batcher.embed("x" * i) for i in range(1, 11)))
+
+        assert len(encoder.batches) == 1
+        assert [r[0] for r in results] == [float(i) for i in range(1, 11)]
+        stats = batcher.get_stats()
+        assert stats["batch_size"]["buckets"]["le_16"] == 1
+        assert stats["queue_wait_ms"]["count"] == 10
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_max_batch_size(self):
+        encoder = FakeEncoder()
+        batcher = EmbeddingMicroBatcher(encoder.embed_texts, max_batch_size=4, max_wait_ms=1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(batcher.embed(f"q{i}") for i in range(8)))
+
+        assert [len(batch) for batch in encoder.batches] == [4, 4]
+        assert time.perf_counter() - start < 0.5  # não esperou o timer de 1s
+
+    @pytest.mark.asyncio
+    async def test_duplicate_texts_embedded_once(self):
+        encoder = FakeEncoder()
+        batcher = EmbeddingMicroBatcher(encoder.embed_texts, max_wait_ms=2)
+
+        a, b = await asyncio.gather(batcher.embed("oi"), batcher.embed("oi"))
+
+        assert encoder.batches == [["oi"]]
+        np.testing.assert_array_equal(a, b)
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_reaches_every_caller(self):
+        async def failing(texts):
+            raise RuntimeError("model unavailable")
+
+        batcher = EmbeddingMicroBatcher(failing, max_wait_ms=1)
+
+        results = await asyncio.gather(
+            batcher.embed("a"), batcher.embed("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert batcher.get_stats()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_break_batch(self):
+        encoder = FakeEncoder(call_overhead_s=0.01)
+        batcher = EmbeddingMicroBatcher(encoder.embed_texts, max_wait_ms=1)
+
+        cancelled = asyncio.ensure_future(batcher.embed("a"))
+        kept = asyncio.ensure_future(batcher.embed("bb"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        assert (await kept)[0] == 2.0
+        await batcher.drain()
+
+
+@pytest.mark.performance
+class TestEmbeddingBatcherBenchmark:
+    """64 concurrent queries on one CPU worker: per-query calls vs micro-batches."""
+
+    CALL_OVERHEAD_S = 0.004
+    PER_TEXT_S = 0.0002
+
+    @pytest.mark.asyncio
+    async def test_concurrent_query_throughput(self):
+        queries = [f"qual o horário de funcionamento {i}?" for i in range(64)]
+
+        unbatched = FakeEncoder(self.CALL_OVERHEAD_S, self.PER_TEXT_S)
+        start = time.perf_counter()
+        await asyncio.gather(*(unbatched.embed_texts([q]) for q in queries))
+        unbatched_qps = len(queries) / (time.perf_counter() - start)
+
+        batched = FakeEncoder(self.CALL_OVERHEAD_S, self.PER_TEXT_S)
+        batcher = EmbeddingMicroBatcher(batched.embed_texts, max_batch_size=32, max_wait_ms=5)
+        start = time.perf_counter()
+        await asyncio.gather(*(batcher.embed(q) for q in queries))
+        batched_qps = len(queries) / (time.perf_counter() - start)
+
+        stats = batcher.get_stats()
+        print(
+            f"\nBENCH|embedding_microbatch|queries={len(queries)}|"
+            f"unbatched_calls={len(unbatched.batches)}|unbatched_qps={unbatched_qps:.0f}|"
+            f"batched_calls={len(batched.batches)}|batched_qps={batched_qps:.0f}|"
+            f"mean_batch={stats['batch_size']['mean']}|mean_wait_ms={stats['queue_wait_ms']['mean']}"
+        )
+
+        assert len(batched.batches) == 2
+        assert batched_qps > unbatched_qps
@@ -0,0 +1,175 @@
+"""
+Tests for the memory-mapped embedding cache store.
+One float32 matrix per namespace, zero-copy lookups and LRU compaction.
+"""
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+from app.services.embedding_store import EmbeddingMatrixStore
+from app.services.hybrid_embedding_service import HybridEmbeddingService
+
+DIM = 8
+
+
+def _vec(seed: int, dim: int = DIM) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return EmbeddingMatrixStore(tmp_path, DIM, namespace="test")
+
+
+class TestEmbeddingMatrixStore:
+    """Append, lookup, persistence and compaction."""
+
+    def test_roundtrip_returns_readonly_views(self, store):
+        store.put_many([("a", _vec(1)), ("b", _vec(2))])
+
+        a, b, missing = store.get_many(["a", "b", "c"])
+
+        np.testing.assert_array_equal(a, _vec(1))
+        np.testing.assert_array_equal(b, _vec(2))
+        assert missing is None
+        assert isinstance(a.base, np.memmap) or isinstance(a, np.memmap)
+        assert not a.flags.writeable
+        assert store.stats()["hits"] == 2 and store.stats()["misses"] == 1
+
+    def test_duplicate_keys_are_appended_once(self, store):
+        store.put("a", _vec(1))
+        store.put_many([("a", _vec(2)), ("b", _vec(3)), ("b", _vec(4))])
+
+        assert len(store) == 2
+        np.testing.assert_array_equal(store.get("a"), _vec(1))
+        assert store.stats()["size_mb"] == round(2 * DIM * 4 / (1024 * 1024), 3)
+
+    def test_persists_across_instances(self, store, tmp_path):
+        store.put_many([(f"k{i}", _vec(i)) for i in range(10)])
+
+        reopened = EmbeddingMatrixStore(tmp_path, DIM, namespace="test")
+
+        assert len(reopened) == 10
+        np.testing.assert_array_equal(reopened.get("k7"), _vec(7))
+
+    def test_sees_rows_appended_by_another_process(self, store, tmp_path):
+        other = EmbeddingMatrixStore(tmp_path, DIM, namespace="test")
+        store.put("a", _vec(1))
+        other.put("b", _vec(2))
+
+        np.testing.assert_array_equal(store.get("b"), _vec(2))
+        np.testing.assert_array_equal(other.get("a"), _vec(1))
+
+    def test_lru_compaction_keeps_recently_used_rows(self, tmp_path):
+        store = EmbeddingMatrixStore(tmp_path, DIM, namespace="lru", max_rows=10, compact_ratio=0.5)
+        store.put_many([(f"k{i}", _vec(i)) for i in range(10)])
+        store.get_many(["k0", "k1"])  # mais recentes que k2..k9
+
+        store.put("k10", _vec(10))
+
+        assert store.stats()["compactions"] == 1
+        assert len(store) == 5
+        assert store.get("k0") is not None and store.get("k1") is not None
+        assert store.get("k10") is not None
+        assert store.get("k2") is None
+        np.testing.assert_array_equal(store.get("k0"), _vec(0))
+        assert sorted(p.name for p in tmp_path.glob("lru.*.f32")) == ["lru.1.f32"]
+
+        reopened = EmbeddingMatrixStore(tmp_path, DIM, namespace="lru")
+        np.testing.assert_array_equal(reopened.get("k10"), _vec(10))
+
+    def test_dimension_change_starts_new_generation(self, store, tmp_path):
+        store.put("a", _vec(1))
+
+        wider = EmbeddingMatrixStore(tmp_path, DIM * 2, namespace="test")
+
+        assert len(wider) == 0
+        assert wider.stats()["generation"] == 1
+
+    def test_wrong_dimension_vectors_are_skipped(self, store):
+        store.put("a", _vec(1, DIM + 1))
+
+        assert store.get("a") is None
+
+    def test_partial_row_from_interrupted_write_is_dropped(self, store, tmp_path):
+        store.put("a", _vec(1))
+        with open(tmp_path / "test.0.f32", "ab") as f:
+            f.write(b"\x00" * 5)
+
+        store.put("b", _vec(2))
+
+        np.testing.assert_array_equal(
+            EmbeddingMatrixStore(tmp_path, DIM, namespace="test").get("b"), _vec(2)
+        )
+
+    def test_clear(self, store):
+        store.put("a", _vec(1))
+        store.clear()
+
+        assert store.get("a") is None
+        assert len(store) == 0
+
+
+class TestHybridEmbeddingCache:
+    """HybridEmbeddingService caches through the matrix store."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_served_from_store(self, tmp_path, monkeypatch):
+        monkeypatch.delenv("UNIT_TESTING", raising=False)
+        monkeypatch.setattr("app.services.hybrid_embedding_service.settings.EMBEDDING_CACHE_DIR", str(tmp_path))
+        service = HybridEmbeddingService()
+        service._ensure_initialized()
+
+        calls = []
+
+        class _Primary:
+            async def embed_texts(self, texts, batch_size=32):
+                calls.extend(texts)
+                return [[0.5] * 384 for _ in texts]
+
+        service.primary_service = _Primary()
+
+        assert await service.embed_text("Qual o valor?") == [0.5] * 384
+        assert await service.embed_text("Qual o valor?") == [0.5] * 384
+        assert calls == ["Qual o valor?"]
+        assert len(service.stores[384]) == 1
+        assert not [p for p in tmp_path.glob("*.json") if not p.name.endswith(".meta.json")]
+
+
+@pytest.mark.performance
+class TestEmbeddingStoreBenchmark:
+    """Lookup latency: one pickle file per text vs memory-mapped matrix."""
+
+    def test_lookup_latency(self, tmp_path):
+        n, dim = 2000, 384
+        vectors = [_vec(i, dim) for i in range(n)]
+        keys = [f"k{i}" for i in range(n)]
+
+        pickle_dir = tmp_path / "pickles"
+        pickle_dir.mkdir()
+        for key, vector in zip(keys, vectors):
+            with open(pickle_dir / f"{key}.pkl", "wb") as f:
+                pickle.dump(vector, f)
+
+        store = EmbeddingMatrixStore(tmp_path / "matrix", dim, namespace="bench")
+        store.put_many(list(zip(keys, vectors)))
+
+        start = time.perf_counter()
+        for key in keys:
+            cache_file = pickle_dir / f"{key}.pkl"
+            if cache_file.exists():
+                cache_file.touch()
+                with open(cache_file, "rb") as f:
+                    pickle.load(f)
+        pickle_us = (time.perf_counter() - start) / n * 1e6
+
+        start = time.perf_counter()
+        for key in keys:
+            store.get(key)
+        store_us = (time.perf_counter() - start) / n * 1e6
+
+        print(f"\nBENCH|embedding_store|n={n}|pickle_us={pickle_us:.1f}|mmap_us={store_us:.1f}")
+
+        assert store_us < pickle_us
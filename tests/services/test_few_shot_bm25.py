@@ -0,0 +1,167 @@
+"""
+Tests for BM25 few-shot example retrieval in RAGEngine.
+Stemmed PT-BR terms in an inverted index, updated on add/reload.
+"""
+import random
+import time
+
+import pytest
+
+from app.services.bm25_index import BM25Index, stem_pt, tokenize
+from app.services.rag_engine import FewShotExample, RAGEngine
+
+
+def _legacy_find_similar(examples, question, max_examples=3):
+    """Implementação anterior: varredura de todos os exemplos por pergunta."""
+    question_lower = question.lower()
+    scored = []
+    for example in examples:
+        score = 0
+        for keyword in example.keywords:
+            if keyword.lower() in question_lower:
+                score += 5
+        example_words = example.question.lower().split()
+        for word in question_lower.split():
+            if len(word) > 3:
+                if word in example.question.lower():
+                    score += 3
+                elif any(word in example_word for example_word in example_words):
+                    score += 1
+        if score > 0:
+            scored.append((score, example))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [example for _, example in scored[:max_examples]]
+
+
+@pytest.fixture
+def engine():
+    return RAGEngine()
+
+
+class TestTokenize:
+    """Accent folding, stopwords and light stemming."""
+
+    def test_inflections_share_a_term(self):
+        assert tokenize("Mensalidades?") == tokenize("mensalidade")
+        assert tokenize("informações") == tokenize("informação")
+        assert tokenize("Horários") == tokenize("horario")
+
+    def test_stopwords_and_punctuation_are_dropped(self):
+        assert tokenize("Qual o valor da mensalidade?") == ["valor", "mensalidad"]
+
+    def test_short_stems_are_kept(self):
+        assert stem_pt("mes") == "mes"
+        assert stem_pt("dias") == "dia"
+
+
+class TestBM25Index:
+    """Scoring, incremental updates and removal."""
+
+    def test_rare_terms_score_higher(self):
+        index = BM25Index()
+        index.add("a", tokenize("valor da mensalidade do kumon"))
+        index.add("b", tokenize("horário de funcionamento do kumon"))
+        index.add("c", tokenize("kumon matemática"))
+
+        hits = index.search(tokenize("kumon mensalidade"))
+
+        assert hits[0][0] == "a"
+        assert {doc_id for doc_id, _ in hits} == {"a", "b", "c"}
+
+    def test_add_replaces_and_remove_cleans_postings(self):
+        index = BM25Index()
+        index.add("a", tokenize("valor"))
+        index.add("a", tokenize("horário"))
+
+        assert index.search(tokenize("valor")) == []
+        assert index.remove("a") and not index.remove("a")
+        assert index.get_stats() == {"documents": 0, "terms": 0, "average_length": 0.0}
+
+    def test_no_matching_terms(self):
+        index = BM25Index()
+        index.add("a", tokenize("valor"))
+
+        assert index.search(tokenize("xyz")) == []
+        assert BM25Index().search(["valor"]) == []
+
+
+class TestRAGEngineFewShotRetrieval:
+    """RAGEngine uses the index built from the loaded examples."""
+
+    def test_indexes_every_loaded_example(self, engine):
+        assert len(engine.few_shot_examples) == len(engine.example_index) > 0
+        assert all(example.answer for example in engine.few_shot_examples)
+
+    def test_finds_pricing_example_for_inflected_question(self, engine):
+        similar = engine._find_similar_examples("Quanto custam as mensalidades?")
+
+        assert similar and similar[0].category == "pricing"
+
+    def test_add_example_is_indexed_incrementally(self, engine):
+        engine.add_few_shot_example(
+            "Vocês têm estacionamento?", "Sim, há estacionamento na rua.", "infra", ["estacionamento", "carro"]
+        )
+
+        similar = engine._find_similar_examples("onde posso estacionar o carro?")
+
+        assert similar[0].category == "infra"
+        assert len(engine.example_index) == len(engine.few_shot_examples)
+
+    def test_reload_rebuilds_index(self, engine):
+        engine.add_few_shot_example("Pergunta extra", "Resposta", "extra", ["extra"])
+
+        engine.reload_examples()
+
+        assert len(engine.example_index) == len(engine.few_shot_examples)
+        assert engine._find_similar_examples("extra") == []
+
+
+@pytest.mark.performance
+class TestFewShotRetrievalBenchmark:
+    """Query latency as the example set grows: linear scan vs BM25 index."""
+
+    VOCABULARY = (
+        "matemática português inglês mensalidade valor matrícula horário unidade "
+        "telefone endereço idade criança filho método apostila tarefa lição nível "
+        "professor orientador avaliação diagnóstico material desconto irmãos férias "
+        "reposição aula presencial online progresso dificuldade leitura cálculo"
+    ).split()
+
+    def _example(self, rng, i):
+        words = rng.sample(self.VOCABULARY, 6)
+        return FewShotExample(
+            question=f"Pergunta {i} sobre " + " ".join(words) + "?",
+            answer=f"Resposta {i}",
+            category=rng.choice(["pricing", "methodology", "contact"]),
+            keywords=rng.sample(self.VOCABULARY, 3),
+        )
+
+    def test_query_latency_by_example_count(self, engine):
+        rng = random.Random(7)
+        questions = [
+            "Qual o valor da mensalidade de matemática?",
+            "Com que idade meu filho pode começar a leitura?",
+            "Tem desconto para irmãos na matrícula?",
+        ]
+        results = []
+
+        for size in (100, 1_000, 10_000):
+            engine.few_shot_examples = [self._example(rng, i) for i in range(size)]
+            engine._rebuild_example_index()
+
+            start = time.perf_counter()
+            for question in questions:
+                _legacy_find_similar(engine.few_shot_examples, question)
+            scan_ms = (time.perf_counter() - start) / len(questions) * 1000
+
+            start = time.perf_counter()
+            for question in questions:
+                engine._find_similar_examples(question)
+            index_ms = (time.perf_counter() - start) / len(questions) * 1000
+
+            results.append(f"n={size}|scan_ms={scan_ms:.2f}|bm25_ms={index_ms:.2f}")
+            assert len(engine._find_similar_examples(questions[0])) == 3
+
+        print("\nBENCH|few_shot_retrieval|" + "|".join(results))
+
+        assert index_ms < scan_ms
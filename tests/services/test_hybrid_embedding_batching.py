@@ -0,0 +1,153 @@
+"""
+Tests for batched HybridEmbeddingService.embed_texts.
+Bulk cache lookups and one model call for all cache misses.
+"""
+import zlib
+
+import numpy as np
+import pytest
+
+from app.services.hybrid_embedding_service import (
+    GCPEmbeddingWrapper,
+    HybridEmbeddingService,
+    SentenceTransformersWrapper,
+    TFIDFWrapper,
+)
+
+
+class FakeSentenceTransformer:
+    """encode() with deterministic vectors per text; records each call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.calls.append((len(texts), batch_size))
+        return np.stack(
+            [np.random.default_rng(zlib.crc32(t.encode())).random(384, dtype=np.float32) for t in texts]
+        )
+
+
+class FailingService:
+    async def embed_texts(self, texts, batch_size=32):
+        raise RuntimeError("model unavailable")
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.delenv("UNIT_TESTING", raising=False)
+    monkeypatch.setattr("app.services.hybrid_embedding_service.settings.EMBEDDING_CACHE_DIR", str(tmp_path))
+    service = HybridEmbeddingService()
+    service._ensure_initialized()
+    return service
+
+
+def _with_model(service, model) -> HybridEmbeddingService:
+    service.primary_service = SentenceTransformersWrapper(model, "cpu")
+    return service
+
+
+class TestBatchedEmbedTexts:
+    """Cache-aware batching in embed_texts."""
+
+    @pytest.mark.asyncio
+    async def test_single_encode_call_for_all_misses(self, service):
+        model = FakeSentenceTransformer()
+        _with_model(service, model)
+        texts = [f"chunk {i}" for i in range(40)] + ["chunk 3", "", "  "]
+
+        embeddings = await service.embed_texts(texts, batch_size=16)
+
+        assert model.calls == [(40, 16)]
+        assert embeddings[3] == embeddings[40]
+        assert embeddings[41] == embeddings[42] == [0.0] * 384
+        assert embeddings[7] == pytest.approx(model.encode(["chunk 7"])[0].tolist())
+
+    @pytest.mark.asyncio
+    async def test_knowledge_base_ingestion_is_one_encode_call(self, service):
+        model = FakeSentenceTransformer()
+        _with_model(service, model)
+        chunks = [f"Kumon chunk {i}: método individualizado de estudo" for i in range(1000)]
+
+        embeddings = await service.embed_texts(chunks)
+
+        assert model.calls == [(1000, 32)]
+        assert embeddings[500] == pytest.approx(model.encode([chunks[500]])[0].tolist())
+
+    @pytest.mark.asyncio
+    async def test_cached_texts_are_not_re_encoded(self, service):
+        model = FakeSentenceTransformer()
+        _with_model(service, model)
+        first = await service.embed_texts(["a", "b"])
+
+        embeddings = await service.embed_texts(["b", "c", "a"])
+
+        assert model.calls[-1][0] == 1  # só "c"
+        assert embeddings[0] == pytest.approx(first[1])
+        assert embeddings[2] == pytest.approx(first[0])
+
+    @pytest.mark.asyncio
+    async def test_batch_falls_back_to_next_service(self, service):
+        model = FakeSentenceTransformer()
+        service.primary_service = FailingService()
+        service.fallback_service = SentenceTransformersWrapper(model, "cpu")
+
+        embeddings = await service.embed_texts(["a", "b", "c"])
+
+        assert model.calls == [(3, 32)]
+        assert len(embeddings) == 3
+
+    @pytest.mark.asyncio
+    async def test_all_services_failing_returns_zero_vectors(self, service):
+        service.primary_service = FailingService()
+
+        assert await service.embed_texts(["a"]) == [[0.0] * 384]
+
+    @pytest.mark.asyncio
+    async def test_embed_text_goes_through_batch_path(self, service):
+        model = FakeSentenceTransformer()
+        _with_model(service, model)
+
+        assert await service.embed_text("oi") == pytest.approx(model.encode(["oi"])[0].tolist())
+        assert await service.embed_text("") == [0.0] * 384
+
+
+class TestServiceWrappers:
+    """Multi-instance Vertex AI requests and vectorized TF-IDF."""
+
+    @pytest.mark.asyncio
+    async def test_vertex_multi_instance_requests(self):
+        pytest.importorskip("google.protobuf")
+
+        class FakePredictionClient:
+            def __init__(self):
+                self.instances_per_call = []
+
+            def predict(self, endpoint, instances, parameters):
+                self.instances_per_call.append(len(instances))
+
+                class _Response:
+                    predictions = [
+                        {"embeddings": {"values": [float(i)] * 768}} for i in range(len(instances))
+                    ]
+
+                return _Response()
+
+        client = FakePredictionClient()
+        wrapper = GCPEmbeddingWrapper(client, object())
+        wrapper.max_instances = 5
+
+        embeddings = await wrapper.embed_texts([f"t{i}" for i in range(12)])
+
+        assert client.instances_per_call == [5, 5, 2]
+        assert len(embeddings) == 12 and len(embeddings[0]) == 768
+
+    @pytest.mark.asyncio
+    async def test_tfidf_single_transform(self):
+        sklearn_text = pytest.importorskip("sklearn.feature_extraction.text")
+        wrapper = TFIDFWrapper(sklearn_text.TfidfVectorizer(max_features=384))
+
+        embeddings = await wrapper.embed_texts(["matemática kumon", "português kumon"])
+
+        assert len(embeddings) == 2 and all(len(e) == 384 for e in embeddings)
+        assert embeddings[0] != embeddings[1]
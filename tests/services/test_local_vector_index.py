@@ -0,0 +1,148 @@
+"""
+Tests for the persisted local vector index used when Qdrant is unavailable.
+Same embeddings and category/keywords filters as the Qdrant collection.
+"""
+import time
+
+import numpy as np
+import pytest
+
+from app.services.local_vector_index import LocalVectorIndex
+
+DIM = 16
+
+
+def _vec(seed: int, dim: int = DIM) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+
+def _point(i: int, category: str = "general", keywords=()):
+    return (i, _vec(i), {"content": f"doc {i}", "category": category, "keywords": list(keywords)})
+
+
+@pytest.fixture
+def index(tmp_path):
+    return LocalVectorIndex("kumon_knowledge", directory=str(tmp_path))
+
+
+class TestLocalVectorIndex:
+    """Upsert/delete mirroring, filters and persistence."""
+
+    def test_search_returns_string_ids_and_payloads(self, index):
+        index.upsert([_point(i) for i in range(20)])
+
+        hits = index.search(_vec(3), limit=2)
+
+        assert hits[0][0] == "3"
+        assert hits[0][1] == pytest.approx(1.0)
+        assert hits[0][2]["content"] == "doc 3"
+        assert len(hits) == 2
+
+    def test_score_threshold(self, index):
+        index.upsert([_point(i) for i in range(20)])
+
+        assert [h[0] for h in index.search(_vec(3), limit=5, score_threshold=0.99)] == ["3"]
+
+    def test_category_and_keyword_filters(self, index):
+        index.upsert([
+            _point(1, "pricing", ["valor"]),
+            _point(2, "pricing", ["matrícula"]),
+            _point(3, "business_info", ["horário"]),
+            _point(4, "methodology", ["valor"]),
+        ])
+
+        by_category = index.search(_vec(1), limit=10, category="pricing")
+        by_keyword = index.search(_vec(1), limit=10, keywords=["valor"])
+        either = index.search(_vec(1), limit=10, category="business_info", keywords=["matrícula"])
+
+        assert sorted(h[0] for h in by_category) == ["1", "2"]
+        assert sorted(h[0] for h in by_keyword) == ["1", "4"]
+        assert sorted(h[0] for h in either) == ["2", "3"]
+        assert index.search(_vec(1), limit=10, category="inexistente") == []
+
+    def test_upsert_replaces_payload_postings(self, index):
+        index.upsert([_point(1, "pricing")])
+        index.upsert([_point(1, "programs")])
+
+        assert index.search(_vec(1), category="pricing") == []
+        assert [h[0] for h in index.search(_vec(1), category="programs")] == ["1"]
+        assert len(index) == 1
+
+    def test_delete_accepts_qdrant_string_ids(self, index):
+        index.upsert([_point(i, "pricing") for i in range(5)])
+
+        assert index.delete(["2", "99"]) == 1
+
+        assert "2" not in [h[0] for h in index.search(_vec(2), limit=10, category="pricing")]
+        assert len(index) == 4
+
+    def test_persists_across_instances(self, index, tmp_path):
+        index.upsert([_point(i, "pricing", ["valor"]) for i in range(5)])
+        index.delete([0])
+
+        reopened = LocalVectorIndex("kumon_knowledge", directory=str(tmp_path))
+
+        assert len(reopened) == 4
+        assert reopened.search(_vec(4), limit=1, keywords=["valor"])[0][0] == "4"
+
+    def test_unreadable_snapshot_is_discarded(self, index, tmp_path):
+        index.upsert([_point(1)])
+        (tmp_path / "kumon_knowledge.json").write_text("{corrompido")
+
+        reopened = LocalVectorIndex("kumon_knowledge", directory=str(tmp_path))
+
+        assert len(reopened) == 0
+        assert reopened.search(_vec(1)) == []
+
+    def test_dimension_change_resets(self, index):
+        index.upsert([_point(1)])
+        index.upsert([("novo", _vec(1, DIM * 2), {"category": "general"})])
+
+        assert len(index) == 1 and index.dimension == DIM * 2
+        assert index.search(_vec(1)) == []  # consulta com a dimensão antiga
+
+    def test_clear_removes_snapshot(self, index, tmp_path):
+        index.upsert([_point(1)])
+        index.clear()
+
+        assert len(index) == 0
+        assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.performance
+class TestLocalVectorIndexBenchmark:
+    """Fallback search latency over 10k chunks at dim 384, filtered and unfiltered."""
+
+    def test_search_latency(self, tmp_path):
+        n, dim = 10_000, 384
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((n, dim)).astype(np.float32)
+        categories = ["programs", "pricing", "business_info", "methodology"]
+        index = LocalVectorIndex("bench", directory=str(tmp_path))
+        index.upsert([
+            (i, vectors[i], {"category": categories[i % 4], "keywords": [f"kw{i % 50}"]})
+            for i in range(n)
+        ])
+        query = rng.standard_normal(dim).astype(np.float32)
+
+        def _latency_ms(**filters):
+            runs = 50
+            start = time.perf_counter()
+            for _ in range(runs):
+                index.search(query, limit=5, **filters)
+            return (time.perf_counter() - start) / runs * 1000
+
+        unfiltered_ms = _latency_ms()
+        filtered_ms = _latency_ms(category="pricing", keywords=["kw7"])
+
+        start = time.perf_counter()
+        LocalVectorIndex("bench", directory=str(tmp_path)).search(query)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        print(
+            f"\nBENCH|local_vector_index|n={n}|dim={dim}|search_ms={unfiltered_ms:.2f}|"
+            f"filtered_ms={filtered_ms:.2f}|cold_load_ms={load_ms:.0f}"
+        )
+
+        assert unfiltered_ms < 10
+        assert filtered_ms < 10
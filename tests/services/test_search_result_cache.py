@@ -0,0 +1,89 @@
+"""
+Tests for the vector search result cache.
+Keyed by query-embedding hash + search parameters, short TTL, cleared on writes.
+"""
+import time
+
+import numpy as np
+import pytest
+
+from app.services.search_result_cache import SearchResultCache
+
+
+def _embedding(seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(384).astype(np.float32)
+
+
+class TestSearchResultCache:
+    """Keys, TTL, LRU eviction and invalidation."""
+
+    def test_same_embedding_and_filters_hit(self):
+        cache = SearchResultCache(ttl_seconds=60, max_entries=10)
+        key = cache.make_key(_embedding(), 5, 0.7, "pricing", ["valor", "matrícula"])
+
+        cache.set(key, [{"id": "1"}])
+
+        same = cache.make_key(_embedding().tolist(), 5, 0.7, "pricing", ["matrícula", "valor"])
+        assert cache.get(same) == [{"id": "1"}]
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            (_embedding(1), 5, 0.7, None, None),
+            (_embedding(), 3, 0.7, None, None),
+            (_embedding(), 5, 0.5, None, None),
+            (_embedding(), 5, 0.7, "pricing", None),
+            (_embedding(), 5, 0.7, None, ["valor"]),
+        ],
+    )
+    def test_different_parameters_miss(self, args):
+        cache = SearchResultCache(ttl_seconds=60, max_entries=10)
+        cache.set(cache.make_key(_embedding(), 5, 0.7), [{"id": "1"}])
+
+        assert cache.get(cache.make_key(*args)) is None
+
+    def test_results_are_copies(self):
+        cache = SearchResultCache(ttl_seconds=60, max_entries=10)
+        results = [{"id": "1", "metadata": {}}]
+        cache.set("k", results)
+        results[0]["metadata"]["x"] = 1
+
+        cached = cache.get("k")
+        cached[0]["id"] = "alterado"
+
+        assert cache.get("k") == [{"id": "1", "metadata": {}}]
+
+    def test_entries_expire(self):
+        cache = SearchResultCache(ttl_seconds=0.01, max_entries=10)
+        cache.set("k", [1])
+        time.sleep(0.02)
+
+        assert cache.get("k") is None
+        assert cache.get_stats()["entries"] == 0
+
+    def test_lru_eviction(self):
+        cache = SearchResultCache(ttl_seconds=60, max_entries=2)
+        cache.set("a", [1])
+        cache.set("b", [2])
+        cache.get("a")
+        cache.set("c", [3])
+
+        assert cache.get("b") is None
+        assert cache.get("a") == [1] and cache.get("c") == [3]
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_clear_on_write(self):
+        cache = SearchResultCache(ttl_seconds=60, max_entries=10)
+        cache.set("k", [1])
+
+        cache.clear()
+
+        assert cache.get("k") is None
+        assert cache.get_stats()["invalidations"] == 1
+
+    def test_zero_ttl_disables_cache(self):
+        cache = SearchResultCache(ttl_seconds=0, max_entries=10)
+        cache.set("k", [1])
+
+        assert cache.get("k") is None
@@ -0,0 +1,201 @@
+"""
+Tests for the matrix-backed similarity index.
+Pre-normalized float32 rows, one matmul per query and argpartition top-k.
+"""
+import time
+
+import numpy as np
+import pytest
+import pytest_asyncio
+
+from app.services.similarity_index import SimilarityIndex, top_k_cosine
+
+DIM = 16
+
+
+def _vectors(n: int, dim: int = DIM, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def _loop_top_k(query, candidates, top_k):
+    """Implementação anterior: um cosseno por candidato e sort completo."""
+    similarities = []
+    for i, candidate in enumerate(candidates):
+        score = float(np.dot(query, candidate) / (np.linalg.norm(query) * np.linalg.norm(candidate)))
+        similarities.append((i, score))
+    similarities.sort(key=lambda x: x[1], reverse=True)
+    return similarities[:top_k]
+
+
+class TestTopKCosine:
+    """Ad-hoc top-k over a list of candidates."""
+
+    def test_matches_python_loop(self):
+        candidates = list(_vectors(200))
+        query = _vectors(1, seed=1)[0]
+
+        result = top_k_cosine(query, candidates, top_k=10)
+        expected = _loop_top_k(query, candidates, 10)
+
+        assert [i for i, _ in result] == [i for i, _ in expected]
+        assert [s for _, s in result] == pytest.approx([s for _, s in expected], abs=1e-5)
+
+    def test_top_k_larger_than_candidates(self):
+        candidates = list(_vectors(3))
+
+        assert len(top_k_cosine(candidates[0], candidates, top_k=10)) == 3
+        assert top_k_cosine(candidates[0], candidates, top_k=10)[0] == (0, pytest.approx(1.0))
+
+    def test_empty_candidates_and_zero_vectors(self):
+        assert top_k_cosine(np.ones(DIM), [], top_k=5) == []
+        assert top_k_cosine(np.zeros(DIM), [np.ones(DIM)], top_k=1) == [(0, 0.0)]
+
+
+class TestSimilarityIndex:
+    """Incremental add/remove, masks and batch search."""
+
+    def test_search_returns_ids_best_first(self):
+        vectors = _vectors(50)
+        index = SimilarityIndex(DIM, initial_capacity=4)
+        index.add([f"doc{i}" for i in range(50)], vectors)
+
+        hits = index.search(vectors[7], top_k=3)
+
+        assert hits[0] == ("doc7", pytest.approx(1.0))
+        assert hits[0][1] >= hits[1][1] >= hits[2][1]
+        assert index.get_stats()["capacity"] == 64
+
+    def test_upsert_replaces_existing_vector(self):
+        vectors = _vectors(3)
+        index = SimilarityIndex(DIM)
+        index.add(["a", "b"], vectors[:2])
+
+        index.add(["a"], vectors[2:])
+
+        assert len(index) == 2
+        assert index.search(vectors[2], top_k=1)[0][0] == "a"
+
+    def test_remove_swaps_last_row(self):
+        vectors = _vectors(4)
+        index = SimilarityIndex(DIM)
+        index.add(["a", "b", "c", "d"], vectors)
+
+        assert index.remove(["b", "missing"]) == 1
+
+        assert index.ids == ["a", "d", "c"]
+        assert "b" not in index
+        assert index.search(vectors[3], top_k=1)[0] == ("d", pytest.approx(1.0))
+
+    def test_mask_and_min_score(self):
+        vectors = _vectors(10)
+        index = SimilarityIndex(DIM)
+        index.add(list(range(10)), vectors)
+        mask = np.ones(10, dtype=bool)
+        mask[4] = False
+
+        hits = index.search(vectors[4], top_k=10, mask=mask)
+        strong = index.search(vectors[4], top_k=10, min_score=0.99)
+
+        assert 4 not in [i for i, _ in hits] and len(hits) == 9
+        assert strong == [(4, pytest.approx(1.0))]
+
+    def test_batch_search_matches_single_queries(self):
+        vectors = _vectors(100)
+        index = SimilarityIndex(DIM)
+        index.add(list(range(100)), vectors)
+        queries = _vectors(5, seed=9)
+
+        batch = index.search_batch(queries, top_k=4)
+
+        for hits, query in zip(batch, queries):
+            single = index.search(query, top_k=4)
+            assert [i for i, _ in hits] == [i for i, _ in single]
+            assert [s for _, s in hits] == pytest.approx([s for _, s in single], abs=1e-6)
+
+    def test_empty_index(self):
+        assert SimilarityIndex(DIM).search(np.ones(DIM)) == []
+
+
+class TestLocalVectorStoreSemanticSearch:
+    """Fallback RAG search uses embeddings when an embedder is configured."""
+
+    @pytest_asyncio.fixture
+    async def store(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        # o módulo agenda uma task ao ser importado; precisa de loop ativo
+        from app.core.robust_fallbacks import LocalVectorStore
+
+        store = LocalVectorStore()
+        store.knowledge_base = [
+            {"id": "1", "text": "Horário de funcionamento", "metadata": {"category": "horarios"}},
+            {"id": "2", "text": "Valor da mensalidade", "metadata": {"category": "precos"}},
+        ]
+        return store
+
+    @pytest.mark.asyncio
+    async def test_semantic_search_with_embedder(self, store):
+        calls = []
+
+        async def embed_texts(texts):
+            calls.append(list(texts))
+            return [[1.0, 0.0] if "Horário" in t else [0.0, 1.0] for t in texts]
+
+        store.set_embedder(embed_texts)
+
+        first = await store.search("quanto custa?", limit=1, query_embedding=[0.1, 0.9])
+        second = await store.search("que horas abre?", limit=1, query_embedding=[0.9, 0.1])
+
+        assert first[0]["id"] == "2" and first[0]["is_fallback"]
+        assert second[0]["id"] == "1"
+        assert len(calls) == 1  # índice construído uma vez
+
+    @pytest.mark.asyncio
+    async def test_keyword_search_without_embedding(self, store):
+        results = await store.search("mensalidade", limit=5)
+
+        assert [r["id"] for r in results] == ["2"]
+
+    @pytest.mark.asyncio
+    async def test_embedder_failure_falls_back_to_keywords(self, store):
+        async def failing(texts):
+            raise RuntimeError("model unavailable")
+
+        store.set_embedder(failing)
+
+        results = await store.search("mensalidade", limit=5, query_embedding=[1.0, 0.0])
+
+        assert [r["id"] for r in results] == ["2"]
+
+
+@pytest.mark.performance
+class TestSimilarityIndexBenchmark:
+    """Top-5 latency at dim 384: Python loop + full sort vs matmul + argpartition."""
+
+    DIM = 384
+
+    def test_top_k_latency(self):
+        query = _vectors(1, self.DIM, seed=42)[0]
+        results = []
+
+        for n in (1_000, 10_000, 100_000):
+            candidates = _vectors(n, self.DIM)
+            index = SimilarityIndex(self.DIM, initial_capacity=n)
+            index.add(list(range(n)), candidates)
+
+            runs = 20
+            start = time.perf_counter()
+            for _ in range(runs):
+                hits = index.search(query, top_k=5)
+            index_ms = (time.perf_counter() - start) / runs * 1000
+
+            loop_ms = None
+            if n <= 10_000:
+                start = time.perf_counter()
+                expected = _loop_top_k(query, candidates, 5)
+                loop_ms = (time.perf_counter() - start) * 1000
+                assert [i for i, _ in hits] == [i for i, _ in expected]
+                assert index_ms < loop_ms
+
+            results.append(f"n={n}|index_ms={index_ms:.2f}|loop_ms={loop_ms and round(loop_ms, 2)}")
+
+        print("\nBENCH|similarity_index|" + "|".join(results))
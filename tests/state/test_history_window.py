@@ -0,0 +1,128 @@
+"""
+Test History Window - bounded, compacted history in the ONE_TURN state.
+
+Validates the ring-buffer window, rolling summary and archiving, plus a
+500-turn benchmark showing per-turn checkpoint bytes and latency stay flat.
+"""
+
+import copy
+import json
+import time
+
+import pytest
+
+from app.core import history_window
+from app.core.history_window import append_turn, compact_history, roll_summary
+
+
+def _simulate_turn(state: dict, turn: int, archive=None) -> dict:
+    """Build the next checkpoint state the way the webhook + nodes do."""
+    text = f"mensagem {turn}: gostaria de saber mais sobre o método Kumon"
+    history, summary = append_turn(state, text, phone="5511999999999", archive=archive)
+    return {
+        "phone": "5511999999999",
+        "message_id": f"msg_{turn}",
+        "text": text,
+        "collected_data": {"parent_name": "Gabriel", "student_age": 8},
+        "history": history,
+        "history_summary": summary,
+        "last_bot_response": f"resposta {turn}: o Kumon desenvolve autonomia e foco.",
+    }
+
+
+class TestHistoryWindow:
+    """Window, summary and archive behaviour."""
+
+    def test_short_history_is_untouched(self):
+        history = [{"role": "user", "content": "oi"}]
+
+        window, summary, evicted = compact_history(history, "", window=4)
+
+        assert window == history
+        assert summary == ""
+        assert evicted == []
+
+    def test_overflow_is_evicted_into_summary(self):
+        history = [{"role": "user", "content": f"m{i}"} for i in range(6)]
+
+        window, summary, evicted = compact_history(history, "", window=4)
+
+        assert [e["content"] for e in window] == ["m2", "m3", "m4", "m5"]
+        assert [e["content"] for e in evicted] == ["m0", "m1"]
+        assert summary == "Usuário: m0 | Usuário: m1"
+
+    def test_summary_is_bounded_and_keeps_latest(self, monkeypatch):
+        monkeypatch.setattr(history_window, "SUMMARY_MAX_CHARS", 40)
+        entries = [{"role": "assistant", "content": f"resposta {i}"} for i in range(10)]
+
+        summary = roll_summary("", entries)
+
+        assert len(summary) <= 40
+        assert summary.endswith("Assistente: resposta 9")
+        assert not summary.startswith("|")
+
+    def test_append_turn_adds_bot_then_user_without_mutating_state(self):
+        previous = {"history": [{"role": "user", "content": "oi"}], "last_bot_response": "Olá!"}
+
+        history, _ = append_turn(previous, "quero matricular", window=10)
+
+        assert [e["role"] for e in history] == ["user", "assistant", "user"]
+        assert len(previous["history"]) == 1
+
+    def test_append_turn_archives_evicted_entries(self):
+        archived = []
+        previous = {"history": [{"role": "user", "content": f"m{i}"} for i in range(4)]}
+
+        append_turn(
+            previous, "nova", phone="5511", archive=lambda p, e: archived.extend(e), window=4
+        )
+
+        assert [e["content"] for e in archived] == ["m0"]
+
+    def test_archive_failure_does_not_break_turn(self):
+        def broken_archive(phone, entries):
+            raise RuntimeError("redis down")
+
+        previous = {"history": [{"role": "user", "content": f"m{i}"} for i in range(4)]}
+
+        history, summary = append_turn(
+            previous, "nova", phone="5511", archive=broken_archive, window=4
+        )
+
+        assert len(history) == 4
+        assert "m0" in summary
+
+
+@pytest.mark.performance
+class TestHistoryWindowBenchmark:
+    """500-turn conversation: checkpoint size and per-turn cost stay flat."""
+
+    TURNS = 500
+
+    def test_checkpoint_bytes_and_latency_stay_flat(self):
+        state: dict = {}
+        sizes = []
+        latencies = []
+
+        for turn in range(self.TURNS):
+            start = time.perf_counter()
+            state = _simulate_turn(state, turn)
+            # Nodes deepcopy the state and the checkpointer serializes it
+            payload = json.dumps(copy.deepcopy(state), ensure_ascii=False)
+            latencies.append(time.perf_counter() - start)
+            sizes.append(len(payload.encode("utf-8")))
+
+        early = sizes[50:100]
+        late = sizes[-50:]
+        print(
+            f"\nBENCH|history_window|turns={self.TURNS}|"
+            f"bytes_turn50={sizes[50]}|bytes_turn500={sizes[-1]}|"
+            f"p50_early_us={sorted(latencies[50:100])[25] * 1e6:.0f}|"
+            f"p50_late_us={sorted(latencies[-50:])[25] * 1e6:.0f}"
+        )
+
+        assert len(state["history"]) == history_window.HISTORY_WINDOW_SIZE
+        # Bytes: bounded by window + summary cap, independent of turn count
+        assert max(late) <= max(early) * 1.05
+        # Latency: median of late turns comparable to early turns
+        assert sorted(latencies[-50:])[25] <= sorted(latencies[50:100])[25] * 3
@@ -0,0 +1,211 @@
+"""
+Test AsyncPooledCheckpointSaver - async pooled checkpoints for the ONE_TURN graph.
+
+Runs against an in-memory stand-in for the asyncpg pool; validates the
+round trip, lazy single pool creation and write-behind coalescing.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+try:
+    from app.services.postgres_checkpointer import AsyncPooledCheckpointSaver
+except Exception as exc:  # langgraph < 0.2 has no CheckpointMetadata
+    pytest.skip(f"langgraph checkpoint v2 API unavailable: {exc}", allow_module_level=True)
+
+
+class FakeConnection:
+    """Minimal asyncpg connection backed by a dict (one row per thread)."""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def execute(self, sql, *args):
+        if args:
+            await asyncio.sleep(self.pool.write_delay)
+            self.pool.rows[(args[0], args[1])] = args[2:]
+            self.pool.upserts += 1
+        return "OK"
+
+    async def fetchrow(self, sql, *args):
+        return self.pool.rows.get(args)
+
+
+class FakePool:
+    def __init__(self, write_delay=0.0):
+        self.rows = {}
+        self.upserts = 0
+        self.write_delay = write_delay
+        self.closed = False
+
+    def acquire(self):
+        pool = self
+
+        class _Acquire:
+            async def __aenter__(self):
+                return FakeConnection(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Acquire()
+
+    async def close(self):
+        self.closed = True
+
+
+def _checkpoint(text: str) -> dict:
+    return {
+        "v": 1,
+        "id": str(uuid.uuid4()),
+        "ts": "2024-01-01T00:00:00+00:00",
+        "channel_values": {"__root__": {"text": text, "collected_data": {"age": 8}}},
+        "channel_versions": {"__root__": 1},
+        "versions_seen": {},
+        "pending_sends": [],
+    }
+
+
+def _config(thread_id: str = "5511999999999") -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+@pytest.fixture
+def saver():
+    checkpointer = AsyncPooledCheckpointSaver("postgresql+asyncpg://u:p@db:5432/kumon")
+    checkpointer.pool = FakePool()
+    return checkpointer
+
+
+class TestAsyncPooledCheckpointSaver:
+    """Round trip, pool creation and write-behind."""
+
+    def test_dsn_is_normalized_for_asyncpg(self, saver):
+        assert saver.dsn == "postgresql://u:p@db:5432/kumon"
+
+    @pytest.mark.asyncio
+    async def test_round_trip_keeps_latest_checkpoint(self, saver):
+        first = _checkpoint("oi")
+        next_config = await saver.aput(_config(), first, {"step": 1}, {})
+        second = _checkpoint("quero matrícula")
+        await saver.aput(next_config, second, {"step": 2}, {})
+
+        latest = await saver.aget_tuple(_config())
+
+        assert latest.checkpoint["channel_values"] == second["channel_values"]
+        assert latest.config["configurable"]["checkpoint_id"] == second["id"]
+        assert latest.parent_config["configurable"]["checkpoint_id"] == first["id"]
+        assert latest.metadata == {"step": 2}
+        assert len(saver.pool.rows) == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_thread_returns_none(self, saver):
+        assert await saver.aget_tuple(_config("nobody")) is None
+        assert await saver.aget_tuple({"configurable": {}}) is None
+
+    @pytest.mark.asyncio
+    async def test_pool_is_created_once_under_concurrency(self, monkeypatch):
+        created = []
+
+        async def fake_create_pool(dsn, **kwargs):
+            await asyncio.sleep(0.01)
+            created.append(kwargs)
+            return FakePool()
+
+        import asyncpg
+
+        monkeypatch.setattr(asyncpg, "create_pool", fake_create_pool)
+        checkpointer = AsyncPooledCheckpointSaver(
+            "postgresql://db/kumon", min_size=1, max_size=4, statement_cache_size=0
+        )
+
+        await asyncio.gather(*(checkpointer.aget_tuple(_config(str(i))) for i in range(8)))
+
+        assert len(created) == 1
+        assert created[0]["max_size"] == 4
+        assert created[0]["statement_cache_size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_write_behind_returns_early_and_coalesces(self, saver):
+        saver.write_behind = True
+        saver.pool.write_delay = 0.02
+        checkpoints = [_checkpoint(f"m{i}") for i in range(5)]
+
+        for checkpoint in checkpoints:
+            await saver.aput(_config(), checkpoint, {}, {})
+
+        # Reads see the newest checkpoint before it reaches the database
+        pending = await saver.aget_tuple(_config())
+        assert pending.checkpoint["id"] == checkpoints[-1]["id"]
+        assert saver.pool.upserts == 0
+
+        pool = saver.pool
+        await saver.aclose()
+
+        stored = saver._to_tuple(("5511999999999", ""), pool.rows[("5511999999999", "")])
+        assert stored.checkpoint["id"] == checkpoints[-1]["id"]
+        assert pool.closed and saver.pool is None
+        assert saver.stats["writes"] <= 2
+        assert saver.stats["coalesced"] >= 3
+
+    @pytest.mark.asyncio
+    async def test_write_behind_retries_transient_failure(self, saver):
+        saver.write_behind = True
+        saver.retry_delay = 0.0
+        write = saver._write
+        calls = []
+
+        async def flaky_write(row):
+            calls.append(row)
+            if len(calls) == 1:
+                raise ConnectionError("db down")
+            await write(row)
+
+        saver._write = flaky_write
+        checkpoint = _checkpoint("oi")
+        await saver.aput(_config(), checkpoint, {}, {})
+        await saver.flush()
+
+        assert saver.stats["write_failures"] == 1
+        assert saver._unflushed == {}
+        assert saver.pool.rows[("5511999999999", "")][0] == checkpoint["id"]
+
+    @pytest.mark.asyncio
+    async def test_write_behind_failure_surfaces_on_flush(self, saver):
+        saver.write_behind = True
+        saver.retry_delay = 0.0
+
+        async def broken_write(row):
+            raise ConnectionError("db down")
+
+        saver._write = broken_write
+        checkpoint = _checkpoint("oi")
+        await saver.aput(_config(), checkpoint, {}, {})
+
+        pool = saver.pool
+        with pytest.raises(ConnectionError):
+            await saver.aclose()
+
+        # Nada é descartado: a leitura ainda vê o checkpoint não persistido
+        assert (await saver.aget_tuple(_config())).checkpoint["id"] == checkpoint["id"]
+        assert saver.stats["write_failures"] == saver.write_retries + 1
+        assert pool.closed
+
+    def test_sync_api_bridges_to_async(self, saver):
+        checkpoint = _checkpoint("oi")
+
+        saved = saver.put(_config(), checkpoint, {"step": 1}, {})
+        loaded = saver.get_tuple(_config())
+
+        assert saved["configurable"]["checkpoint_id"] == checkpoint["id"]
+        assert loaded.checkpoint["id"] == checkpoint["id"]
+        assert [item.checkpoint["id"] for item in saver.list(_config())] == [checkpoint["id"]]
+
+    @pytest.mark.asyncio
+    async def test_sync_call_from_pool_loop_is_refused(self, saver):
+        saver._loop = asyncio.get_running_loop()
+
+        with pytest.raises(asyncio.InvalidStateError):
+            saver.get_tuple(_config())
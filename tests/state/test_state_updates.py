@@ -0,0 +1,123 @@
+"""
+Test State Updates - copy-on-write partial updates for LangGraph nodes.
+
+Validates merge semantics (no mutation of the incoming state) plus a
+benchmark comparing deepcopy-per-node with copy-on-write updates.
+"""
+
+import copy
+import time
+import tracemalloc
+
+import pytest
+
+from app.core.state.updates import as_graph_node, merge_update, with_collected
+
+
+def _realistic_state() -> dict:
+    """State shaped like a mid-conversation checkpoint."""
+    return {
+        "phone": "5511999999999",
+        "message_id": "msg_42",
+        "text": "gostaria de agendar uma visita",
+        "instance": "kumon_assistant",
+        "collected_data": {
+            "parent_name": "Gabriel",
+            "child_name": "Ana",
+            "student_age": 8,
+            "program_interests": ["matemática", "português"],
+        },
+        "history": [
+            {"role": "user" if i % 2 else "assistant", "content": f"mensagem {i} " * 8}
+            for i in range(12)
+        ],
+        "history_summary": "Usuário: oi | Assistente: Olá! " * 10,
+        "nlu_result": {"primary_intent": "information", "entities": {"age": 8}},
+        "last_bot_response": "O Kumon desenvolve autonomia e foco.",
+    }
+
+
+class TestStateUpdates:
+    """Merge semantics."""
+
+    def test_merge_update_does_not_mutate_state(self):
+        state = {"a": 1, "nested": {"x": 1}}
+
+        merged = merge_update(state, {"a": 2})
+
+        assert merged == {"a": 2, "nested": {"x": 1}}
+        assert state["a"] == 1
+        assert merged["nested"] is state["nested"]
+
+    def test_with_collected_copies_only_when_changed(self):
+        state = {"collected_data": {"parent_name": "Gabriel"}}
+
+        unchanged = with_collected(state, parent_name="Gabriel")
+        changed = with_collected(state, student_age=8)
+
+        assert unchanged is state["collected_data"]
+        assert changed == {"parent_name": "Gabriel", "student_age": 8}
+        assert state["collected_data"] == {"parent_name": "Gabriel"}
+
+    def test_with_collected_handles_missing_dict(self):
+        assert with_collected({}, child_name="Ana") == {"child_name": "Ana"}
+
+    @pytest.mark.asyncio
+    async def test_as_graph_node_merges_partial_update(self):
+        async def node(state):
+            return {"response": "oi"}
+
+        state = {"phone": "5511", "response": None}
+
+        result = await as_graph_node(node)(state)
+
+        assert result == {"phone": "5511", "response": "oi"}
+        assert state["response"] is None
+
+
+@pytest.mark.performance
+class TestStateUpdatesBenchmark:
+    """deepcopy per node vs copy-on-write partial update."""
+
+    ITERATIONS = 2000
+
+    RETAINED = 100
+
+    def _measure(self, step):
+        """Per-step latency and bytes retained by the resulting states."""
+        state = _realistic_state()
+        start = time.perf_counter()
+        for _ in range(self.ITERATIONS):
+            step(state)
+        latency = (time.perf_counter() - start) / self.ITERATIONS
+
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        retained = [step(state) for _ in range(self.RETAINED)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del retained
+        return latency, (current - baseline) // self.RETAINED
+
+    def test_cow_is_cheaper_than_deepcopy(self):
+        def deepcopy_step(state):
+            working = copy.deepcopy(state)
+            working["collected_data"]["student_age"] = 9
+            working["response"] = "ok"
+            return working
+
+        def cow_step(state):
+            update = {"collected_data": with_collected(state, student_age=9), "response": "ok"}
+            return merge_update(state, update)
+
+        deep_latency, deep_bytes = self._measure(deepcopy_step)
+        cow_latency, cow_bytes = self._measure(cow_step)
+
+        print(
+            f"\nBENCH|state_updates|iterations={self.ITERATIONS}|"
+            f"deepcopy_us={deep_latency * 1e6:.1f}|cow_us={cow_latency * 1e6:.1f}|"
+            f"deepcopy_bytes={deep_bytes}|cow_bytes={cow_bytes}"
+        )
+
+        assert cow_latency * 5 < deep_latency
+        assert cow_bytes * 5 < deep_bytes